@@ -0,0 +1,76 @@
+"""
+Linux Daily Tips Backend - Alembic Environment
+
+Runs migrations over asyncpg with the application's DATABASE_URL and
+session settings (statement_timeout disabled, see
+app.config.migrations.get_migration_engine). Each migration runs in its
+own transaction so the CONCURRENTLY helpers can step outside it, and a
+session advisory lock keeps two deploys or workers from migrating at the
+same time.
+"""
+
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import text
+
+from app.config.database import Base
+from app.config.migrations import MIGRATION_LOCK_ID, get_migration_engine
+from app.config.settings import get_settings
+
+
+config = context.config
+
+# Configure logging from alembic.ini unless running inside the application
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Render migrations as SQL (alembic upgrade head --sql)."""
+    context.configure(
+        url=get_settings().database_url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection) -> None:
+    """Run migrations on a connection while holding the migration lock."""
+    # Session-level lock: it outlives the commit and each migration's transaction
+    connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+    connection.commit()
+    try:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            transaction_per_migration=True,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+    finally:
+        connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+        connection.commit()
+
+
+async def run_migrations_online() -> None:
+    """Run migrations against the database."""
+    engine = get_migration_engine()
+    try:
+        async with engine.connect() as connection:
+            await connection.run_sync(do_run_migrations)
+    finally:
+        await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
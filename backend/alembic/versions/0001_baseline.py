@@ -0,0 +1,60 @@
+"""Baseline schema from init-db/01-init-schema.sql
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+Databases created by the PostgreSQL container already have this schema
+(docker-entrypoint-initdb.d runs init-db/), so the script is only run
+when the tips table is missing. Either way the database ends up at this
+revision and later migrations apply on top.
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+from alembic.util import CommandError
+import sqlalchemy as sa
+from sqlalchemy.util import await_only
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INIT_SCHEMA = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "init-db",
+    "01-init-schema.sql",
+)
+
+
+def _strip_psql_meta_commands(script: str) -> str:
+    """Drop psql backslash commands such as \\echo, which only psql understands."""
+    return "".join(
+        line for line in script.splitlines(keepends=True)
+        if not line.lstrip().startswith("\\")
+    )
+
+
+def upgrade() -> None:
+    """Create the schema unless the container init already did."""
+    bind = op.get_bind()
+    if bind.scalar(sa.text("SELECT to_regclass('linux_tips.tips') IS NOT NULL")):
+        return
+
+    with open(INIT_SCHEMA) as f:
+        script = _strip_psql_meta_commands(f.read())
+    # The script has dollar-quoted function bodies; asyncpg runs it as one
+    # simple-protocol batch inside the migration's transaction
+    await_only(bind.connection.driver_connection.execute(script))
+
+
+def downgrade() -> None:
+    """The baseline cannot be downgraded."""
+    raise CommandError(
+        "Revision 0001 is the baseline schema; downgrading below it would drop "
+        "every table and its data. Drop the database instead if that is intended."
+    )
@@ -0,0 +1,73 @@
+"""Indexes matched to access patterns
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:05:00.000000
+
+Brings databases created from an older init-db/01-init-schema.sql in
+line with the current one. New indexes are built before the ones they
+replace are dropped; everything runs CONCURRENTLY, so reads and writes
+continue while it runs.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.config.migrations import (
+    create_index_concurrently,
+    drop_index_concurrently,
+    execute_with_lock_timeout,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Superseded by the partial indexes, or duplicates of UNIQUE constraint
+# indexes and of the leading column of idx_draft_tips_unique_day
+REDUNDANT_INDEXES = {
+    "idx_tips_is_active": ("tips", "is_active"),
+    "idx_admin_users_username": ("admin_users", "username"),
+    "idx_admin_users_email": ("admin_users", "email"),
+    "idx_draft_tips_week_id": ("draft_tips", "draft_week_id"),
+    "idx_terminal_sessions_status": ("terminal_sessions", "status"),
+    "idx_terminal_sessions_expires_at": ("terminal_sessions", "expires_at"),
+}
+
+
+def upgrade() -> None:
+    """Add the partial indexes, then drop the ones they replace."""
+    # Daily tip, archive pages and the publish calendar all read active
+    # tips newest first. They fetch heap rows anyway (archive pages read
+    # view_count, which must stay out of indexes for HOT updates), so
+    # nothing is INCLUDEd
+    create_index_concurrently(
+        "idx_tips_active_publish_date",
+        "tips",
+        ["publish_date DESC", "created_at DESC"],
+        where="is_active",
+    )
+    # Expiry sweeps and active-session counts only look at active sessions
+    create_index_concurrently(
+        "idx_terminal_sessions_active_expires_at",
+        "terminal_sessions",
+        ["expires_at"],
+        where="status = 'active'",
+    )
+    for name in REDUNDANT_INDEXES:
+        drop_index_concurrently(name)
+
+    with op.get_context().autocommit_block():
+        execute_with_lock_timeout("ANALYZE tips")
+        execute_with_lock_timeout("ANALYZE terminal_sessions")
+
+
+def downgrade() -> None:
+    """Restore the single-column indexes and drop the partial ones."""
+    for name, (table, column) in REDUNDANT_INDEXES.items():
+        create_index_concurrently(name, table, [column])
+    drop_index_concurrently("idx_terminal_sessions_active_expires_at")
+    drop_index_concurrently("idx_tips_active_publish_date")
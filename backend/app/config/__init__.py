@@ -3,155 +3,220 @@ Linux Daily Tips Backend - Configuration Module
 
 This module provides centralized configuration management for the FastAPI application,
 including settings, database connections, Redis caching, and other infrastructure components.
+
+Only settings are imported eagerly. Everything else is resolved on first
+attribute access, so importing app.config for settings does not pull in
+sqlalchemy, asyncpg or redis.
 """
 
-from .settings import Settings, get_settings, get_config
-from .database import (
-    Base,
-    metadata,
-    DatabaseConfig,
-    get_database,
-    get_async_session,
-    get_sync_session,
-    get_session_context,
-    transaction,
-    init_database,
-    cleanup_database
-)
-from .redis import (
-    RedisConfig,
-    RedisClient,
-    RedisCache,
-    get_redis_config,
-    get_redis_client,
-    get_redis_cache,
-    get_redis,
-    get_cache,
-    init_redis,
-    cleanup_redis,
-    redis_transaction
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+from .settings import (
+    Settings,
+    RuntimeSettings,
+    get_settings,
+    get_runtime_settings,
+    set_runtime_settings,
+    get_config
 )
 
-# =============================================================================
-# CENTRALIZED INITIALIZATION AND CLEANUP
-# =============================================================================
+# Attribute name -> submodule defining it, imported on first access
+_LAZY_EXPORTS = {
+    # Database
+    "Base": ".database",
+    "metadata": ".database",
+    "DatabaseConfig": ".database",
+    "ReplicaRouter": ".database",
+    "get_database": ".database",
+    "get_async_session": ".database",
+    "get_read_session": ".database",
+    "get_sync_session": ".database",
+    "get_session_context": ".database",
+    "transaction": ".database",
+    "init_database": ".database",
+    "cleanup_database": ".database",
 
-async def init_all() -> None:
-    """Initialize all configuration components."""
-    print("Initializing application configuration...")
+    # Migrations
+    "SchemaVersionError": ".migrations",
+    "get_schema_status": ".migrations",
+    "check_schema_version": ".migrations",
+    "upgrade_schema": ".migrations",
 
-    # Initialize database
-    await init_database()
+    # Telemetry
+    "Histogram": ".telemetry",
+    "Gauge": ".telemetry",
+    "PoolTelemetry": ".telemetry",
 
-    # Initialize Redis
-    await init_redis()
+    # Profiling
+    "RequestProfiler": ".profiling",
+    "ProfilingMiddleware": ".profiling",
+    "current_profile": ".profiling",
+    "profile_scope": ".profiling",
+    "get_request_profiler": ".profiling",
 
-    print("All configuration components initialized successfully")
+    # Logging
+    "setup_logging": ".logging",
+    "shutdown_logging": ".logging",
+    "get_logging_stats": ".logging",
 
+    # Tracing
+    "TracingConfig": ".tracing",
+    "TracedRedisClient": ".tracing",
+    "register_exporter": ".tracing",
+    "start_span": ".tracing",
+    "get_tracing": ".tracing",
+    "get_tracer": ".tracing",
+    "shutdown_tracing": ".tracing",
 
-async def cleanup_all() -> None:
-    """Cleanup all configuration components."""
-    print("Cleaning up application configuration...")
+    # Pool sizing
+    "AdaptivePoolController": ".pool_sizing",
+    "worker_connection_cap": ".pool_sizing",
+    "get_pool_controller": ".pool_sizing",
 
-    # Cleanup database connections
-    await cleanup_database()
+    # Startup
+    "StartupState": ".startup",
+    "get_startup_state": ".startup",
+    "is_live": ".startup",
+    "is_ready": ".startup",
+    "register_cache_warmer": ".startup",
+    "run_cache_warmers": ".startup",
 
-    # Cleanup Redis connections
-    await cleanup_redis()
+    # Health
+    "HealthMonitor": ".health",
+    "get_health_monitor": ".health",
 
-    print("All configuration components cleaned up successfully")
+    # Runtime tuning
+    "TUNABLE_FIELDS": ".runtime_tuning",
+    "RuntimeTuning": ".runtime_tuning",
+    "get_runtime_tuning": ".runtime_tuning",
 
+    # Redis
+    "RedisConfig": ".redis",
+    "RedisClient": ".redis",
+    "RedisCache": ".redis",
+    "get_redis_config": ".redis",
+    "get_redis_client": ".redis",
+    "get_redis_cache": ".redis",
+    "get_redis": ".redis",
+    "get_cache": ".redis",
+    "init_redis": ".redis",
+    "cleanup_redis": ".redis",
+    "redis_transaction": ".redis",
 
-# =============================================================================
-# HEALTH CHECK UTILITIES
-# =============================================================================
+    # Centralized functions
+    "init_all": ".lifecycle",
+    "cleanup_all": ".lifecycle",
+    "check_health": ".lifecycle",
+    "get_diagnostics": ".lifecycle",
+    "get_config_summary": ".lifecycle",
+}
 
-async def check_health() -> dict:
-    """Check health of all configuration components."""
-    health_status = {
-        "status": "healthy",
-        "components": {}
-    }
-
-    # Check database health
-    try:
-        db = get_database()
-        db_healthy = await db.check_connection()
-        db_info = await db.get_database_info()
-
-        health_status["components"]["database"] = {
-            "status": "healthy" if db_healthy else "unhealthy",
-            "info": db_info if db_healthy else {"error": "Connection failed"}
-        }
-    except Exception as e:
-        health_status["components"]["database"] = {
-            "status": "unhealthy",
-            "info": {"error": str(e)}
-        }
-
-    # Check Redis health
-    try:
-        redis_config = get_redis_config()
-        redis_healthy = await redis_config.ping()
-        redis_info = await redis_config.get_info() if redis_healthy else {}
-
-        health_status["components"]["redis"] = {
-            "status": "healthy" if redis_healthy else "unhealthy",
-            "info": redis_info if redis_healthy else {"error": "Connection failed"}
-        }
-    except Exception as e:
-        health_status["components"]["redis"] = {
-            "status": "unhealthy",
-            "info": {"error": str(e)}
-        }
-
-    # Update overall status
-    component_statuses = [
-        comp["status"] for comp in health_status["components"].values()
-    ]
-    if any(status == "unhealthy" for status in component_statuses):
-        health_status["status"] = "unhealthy"
-
-    return health_status
 
+def __getattr__(name: str) -> Any:
+    """Import the submodule defining a lazily exported name."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-# =============================================================================
-# CONFIGURATION SUMMARY
-# =============================================================================
 
-def get_config_summary() -> dict:
-    """Get a summary of current configuration settings."""
-    settings = get_settings()
-
-    return {
-        "app_name": settings.app_name,
-        "app_version": settings.app_version,
-        "environment": settings.environment,
-        "debug": settings.debug,
-        "log_level": settings.log_level,
-        "database": {
-            "host": settings.database_host,
-            "port": settings.database_port,
-            "database": settings.postgres_db,
-        },
-        "redis": {
-            "host": settings.redis_host,
-            "port": settings.redis_port,
-            "db": settings.redis_db,
-        },
-        "security": {
-            "jwt_algorithm": settings.jwt_algorithm,
-            "jwt_access_token_expire_minutes": settings.jwt_access_token_expire_minutes,
-        },
-        "cors": {
-            "origins": settings.cors_origins,
-            "credentials": settings.cors_credentials,
-        },
-        "features": {
-            "cache_enabled": settings.cache_enabled,
-            "adsense_enabled": settings.adsense_enabled,
-        }
-    }
+def __dir__() -> list:
+    """List eager and lazily exported names."""
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
+
+if TYPE_CHECKING:
+    from .database import (
+        Base,
+        metadata,
+        DatabaseConfig,
+        ReplicaRouter,
+        get_database,
+        get_async_session,
+        get_read_session,
+        get_sync_session,
+        get_session_context,
+        transaction,
+        init_database,
+        cleanup_database
+    )
+    from .migrations import (
+        SchemaVersionError,
+        get_schema_status,
+        check_schema_version,
+        upgrade_schema
+    )
+    from .telemetry import (
+        Histogram,
+        Gauge,
+        PoolTelemetry
+    )
+    from .profiling import (
+        RequestProfiler,
+        ProfilingMiddleware,
+        current_profile,
+        profile_scope,
+        get_request_profiler
+    )
+    from .logging import (
+        setup_logging,
+        shutdown_logging,
+        get_logging_stats
+    )
+    from .tracing import (
+        TracingConfig,
+        TracedRedisClient,
+        register_exporter,
+        start_span,
+        get_tracing,
+        get_tracer,
+        shutdown_tracing
+    )
+    from .pool_sizing import (
+        AdaptivePoolController,
+        worker_connection_cap,
+        get_pool_controller
+    )
+    from .startup import (
+        StartupState,
+        get_startup_state,
+        is_live,
+        is_ready,
+        register_cache_warmer,
+        run_cache_warmers
+    )
+    from .health import (
+        HealthMonitor,
+        get_health_monitor
+    )
+    from .runtime_tuning import (
+        TUNABLE_FIELDS,
+        RuntimeTuning,
+        get_runtime_tuning
+    )
+    from .redis import (
+        RedisConfig,
+        RedisClient,
+        RedisCache,
+        get_redis_config,
+        get_redis_client,
+        get_redis_cache,
+        get_redis,
+        get_cache,
+        init_redis,
+        cleanup_redis,
+        redis_transaction
+    )
+    from .lifecycle import (
+        init_all,
+        cleanup_all,
+        check_health,
+        get_diagnostics,
+        get_config_summary
+    )
 
 
 # =============================================================================
@@ -161,21 +226,80 @@ def get_config_summary() -> dict:
 __all__ = [
     # Settings
     "Settings",
+    "RuntimeSettings",
     "get_settings",
+    "get_runtime_settings",
+    "set_runtime_settings",
     "get_config",
 
     # Database
     "Base",
     "metadata",
     "DatabaseConfig",
+    "ReplicaRouter",
     "get_database",
     "get_async_session",
+    "get_read_session",
     "get_sync_session",
     "get_session_context",
     "transaction",
     "init_database",
     "cleanup_database",
 
+    # Migrations
+    "SchemaVersionError",
+    "get_schema_status",
+    "check_schema_version",
+    "upgrade_schema",
+
+    # Telemetry
+    "Histogram",
+    "Gauge",
+    "PoolTelemetry",
+
+    # Profiling
+    "RequestProfiler",
+    "ProfilingMiddleware",
+    "current_profile",
+    "profile_scope",
+    "get_request_profiler",
+
+    # Logging
+    "setup_logging",
+    "shutdown_logging",
+    "get_logging_stats",
+
+    # Tracing
+    "TracingConfig",
+    "TracedRedisClient",
+    "register_exporter",
+    "start_span",
+    "get_tracing",
+    "get_tracer",
+    "shutdown_tracing",
+
+    # Pool sizing
+    "AdaptivePoolController",
+    "worker_connection_cap",
+    "get_pool_controller",
+
+    # Startup
+    "StartupState",
+    "get_startup_state",
+    "is_live",
+    "is_ready",
+    "register_cache_warmer",
+    "run_cache_warmers",
+
+    # Health
+    "HealthMonitor",
+    "get_health_monitor",
+
+    # Runtime tuning
+    "TUNABLE_FIELDS",
+    "RuntimeTuning",
+    "get_runtime_tuning",
+
     # Redis
     "RedisConfig",
     "RedisClient",
@@ -193,5 +317,6 @@ __all__ = [
     "init_all",
     "cleanup_all",
     "check_health",
+    "get_diagnostics",
     "get_config_summary",
 ]
\ No newline at end of file
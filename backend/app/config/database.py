@@ -6,25 +6,34 @@ and provides database utilities for the FastAPI application.
 Supports both synchronous and asynchronous database operations.
 """
 
+import logging
 import os
 import asyncio
-from typing import AsyncGenerator, Optional, Dict, Any
+import time
+from typing import AsyncGenerator, Optional, Dict, Any, List
 from contextlib import asynccontextmanager
 from functools import lru_cache
 
-import asyncpg
-from sqlalchemy import create_engine, MetaData, event, pool
+from sqlalchemy import create_engine, MetaData, event, text
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
     AsyncSession,
     AsyncEngine
 )
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import NullPool, QueuePool
+from sqlalchemy.orm import declarative_base, sessionmaker, Session
+from sqlalchemy.pool import NullPool
+
+from .settings import get_settings, get_runtime_settings
+from .pool_sizing import worker_connection_cap
+from .telemetry import (
+    PoolTelemetry,
+    InstrumentedQueuePool,
+    InstrumentedAsyncAdaptedQueuePool
+)
+
 
-from .settings import get_settings
+logger = logging.getLogger(__name__)
 
 
 # =============================================================================
@@ -38,6 +47,143 @@ Base = declarative_base()
 metadata = MetaData()
 
 
+# =============================================================================
+# READ REPLICA ROUTING
+# =============================================================================
+
+# Replication lag in seconds; 0 when the server is not in recovery (primary
+# reachable under a second URL) or when the replica has replayed all WAL.
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+
+class ReplicaRouter:
+    """
+    Select a read replica for read-only sessions.
+
+    Replicas are chosen round-robin or by fewest in-flight sessions.
+    Replication lag is sampled by a background task every check interval,
+    so choosing a replica never waits on a lag query; replicas that lag
+    beyond the limit, cannot be reached or have not been measured yet are
+    skipped, and when none qualify the caller falls back to the primary.
+    """
+
+    def __init__(
+        self,
+        engines: List[AsyncEngine],
+        strategy: str = "round_robin",
+        max_lag_seconds: float = 10.0,
+        check_interval: float = 5.0
+    ):
+        """Initialize router over the given replica engines."""
+        self.engines = engines
+        self.strategy = strategy
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._in_flight = [0] * len(engines)
+        self._lag: List[Optional[float]] = [None] * len(engines)
+        self._next = 0
+        self._checked_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _measure_lag(self, engine: AsyncEngine) -> float:
+        """Measure replication lag for one replica (inf if unreachable)."""
+        try:
+            async with engine.connect() as conn:
+                result = await conn.execute(REPLICA_LAG_QUERY)
+                return float(result.scalar() or 0)
+        except Exception as e:
+            logger.warning("Replica lag check failed: %s", e)
+            return float("inf")
+
+    async def refresh_lag(self) -> List[Optional[float]]:
+        """Measure replication lag of every replica."""
+        self._lag = list(await asyncio.gather(
+            *(self._measure_lag(engine) for engine in self.engines)
+        ))
+        self._checked_at = time.monotonic()
+        return self._lag
+
+    async def run(self) -> None:
+        """Refresh replica lag every check interval until cancelled."""
+        while True:
+            try:
+                await self.refresh_lag()
+            except Exception as e:
+                logger.exception("Replica lag refresh failed: %s", e)
+            await asyncio.sleep(self.check_interval)
+
+    def start(self) -> None:
+        """Start refreshing replica lag on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop refreshing replica lag."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # Measurements older than this many check intervals are not trusted,
+    # e.g. if the refresh task died
+    STALE_AFTER_INTERVALS = 3
+
+    def healthy_replicas(self) -> List[int]:
+        """Get indexes of replicas within the allowed replication lag."""
+        if time.monotonic() - self._checked_at > self.check_interval * self.STALE_AFTER_INTERVALS:
+            return []
+        return [
+            index for index, lag in enumerate(self._lag)
+            if lag is not None and lag <= self.max_lag_seconds
+        ]
+
+    def choose(self) -> Optional[int]:
+        """Choose a replica index, or None to fall back to the primary."""
+        candidates = self.healthy_replicas()
+        if not candidates:
+            return None
+
+        if self.strategy == "least_connections":
+            return min(candidates, key=lambda index: self._in_flight[index])
+
+        index = candidates[self._next % len(candidates)]
+        self._next += 1
+        return index
+
+    def acquire(self, index: int) -> None:
+        """Record a session opened against a replica."""
+        self._in_flight[index] += 1
+
+    def release(self, index: int) -> None:
+        """Record a session closed against a replica."""
+        self._in_flight[index] -= 1
+
+    def get_status(self) -> List[Dict[str, Any]]:
+        """Get per-replica lag and in-flight session counts."""
+        return [
+            {
+                "index": index,
+                "lag_seconds": self._lag[index],
+                "in_flight": self._in_flight[index],
+                "healthy": index in self.healthy_replicas(),
+            }
+            for index in range(len(self.engines))
+        ]
+
+
 # =============================================================================
 # DATABASE ENGINE CONFIGURATION
 # =============================================================================
@@ -52,6 +198,10 @@ class DatabaseConfig:
         self._sync_engine = None
         self._async_session_factory = None
         self._sync_session_factory = None
+        self._replica_engines: Optional[List[AsyncEngine]] = None
+        self._replica_session_factories: List[async_sessionmaker] = []
+        self._replica_router: Optional[ReplicaRouter] = None
+        self._pool_telemetry: Dict[str, PoolTelemetry] = {}
 
     @property
     def async_engine(self) -> AsyncEngine:
@@ -67,33 +217,84 @@ class DatabaseConfig:
             self._sync_engine = self._create_sync_engine()
         return self._sync_engine
 
-    def _create_async_engine(self) -> AsyncEngine:
+    @property
+    def replica_engines(self) -> List[AsyncEngine]:
+        """Get or create async engines for configured read replicas."""
+        if self._replica_engines is None:
+            self._replica_engines = [
+                self._create_async_engine(url, name=f"replica-{index}")
+                for index, url in enumerate(self.settings.database_replica_urls)
+            ]
+            self._replica_session_factories = [
+                self._make_async_session_factory(engine)
+                for engine in self._replica_engines
+            ]
+        return self._replica_engines
+
+    @property
+    def replica_router(self) -> Optional[ReplicaRouter]:
+        """Get or create the replica router (None without replicas)."""
+        if self._replica_router is None and self.replica_engines:
+            settings = self.settings
+            self._replica_router = ReplicaRouter(
+                self.replica_engines,
+                strategy=settings.db_replica_strategy,
+                max_lag_seconds=settings.db_replica_max_lag_seconds,
+                check_interval=settings.db_replica_lag_check_interval,
+            )
+        return self._replica_router
+
+    def _primary_pool_limits(self) -> tuple[int, int]:
+        """Get pool size and overflow for the primary, within the budget."""
+        settings = self.settings
+        cap = worker_connection_cap(
+            settings.db_connection_budget,
+            settings.workers,
+            settings.db_pool_size + settings.db_max_overflow,
+        )
+        pool_size = min(settings.db_pool_size, cap)
+        return pool_size, min(settings.db_max_overflow, cap - pool_size)
+
+    def _create_async_engine(
+        self,
+        url: Optional[str] = None,
+        name: str = "primary"
+    ) -> AsyncEngine:
         """Create and configure async database engine."""
         settings = self.settings
 
+        # Replicas are separate servers; only the primary shares the budget
+        if url is None:
+            pool_size, max_overflow = self._primary_pool_limits()
+        else:
+            pool_size, max_overflow = settings.db_pool_size, settings.db_max_overflow
+
         # Engine configuration
         engine_config = {
-            "url": settings.database_url,
-            "echo": settings.debug and settings.log_level == "DEBUG",
+            "url": url or settings.database_url,
+            "echo": get_runtime_settings().debug_logging,
             "echo_pool": settings.debug,
             "future": True,  # Use SQLAlchemy 2.0 style
-            "pool_size": settings.db_pool_size,
-            "max_overflow": settings.db_max_overflow,
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
             "pool_timeout": settings.db_pool_timeout,
             "pool_pre_ping": True,  # Validate connections before use
             "pool_recycle": 3600,   # Recycle connections every hour
+            # Session parameters travel in the startup packet, so new
+            # connections need no extra round trip to configure them
+            "connect_args": {"server_settings": settings.db_server_settings},
         }
 
         # Use NullPool for testing to avoid connection issues
         if settings.is_testing:
             engine_config["poolclass"] = NullPool
         else:
-            engine_config["poolclass"] = QueuePool
+            engine_config["poolclass"] = InstrumentedAsyncAdaptedQueuePool
 
         engine = create_async_engine(**engine_config)
 
         # Add event listeners for connection handling
-        self._setup_engine_events(engine.sync_engine)
+        self._setup_engine_events(engine.sync_engine, name)
 
         return engine
 
@@ -106,72 +307,155 @@ class DatabaseConfig:
             "postgresql+asyncpg://", "postgresql+psycopg2://"
         )
 
+        pool_size, max_overflow = self._primary_pool_limits()
+
         engine_config = {
             "url": sync_url,
-            "echo": settings.debug and settings.log_level == "DEBUG",
+            "echo": get_runtime_settings().debug_logging,
             "echo_pool": settings.debug,
             "future": True,
-            "pool_size": settings.db_pool_size,
-            "max_overflow": settings.db_max_overflow,
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
             "pool_timeout": settings.db_pool_timeout,
             "pool_pre_ping": True,
             "pool_recycle": 3600,
+            "connect_args": {
+                "options": self._libpq_options(settings.db_server_settings)
+            },
         }
 
         # Use NullPool for testing
         if settings.is_testing:
             engine_config["poolclass"] = NullPool
         else:
-            engine_config["poolclass"] = QueuePool
+            engine_config["poolclass"] = InstrumentedQueuePool
 
         engine = create_engine(**engine_config)
 
         # Add event listeners
-        self._setup_engine_events(engine)
+        self._setup_engine_events(engine, "sync")
 
         return engine
 
-    def _setup_engine_events(self, engine):
+    @staticmethod
+    def _libpq_options(server_settings: Dict[str, str]) -> str:
+        """Render session parameters as a libpq "options" string."""
+        options = []
+        for name, value in server_settings.items():
+            # libpq splits options on whitespace; embedded spaces are escaped
+            escaped = value.replace(" ", "\\ ")
+            options.append(f"-c {name}={escaped}")
+        return " ".join(options)
+
+    def _setup_engine_events(self, engine, name: str):
         """Setup database engine event listeners."""
+        runtime = get_runtime_settings()
+
+        if runtime.db_pool_telemetry_enabled:
+            telemetry = PoolTelemetry(name)
+            telemetry.attach(engine)
+            self._pool_telemetry[name] = telemetry
+
+        if self.settings.profiling_enabled:
+            from .profiling import get_request_profiler
+            get_request_profiler().attach_engine(engine, name)
+
+        if self.settings.tracing_enabled:
+            from .tracing import get_tracing
+            get_tracing().attach_engine(engine, name)
 
-        @event.listens_for(engine, "connect")
-        def set_sqlite_pragma(dbapi_connection, connection_record):
-            """Set database-specific settings on connection."""
-            # For PostgreSQL, we can set session parameters here if needed
-            if hasattr(dbapi_connection, "execute"):
-                # Set timezone to UTC for consistency
-                try:
-                    cursor = dbapi_connection.cursor()
-                    cursor.execute("SET timezone TO 'UTC'")
-                    cursor.close()
-                except Exception:
-                    pass  # Ignore if setting fails
+        # Debug listeners are only registered when debug logging is on, so
+        # checkouts cost nothing extra otherwise
+        if not runtime.debug_logging:
+            return
 
         @event.listens_for(engine, "checkout")
         def receive_checkout(dbapi_connection, connection_record, connection_proxy):
             """Log database connection checkout in debug mode."""
-            if self.settings.debug and self.settings.log_level == "DEBUG":
-                print(f"Connection checked out: {id(dbapi_connection)}")
+            logger.debug("Connection checked out (%s): %s", name, id(dbapi_connection))
 
         @event.listens_for(engine, "checkin")
         def receive_checkin(dbapi_connection, connection_record):
             """Log database connection checkin in debug mode."""
-            if self.settings.debug and self.settings.log_level == "DEBUG":
-                print(f"Connection checked in: {id(dbapi_connection)}")
+            logger.debug("Connection checked in (%s): %s", name, id(dbapi_connection))
+
+    def get_pool_telemetry(self, name: str = "primary") -> Optional[PoolTelemetry]:
+        """Get the telemetry sink for an engine, if telemetry is enabled."""
+        return self._pool_telemetry.get(name)
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get pool telemetry snapshots keyed by engine name."""
+        return {
+            name: telemetry.snapshot()
+            for name, telemetry in self._pool_telemetry.items()
+        }
+
+    @staticmethod
+    def _make_async_session_factory(engine: AsyncEngine) -> async_sessionmaker:
+        """Create async session factory bound to an engine."""
+        return async_sessionmaker(
+            bind=engine,
+            class_=AsyncSession,
+            autoflush=True,
+            autocommit=False,
+            expire_on_commit=False  # Keep objects usable after commit
+        )
 
     @property
     def async_session_factory(self):
         """Get or create async session factory."""
         if self._async_session_factory is None:
-            self._async_session_factory = async_sessionmaker(
-                bind=self.async_engine,
-                class_=AsyncSession,
-                autoflush=True,
-                autocommit=False,
-                expire_on_commit=False  # Keep objects usable after commit
+            self._async_session_factory = self._make_async_session_factory(
+                self.async_engine
             )
         return self._async_session_factory
 
+    @asynccontextmanager
+    async def read_session(self) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Open a session for read-only work.
+
+        Routes to a healthy replica when replicas are configured and falls
+        back to the primary otherwise.
+        """
+        router = self.replica_router
+        index = router.choose() if router else None
+
+        if index is None:
+            async with self.async_session_factory() as session:
+                yield session
+            return
+
+        router.acquire(index)
+        try:
+            async with self._replica_session_factories[index]() as session:
+                yield session
+        finally:
+            router.release(index)
+
+    @asynccontextmanager
+    async def driver_connection(self, readonly: bool = False) -> AsyncGenerator[Any, None]:
+        """
+        Borrow the asyncpg connection behind a pooled connection.
+
+        For driver features SQLAlchemy does not expose, such as COPY. The
+        connection returns to the pool when the context exits; readonly
+        work is routed like read_session().
+        """
+        router = self.replica_router if readonly else None
+        index = router.choose() if router else None
+        engine = self.async_engine if index is None else self.replica_engines[index]
+
+        if index is not None:
+            router.acquire(index)
+        try:
+            async with engine.connect() as conn:
+                raw = await conn.get_raw_connection()
+                yield raw.driver_connection
+        finally:
+            if index is not None:
+                router.release(index)
+
     @property
     def sync_session_factory(self):
         """Get or create sync session factory."""
@@ -194,6 +478,9 @@ class DatabaseConfig:
         # Create connection to postgres database (without specific db)
         admin_url = settings.database_url.rsplit('/', 1)[0] + '/postgres'
 
+        # Only "create" startup mode needs asyncpg directly
+        import asyncpg
+
         try:
             conn = await asyncpg.connect(admin_url)
 
@@ -205,14 +492,14 @@ class DatabaseConfig:
             if not exists:
                 # Create database
                 await conn.execute(f'CREATE DATABASE "{db_name}"')
-                print(f"Database '{db_name}' created successfully")
+                logger.info("Database '%s' created successfully", db_name)
             else:
-                print(f"Database '{db_name}' already exists")
+                logger.info("Database '%s' already exists", db_name)
 
             await conn.close()
 
         except Exception as e:
-            print(f"Error creating database: {e}")
+            logger.error("Error creating database: %s", e)
             # Don't raise exception to allow application to continue
 
     async def create_tables(self) -> None:
@@ -223,52 +510,57 @@ class DatabaseConfig:
             # from app.models import *  # noqa
 
             await conn.run_sync(Base.metadata.create_all)
-            print("Database tables created successfully")
+            logger.info("Database tables created successfully")
 
     async def drop_tables(self) -> None:
         """Drop all database tables (use with caution!)."""
         async with self.async_engine.begin() as conn:
             await conn.run_sync(Base.metadata.drop_all)
-            print("Database tables dropped successfully")
+            logger.info("Database tables dropped successfully")
 
     async def check_connection(self) -> bool:
         """Check if database connection is working."""
         try:
             async with self.async_session_factory() as session:
-                await session.execute("SELECT 1")
+                await session.execute(text("SELECT 1"))
                 return True
         except Exception as e:
-            print(f"Database connection check failed: {e}")
+            logger.error("Database connection check failed: %s", e)
             return False
 
+    async def prewarm_pool(self, count: int) -> int:
+        """Open up to count pool connections concurrently."""
+        async def touch() -> None:
+            async with self.async_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        results = await asyncio.gather(
+            *(touch() for _ in range(count)), return_exceptions=True
+        )
+        return sum(1 for result in results if not isinstance(result, Exception))
+
     async def get_database_info(self) -> Dict[str, Any]:
-        """Get database information and statistics."""
+        """Get database information and statistics in one round trip."""
         try:
             async with self.async_session_factory() as session:
-                # Get PostgreSQL version
-                version_result = await session.execute("SELECT version()")
-                version = version_result.scalar()
-
-                # Get database size
-                size_result = await session.execute(
-                    "SELECT pg_size_pretty(pg_database_size(current_database()))"
-                )
-                size = size_result.scalar()
-
-                # Get connection count
-                connections_result = await session.execute(
+                result = await session.execute(text(
                     """
-                    SELECT count(*)
-                    FROM pg_stat_activity
-                    WHERE datname = current_database()
+                    SELECT
+                        version() AS version,
+                        pg_size_pretty(pg_database_size(current_database())) AS size,
+                        (
+                            SELECT count(*)
+                            FROM pg_stat_activity
+                            WHERE datname = current_database()
+                        ) AS connections
                     """
-                )
-                connections = connections_result.scalar()
+                ))
+                row = result.one()
 
                 return {
-                    "version": version,
-                    "size": size,
-                    "active_connections": connections,
+                    "version": row.version,
+                    "size": row.size,
+                    "active_connections": row.connections,
                     "database_name": self.settings.postgres_db
                 }
         except Exception as e:
@@ -276,10 +568,14 @@ class DatabaseConfig:
 
     async def close(self) -> None:
         """Close database connections."""
+        if self._replica_router is not None:
+            await self._replica_router.stop()
         if self._async_engine:
             await self._async_engine.dispose()
         if self._sync_engine:
             self._sync_engine.dispose()
+        for engine in self._replica_engines or []:
+            await engine.dispose()
 
 
 # =============================================================================
@@ -315,6 +611,23 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get a read-only database session.
+
+    Sessions are served by a read replica when one is configured and
+    within the allowed replication lag, otherwise by the primary.
+    Use get_async_session for anything that writes.
+    """
+    db = get_database()
+    async with db.read_session() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+
 def get_sync_session() -> Session:
     """
     Dependency function to get sync database session.
@@ -334,15 +647,21 @@ def get_sync_session() -> Session:
 
 
 @asynccontextmanager
-async def get_session_context() -> AsyncGenerator[AsyncSession, None]:
+async def get_session_context(
+    readonly: bool = False
+) -> AsyncGenerator[AsyncSession, None]:
     """
     Context manager for database sessions.
 
     This provides an alternative way to get database sessions
-    outside of FastAPI's dependency injection system.
+    outside of FastAPI's dependency injection system. Pass
+    readonly=True to route the session to a read replica.
     """
     db = get_database()
-    async with db.async_session_factory() as session:
+    session_context = (
+        db.read_session() if readonly else db.async_session_factory()
+    )
+    async with session_context as session:
         try:
             yield session
         except Exception:
@@ -354,30 +673,58 @@ async def get_session_context() -> AsyncGenerator[AsyncSession, None]:
 # DATABASE INITIALIZATION FUNCTIONS
 # =============================================================================
 
-async def init_database() -> None:
-    """Initialize database connection and create tables."""
+async def init_database(mode: Optional[str] = None) -> None:
+    """
+    Initialize database connection and check the schema version.
+
+    Startup never creates or alters tables. In "verify" mode (the
+    production default) it only checks the connection and that
+    alembic_version is at the migration head, failing if migrations are
+    pending. In "create" mode it first creates the database if needed
+    and applies pending migrations.
+    """
+    from .migrations import check_schema_version, upgrade_schema
+
     db = get_database()
+    settings = db.settings
+    mode = mode or settings.resolved_db_startup_mode
 
-    print("Initializing database...")
+    logger.info("Initializing database (%s mode)...", mode)
 
     # Create database if it doesn't exist
-    await db.create_database()
+    if mode == "create":
+        await db.create_database()
 
     # Check connection
     if not await db.check_connection():
         raise Exception("Failed to connect to database")
 
-    # Create tables
-    await db.create_tables()
+    # Apply pending migrations outside production
+    if mode == "create":
+        await upgrade_schema()
+
+    status = await check_schema_version(db.async_engine)
+    logger.info("Database schema at revision %s", ", ".join(status.current))
+
+    # Open pool connections now instead of on the first requests
+    if settings.db_pool_prewarm > 0:
+        warmed = await db.prewarm_pool(settings.db_pool_prewarm)
+        logger.info("Database pool pre-warmed with %s connections", warmed)
+
+    # Measure replica lag once before serving reads, then in the background
+    router = db.replica_router
+    if router is not None:
+        await router.refresh_lag()
+        router.start()
 
-    print("Database initialization completed successfully")
+    logger.info("Database initialization completed successfully")
 
 
 async def cleanup_database() -> None:
     """Cleanup database connections."""
     db = get_database()
     await db.close()
-    print("Database connections closed")
+    logger.info("Database connections closed")
 
 
 # =============================================================================
@@ -390,7 +737,8 @@ async def transaction() -> AsyncGenerator[AsyncSession, None]:
     Context manager for database transactions.
 
     Automatically handles commit/rollback based on whether
-    an exception occurs within the context.
+    an exception occurs within the context. Transactions always
+    run on the primary.
     """
     async with get_session_context() as session:
         try:
@@ -409,8 +757,10 @@ __all__ = [
     "Base",
     "metadata",
     "DatabaseConfig",
+    "ReplicaRouter",
     "get_database",
     "get_async_session",
+    "get_read_session",
     "get_sync_session",
     "get_session_context",
     "transaction",
@@ -0,0 +1,230 @@
+"""
+Linux Daily Tips Backend - Health Monitoring
+
+This module keeps component health in a cached snapshot refreshed by a
+background prober, so load-balancer probes never touch PostgreSQL or
+Redis themselves. Expensive server details (version, database size,
+connection counts, Redis INFO) are served by a separate, rate-limited
+diagnostics call.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .logging import get_logging_stats
+from .settings import get_settings
+from .startup import get_startup_state
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# HEALTH MONITOR
+# =============================================================================
+
+class HealthMonitor:
+    """Background prober with an O(1) cached health snapshot."""
+
+    def __init__(
+        self,
+        interval: Optional[float] = None,
+        timeout: Optional[float] = None,
+        diagnostics_min_interval: Optional[float] = None
+    ):
+        """Initialize monitor with probe interval and timeouts."""
+        settings = get_settings()
+        self.interval = interval or settings.health_check_interval
+        self.timeout = timeout or settings.health_check_timeout
+        self.diagnostics_min_interval = (
+            diagnostics_min_interval or settings.health_diagnostics_min_interval
+        )
+        self._components: Dict[str, Dict[str, Any]] = {}
+        self._snapshot: Dict[str, Any] = {"status": "unknown", "components": {}}
+        self._refreshed_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._diagnostics: Optional[Dict[str, Any]] = None
+        self._diagnostics_at = 0.0
+        self._diagnostics_lock = asyncio.Lock()
+
+    # =============================================================================
+    # PROBES
+    # =============================================================================
+
+    async def _probe(
+        self,
+        name: str,
+        check: Callable[[], Awaitable[bool]]
+    ) -> None:
+        """Run one cheap component check and record its result."""
+        previous = self._components.get(name, {})
+        start = time.perf_counter()
+        error = None
+        try:
+            healthy = await asyncio.wait_for(check(), self.timeout)
+        except asyncio.TimeoutError:
+            healthy, error = False, f"Timed out after {self.timeout}s"
+        except Exception as e:
+            healthy, error = False, str(e)
+
+        component = {
+            "status": "healthy" if healthy else "unhealthy",
+            "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+            "checked_at": time.time(),
+            "consecutive_failures": (
+                0 if healthy else previous.get("consecutive_failures", 0) + 1
+            ),
+        }
+        if not healthy:
+            component["error"] = error or "Connection failed"
+        self._components[name] = component
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Probe all components concurrently and rebuild the snapshot."""
+        from .database import get_database
+        from .redis import get_redis_config
+
+        await asyncio.gather(
+            self._probe("database", get_database().check_connection),
+            self._probe("redis", get_redis_config().ping),
+        )
+        self._refreshed_at = time.monotonic()
+        self._snapshot = self._build_snapshot()
+        return self._snapshot
+
+    def _build_snapshot(self) -> Dict[str, Any]:
+        """Assemble the snapshot served to probes."""
+        components = {name: dict(value) for name, value in self._components.items()}
+        unhealthy = any(
+            component["status"] == "unhealthy" for component in components.values()
+        )
+        return {
+            "status": "unhealthy" if unhealthy else "healthy",
+            "components": components,
+        }
+
+    # =============================================================================
+    # SNAPSHOT ACCESS
+    # =============================================================================
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """
+        Get the cached health snapshot without any I/O.
+
+        The snapshot is marked stale when the prober has not refreshed it
+        for three intervals, which usually means the event loop is blocked.
+        """
+        age = time.monotonic() - self._refreshed_at if self._refreshed_at else None
+        state = get_startup_state()
+        return {
+            **self._snapshot,
+            "ready": state.ready,
+            "age_seconds": round(age, 3) if age is not None else None,
+            "stale": age is None or age > 3 * self.interval,
+        }
+
+    @property
+    def has_snapshot(self) -> bool:
+        """Check whether the prober has completed at least one refresh."""
+        return self._refreshed_at > 0
+
+    # =============================================================================
+    # DIAGNOSTICS
+    # =============================================================================
+
+    async def get_diagnostics(self) -> Dict[str, Any]:
+        """
+        Get detailed database and Redis information.
+
+        Results are reused for diagnostics_min_interval seconds, and
+        concurrent callers share a single in-flight collection.
+        """
+        if self._diagnostics and (
+            time.monotonic() - self._diagnostics_at < self.diagnostics_min_interval
+        ):
+            return self._diagnostics
+
+        async with self._diagnostics_lock:
+            if self._diagnostics and (
+                time.monotonic() - self._diagnostics_at
+                < self.diagnostics_min_interval
+            ):
+                return self._diagnostics
+
+            from .database import get_database
+            from .migrations import get_schema_status
+            from .redis import get_redis_config
+
+            database_info, redis_info, schema_status = await asyncio.gather(
+                get_database().get_database_info(),
+                get_redis_config().get_info(),
+                get_schema_status(),
+            )
+            self._diagnostics = {
+                "collected_at": time.time(),
+                "database": database_info,
+                "schema": schema_status.to_dict(),
+                "redis": redis_info,
+                "pools": get_database().get_pool_stats(),
+                "logging": get_logging_stats(),
+            }
+            if get_settings().profiling_enabled:
+                from .profiling import get_request_profiler
+                self._diagnostics["profiling"] = get_request_profiler().get_report()
+            self._diagnostics_at = time.monotonic()
+        return self._diagnostics
+
+    # =============================================================================
+    # BACKGROUND LOOP
+    # =============================================================================
+
+    async def run(self) -> None:
+        """Refresh the snapshot every interval until cancelled."""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.exception("Health refresh failed: %s", e)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the background prober on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the background prober."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# =============================================================================
+# GLOBAL HEALTH MONITOR
+# =============================================================================
+
+_health_monitor: Optional[HealthMonitor] = None
+
+
+def get_health_monitor() -> HealthMonitor:
+    """Get the process-wide health monitor."""
+    global _health_monitor
+    if _health_monitor is None:
+        _health_monitor = HealthMonitor()
+    return _health_monitor
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "HealthMonitor",
+    "get_health_monitor",
+]
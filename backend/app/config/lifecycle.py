@@ -0,0 +1,232 @@
+"""
+Linux Daily Tips Backend - Application Lifecycle
+
+This module orchestrates startup and shutdown of the configuration
+components and provides the health and configuration summary helpers
+exposed by the app.config package.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from .settings import get_settings
+from .database import init_database, cleanup_database
+from .redis import init_redis, cleanup_redis
+from .pool_sizing import get_pool_controller
+from .startup import get_startup_state, register_cache_warmer, run_cache_warmers
+from .health import get_health_monitor
+from .runtime_tuning import get_runtime_tuning
+from .tracing import shutdown_tracing
+from .logging import setup_logging, shutdown_logging
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# TIP SERVICES
+# =============================================================================
+
+_tip_services_started = False
+
+
+def _start_tip_services() -> None:
+    """
+    Create the services derived from the tips table and start their loops.
+
+    The getters register the tip change listeners, so every worker updates
+    the calendar, facets and response cache after a change it made itself;
+    the loops pick up what other workers rebuilt or invalidated. The
+    calendar is also registered as the daily tip cache warmer.
+    """
+    from app.services.response_cache import get_response_cache
+    from app.services.tips import get_publish_calendar, get_tip_facets
+
+    global _tip_services_started
+    get_tip_facets()
+    calendar = get_publish_calendar()
+    register_cache_warmer("daily_tips", calendar.warm)
+    calendar.start()
+    get_response_cache().start()
+    _tip_services_started = True
+
+
+async def _stop_tip_services() -> None:
+    """Stop the loops started by _start_tip_services()."""
+    from app.services.response_cache import get_response_cache
+    from app.services.tips import get_publish_calendar
+
+    global _tip_services_started
+    if not _tip_services_started:
+        return
+    _tip_services_started = False
+    await get_publish_calendar().stop()
+    await get_response_cache().stop()
+
+
+# =============================================================================
+# CENTRALIZED INITIALIZATION AND CLEANUP
+# =============================================================================
+
+async def init_all(db_mode: Optional[str] = None) -> None:
+    """
+    Initialize all configuration components.
+
+    Database and Redis initialize concurrently; cache warmers run once
+    both are up. The worker reports ready only after every phase
+    finished, and stays alive but not ready if startup fails.
+
+    Args:
+        db_mode: Database startup mode override ("create" or "verify")
+    """
+    setup_logging()
+    logger.info("Initializing application configuration...")
+    state = get_startup_state()
+    state.begin()
+
+    try:
+        # Initialize database and Redis concurrently
+        await asyncio.gather(
+            state.track("database", init_database(db_mode)),
+            state.track("redis", init_redis()),
+        )
+
+        # Apply stored tuning overrides and follow changes from other workers
+        if get_settings().runtime_tuning_enabled:
+            tuning = get_runtime_tuning()
+            await state.track("runtime_tuning", tuning.load())
+            tuning.start()
+
+        # Register tip change listeners in every worker, not only in the
+        # ones that happened to call a getter
+        _start_tip_services()
+
+        # Fill hot cache keys before taking traffic
+        await state.track("cache_warmup", run_cache_warmers())
+
+        # Start adaptive pool sizing once both pools exist
+        if get_settings().pool_autoscale_enabled:
+            get_pool_controller().start()
+
+        # Prime the health snapshot, then keep it fresh in the background
+        monitor = get_health_monitor()
+        await monitor.refresh()
+        monitor.start()
+    except Exception as e:
+        state.mark_failed(e)
+        raise
+
+    state.mark_ready()
+    logger.info(
+        "All configuration components initialized successfully in %.1f ms",
+        state.duration_ms
+    )
+
+
+async def cleanup_all() -> None:
+    """Cleanup all configuration components."""
+    logger.info("Cleaning up application configuration...")
+    get_startup_state().mark_stopping()
+
+    # Stop probing before connections close
+    await get_health_monitor().stop()
+    if get_settings().runtime_tuning_enabled:
+        await get_runtime_tuning().stop()
+
+    # Stop tip service loops before Redis closes
+    await _stop_tip_services()
+
+    # Stop pool sizing before the pools go away
+    if get_settings().pool_autoscale_enabled:
+        await get_pool_controller().stop()
+
+    # Cleanup database connections
+    await cleanup_database()
+
+    # Cleanup Redis connections
+    await cleanup_redis()
+
+    # Flush spans recorded during shutdown
+    shutdown_tracing()
+
+    logger.info("All configuration components cleaned up successfully")
+    shutdown_logging()
+
+
+# =============================================================================
+# HEALTH CHECK UTILITIES
+# =============================================================================
+
+async def check_health() -> dict:
+    """
+    Check health of all configuration components.
+
+    Returns the snapshot maintained by the background health prober, so
+    probes cost no database or Redis round trips. Before the prober has
+    run (e.g. outside the application lifespan) one refresh is done
+    inline.
+    """
+    monitor = get_health_monitor()
+    if not monitor.has_snapshot:
+        await monitor.refresh()
+    return monitor.get_snapshot()
+
+
+async def get_diagnostics() -> dict:
+    """Get detailed, rate-limited database and Redis diagnostics."""
+    return await get_health_monitor().get_diagnostics()
+
+
+# =============================================================================
+# CONFIGURATION SUMMARY
+# =============================================================================
+
+def get_config_summary() -> dict:
+    """Get a summary of current configuration settings."""
+    settings = get_settings()
+
+    return {
+        "app_name": settings.app_name,
+        "app_version": settings.app_version,
+        "environment": settings.environment,
+        "debug": settings.debug,
+        "log_level": settings.log_level,
+        "database": {
+            "host": settings.database_host,
+            "port": settings.database_port,
+            "database": settings.postgres_db,
+            "replicas": len(settings.database_replica_urls),
+            "replica_strategy": settings.db_replica_strategy,
+        },
+        "redis": {
+            "host": settings.redis_host,
+            "port": settings.redis_port,
+            "db": settings.redis_db,
+        },
+        "security": {
+            "jwt_algorithm": settings.jwt_algorithm,
+            "jwt_access_token_expire_minutes": settings.jwt_access_token_expire_minutes,
+        },
+        "cors": {
+            "origins": settings.cors_origins,
+            "credentials": settings.cors_credentials,
+        },
+        "features": {
+            "cache_enabled": settings.cache_enabled,
+            "adsense_enabled": settings.adsense_enabled,
+        }
+    }
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "init_all",
+    "cleanup_all",
+    "check_health",
+    "get_diagnostics",
+    "get_config_summary",
+]
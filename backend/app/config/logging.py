@@ -0,0 +1,296 @@
+"""
+Linux Daily Tips Backend - Logging Configuration
+
+This module sets up application logging from the LOG_* settings. Records
+are put on a bounded in-memory queue by a QueueHandler and written by a
+QueueListener thread, so logging never blocks the event loop on console
+or disk I/O. Output is one JSON object per line (or LOG_FORMAT text), the
+log file rotates per LOG_ROTATION/LOG_RETENTION_DAYS, and repeated
+warnings and errors are deduplicated per message template, so an outage
+produces one line per window instead of one per request.
+
+Modules log through logging.getLogger(__name__) with %-style arguments;
+the unformatted message is what deduplication keys on.
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from .settings import Settings, get_settings
+
+
+# =============================================================================
+# JSON FORMATTER
+# =============================================================================
+
+# LogRecord attributes that are not user-supplied extras
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Render a record with its extras and exception text."""
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name, value in record.__dict__.items():
+            if name not in _RECORD_ATTRIBUTES and not name.startswith("_"):
+                entry[name] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+# =============================================================================
+# DEDUPLICATION
+# =============================================================================
+
+class DedupFilter(logging.Filter):
+    """
+    Rate-limit repeated warnings and errors.
+
+    Records are keyed by logger, level and unformatted message, so "Redis
+    GET error for key %r: %s" is one key whatever the key and error; a
+    "dedup_key" extra replaces the message in the key. The first record of
+    a key passes; repeats within the window are dropped and counted, and
+    the first record after the window carries the count as "suppressed".
+    Records below min_level always pass.
+    """
+
+    def __init__(self, window: float, min_level: int = logging.WARNING, max_keys: int = 1024):
+        """Initialize filter with a suppression window in seconds."""
+        super().__init__()
+        self.window = window
+        self.min_level = min_level
+        self.max_keys = max_keys
+        self._seen: Dict[Tuple[str, int, str], List[float]] = {}
+        self._lock = threading.Lock()
+        self.suppressed_total = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Decide whether a record is logged."""
+        if record.levelno < self.min_level or self.window <= 0:
+            return True
+
+        message_key = getattr(record, "dedup_key", None) or str(record.msg)
+        key = (record.name, record.levelno, message_key)
+        now = time.monotonic()
+        with self._lock:
+            state = self._seen.get(key)
+            if state is not None and now - state[0] < self.window:
+                state[1] += 1
+                self.suppressed_total += 1
+                return False
+
+            if state is None and len(self._seen) >= self.max_keys:
+                # Forget the key whose window started first
+                del self._seen[min(self._seen, key=lambda seen: self._seen[seen][0])]
+            if state is not None and state[1]:
+                record.suppressed = int(state[1])
+            self._seen[key] = [now, 0]
+        return True
+
+
+# =============================================================================
+# QUEUE HANDLING
+# =============================================================================
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        """Initialize handler for a bounded queue."""
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Make a record safe to hand to another thread.
+
+        Arguments are merged into the message and the traceback rendered
+        to text, but unlike the default the traceback is not folded into
+        the message, so the JSON formatter can keep it separate.
+        """
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Queue a record, dropping it if the writer has fallen behind."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+# =============================================================================
+# HANDLERS
+# =============================================================================
+
+_SIZE_PATTERN = re.compile(r"^(\d+)\s*([kmg]?)b?$", re.I)
+_SIZE_UNITS = {"": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+# LOG_ROTATION -> (TimedRotatingFileHandler "when", rotations per day)
+_TIMED_ROTATIONS = {
+    "hourly": ("H", 24),
+    "daily": ("midnight", 1),
+    "midnight": ("midnight", 1),
+    "weekly": ("W0", 1 / 7),
+}
+
+
+def create_file_handler(settings: Settings) -> logging.Handler:
+    """
+    Create the log file handler for LOG_ROTATION.
+
+    "hourly", "daily" and "weekly" rotate on time and keep
+    LOG_RETENTION_DAYS worth of files; a size such as "100MB" rotates on
+    size and keeps LOG_RETENTION_DAYS files; "none" never rotates.
+    """
+    path = settings.log_file
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    rotation = settings.log_rotation.strip().lower()
+    retention = settings.log_retention_days
+
+    if rotation in _TIMED_ROTATIONS:
+        when, per_day = _TIMED_ROTATIONS[rotation]
+        return logging.handlers.TimedRotatingFileHandler(
+            path,
+            when=when,
+            backupCount=max(1, int(retention * per_day)),
+            encoding="utf-8",
+            utc=True,
+        )
+
+    match = _SIZE_PATTERN.match(rotation)
+    if match:
+        return logging.handlers.RotatingFileHandler(
+            path,
+            maxBytes=int(match.group(1)) * _SIZE_UNITS[match.group(2).lower()],
+            backupCount=retention,
+            encoding="utf-8",
+        )
+
+    if rotation not in ("none", "off", ""):
+        raise ValueError(f"Unsupported log rotation: {settings.log_rotation!r}")
+    return logging.FileHandler(path, encoding="utf-8")
+
+
+def create_formatter(settings: Settings) -> logging.Formatter:
+    """Create the JSON formatter, or a text one from LOG_FORMAT."""
+    if settings.log_json:
+        return JsonFormatter()
+    return logging.Formatter(settings.log_format)
+
+
+# =============================================================================
+# SETUP AND SHUTDOWN
+# =============================================================================
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_dedup_filter: Optional[DedupFilter] = None
+
+
+def setup_logging(settings: Optional[Settings] = None) -> None:
+    """
+    Route the root logger through the queue to console and file handlers.
+
+    Safe to call more than once; later calls are ignored until
+    shutdown_logging().
+    """
+    global _listener, _queue_handler, _dedup_filter
+    if _listener is not None:
+        return
+
+    settings = settings or get_settings()
+    formatter = create_formatter(settings)
+
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    if settings.log_file:
+        try:
+            handlers.append(create_file_handler(settings))
+        except OSError as e:
+            # Keep console logging when the file cannot be opened
+            logging.getLogger(__name__).error("Cannot open log file %s: %s", settings.log_file, e)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_size)
+    _queue_handler = NonBlockingQueueHandler(log_queue)
+    _dedup_filter = DedupFilter(settings.log_dedup_window)
+    _queue_handler.addFilter(_dedup_filter)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(settings.log_level)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and close the handlers."""
+    global _listener, _queue_handler, _dedup_filter
+    if _listener is None:
+        return
+
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+    _queue_handler = None
+    _dedup_filter = None
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Get queue depth and dropped/suppressed record counts."""
+    if _queue_handler is None:
+        return {"configured": False}
+    return {
+        "configured": True,
+        "queued": _queue_handler.queue.qsize(),
+        "dropped": _queue_handler.dropped,
+        "suppressed": _dedup_filter.suppressed_total if _dedup_filter else 0,
+    }
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "JsonFormatter",
+    "DedupFilter",
+    "NonBlockingQueueHandler",
+    "create_file_handler",
+    "create_formatter",
+    "setup_logging",
+    "shutdown_logging",
+    "get_logging_stats",
+]
@@ -0,0 +1,437 @@
+"""
+Linux Daily Tips Backend - Schema Migrations
+
+This module connects the application to the Alembic migrations in
+backend/alembic. Startup does not create or alter tables: it reads the
+revision in alembic_version and compares it with the head revision of
+the migration scripts, which costs one small query. Migrations are
+applied with "alembic upgrade head" (or upgrade_schema(), which the
+"create" startup mode uses outside production).
+
+It also provides the helpers migration scripts use for online, lock-safe
+DDL on busy tables such as analytics_events:
+
+- execute_with_lock_timeout() runs a statement under a short lock_timeout
+  and retries with backoff, so DDL waiting behind a long transaction
+  gives up quickly instead of queueing every other query behind it
+- create_index_concurrently() / drop_index_concurrently() build and drop
+  indexes without blocking writes, rebuilding indexes a failed
+  concurrent build left invalid
+- backfill_in_batches() updates rows in small committed batches with a
+  pause between them, keeping locks short and replicas caught up
+
+The DDL helpers are synchronous and must be called from a migration's
+upgrade() or downgrade().
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+from .settings import Settings, get_settings
+
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ALEMBIC_INI = os.path.join(BACKEND_DIR, "alembic.ini")
+
+# Arbitrary constant; serializes migration runs across workers and hosts
+MIGRATION_LOCK_ID = 7261_0001
+
+# SQLSTATE lock_not_available, raised when lock_timeout expires
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+class SchemaVersionError(RuntimeError):
+    """The database schema is behind the migrations this code expects."""
+
+
+# =============================================================================
+# ALEMBIC CONFIGURATION
+# =============================================================================
+
+def get_alembic_config():
+    """Get the Alembic configuration for backend/alembic."""
+    from alembic.config import Config
+
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    # Running inside the application: logging is already set up
+    config.attributes["configure_logger"] = False
+    return config
+
+
+@lru_cache()
+def get_head_revisions() -> Tuple[str, ...]:
+    """Get the head revisions of the migration scripts."""
+    from alembic.script import ScriptDirectory
+
+    return tuple(sorted(ScriptDirectory.from_config(get_alembic_config()).get_heads()))
+
+
+def get_migration_engine(settings: Optional[Settings] = None):
+    """
+    Create a single-connection engine for running migrations.
+
+    statement_timeout is disabled because index builds and backfills may
+    legitimately run for minutes; lock waits are bounded by lock_timeout
+    in the helpers instead.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    settings = settings or get_settings()
+    server_settings = {
+        **settings.db_server_settings,
+        "statement_timeout": "0",
+        "application_name": f"{settings.db_application_name}-migrations",
+    }
+    return create_async_engine(
+        settings.database_url,
+        poolclass=NullPool,
+        connect_args={"server_settings": server_settings},
+    )
+
+
+# =============================================================================
+# SCHEMA VERSION
+# =============================================================================
+
+@dataclass
+class SchemaStatus:
+    """Database revision compared with the migration heads."""
+
+    current: Tuple[str, ...]
+    head: Tuple[str, ...]
+
+    @property
+    def state(self) -> str:
+        """Get "current", "behind" or "ahead"."""
+        if self.current == self.head:
+            return "current"
+        if not self.current or _is_known(self.current):
+            return "behind"
+        # Applied by a newer release, e.g. during a rolling deploy
+        return "ahead"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the status as a JSON-serializable dict."""
+        return {"current": list(self.current), "head": list(self.head), "state": self.state}
+
+
+def _is_known(revisions: Iterable[str]) -> bool:
+    """Check whether every revision exists in the migration scripts."""
+    from alembic.script import ScriptDirectory
+
+    scripts = ScriptDirectory.from_config(get_alembic_config())
+    try:
+        return all(scripts.get_revision(revision) is not None for revision in revisions)
+    except Exception:
+        return False
+
+
+async def get_schema_status(engine=None) -> SchemaStatus:
+    """Read the applied revision from alembic_version."""
+    from sqlalchemy import text
+
+    if engine is None:
+        from .database import get_database
+
+        engine = get_database().async_engine
+
+    async with engine.connect() as conn:
+        exists = await conn.scalar(text("SELECT to_regclass('alembic_version') IS NOT NULL"))
+        current: Tuple[str, ...] = ()
+        if exists:
+            rows = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            current = tuple(sorted(row.version_num for row in rows))
+    return SchemaStatus(current=current, head=get_head_revisions())
+
+
+async def check_schema_version(engine=None) -> SchemaStatus:
+    """
+    Make sure the database has every migration this code expects.
+
+    A database ahead of the code is accepted with a warning, so workers of
+    the previous release keep running while a newer one migrates.
+
+    Raises:
+        SchemaVersionError: if migrations are pending
+    """
+    status = await get_schema_status(engine)
+    if status.state == "behind":
+        raise SchemaVersionError(
+            f"Database schema is at {list(status.current) or 'no revision'}, "
+            f"expected {list(status.head)}; run 'alembic upgrade head'"
+        )
+    if status.state == "ahead":
+        logger.warning(
+            "Database schema %s is newer than this release (%s)",
+            list(status.current), list(status.head),
+        )
+    return status
+
+
+async def upgrade_schema(revision: str = "head") -> SchemaStatus:
+    """
+    Apply migrations up to a revision.
+
+    Alembic's command API is synchronous and starts its own event loop,
+    so it runs in a worker thread. Concurrent callers are serialized by
+    an advisory lock in alembic/env.py.
+    """
+    from alembic import command
+
+    await asyncio.to_thread(command.upgrade, get_alembic_config(), revision)
+    engine = get_migration_engine()
+    try:
+        return await get_schema_status(engine)
+    finally:
+        await engine.dispose()
+
+
+# =============================================================================
+# ONLINE DDL HELPERS
+# =============================================================================
+
+def _is_lock_timeout(error: Exception) -> bool:
+    """Check whether a database error is an expired lock_timeout."""
+    orig = getattr(error, "orig", error)
+    code = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    return code == LOCK_NOT_AVAILABLE or "lock timeout" in str(error).lower()
+
+
+def _wait_after_lock_timeout(attempt: int, retries: int, statement: str) -> None:
+    """Back off before the next attempt of a statement that timed out."""
+    delay = min(30.0, 0.5 * 2 ** attempt)
+    logger.warning(
+        "Lock timeout (attempt %d/%d), retrying in %.1fs: %s",
+        attempt + 1, retries + 1, delay, " ".join(statement.split())[:120],
+    )
+    time.sleep(delay)
+
+
+def _is_autocommit(conn) -> bool:
+    """Check whether a connection is inside an autocommit block."""
+    return conn.get_execution_options().get("isolation_level") == "AUTOCOMMIT"
+
+
+def execute_with_lock_timeout(
+    statement: str,
+    params: Optional[Dict[str, Any]] = None,
+    lock_timeout: Optional[str] = None,
+    retries: Optional[int] = None
+) -> Any:
+    """
+    Run a migration statement with a short lock_timeout, retrying on expiry.
+
+    Inside the migration's transaction each attempt runs in a savepoint
+    with SET LOCAL, so a timed-out attempt does not abort the migration;
+    inside an autocommit block the session setting is used and reset
+    after each attempt.
+
+    Args:
+        statement: SQL to run
+        params: Bound parameters
+        lock_timeout: PostgreSQL interval, default DB_MIGRATION_LOCK_TIMEOUT
+        retries: Attempts after the first, default DB_MIGRATION_LOCK_RETRIES
+
+    Returns:
+        The statement's result
+    """
+    from alembic import op
+    from sqlalchemy import exc, text
+
+    settings = get_settings()
+    lock_timeout = lock_timeout or settings.db_migration_lock_timeout
+    retries = settings.db_migration_lock_retries if retries is None else retries
+    conn = op.get_bind()
+    autocommit = _is_autocommit(conn)
+
+    for attempt in range(retries + 1):
+        try:
+            if autocommit:
+                conn.execute(text(f"SET lock_timeout = '{lock_timeout}'"))
+                try:
+                    return conn.execute(text(statement), params or {})
+                finally:
+                    conn.execute(text("RESET lock_timeout"))
+            with conn.begin_nested():
+                conn.execute(text(f"SET LOCAL lock_timeout = '{lock_timeout}'"))
+                return conn.execute(text(statement), params or {})
+        except exc.DBAPIError as e:
+            if not _is_lock_timeout(e) or attempt == retries:
+                raise
+            _wait_after_lock_timeout(attempt, retries, statement)
+
+
+def _index_is_valid(conn, name: str) -> Optional[bool]:
+    """Get pg_index.indisvalid for an index, or None if it does not exist."""
+    from sqlalchemy import text
+
+    return conn.scalar(
+        text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+        {"name": name},
+    )
+
+
+def create_index_concurrently(
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    unique: bool = False,
+    include: Sequence[str] = (),
+    where: Optional[str] = None,
+    using: Optional[str] = None
+) -> None:
+    """
+    Build an index without blocking writes.
+
+    Runs in an autocommit block (CONCURRENTLY cannot run in a
+    transaction) and is idempotent. A concurrent build that fails,
+    including one that hits lock_timeout while waiting for older
+    transactions, leaves an INVALID index behind that IF NOT EXISTS would
+    accept; so before every attempt such an index is dropped, and the
+    index must be valid once the build returns.
+
+    Raises:
+        RuntimeError: if the index is missing or invalid after the build
+    """
+    from alembic import op
+    from sqlalchemy import exc
+
+    sql = "CREATE {unique}INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table}{using} ({columns})".format(
+        unique="UNIQUE " if unique else "",
+        name=name,
+        table=table,
+        using=f" USING {using}" if using else "",
+        columns=", ".join(columns),
+    )
+    if include:
+        sql += f" INCLUDE ({', '.join(include)})"
+    if where:
+        sql += f" WHERE {where}"
+
+    retries = get_settings().db_migration_lock_retries
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        start = time.perf_counter()
+        for attempt in range(retries + 1):
+            if _index_is_valid(conn, name) is False:
+                logger.warning("Dropping invalid index %s before building it", name)
+                execute_with_lock_timeout(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            try:
+                execute_with_lock_timeout(sql, retries=0)
+                break
+            except exc.DBAPIError as e:
+                if not _is_lock_timeout(e) or attempt == retries:
+                    raise
+                _wait_after_lock_timeout(attempt, retries, sql)
+
+        if _index_is_valid(conn, name) is not True:
+            raise RuntimeError(f"Index {name} is missing or invalid after CREATE INDEX CONCURRENTLY")
+        logger.info("Built index %s in %.1fs", name, time.perf_counter() - start)
+
+
+def drop_index_concurrently(name: str) -> None:
+    """Drop an index without blocking reads and writes; idempotent."""
+    from alembic import op
+
+    with op.get_context().autocommit_block():
+        execute_with_lock_timeout(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def backfill_in_batches(
+    table: str,
+    set_clause: str,
+    where: str,
+    key: str = "id",
+    batch_size: Optional[int] = None,
+    pause: Optional[float] = None,
+    params: Optional[Dict[str, Any]] = None
+) -> int:
+    """
+    Update rows in small, separately committed batches.
+
+    Each batch updates up to batch_size rows matching where, locking
+    only those rows (SKIP LOCKED leaves rows busy in the application for
+    a later batch), then sleeps for pause seconds. where must stop
+    matching once a row is updated (e.g. "new_column IS NULL"), otherwise
+    the loop never ends.
+
+    Args:
+        table: Table to update
+        set_clause: SQL after SET, e.g. "kind = event_data->>'kind'"
+        where: Predicate selecting rows that still need the update
+        key: Unique column used to address rows
+        batch_size: Rows per batch, default DB_BACKFILL_BATCH_SIZE
+        pause: Seconds between batches, default DB_BACKFILL_PAUSE
+        params: Bound parameters used by set_clause or where
+
+    Returns:
+        Number of rows updated
+    """
+    from alembic import op
+
+    settings = get_settings()
+    batch_size = batch_size or settings.db_backfill_batch_size
+    pause = settings.db_backfill_pause if pause is None else pause
+    statement = f"""
+        UPDATE {table} SET {set_clause}
+        WHERE {key} IN (
+            SELECT {key} FROM {table}
+            WHERE {where}
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+    """
+
+    total = 0
+    start = time.perf_counter()
+    with op.get_context().autocommit_block():
+        while True:
+            result = execute_with_lock_timeout(
+                statement, {**(params or {}), "batch_size": batch_size}
+            )
+            if not result.rowcount:
+                # Done, unless every remaining row was locked by the application
+                remaining = execute_with_lock_timeout(
+                    f"SELECT EXISTS (SELECT 1 FROM {table} WHERE {where})", params
+                ).scalar()
+                if not remaining:
+                    break
+                time.sleep(max(pause, 1.0))
+                continue
+            total += result.rowcount
+            logger.info(
+                "Backfilled %d rows of %s (%.0f rows/s)",
+                total, table, total / max(time.perf_counter() - start, 1e-6),
+            )
+            if pause:
+                time.sleep(pause)
+    return total
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "SchemaVersionError",
+    "SchemaStatus",
+    "get_alembic_config",
+    "get_head_revisions",
+    "get_migration_engine",
+    "get_schema_status",
+    "check_schema_version",
+    "upgrade_schema",
+    "execute_with_lock_timeout",
+    "create_index_concurrently",
+    "drop_index_concurrently",
+    "backfill_in_batches",
+]
@@ -0,0 +1,388 @@
+"""
+Linux Daily Tips Backend - Adaptive Connection Pool Sizing
+
+This module resizes the SQLAlchemy and Redis connection pools of a worker
+from measured checkout wait and utilization. Sizes stay within configured
+bounds and within a global connection budget split evenly across uvicorn
+workers, so that workers x (pool size + overflow) never exceeds what
+PostgreSQL and Redis are provisioned for.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional
+
+from .settings import Settings, get_settings
+
+if TYPE_CHECKING:
+    from .telemetry import PoolTelemetry
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# BUDGET HELPERS
+# =============================================================================
+
+def worker_connection_cap(budget: int, workers: int, upper: int) -> int:
+    """
+    Get the per-worker connection cap.
+
+    Args:
+        budget: Total connections allowed across all workers (0 = no budget)
+        workers: Number of worker processes sharing the budget
+        upper: Configured per-worker upper bound
+
+    Returns:
+        The smaller of the upper bound and this worker's budget share
+    """
+    if budget <= 0:
+        return upper
+    return max(1, min(upper, budget // max(workers, 1)))
+
+
+# =============================================================================
+# POOL TARGETS
+# =============================================================================
+
+class PoolTarget(ABC):
+    """A resizable connection pool observed by the controller."""
+
+    name = "pool"
+
+    def __init__(self, min_size: int, max_size: int):
+        """Initialize target with per-worker size bounds."""
+        self.min_size = min_size
+        self.max_size = max(min_size, max_size)
+        self.window_peak_in_use = 0
+
+    @property
+    @abstractmethod
+    def size(self) -> int:
+        """Get the current connection limit."""
+
+    @abstractmethod
+    def in_use(self) -> int:
+        """Get the number of connections currently checked out."""
+
+    def sample(self) -> None:
+        """Record current usage into the window peak."""
+        self.window_peak_in_use = max(self.window_peak_in_use, self.in_use())
+
+    def collect_window(self) -> Dict[str, Any]:
+        """Get usage for the finished window and start a new one."""
+        window = {"peak_in_use": max(self.window_peak_in_use, self.in_use())}
+        self.window_peak_in_use = 0
+        return window
+
+    @abstractmethod
+    async def resize(self, size: int) -> None:
+        """Apply a new connection limit."""
+
+
+class DatabasePoolTarget(PoolTarget):
+    """SQLAlchemy QueuePool behind an async engine."""
+
+    name = "database"
+
+    def __init__(
+        self,
+        engine,
+        telemetry: Optional["PoolTelemetry"],
+        min_size: int,
+        max_size: int
+    ):
+        """Initialize target for an async engine's pool."""
+        super().__init__(min_size, max_size)
+        self.engine = engine
+        self.telemetry = telemetry
+        # Keep the configured split between persistent and overflow slots
+        self.size_ratio = self.pool.size() / max(self.size, 1)
+        self._wait_counts: Optional[List[int]] = None
+        self._timeouts = telemetry.checkout_timeouts if telemetry else 0
+
+    @property
+    def pool(self):
+        """Get the live pool (replaced on engine.dispose())."""
+        return self.engine.sync_engine.pool
+
+    @property
+    def size(self) -> int:
+        """Get pool size plus allowed overflow."""
+        return self.pool.size() + max(self.pool._max_overflow, 0)
+
+    def in_use(self) -> int:
+        """Get checked-out connection count."""
+        return self.pool.checkedout()
+
+    def collect_window(self) -> Dict[str, Any]:
+        """Add checkout wait p95 and timeouts since the last window."""
+        from .telemetry import percentile_from_counts
+
+        window = super().collect_window()
+        telemetry = self.telemetry
+        if telemetry is None:
+            return window
+
+        histogram = telemetry.checkout_wait
+        counts = list(histogram.counts)
+        previous = self._wait_counts or [0] * len(counts)
+        delta = [now - before for now, before in zip(counts, previous)]
+        self._wait_counts = counts
+
+        window["wait_p95_ms"] = 1000 * percentile_from_counts(
+            histogram.buckets, delta, 95, histogram.max
+        )
+        window["timeouts"] = telemetry.checkout_timeouts - self._timeouts
+        self._timeouts = telemetry.checkout_timeouts
+        return window
+
+    async def resize(self, size: int) -> None:
+        """Split the limit into a persistent size and overflow."""
+        from sqlalchemy.util import greenlet_spawn
+
+        pool_size = max(1, round(size * self.size_ratio))
+        # Closing idle asyncpg connections awaits the driver
+        await greenlet_spawn(self.pool.resize, pool_size, size - pool_size)
+
+
+class RedisPoolTarget(PoolTarget):
+    """redis.asyncio ConnectionPool."""
+
+    name = "redis"
+
+    def __init__(self, connection_pool, min_size: int, max_size: int):
+        """Initialize target for a Redis connection pool."""
+        super().__init__(min_size, max_size)
+        self.connection_pool = connection_pool
+
+    @property
+    def size(self) -> int:
+        """Get max_connections."""
+        return self.connection_pool.max_connections
+
+    def in_use(self) -> int:
+        """Get in-use connection count."""
+        return len(self.connection_pool._in_use_connections)
+
+    async def resize(self, size: int) -> None:
+        """Change max_connections and disconnect surplus idle connections."""
+        pool = self.connection_pool
+        pool.max_connections = size
+        available = pool._available_connections
+        surplus = []
+        while available and len(available) + self.in_use() > size:
+            surplus.append(available.pop())
+        for connection in surplus:
+            await connection.disconnect()
+
+
+# =============================================================================
+# ADAPTIVE CONTROLLER
+# =============================================================================
+
+class AdaptivePoolController:
+    """
+    Grow pools under contention and shrink them when idle.
+
+    Usage is sampled every sample interval; every decision interval each
+    pool is grown by a quarter when callers waited longer than the target
+    (or timed out) or peak utilization crossed the high watermark, and
+    shrunk by a quarter after three consecutive windows below the low
+    watermark.
+    """
+
+    SHRINK_AFTER_WINDOWS = 3
+
+    def __init__(self, targets: List[PoolTarget], settings: Optional[Settings] = None):
+        """Initialize controller over pool targets."""
+        self.settings = settings or get_settings()
+        self.targets = targets
+        self.decisions: Deque[Dict[str, Any]] = deque(maxlen=200)
+        self._low_windows = {target.name: 0 for target in targets}
+        self._task: Optional[asyncio.Task] = None
+
+    def decide(self, target: PoolTarget, window: Dict[str, Any]) -> Dict[str, Any]:
+        """Decide the next size for one target from a finished window."""
+        settings = self.settings
+        size = target.size
+        utilization = window["peak_in_use"] / size if size else 0.0
+        wait_p95_ms = window.get("wait_p95_ms", 0.0)
+        timeouts = window.get("timeouts", 0)
+
+        decision = {
+            "pool": target.name,
+            "at": time.time(),
+            "size": size,
+            "new_size": size,
+            "utilization": round(utilization, 3),
+            "wait_p95_ms": wait_p95_ms,
+            "timeouts": timeouts,
+            "action": "hold",
+            "reason": "within targets",
+        }
+
+        starving = (
+            timeouts > 0
+            or wait_p95_ms > settings.pool_autoscale_target_wait_ms
+            or utilization >= settings.pool_autoscale_high_utilization
+        )
+        if starving:
+            self._low_windows[target.name] = 0
+            if size < target.max_size:
+                decision["new_size"] = min(
+                    target.max_size, size + max(1, math.ceil(size / 4))
+                )
+                decision["action"] = "grow"
+                decision["reason"] = "contention"
+            else:
+                decision["reason"] = "contention at upper bound"
+            return decision
+
+        if utilization < settings.pool_autoscale_low_utilization:
+            self._low_windows[target.name] += 1
+            if (
+                self._low_windows[target.name] >= self.SHRINK_AFTER_WINDOWS
+                and size > target.min_size
+            ):
+                self._low_windows[target.name] = 0
+                decision["new_size"] = max(target.min_size, size - max(1, size // 4))
+                decision["action"] = "shrink"
+                decision["reason"] = "sustained low utilization"
+        else:
+            self._low_windows[target.name] = 0
+
+        return decision
+
+    async def evaluate(self) -> List[Dict[str, Any]]:
+        """Close the current window and apply decisions for all targets."""
+        decisions = []
+        for target in self.targets:
+            decision = self.decide(target, target.collect_window())
+            if decision["new_size"] != decision["size"]:
+                try:
+                    await target.resize(decision["new_size"])
+                except Exception as e:
+                    decision["action"] = "error"
+                    decision["reason"] = str(e)
+                logger.info(
+                    "Pool autoscale: %s %s %s -> %s (%s)",
+                    decision["pool"], decision["action"],
+                    decision["size"], decision["new_size"], decision["reason"],
+                    extra={"autoscale": decision},
+                )
+            self.decisions.append(decision)
+            decisions.append(decision)
+        return decisions
+
+    async def run(self) -> None:
+        """Sample usage and evaluate windows until cancelled."""
+        settings = self.settings
+        next_decision = time.monotonic() + settings.pool_autoscale_interval
+        while True:
+            await asyncio.sleep(settings.pool_autoscale_sample_interval)
+            for target in self.targets:
+                try:
+                    target.sample()
+                except Exception as e:
+                    logger.exception("Pool autoscale sample failed for %s: %s", target.name, e)
+            if time.monotonic() >= next_decision:
+                await self.evaluate()
+                next_decision = time.monotonic() + settings.pool_autoscale_interval
+
+    def start(self) -> None:
+        """Start the controller loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the controller loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get current sizes, bounds and recent decisions."""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "pools": {
+                target.name: {
+                    "size": target.size,
+                    "in_use": target.in_use(),
+                    "min_size": target.min_size,
+                    "max_size": target.max_size,
+                }
+                for target in self.targets
+            },
+            "decisions": list(self.decisions)[-20:],
+        }
+
+
+# =============================================================================
+# GLOBAL CONTROLLER INSTANCE
+# =============================================================================
+
+_controller: Optional[AdaptivePoolController] = None
+
+
+def get_pool_controller() -> AdaptivePoolController:
+    """Get the controller for this worker's primary database and Redis pools."""
+    global _controller
+    if _controller is None:
+        from .database import get_database
+        from .redis import get_redis_config
+        from .telemetry import InstrumentedPoolMixin
+
+        settings = get_settings()
+        db = get_database()
+        redis_config = get_redis_config()
+
+        targets: List[PoolTarget] = []
+        # NullPool (testing) has nothing to resize
+        if isinstance(db.async_engine.sync_engine.pool, InstrumentedPoolMixin):
+            targets.append(DatabasePoolTarget(
+                db.async_engine,
+                db.get_pool_telemetry("primary"),
+                min_size=settings.db_pool_min_size,
+                max_size=worker_connection_cap(
+                    settings.db_connection_budget,
+                    settings.workers,
+                    settings.db_pool_max_size,
+                ),
+            ))
+        targets.append(
+            RedisPoolTarget(
+                redis_config.connection_pool,
+                min_size=settings.redis_min_connections,
+                max_size=worker_connection_cap(
+                    settings.redis_connection_budget,
+                    settings.workers,
+                    settings.redis_max_connections,
+                ),
+            )
+        )
+        _controller = AdaptivePoolController(targets, settings)
+    return _controller
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "worker_connection_cap",
+    "PoolTarget",
+    "DatabasePoolTarget",
+    "RedisPoolTarget",
+    "AdaptivePoolController",
+    "get_pool_controller",
+]
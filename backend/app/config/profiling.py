@@ -0,0 +1,591 @@
+"""
+Linux Daily Tips Backend - Request Profiling
+
+This module provides opt-in (PROFILING_ENABLED) instrumentation that
+correlates, per request, the time spent in PostgreSQL, in Redis and in the
+handler overall. Statements slower than a threshold are logged with their
+normalized SQL and a fingerprint of their parameters and kept in a top-N
+table, and a sample of requests is profiled with pyinstrument (the
+"profiling" extra; cProfile when it is not installed), keeping captures
+only for requests that turned out slower than the request threshold.
+
+Nothing here is attached unless profiling is enabled at startup, so the
+disabled cost is zero for queries and Redis commands and a single branch
+in the middleware.
+"""
+
+import asyncio
+import cProfile
+import hashlib
+import logging
+import os
+import random
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from redis.asyncio import Redis
+from sqlalchemy import event
+
+from .settings import Settings, get_settings
+from .telemetry import Histogram
+
+try:
+    from pyinstrument import Profiler as _Pyinstrument
+except ImportError:  # pragma: no cover - optional dependency
+    _Pyinstrument = None
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# REQUEST PROFILES
+# =============================================================================
+
+class RequestProfile:
+    """Time spent in one request, split by backend."""
+
+    __slots__ = (
+        "method", "path", "started", "total",
+        "db_time", "db_statements", "redis_time", "redis_commands",
+    )
+
+    def __init__(self, method: str, path: str):
+        """Start timing a request."""
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.total = 0.0
+        self.db_time = 0.0
+        self.db_statements = 0
+        self.redis_time = 0.0
+        self.redis_commands = 0
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the request started, or its total once finished."""
+        return self.total or time.perf_counter() - self.started
+
+    @property
+    def app_time(self) -> float:
+        """Handler time outside the database and Redis."""
+        return max(0.0, self.elapsed - self.db_time - self.redis_time)
+
+    def finish(self) -> None:
+        """Freeze the total request time."""
+        self.total = time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """Render a Server-Timing header value in milliseconds."""
+        return (
+            f"db;dur={self.db_time * 1000:.1f};desc=\"{self.db_statements} queries\", "
+            f"redis;dur={self.redis_time * 1000:.1f};desc=\"{self.redis_commands} commands\", "
+            f"app;dur={self.app_time * 1000:.1f}, "
+            f"total;dur={self.elapsed * 1000:.1f}"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the profile as milliseconds and counts."""
+        return {
+            "method": self.method,
+            "path": self.path,
+            "total_ms": round(self.elapsed * 1000, 3),
+            "db_ms": round(self.db_time * 1000, 3),
+            "db_statements": self.db_statements,
+            "redis_ms": round(self.redis_time * 1000, 3),
+            "redis_commands": self.redis_commands,
+            "app_ms": round(self.app_time * 1000, 3),
+        }
+
+
+# Profile of the request being handled in the current task. SQLAlchemy runs
+# cursor events in a greenlet that shares the calling task's context.
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "current_profile", default=None
+)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """Get the profile of the request being handled, if any."""
+    return _current_profile.get()
+
+
+@contextmanager
+def profile_scope(method: str, path: str) -> Iterator[RequestProfile]:
+    """
+    Attribute database and Redis time to a unit of work.
+
+    Used by the middleware for requests; background jobs and scripts can
+    use it directly.
+    """
+    profile = RequestProfile(method, path)
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        profile.finish()
+        _current_profile.reset(token)
+
+
+# =============================================================================
+# STATEMENT NORMALIZATION
+# =============================================================================
+
+_SQL_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_SQL_STRING = re.compile(r"'(?:[^']|'')*'")
+# asyncpg ($1), psycopg2 (%(name)s, %s) and named (:name, not ::cast) styles
+_SQL_PARAM = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+")
+_SQL_NUMBER = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b", re.I)
+_SQL_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SQL_SPACE = re.compile(r"\s+")
+
+# Names written by RequestProfiler._capture_path; other files in the
+# capture directory are never pruned
+_CAPTURE_NAME = re.compile(r"^\d{8}T\d{6}-[a-z]*-[A-Za-z0-9_]+-\d+ms\.(?:html|prof)$")
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Reduce a statement to its shape.
+
+    Comments are dropped, literals and bind parameters become "?", lists
+    of placeholders collapse to "(?...)" so expanded IN clauses of any
+    length group together, and whitespace is collapsed.
+    """
+    sql = _SQL_COMMENT.sub(" ", statement)
+    sql = _SQL_STRING.sub("?", sql)
+    sql = _SQL_PARAM.sub("?", sql)
+    sql = _SQL_NUMBER.sub("?", sql)
+    sql = _SQL_IN_LIST.sub("(?...)", sql)
+    return _SQL_SPACE.sub(" ", sql).strip()
+
+
+def sql_fingerprint(normalized: str) -> str:
+    """Get a short stable identifier for a normalized statement."""
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def params_fingerprint(parameters: Any, executemany: bool = False) -> str:
+    """
+    Get a short hash of bound parameter values.
+
+    Values are never logged; equal fingerprints only show that a slow
+    statement keeps being run with the same arguments.
+    """
+    if executemany and isinstance(parameters, (list, tuple)):
+        parameters = (len(parameters), parameters[:1])
+    return hashlib.sha1(repr(parameters).encode()).hexdigest()[:12]
+
+
+# =============================================================================
+# SLOW STATEMENT TABLE
+# =============================================================================
+
+# Distinct parameter fingerprints remembered per statement
+MAX_PARAM_FINGERPRINTS = 20
+
+
+@dataclass
+class StatementStats:
+    """Aggregated slow executions of one normalized statement."""
+
+    fingerprint: str
+    sql: str
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    last_seen: float = 0.0
+    params: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the entry with times in milliseconds."""
+        return {
+            "fingerprint": self.fingerprint,
+            "sql": self.sql,
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+            "distinct_params": len(self.params),
+            "last_seen": self.last_seen,
+        }
+
+
+class SlowQueryLog:
+    """
+    Top-N table of slow statements by total time.
+
+    The table holds up to twice its reporting size so statements near the
+    cut-off are not forgotten as soon as they are recorded; when full, the
+    entry with the least total time is evicted.
+    """
+
+    def __init__(self, top_n: int):
+        """Initialize an empty table."""
+        self.top_n = top_n
+        self.capacity = top_n * 2
+        self._entries: Dict[str, StatementStats] = {}
+        self.recorded = 0
+
+    def record(self, normalized: str, elapsed: float, params: str) -> StatementStats:
+        """Add one slow execution."""
+        fingerprint = sql_fingerprint(normalized)
+        entry = self._entries.get(fingerprint)
+        if entry is None:
+            if len(self._entries) >= self.capacity:
+                coldest = min(self._entries.values(), key=lambda item: item.total)
+                del self._entries[coldest.fingerprint]
+            entry = self._entries[fingerprint] = StatementStats(fingerprint, normalized)
+
+        entry.count += 1
+        entry.total += elapsed
+        entry.max = max(entry.max, elapsed)
+        entry.last_seen = time.time()
+        if params not in entry.params and len(entry.params) < MAX_PARAM_FINGERPRINTS:
+            entry.params.append(params)
+        self.recorded += 1
+        return entry
+
+    def top(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the slowest statements by total time."""
+        entries = sorted(self._entries.values(), key=lambda item: item.total, reverse=True)
+        return [entry.to_dict() for entry in entries[:limit or self.top_n]]
+
+    def reset(self) -> None:
+        """Forget all entries."""
+        self._entries.clear()
+        self.recorded = 0
+
+
+# =============================================================================
+# REDIS INSTRUMENTATION
+# =============================================================================
+
+def _record_redis(elapsed: float, commands: int) -> None:
+    """Attribute Redis time to the current request."""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.redis_time += elapsed
+        profile.redis_commands += commands
+
+
+class ProfiledRedis(Redis):
+    """
+    Redis client that times commands and pipelines.
+
+    RedisConfig builds this class instead of Redis when profiling is
+    enabled, so every RedisClient and RedisCache call is covered.
+    """
+
+    async def execute_command(self, *args, **options):
+        """Execute a command and attribute its time."""
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            _record_redis(time.perf_counter() - started, 1)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None):
+        """Create a pipeline whose execute() is timed as a whole."""
+        pipe = super().pipeline(transaction, shard_hint)
+        execute = pipe.execute
+
+        async def timed_execute(raise_on_error: bool = True):
+            commands = len(pipe.command_stack)
+            started = time.perf_counter()
+            try:
+                return await execute(raise_on_error)
+            finally:
+                _record_redis(time.perf_counter() - started, commands)
+
+        pipe.execute = timed_execute
+        return pipe
+
+
+# =============================================================================
+# REQUEST PROFILER
+# =============================================================================
+
+class RequestProfiler:
+    """Collects per-request timings, slow statements and sampled captures."""
+
+    def __init__(self, settings: Optional[Settings] = None):
+        """Initialize profiler from settings."""
+        settings = settings or get_settings()
+        self.enabled = settings.profiling_enabled
+        self.slow_query_seconds = settings.profiling_slow_query_ms / 1000
+        self.slow_request_seconds = settings.profiling_slow_request_ms / 1000
+        self.sample_rate = settings.profiling_sample_rate
+        self.server_timing = settings.profiling_server_timing
+        self.capture_dir = settings.profiling_capture_dir
+        self.max_captures = settings.profiling_max_captures
+
+        self.slow_queries = SlowQueryLog(settings.profiling_top_n)
+        self.requests = Histogram("request_seconds")
+        self.request_db = Histogram("request_db_seconds")
+        self.request_redis = Histogram("request_redis_seconds")
+        self.slow_requests = 0
+        self.captures: deque = deque(maxlen=self.max_captures)
+        self._capturing = False
+
+    # =============================================================================
+    # DATABASE INSTRUMENTATION
+    # =============================================================================
+
+    def attach_engine(self, engine, name: str) -> None:
+        """Time cursor executions on a (sync) engine."""
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("profiling_started", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info["profiling_started"].pop()
+            profile = _current_profile.get()
+            if profile is not None:
+                profile.db_time += elapsed
+                profile.db_statements += 1
+            if elapsed >= self.slow_query_seconds:
+                self._log_slow_query(name, statement, parameters, executemany, elapsed)
+
+        @event.listens_for(engine, "handle_error")
+        def handle_error(exception_context):
+            # after_cursor_execute does not run for failed statements
+            conn = exception_context.connection
+            if conn is not None and conn.info.get("profiling_started"):
+                conn.info["profiling_started"].pop()
+
+    def _log_slow_query(
+        self,
+        engine: str,
+        statement: str,
+        parameters: Any,
+        executemany: bool,
+        elapsed: float
+    ) -> None:
+        """Record a slow statement and log it."""
+        normalized = normalize_sql(statement)
+        params = params_fingerprint(parameters, executemany)
+        entry = self.slow_queries.record(normalized, elapsed, params)
+        profile = _current_profile.get()
+        # Repeats of one statement are deduplicated by fingerprint; the
+        # slow statement table keeps the full counts
+        logger.warning(
+            "Slow query (%s) %.1f ms [%s params=%s]: %s",
+            engine, elapsed * 1000, entry.fingerprint, params, normalized[:500],
+            extra={
+                "dedup_key": entry.fingerprint,
+                "duration_ms": round(elapsed * 1000, 3),
+                "path": profile.path if profile is not None else None,
+            },
+        )
+
+    # =============================================================================
+    # CAPTURES
+    # =============================================================================
+
+    def _start_capture(self) -> Optional[Any]:
+        """Start a sampled profiler capture, one at a time."""
+        if self._capturing or random.random() >= self.sample_rate:
+            return None
+        # Only one profiler can be active per thread. cProfile also sees
+        # other requests running concurrently on the loop; pyinstrument's
+        # async mode attributes time to the sampled request only.
+        self._capturing = True
+        try:
+            if _Pyinstrument is not None:
+                profiler = _Pyinstrument(async_mode="enabled")
+                profiler.start()
+            else:
+                profiler = cProfile.Profile()
+                profiler.enable()
+        except Exception as e:
+            logger.error("Profiler capture failed to start: %s", e)
+            self._capturing = False
+            return None
+        return profiler
+
+    def _stop_capture(self, profiler: Any) -> None:
+        """Stop a capture."""
+        try:
+            if isinstance(profiler, cProfile.Profile):
+                profiler.disable()
+            else:
+                profiler.stop()
+        finally:
+            self._capturing = False
+
+    def _capture_path(self, profile: RequestProfile, extension: str) -> str:
+        """Build a capture file name from the request."""
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", profile.path).strip("_") or "root"
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        millis = int(profile.elapsed * 1000)
+        name = f"{stamp}-{profile.method.lower()}-{slug[:60]}-{millis}ms.{extension}"
+        return os.path.join(self.capture_dir, name)
+
+    def _write_capture(self, profiler: Any, path: str) -> None:
+        """Write a capture and prune the oldest captures beyond the limit."""
+        os.makedirs(self.capture_dir, exist_ok=True)
+        if isinstance(profiler, cProfile.Profile):
+            profiler.dump_stats(path)
+        else:
+            with open(path, "w") as f:
+                f.write(profiler.output_html())
+
+        files = sorted(
+            (
+                entry for entry in os.scandir(self.capture_dir)
+                if entry.is_file() and _CAPTURE_NAME.match(entry.name)
+            ),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        for entry in files[:-self.max_captures]:
+            os.unlink(entry.path)
+
+    async def _save_capture(self, profiler: Any, profile: RequestProfile) -> None:
+        """Save the capture of a slow request off the event loop."""
+        extension = "prof" if isinstance(profiler, cProfile.Profile) else "html"
+        path = self._capture_path(profile, extension)
+        try:
+            await asyncio.to_thread(self._write_capture, profiler, path)
+        except OSError as e:
+            logger.error("Failed to save profile capture %s: %s", path, e)
+            return
+        self.captures.append({**profile.to_dict(), "file": path, "at": time.time()})
+
+    # =============================================================================
+    # REQUESTS
+    # =============================================================================
+
+    def _finish_request(self, profile: RequestProfile) -> bool:
+        """Record a finished request; returns whether it was slow."""
+        self.requests.observe(profile.total)
+        self.request_db.observe(profile.db_time)
+        self.request_redis.observe(profile.redis_time)
+        if profile.total < self.slow_request_seconds:
+            return False
+
+        self.slow_requests += 1
+        logger.warning(
+            "Slow request %s %s: %.1f ms (db %.1f ms / %d queries, "
+            "redis %.1f ms / %d commands, app %.1f ms)",
+            profile.method, profile.path, profile.total * 1000,
+            profile.db_time * 1000, profile.db_statements,
+            profile.redis_time * 1000, profile.redis_commands,
+            profile.app_time * 1000,
+            extra={"dedup_key": f"{profile.method} {profile.path}", "profile": profile.to_dict()},
+        )
+        return True
+
+    def get_report(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Get request timings, the slow statement table and recent captures."""
+        return {
+            "enabled": self.enabled,
+            "capture_backend": "pyinstrument" if _Pyinstrument is not None else "cProfile",
+            "requests": self.requests.snapshot(),
+            "request_db": self.request_db.snapshot(),
+            "request_redis": self.request_redis.snapshot(),
+            "slow_requests": self.slow_requests,
+            "slow_queries_recorded": self.slow_queries.recorded,
+            "slow_queries": self.slow_queries.top(limit),
+            "captures": list(self.captures),
+        }
+
+    def reset(self) -> None:
+        """Discard collected timings and the slow statement table."""
+        self.slow_queries.reset()
+        self.requests.reset()
+        self.request_db.reset()
+        self.request_redis.reset()
+        self.slow_requests = 0
+        self.captures.clear()
+
+
+# =============================================================================
+# ASGI MIDDLEWARE
+# =============================================================================
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles HTTP requests.
+
+    Adds a Server-Timing header with the db/redis/app split when enabled.
+    Install with app.add_middleware(ProfilingMiddleware).
+    """
+
+    def __init__(self, app, profiler: Optional[RequestProfiler] = None):
+        """Wrap an ASGI application."""
+        self.app = app
+        self.profiler = profiler or get_request_profiler()
+
+    async def __call__(self, scope, receive, send):
+        """Handle one ASGI connection."""
+        profiler = self.profiler
+        if not profiler.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile: Optional[RequestProfile] = None
+        capture = None
+        try:
+            with profile_scope(scope.get("method", ""), scope.get("path", "")) as profile:
+
+                async def send_with_timing(message) -> None:
+                    if message["type"] == "http.response.start" and profiler.server_timing:
+                        headers = list(message.get("headers", []))
+                        headers.append((b"server-timing", profile.server_timing().encode()))
+                        message = {**message, "headers": headers}
+                    await send(message)
+
+                capture = profiler._start_capture()
+                try:
+                    await self.app(scope, receive, send_with_timing)
+                finally:
+                    if capture is not None:
+                        profiler._stop_capture(capture)
+        finally:
+            # Failed and cancelled requests are recorded too; they are
+            # often the slow ones
+            if profile is not None and profiler._finish_request(profile) and capture is not None:
+                await profiler._save_capture(capture, profile)
+
+
+# =============================================================================
+# GLOBAL PROFILER INSTANCE
+# =============================================================================
+
+_request_profiler: Optional[RequestProfiler] = None
+
+
+def get_request_profiler() -> RequestProfiler:
+    """Get the global request profiler."""
+    global _request_profiler
+    if _request_profiler is None:
+        _request_profiler = RequestProfiler()
+    return _request_profiler
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "RequestProfile",
+    "current_profile",
+    "profile_scope",
+    "normalize_sql",
+    "sql_fingerprint",
+    "params_fingerprint",
+    "StatementStats",
+    "SlowQueryLog",
+    "ProfiledRedis",
+    "RequestProfiler",
+    "ProfilingMiddleware",
+    "get_request_profiler",
+]
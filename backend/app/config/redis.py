@@ -7,21 +7,21 @@ session storage in the FastAPI application.
 """
 
 import json
-import pickle
+import logging
+import time
+import asyncio
 from typing import Any, Optional, Union, Dict, List
 from functools import lru_cache
 from contextlib import asynccontextmanager
 
-import redis.asyncio as redis
 from redis.asyncio import ConnectionPool, Redis
-from redis.exceptions import (
-    RedisError,
-    ConnectionError,
-    TimeoutError,
-    RedisClusterException
-)
+from redis.exceptions import RedisError
 
-from .settings import get_settings
+from .settings import get_settings, get_runtime_settings
+from .pool_sizing import worker_connection_cap
+
+
+logger = logging.getLogger(__name__)
 
 
 # =============================================================================
@@ -48,7 +48,11 @@ class RedisConfig:
     def redis_client(self) -> Redis:
         """Get or create Redis client."""
         if self._redis_client is None:
-            self._redis_client = Redis(connection_pool=self.connection_pool)
+            redis_class = Redis
+            if self.settings.profiling_enabled:
+                from .profiling import ProfiledRedis
+                redis_class = ProfiledRedis
+            self._redis_client = redis_class(connection_pool=self.connection_pool)
         return self._redis_client
 
     def _create_connection_pool(self) -> ConnectionPool:
@@ -60,7 +64,11 @@ class RedisConfig:
             "port": settings.redis_port,
             "db": settings.redis_db,
             "password": settings.redis_password,
-            "max_connections": settings.redis_max_connections,
+            "max_connections": worker_connection_cap(
+                settings.redis_connection_budget,
+                settings.workers,
+                settings.redis_max_connections,
+            ),
             "retry_on_timeout": settings.redis_retry_on_timeout,
             "decode_responses": True,  # Automatically decode responses to strings
             "encoding": "utf-8",
@@ -81,9 +89,17 @@ class RedisConfig:
             response = await self.redis_client.ping()
             return response is True
         except Exception as e:
-            print(f"Redis ping failed: {e}")
+            logger.error("Redis ping failed: %s", e)
             return False
 
+    async def prewarm_pool(self, count: int) -> int:
+        """Open up to count pool connections concurrently."""
+        results = await asyncio.gather(
+            *(self.redis_client.ping() for _ in range(count)),
+            return_exceptions=True
+        )
+        return sum(1 for result in results if result is True)
+
     async def get_info(self) -> Dict[str, Any]:
         """Get Redis server information."""
         try:
@@ -105,7 +121,7 @@ class RedisConfig:
             await self.redis_client.flushdb()
             return True
         except Exception as e:
-            print(f"Redis flush failed: {e}")
+            logger.error("Redis flush failed: %s", e)
             return False
 
     async def close(self) -> None:
@@ -137,7 +153,7 @@ class RedisClient:
             value = await self.redis.get(key)
             return value if value is not None else default
         except RedisError as e:
-            print(f"Redis GET error for key '{key}': {e}")
+            logger.error("Redis GET error for key '%s': %s", key, e)
             return default
 
     async def set(
@@ -164,7 +180,7 @@ class RedisClient:
         try:
             return await self.redis.set(key, value, ex=ttl, nx=nx, xx=xx)
         except RedisError as e:
-            print(f"Redis SET error for key '{key}': {e}")
+            logger.error("Redis SET error for key '%s': %s", key, e)
             return False
 
     async def delete(self, *keys: str) -> int:
@@ -172,7 +188,7 @@ class RedisClient:
         try:
             return await self.redis.delete(*keys)
         except RedisError as e:
-            print(f"Redis DELETE error for keys {keys}: {e}")
+            logger.error("Redis DELETE error for keys %s: %s", keys, e)
             return 0
 
     async def exists(self, *keys: str) -> int:
@@ -180,7 +196,7 @@ class RedisClient:
         try:
             return await self.redis.exists(*keys)
         except RedisError as e:
-            print(f"Redis EXISTS error for keys {keys}: {e}")
+            logger.error("Redis EXISTS error for keys %s: %s", keys, e)
             return 0
 
     async def expire(self, key: str, ttl: int) -> bool:
@@ -188,7 +204,7 @@ class RedisClient:
         try:
             return await self.redis.expire(key, ttl)
         except RedisError as e:
-            print(f"Redis EXPIRE error for key '{key}': {e}")
+            logger.error("Redis EXPIRE error for key '%s': %s", key, e)
             return False
 
     async def ttl(self, key: str) -> int:
@@ -196,7 +212,7 @@ class RedisClient:
         try:
             return await self.redis.ttl(key)
         except RedisError as e:
-            print(f"Redis TTL error for key '{key}': {e}")
+            logger.error("Redis TTL error for key '%s': %s", key, e)
             return -1
 
     # =============================================================================
@@ -211,7 +227,7 @@ class RedisClient:
                 return json.loads(value)
             return default
         except (RedisError, json.JSONDecodeError) as e:
-            print(f"Redis GET_JSON error for key '{key}': {e}")
+            logger.error("Redis GET_JSON error for key '%s': %s", key, e)
             return default
 
     async def set_json(
@@ -227,7 +243,7 @@ class RedisClient:
             json_value = json.dumps(value, ensure_ascii=False)
             return await self.redis.set(key, json_value, ex=ttl, nx=nx, xx=xx)
         except (RedisError, json.JSONEncodeError) as e:
-            print(f"Redis SET_JSON error for key '{key}': {e}")
+            logger.error("Redis SET_JSON error for key '%s': %s", key, e)
             return False
 
     # =============================================================================
@@ -240,7 +256,7 @@ class RedisClient:
             value = await self.redis.hget(key, field)
             return value if value is not None else default
         except RedisError as e:
-            print(f"Redis HGET error for key '{key}', field '{field}': {e}")
+            logger.error("Redis HGET error for key '%s', field '%s': %s", key, field, e)
             return default
 
     async def hset(self, key: str, field: str, value: Any) -> bool:
@@ -249,7 +265,7 @@ class RedisClient:
             result = await self.redis.hset(key, field, value)
             return result >= 0
         except RedisError as e:
-            print(f"Redis HSET error for key '{key}', field '{field}': {e}")
+            logger.error("Redis HSET error for key '%s', field '%s': %s", key, field, e)
             return False
 
     async def hgetall(self, key: str) -> Dict[str, str]:
@@ -257,7 +273,7 @@ class RedisClient:
         try:
             return await self.redis.hgetall(key)
         except RedisError as e:
-            print(f"Redis HGETALL error for key '{key}': {e}")
+            logger.error("Redis HGETALL error for key '%s': %s", key, e)
             return {}
 
     async def hmset(self, key: str, mapping: Dict[str, Any]) -> bool:
@@ -266,7 +282,7 @@ class RedisClient:
             await self.redis.hmset(key, mapping)
             return True
         except RedisError as e:
-            print(f"Redis HMSET error for key '{key}': {e}")
+            logger.error("Redis HMSET error for key '%s': %s", key, e)
             return False
 
     # =============================================================================
@@ -278,7 +294,7 @@ class RedisClient:
         try:
             return await self.redis.lpush(key, *values)
         except RedisError as e:
-            print(f"Redis LPUSH error for key '{key}': {e}")
+            logger.error("Redis LPUSH error for key '%s': %s", key, e)
             return 0
 
     async def rpush(self, key: str, *values: Any) -> int:
@@ -286,7 +302,7 @@ class RedisClient:
         try:
             return await self.redis.rpush(key, *values)
         except RedisError as e:
-            print(f"Redis RPUSH error for key '{key}': {e}")
+            logger.error("Redis RPUSH error for key '%s': %s", key, e)
             return 0
 
     async def lpop(self, key: str) -> Optional[str]:
@@ -294,7 +310,7 @@ class RedisClient:
         try:
             return await self.redis.lpop(key)
         except RedisError as e:
-            print(f"Redis LPOP error for key '{key}': {e}")
+            logger.error("Redis LPOP error for key '%s': %s", key, e)
             return None
 
     async def rpop(self, key: str) -> Optional[str]:
@@ -302,7 +318,7 @@ class RedisClient:
         try:
             return await self.redis.rpop(key)
         except RedisError as e:
-            print(f"Redis RPOP error for key '{key}': {e}")
+            logger.error("Redis RPOP error for key '%s': %s", key, e)
             return None
 
     async def lrange(self, key: str, start: int = 0, end: int = -1) -> List[str]:
@@ -310,7 +326,7 @@ class RedisClient:
         try:
             return await self.redis.lrange(key, start, end)
         except RedisError as e:
-            print(f"Redis LRANGE error for key '{key}': {e}")
+            logger.error("Redis LRANGE error for key '%s': %s", key, e)
             return []
 
     async def llen(self, key: str) -> int:
@@ -318,7 +334,7 @@ class RedisClient:
         try:
             return await self.redis.llen(key)
         except RedisError as e:
-            print(f"Redis LLEN error for key '{key}': {e}")
+            logger.error("Redis LLEN error for key '%s': %s", key, e)
             return 0
 
     # =============================================================================
@@ -330,7 +346,7 @@ class RedisClient:
         try:
             return await self.redis.sadd(key, *members)
         except RedisError as e:
-            print(f"Redis SADD error for key '{key}': {e}")
+            logger.error("Redis SADD error for key '%s': %s", key, e)
             return 0
 
     async def srem(self, key: str, *members: Any) -> int:
@@ -338,7 +354,7 @@ class RedisClient:
         try:
             return await self.redis.srem(key, *members)
         except RedisError as e:
-            print(f"Redis SREM error for key '{key}': {e}")
+            logger.error("Redis SREM error for key '%s': %s", key, e)
             return 0
 
     async def smembers(self, key: str) -> set:
@@ -346,7 +362,7 @@ class RedisClient:
         try:
             return await self.redis.smembers(key)
         except RedisError as e:
-            print(f"Redis SMEMBERS error for key '{key}': {e}")
+            logger.error("Redis SMEMBERS error for key '%s': %s", key, e)
             return set()
 
     async def sismember(self, key: str, member: Any) -> bool:
@@ -354,7 +370,7 @@ class RedisClient:
         try:
             return await self.redis.sismember(key, member)
         except RedisError as e:
-            print(f"Redis SISMEMBER error for key '{key}': {e}")
+            logger.error("Redis SISMEMBER error for key '%s': %s", key, e)
             return False
 
     # =============================================================================
@@ -380,8 +396,6 @@ class RedisClient:
         Returns:
             Tuple of (allowed, remaining, reset_time)
         """
-        import time
-
         current_time = int(time.time())
         rate_key = f"{key}:{identifier}"
         window_start = current_time - window
@@ -411,7 +425,7 @@ class RedisClient:
                 return False, 0, current_time + window
 
         except RedisError as e:
-            print(f"Rate limit check error: {e}")
+            logger.error("Rate limit check error: %s", e)
             # Fail open - allow request if Redis is down
             return True, limit, current_time + window
 
@@ -423,10 +437,22 @@ class RedisClient:
 class RedisCache:
     """Redis-based cache with TTL support."""
 
-    def __init__(self, client: RedisClient, default_ttl: int = 3600):
-        """Initialize cache with Redis client."""
+    def __init__(self, client: RedisClient, default_ttl: Optional[int] = None):
+        """
+        Initialize cache with Redis client.
+
+        Without an explicit default_ttl the cache follows the runtime
+        cache_ttl setting, including runtime tuning overrides.
+        """
         self.client = client
-        self.default_ttl = default_ttl
+        self._default_ttl = default_ttl
+
+    @property
+    def default_ttl(self) -> int:
+        """Get the TTL applied when set() is called without one."""
+        if self._default_ttl is not None:
+            return self._default_ttl
+        return get_runtime_settings().cache_ttl
 
     async def get(self, key: str) -> Any:
         """Get cached value."""
@@ -453,7 +479,7 @@ class RedisCache:
                 return await self.client.delete(*keys)
             return 0
         except RedisError as e:
-            print(f"Cache clear pattern error: {e}")
+            logger.error("Cache clear pattern error: %s", e)
             return 0
 
 
@@ -471,6 +497,11 @@ def get_redis_config() -> RedisConfig:
 def get_redis_client() -> RedisClient:
     """Get Redis client instance."""
     config = get_redis_config()
+    if config.settings.tracing_enabled:
+        from .tracing import TracedRedisClient, get_tracer
+        tracer = get_tracer()
+        if tracer is not None:
+            return TracedRedisClient(config.redis_client, tracer)
     return RedisClient(config.redis_client)
 
 
@@ -478,8 +509,7 @@ def get_redis_client() -> RedisClient:
 def get_redis_cache() -> RedisCache:
     """Get Redis cache instance."""
     client = get_redis_client()
-    settings = get_settings()
-    return RedisCache(client, default_ttl=settings.cache_ttl)
+    return RedisCache(client)
 
 
 # =============================================================================
@@ -504,20 +534,27 @@ async def init_redis() -> None:
     """Initialize Redis connection."""
     config = get_redis_config()
 
-    print("Initializing Redis connection...")
+    logger.info("Initializing Redis connection...")
 
     if not await config.ping():
         raise Exception("Failed to connect to Redis")
 
     info = await config.get_info()
-    print(f"Redis connected successfully - Version: {info.get('redis_version', 'Unknown')}")
+    logger.info(
+        "Redis connected successfully - Version: %s", info.get('redis_version', 'Unknown')
+    )
+
+    settings = config.settings
+    if settings.redis_pool_prewarm > 0:
+        warmed = await config.prewarm_pool(settings.redis_pool_prewarm)
+        logger.info("Redis pool pre-warmed with %s connections", warmed)
 
 
 async def cleanup_redis() -> None:
     """Cleanup Redis connections."""
     config = get_redis_config()
     await config.close()
-    print("Redis connections closed")
+    logger.info("Redis connections closed")
 
 
 # =============================================================================
@@ -0,0 +1,389 @@
+"""
+Linux Daily Tips Backend - Runtime Tuning
+
+This module lets operators change the performance-tuning subset of the
+settings (rate limits, cache TTL, pool sizes, terminal limits) without
+restarting workers. Overrides live in a Redis hash, every change is
+validated with the Settings validators, recorded in an audit list and
+announced over pub/sub; each worker then swaps its RuntimeSettings
+snapshot in one assignment.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .settings import (
+    RuntimeSettings,
+    Settings,
+    get_settings,
+    get_runtime_settings,
+    set_runtime_settings
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# TUNABLE FIELDS
+# =============================================================================
+
+TUNABLE_FIELDS = (
+    "rate_limit_requests",
+    "rate_limit_period",
+    "cache_enabled",
+    "cache_ttl",
+    "db_pool_size",
+    "db_max_overflow",
+    "redis_max_connections",
+    "terminal_timeout",
+    "terminal_max_sessions",
+    "terminal_max_memory",
+    "terminal_max_cpu",
+)
+
+TuningHook = Callable[[RuntimeSettings, RuntimeSettings], Awaitable[None]]
+
+
+# =============================================================================
+# RUNTIME TUNING
+# =============================================================================
+
+class RuntimeTuning:
+    """Redis-backed, validated, audited overrides for tuning settings."""
+
+    def __init__(self, client, settings: Optional[Settings] = None):
+        """Initialize tuning layer over a RedisClient."""
+        self.client = client
+        self.settings = settings or get_settings()
+        prefix = self.settings.runtime_tuning_redis_key_prefix
+        self.overrides_key = f"{prefix}overrides"
+        self.version_key = f"{prefix}version"
+        self.audit_key = f"{prefix}audit"
+        self.channel = f"{prefix}changes"
+        self.version = 0
+        self.overrides: Dict[str, Any] = {}
+        self._hooks: List[TuningHook] = []
+        self._task: Optional[asyncio.Task] = None
+        self._apply_lock = asyncio.Lock()
+
+    # =============================================================================
+    # VALIDATION
+    # =============================================================================
+
+    def validate(self, overrides: Dict[str, Any]) -> Settings:
+        """
+        Validate overrides against the Settings model.
+
+        Raises:
+            ValueError: For non-tunable fields or values rejected by the
+                Settings validators
+        """
+        unknown = set(overrides) - set(TUNABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Settings not tunable at runtime: {sorted(unknown)}")
+
+        # Construct a full model so field types and all validators, including
+        # cross-field ones, run exactly as they do at startup
+        return type(self.settings)(**{**self.settings.dict(), **overrides})
+
+    # =============================================================================
+    # APPLYING OVERRIDES
+    # =============================================================================
+
+    def register_hook(self, hook: TuningHook) -> None:
+        """Register a coroutine called with (old, new) after each apply."""
+        self._hooks.append(hook)
+
+    async def apply(self, overrides: Dict[str, Any], version: int) -> RuntimeSettings:
+        """Validate overrides and swap the runtime snapshot in one step."""
+        async with self._apply_lock:
+            if version < self.version:
+                return get_runtime_settings()
+
+            validated = self.validate(overrides)
+            old = get_runtime_settings()
+            new = RuntimeSettings.from_settings(validated)
+            set_runtime_settings(new)
+            self.overrides = dict(overrides)
+            self.version = version
+
+        if new != old:
+            for hook in self._hooks:
+                try:
+                    await hook(old, new)
+                except Exception as e:
+                    logger.error("Runtime tuning hook failed: %s", e)
+        return new
+
+    async def load(self) -> RuntimeSettings:
+        """Read the stored overrides and apply them."""
+        redis = self.client.redis
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hgetall(self.overrides_key)
+            pipe.get(self.version_key)
+            stored, version = await pipe.execute()
+
+        overrides = {field: json.loads(value) for field, value in stored.items()}
+        try:
+            return await self.apply(overrides, int(version or 0))
+        except ValueError as e:
+            # Stored values were valid when written; keep running on the
+            # current snapshot if the Settings model has since changed
+            logger.warning("Ignoring invalid runtime overrides: %s", e)
+            return get_runtime_settings()
+
+    # =============================================================================
+    # CHANGING OVERRIDES
+    # =============================================================================
+
+    async def set_overrides(
+        self,
+        changes: Dict[str, Any],
+        actor: str,
+        reason: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Validate and store overrides, then notify all workers.
+
+        Args:
+            changes: Field values to override
+            actor: Who made the change (recorded in the audit trail)
+            reason: Optional free-text justification
+
+        Returns:
+            The audit entry for the change
+        """
+        return await self._write(changes, [], actor, reason)
+
+    async def reset(
+        self,
+        fields: List[str],
+        actor: str,
+        reason: str = ""
+    ) -> Dict[str, Any]:
+        """Remove overrides so the fields fall back to their Settings values."""
+        return await self._write({}, list(fields), actor, reason)
+
+    async def _write(
+        self,
+        changes: Dict[str, Any],
+        removals: List[str],
+        actor: str,
+        reason: str
+    ) -> Dict[str, Any]:
+        """
+        Validate against the stored overrides and write them in one MULTI.
+
+        The overrides and version are WATCHed while the change is validated,
+        so two concurrent changes cannot both pass validation against the
+        same stored state; the loser retries against the winner's result.
+        The overrides, version, audit entry and notification commit together.
+        """
+        from redis.exceptions import WatchError
+
+        redis = self.client.redis
+        async with redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(self.overrides_key, self.version_key)
+                    stored = {
+                        field: json.loads(value)
+                        for field, value in (await pipe.hgetall(self.overrides_key)).items()
+                    }
+                    version = int(await pipe.get(self.version_key) or 0) + 1
+
+                    remaining = {
+                        field: value for field, value in stored.items()
+                        if field not in removals
+                    }
+                    validated = self.validate({**remaining, **changes})
+                    # Store the coerced values so every worker applies identical ones
+                    updates = {field: getattr(validated, field) for field in changes}
+                    entry = {
+                        "at": time.time(),
+                        "actor": actor,
+                        "reason": reason,
+                        "changes": {
+                            # The value in effect before, override or not
+                            field: {
+                                "old": stored.get(field, getattr(self.settings, field)),
+                                "new": value,
+                            }
+                            for field, value in updates.items()
+                        },
+                        "reset": removals,
+                        "version": version,
+                    }
+
+                    pipe.multi()
+                    if updates:
+                        pipe.hset(
+                            self.overrides_key,
+                            mapping={
+                                field: json.dumps(value) for field, value in updates.items()
+                            },
+                        )
+                    if removals:
+                        pipe.hdel(self.overrides_key, *removals)
+                    pipe.incr(self.version_key)
+                    pipe.lpush(self.audit_key, json.dumps(entry))
+                    pipe.ltrim(
+                        self.audit_key, 0, self.settings.runtime_tuning_audit_max_entries - 1
+                    )
+                    pipe.publish(self.channel, version)
+                    await pipe.execute()
+                    break
+                except WatchError:
+                    continue
+
+        await self.load()
+        return entry
+
+    async def get_audit_log(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Get the most recent override changes, newest first."""
+        entries = await self.client.lrange(self.audit_key, 0, limit - 1)
+        return [json.loads(entry) for entry in entries]
+
+    # =============================================================================
+    # CHANGE NOTIFICATIONS
+    # =============================================================================
+
+    async def listen(self) -> None:
+        """Apply overrides on pub/sub notifications and periodic resyncs."""
+        resync_interval = self.settings.runtime_tuning_resync_interval
+        pubsub = self.client.redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        try:
+            while True:
+                # Messages can be missed while reconnecting; the periodic
+                # reload makes the worker converge regardless
+                message = await pubsub.get_message(timeout=resync_interval)
+                if message is None or int(message["data"]) > self.version:
+                    await self.load()
+        finally:
+            await pubsub.unsubscribe(self.channel)
+            await pubsub.close()
+
+    async def _run(self) -> None:
+        """Keep listening, retrying after Redis errors."""
+        while True:
+            try:
+                await self.listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("Runtime tuning listener error: %s", e)
+                await asyncio.sleep(5)
+
+    def start(self) -> None:
+        """Start listening for changes on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening for changes."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get the applied version and overrides."""
+        return {
+            "version": self.version,
+            "overrides": dict(self.overrides),
+            "listening": self._task is not None and not self._task.done(),
+        }
+
+
+# =============================================================================
+# POOL RESIZING HOOK
+# =============================================================================
+
+async def apply_pool_sizes(old: RuntimeSettings, new: RuntimeSettings) -> None:
+    """
+    Resize the live pools when pool-size overrides change.
+
+    New sizes are capped by this worker's share of the connection budget,
+    exactly as at startup. With adaptive sizing on they are also kept
+    within the controller's bounds and applied through its targets, so the
+    controller carries on from the new size instead of fighting it.
+    """
+    from sqlalchemy.util import greenlet_spawn
+
+    from .database import get_database
+    from .pool_sizing import get_pool_controller, worker_connection_cap
+    from .redis import get_redis_config
+    from .telemetry import InstrumentedPoolMixin
+
+    settings = get_settings()
+    targets = {}
+    if settings.pool_autoscale_enabled:
+        targets = {target.name: target for target in get_pool_controller().targets}
+
+    if (old.db_pool_size, old.db_max_overflow) != (
+        new.db_pool_size, new.db_max_overflow
+    ):
+        limit = worker_connection_cap(
+            settings.db_connection_budget,
+            settings.workers,
+            new.db_pool_size + new.db_max_overflow,
+        )
+        pool_size = min(new.db_pool_size, limit)
+        target = targets.get("database")
+        if target is not None:
+            target.size_ratio = pool_size / limit
+            await target.resize(min(max(limit, target.min_size), target.max_size))
+        else:
+            pool = get_database().async_engine.sync_engine.pool
+            if isinstance(pool, InstrumentedPoolMixin):
+                await greenlet_spawn(pool.resize, pool_size, limit - pool_size)
+
+    if old.redis_max_connections != new.redis_max_connections:
+        limit = worker_connection_cap(
+            settings.redis_connection_budget,
+            settings.workers,
+            new.redis_max_connections,
+        )
+        target = targets.get("redis")
+        if target is not None:
+            await target.resize(min(max(limit, target.min_size), target.max_size))
+        else:
+            get_redis_config().connection_pool.max_connections = limit
+
+
+# =============================================================================
+# GLOBAL RUNTIME TUNING INSTANCE
+# =============================================================================
+
+_runtime_tuning: Optional[RuntimeTuning] = None
+
+
+def get_runtime_tuning() -> RuntimeTuning:
+    """Get the process-wide runtime tuning layer."""
+    global _runtime_tuning
+    if _runtime_tuning is None:
+        from .redis import get_redis_client
+
+        _runtime_tuning = RuntimeTuning(get_redis_client())
+        _runtime_tuning.register_hook(apply_pool_sizes)
+    return _runtime_tuning
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "TUNABLE_FIELDS",
+    "RuntimeTuning",
+    "apply_pool_sizes",
+    "get_runtime_tuning",
+]
@@ -7,9 +7,10 @@ and third-party service integrations.
 """
 
 import os
+import re
+from dataclasses import dataclass
 from typing import List, Optional, Any, Dict
 from pydantic import BaseSettings, validator, Field
-from pydantic.networks import AnyHttpUrl
 from functools import lru_cache
 
 
@@ -76,6 +77,9 @@ class Settings(BaseSettings):
     db_pool_size: int = Field(default=10, env="DB_POOL_SIZE")
     db_max_overflow: int = Field(default=20, env="DB_MAX_OVERFLOW")
     db_pool_timeout: int = Field(default=30, env="DB_POOL_TIMEOUT")
+    db_pool_telemetry_enabled: bool = Field(
+        default=True, env="DB_POOL_TELEMETRY_ENABLED"
+    )
 
     @validator("database_url")
     def validate_database_url(cls, v):
@@ -84,6 +88,117 @@ class Settings(BaseSettings):
             raise ValueError("Database URL must be a valid PostgreSQL connection string")
         return v
 
+    # Startup: "create" creates the database and applies migrations,
+    # "verify" only checks the connection and schema version, "auto"
+    # verifies in production and creates elsewhere
+    db_startup_mode: str = Field(default="auto", env="DB_STARTUP_MODE")
+    db_pool_prewarm: int = Field(default=2, env="DB_POOL_PREWARM")
+
+    # Online migrations (app.config.migrations)
+    db_migration_lock_timeout: str = Field(default="5s", env="DB_MIGRATION_LOCK_TIMEOUT")
+    db_migration_lock_retries: int = Field(default=5, env="DB_MIGRATION_LOCK_RETRIES")
+    db_backfill_batch_size: int = Field(default=5000, env="DB_BACKFILL_BATCH_SIZE")
+    db_backfill_pause: float = Field(default=0.1, env="DB_BACKFILL_PAUSE")
+
+    @validator("db_startup_mode")
+    def validate_db_startup_mode(cls, v):
+        """Validate database startup mode."""
+        valid_modes = ["auto", "create", "verify"]
+        if v.lower() not in valid_modes:
+            raise ValueError(f"Database startup mode must be one of: {valid_modes}")
+        return v.lower()
+
+    # Adaptive pool sizing (bounds are per worker; budgets are totals
+    # across all workers, 0 disables the budget)
+    pool_autoscale_enabled: bool = Field(default=False, env="POOL_AUTOSCALE_ENABLED")
+    pool_autoscale_interval: int = Field(default=15, env="POOL_AUTOSCALE_INTERVAL")
+    pool_autoscale_sample_interval: float = Field(
+        default=1.0, env="POOL_AUTOSCALE_SAMPLE_INTERVAL"
+    )
+    pool_autoscale_target_wait_ms: float = Field(
+        default=10.0, env="POOL_AUTOSCALE_TARGET_WAIT_MS"
+    )
+    pool_autoscale_low_utilization: float = Field(
+        default=0.3, env="POOL_AUTOSCALE_LOW_UTILIZATION"
+    )
+    pool_autoscale_high_utilization: float = Field(
+        default=0.8, env="POOL_AUTOSCALE_HIGH_UTILIZATION"
+    )
+    db_pool_min_size: int = Field(default=2, env="DB_POOL_MIN_SIZE")
+    db_pool_max_size: int = Field(default=30, env="DB_POOL_MAX_SIZE")
+    db_connection_budget: int = Field(default=0, env="DB_CONNECTION_BUDGET")
+
+    @validator("pool_autoscale_high_utilization")
+    def validate_pool_autoscale_utilization(cls, v, values):
+        """Validate utilization watermarks are ordered fractions."""
+        low = values.get("pool_autoscale_low_utilization", 0)
+        if not 0 < v <= 1 or not 0 <= low < v:
+            raise ValueError(
+                "Pool utilization watermarks must satisfy 0 <= low < high <= 1"
+            )
+        return v
+
+    @validator("db_pool_max_size")
+    def validate_db_pool_bounds(cls, v, values):
+        """Validate pool size bounds."""
+        if not 1 <= values.get("db_pool_min_size", 1) <= v:
+            raise ValueError("Database pool bounds must satisfy 1 <= min <= max")
+        return v
+
+    # Per-connection session parameters (sent in the startup packet)
+    db_timezone: str = Field(default="UTC", env="DB_TIMEZONE")
+    db_search_path: str = Field(default="linux_tips,public", env="DB_SEARCH_PATH")
+    db_statement_timeout_ms: int = Field(
+        default=30000, env="DB_STATEMENT_TIMEOUT_MS"
+    )
+    db_idle_in_transaction_timeout_ms: int = Field(
+        default=60000, env="DB_IDLE_IN_TRANSACTION_TIMEOUT_MS"
+    )
+    db_application_name: str = Field(
+        default="linux-daily-tips-api", env="DB_APPLICATION_NAME"
+    )
+
+    @validator("db_statement_timeout_ms", "db_idle_in_transaction_timeout_ms")
+    def validate_db_timeouts(cls, v):
+        """Validate session timeouts are non-negative (0 disables them)."""
+        if v < 0:
+            raise ValueError("Database session timeouts must be >= 0")
+        return v
+
+    # Read Replica Configuration
+    database_replica_urls: List[str] = Field(
+        default=[], env="DATABASE_REPLICA_URLS"
+    )
+    db_replica_strategy: str = Field(
+        default="round_robin", env="DB_REPLICA_STRATEGY"
+    )
+    db_replica_max_lag_seconds: float = Field(
+        default=10.0, env="DB_REPLICA_MAX_LAG_SECONDS"
+    )
+    db_replica_lag_check_interval: int = Field(
+        default=5, env="DB_REPLICA_LAG_CHECK_INTERVAL"
+    )
+
+    @validator("database_replica_urls", pre=True)
+    def validate_database_replica_urls(cls, v):
+        """Parse replica URLs from string or list and validate their format."""
+        if isinstance(v, str):
+            v = [url.strip() for url in v.split(",") if url.strip()]
+        for url in v:
+            if not url.startswith(("postgresql://", "postgresql+asyncpg://")):
+                raise ValueError(
+                    "Replica URLs must be valid PostgreSQL connection strings"
+                )
+        return v
+
+    @validator("db_replica_strategy")
+    def validate_db_replica_strategy(cls, v):
+        """Validate replica selection strategy."""
+        valid_strategies = ["round_robin", "least_connections"]
+        if v.lower() not in valid_strategies:
+            raise ValueError(f"Replica strategy must be one of: {valid_strategies}")
+        return v.lower()
+
     # =============================================================================
     # REDIS CONFIGURATION
     # =============================================================================
@@ -96,6 +211,9 @@ class Settings(BaseSettings):
     # Redis Connection Pool Configuration
     redis_max_connections: int = Field(default=10, env="REDIS_MAX_CONNECTIONS")
     redis_retry_on_timeout: bool = Field(default=True, env="REDIS_RETRY_ON_TIMEOUT")
+    redis_pool_prewarm: int = Field(default=2, env="REDIS_POOL_PREWARM")
+    redis_min_connections: int = Field(default=2, env="REDIS_MIN_CONNECTIONS")
+    redis_connection_budget: int = Field(default=0, env="REDIS_CONNECTION_BUDGET")
 
     @validator("redis_port")
     def validate_redis_port(cls, v):
@@ -197,6 +315,112 @@ class Settings(BaseSettings):
         default="unix:///var/run/docker.sock", env="DOCKER_HOST"
     )
 
+    # Sandbox backend and warm pool (session lifetime is terminal_timeout
+    # minutes, matching the terminal_sessions.expires_at default)
+    terminal_sandbox_backend: str = Field(
+        default="docker", env="TERMINAL_SANDBOX_BACKEND"
+    )
+    terminal_default_image: str = Field(
+        default="ubuntu:22.04", env="TERMINAL_DEFAULT_IMAGE"
+    )
+    terminal_command_timeout: int = Field(default=10, env="TERMINAL_COMMAND_TIMEOUT")
+    terminal_warm_pool_min: int = Field(default=1, env="TERMINAL_WARM_POOL_MIN")
+    terminal_warm_pool_max: int = Field(default=10, env="TERMINAL_WARM_POOL_MAX")
+    terminal_warm_pool_lead_seconds: int = Field(
+        default=60, env="TERMINAL_WARM_POOL_LEAD_SECONDS"
+    )
+    terminal_sandbox_max_reuses: int = Field(
+        default=20, env="TERMINAL_SANDBOX_MAX_REUSES"
+    )
+
+    # Redis session registry and batched write-behind to terminal_sessions
+    terminal_max_sessions_per_ip: int = Field(
+        default=5, env="TERMINAL_MAX_SESSIONS_PER_IP"
+    )
+    terminal_registry_key_prefix: str = Field(
+        default="terminal:", env="TERMINAL_REGISTRY_KEY_PREFIX"
+    )
+    terminal_write_behind_interval: float = Field(
+        default=1.0, env="TERMINAL_WRITE_BEHIND_INTERVAL"
+    )
+    terminal_write_behind_batch_size: int = Field(
+        default=500, env="TERMINAL_WRITE_BEHIND_BATCH_SIZE"
+    )
+    terminal_write_behind_max_attempts: int = Field(
+        default=3, env="TERMINAL_WRITE_BEHIND_MAX_ATTEMPTS"
+    )
+
+    # WebSocket relay: output coalescing, buffering and rate caps
+    terminal_relay_flush_interval_ms: float = Field(
+        default=8.0, env="TERMINAL_RELAY_FLUSH_INTERVAL_MS"
+    )
+    terminal_relay_frame_bytes: int = Field(
+        default=16384, env="TERMINAL_RELAY_FRAME_BYTES"
+    )
+    terminal_relay_buffer_bytes: int = Field(
+        default=262144, env="TERMINAL_RELAY_BUFFER_BYTES"
+    )
+    terminal_relay_bytes_per_cpu: int = Field(
+        default=1048576, env="TERMINAL_RELAY_BYTES_PER_CPU"
+    )
+    terminal_relay_compress: bool = Field(
+        default=False, env="TERMINAL_RELAY_COMPRESS"
+    )
+
+    # Session recording (asciicast v3 chunks on disk or in Redis streams)
+    terminal_recording_enabled: bool = Field(
+        default=False, env="TERMINAL_RECORDING_ENABLED"
+    )
+    terminal_recording_store: str = Field(
+        default="disk", env="TERMINAL_RECORDING_STORE"
+    )
+    terminal_recording_dir: str = Field(
+        default="./recordings", env="TERMINAL_RECORDING_DIR"
+    )
+    terminal_recording_chunk_bytes: int = Field(
+        default=65536, env="TERMINAL_RECORDING_CHUNK_BYTES"
+    )
+    terminal_recording_chunk_seconds: int = Field(
+        default=10, env="TERMINAL_RECORDING_CHUNK_SECONDS"
+    )
+    terminal_recording_retention_days: int = Field(
+        default=30, env="TERMINAL_RECORDING_RETENTION_DAYS"
+    )
+
+    # Expired session reaper
+    terminal_reaper_interval: float = Field(
+        default=15.0, env="TERMINAL_REAPER_INTERVAL"
+    )
+    terminal_reaper_batch_size: int = Field(
+        default=100, env="TERMINAL_REAPER_BATCH_SIZE"
+    )
+    terminal_reaper_concurrency: int = Field(
+        default=8, env="TERMINAL_REAPER_CONCURRENCY"
+    )
+
+    @validator("terminal_sandbox_backend")
+    def validate_terminal_sandbox_backend(cls, v):
+        """Validate sandbox backend name."""
+        valid_backends = ["docker", "subprocess", "fake"]
+        if v.lower() not in valid_backends:
+            raise ValueError(f"Sandbox backend must be one of: {valid_backends}")
+        return v.lower()
+
+    @validator("terminal_recording_store")
+    def validate_terminal_recording_store(cls, v):
+        """Validate recording store name."""
+        valid_stores = ["disk", "redis"]
+        if v.lower() not in valid_stores:
+            raise ValueError(f"Recording store must be one of: {valid_stores}")
+        return v.lower()
+
+    @validator("terminal_warm_pool_max")
+    def validate_terminal_warm_pool_bounds(cls, v, values):
+        """Validate warm pool bounds."""
+        if not 0 <= values.get("terminal_warm_pool_min", 0) <= v:
+            raise ValueError("Warm pool bounds must satisfy 0 <= min <= max")
+        return v
+
     # =============================================================================
     # RATE LIMITING CONFIGURATION
     # =============================================================================
@@ -265,6 +489,102 @@ class Settings(BaseSettings):
     cache_enabled: bool = Field(default=True, env="CACHE_ENABLED")
     cache_ttl: int = Field(default=3600, env="CACHE_TTL")  # 1 hour
     cache_max_size: int = Field(default=1000, env="CACHE_MAX_SIZE")
+    cache_prewarm_enabled: bool = Field(default=True, env="CACHE_PREWARM_ENABLED")
+
+    # =============================================================================
+    # RESPONSE CACHE CONFIGURATION
+    # =============================================================================
+    response_cache_key_prefix: str = Field(default="http:", env="RESPONSE_CACHE_KEY_PREFIX")
+    response_cache_max_age: int = Field(default=60, env="RESPONSE_CACHE_MAX_AGE")
+    response_cache_stale_while_revalidate: int = Field(
+        default=600, env="RESPONSE_CACHE_STALE_WHILE_REVALIDATE"
+    )
+    response_cache_local_ttl: float = Field(default=5.0, env="RESPONSE_CACHE_LOCAL_TTL")
+    response_cache_min_compress_bytes: int = Field(
+        default=512, env="RESPONSE_CACHE_MIN_COMPRESS_BYTES"
+    )
+
+    # =============================================================================
+    # PUBLISH CALENDAR CONFIGURATION
+    # =============================================================================
+    calendar_past_days: int = Field(default=30, env="CALENDAR_PAST_DAYS")
+    calendar_future_days: int = Field(default=14, env="CALENDAR_FUTURE_DAYS")
+    calendar_prewarm_lead_seconds: int = Field(
+        default=300, env="CALENDAR_PREWARM_LEAD_SECONDS"
+    )
+    calendar_resync_interval: float = Field(
+        default=60.0, env="CALENDAR_RESYNC_INTERVAL"
+    )
+    calendar_redis_key: str = Field(default="tips:calendar", env="CALENDAR_REDIS_KEY")
+
+    # =============================================================================
+    # TIP FACETS CONFIGURATION
+    # =============================================================================
+    facets_redis_key: str = Field(default="tips:facets", env="FACETS_REDIS_KEY")
+
+    # =============================================================================
+    # RUNTIME TUNING CONFIGURATION
+    # =============================================================================
+    runtime_tuning_enabled: bool = Field(default=True, env="RUNTIME_TUNING_ENABLED")
+    runtime_tuning_redis_key_prefix: str = Field(
+        default="config:tuning:", env="RUNTIME_TUNING_REDIS_KEY_PREFIX"
+    )
+    runtime_tuning_resync_interval: int = Field(
+        default=60, env="RUNTIME_TUNING_RESYNC_INTERVAL"
+    )
+    runtime_tuning_audit_max_entries: int = Field(
+        default=1000, env="RUNTIME_TUNING_AUDIT_MAX_ENTRIES"
+    )
+
+    # =============================================================================
+    # HEALTH CHECK CONFIGURATION
+    # =============================================================================
+    health_check_interval: float = Field(default=5.0, env="HEALTH_CHECK_INTERVAL")
+    health_check_timeout: float = Field(default=2.0, env="HEALTH_CHECK_TIMEOUT")
+    health_diagnostics_min_interval: float = Field(
+        default=30.0, env="HEALTH_DIAGNOSTICS_MIN_INTERVAL"
+    )
+
+    # =============================================================================
+    # PROFILING CONFIGURATION
+    # =============================================================================
+    profiling_enabled: bool = Field(default=False, env="PROFILING_ENABLED")
+    profiling_slow_query_ms: float = Field(default=100.0, env="PROFILING_SLOW_QUERY_MS")
+    profiling_slow_request_ms: float = Field(default=500.0, env="PROFILING_SLOW_REQUEST_MS")
+    profiling_top_n: int = Field(default=50, env="PROFILING_TOP_N")
+    profiling_sample_rate: float = Field(default=0.01, env="PROFILING_SAMPLE_RATE")
+    profiling_capture_dir: str = Field(default="profiles/", env="PROFILING_CAPTURE_DIR")
+    profiling_max_captures: int = Field(default=20, env="PROFILING_MAX_CAPTURES")
+    profiling_server_timing: bool = Field(default=True, env="PROFILING_SERVER_TIMING")
+
+    @validator("profiling_sample_rate")
+    def validate_profiling_sample_rate(cls, v):
+        """Validate the capture sample rate is a fraction."""
+        if not 0.0 <= v <= 1.0:
+            raise ValueError("Profiling sample rate must be between 0 and 1")
+        return v
+
+    # =============================================================================
+    # TRACING CONFIGURATION
+    # =============================================================================
+    tracing_enabled: bool = Field(default=False, env="TRACING_ENABLED")
+    # Comma-separated exporter names
+    tracing_exporter: str = Field(default="console", env="TRACING_EXPORTER")
+    tracing_service_name: str = Field(
+        default="linux-daily-tips-api", env="TRACING_SERVICE_NAME"
+    )
+    tracing_otlp_endpoint: str = Field(
+        default="http://localhost:4318/v1/traces", env="TRACING_OTLP_ENDPOINT"
+    )
+    tracing_file_path: str = Field(default="logs/traces.jsonl", env="TRACING_FILE_PATH")
+    tracing_sample_ratio: float = Field(default=1.0, env="TRACING_SAMPLE_RATIO")
+
+    @validator("tracing_sample_ratio")
+    def validate_tracing_sample_ratio(cls, v):
+        """Validate the trace sample ratio is a fraction."""
+        if not 0.0 <= v <= 1.0:
+            raise ValueError("Tracing sample ratio must be between 0 and 1")
+        return v
 
     # =============================================================================
     # LOGGING CONFIGURATION
@@ -276,6 +596,21 @@ class Settings(BaseSettings):
         default="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         env="LOG_FORMAT"
     )
+    log_json: bool = Field(default=True, env="LOG_JSON")
+    log_queue_size: int = Field(default=10000, env="LOG_QUEUE_SIZE")
+    log_dedup_window: float = Field(default=60.0, env="LOG_DEDUP_WINDOW")
+
+    @validator("log_rotation")
+    def validate_log_rotation(cls, v):
+        """Validate log rotation is a schedule, a size or "none"."""
+        rotation = v.strip().lower()
+        if rotation in ("hourly", "daily", "midnight", "weekly", "none", "off"):
+            return rotation
+        if re.match(r"^\d+\s*[kmg]?b?$", rotation):
+            return rotation
+        raise ValueError(
+            "Log rotation must be hourly, daily, weekly, none or a size such as 100MB"
+        )
 
     # =============================================================================
     # COMPUTED PROPERTIES
@@ -295,6 +630,13 @@ class Settings(BaseSettings):
         """Check if running in testing environment."""
         return self.environment.lower() in ("test", "testing")
 
+    @property
+    def resolved_db_startup_mode(self) -> str:
+        """Get the effective database startup mode ("create" or "verify")."""
+        if self.db_startup_mode == "auto":
+            return "verify" if self.is_production else "create"
+        return self.db_startup_mode
+
     @property
     def database_config(self) -> Dict[str, Any]:
         """Get database configuration dictionary."""
@@ -303,6 +645,22 @@ class Settings(BaseSettings):
             "pool_size": self.db_pool_size,
             "max_overflow": self.db_max_overflow,
             "pool_timeout": self.db_pool_timeout,
+            "server_settings": self.db_server_settings,
+            "replica_urls": self.database_replica_urls,
+            "replica_strategy": self.db_replica_strategy,
+        }
+
+    @property
+    def db_server_settings(self) -> Dict[str, str]:
+        """Get PostgreSQL session parameters applied to every new connection."""
+        return {
+            "timezone": self.db_timezone,
+            "search_path": self.db_search_path,
+            "statement_timeout": str(self.db_statement_timeout_ms),
+            "idle_in_transaction_session_timeout": str(
+                self.db_idle_in_transaction_timeout_ms
+            ),
+            "application_name": self.db_application_name,
         }
 
     @property
@@ -347,6 +705,62 @@ class Settings(BaseSettings):
         use_enum_values = True
 
 
+@dataclass(frozen=True, slots=True)
+class RuntimeSettings:
+    """
+    Immutable snapshot of the settings read on hot paths.
+
+    Attribute reads on a slotted dataclass skip Pydantic's model machinery,
+    and derived flags such as debug_logging are computed once instead of
+    on every event.
+    """
+
+    environment: str
+    debug: bool
+    log_level: str
+    debug_logging: bool
+    is_production: bool
+    is_testing: bool
+    db_pool_telemetry_enabled: bool
+    cache_enabled: bool
+    cache_ttl: int
+    rate_limit_requests: int
+    rate_limit_period: int
+    rate_limit_redis_key_prefix: str
+    db_pool_size: int
+    db_max_overflow: int
+    redis_max_connections: int
+    terminal_timeout: int
+    terminal_max_sessions: int
+    terminal_max_memory: str
+    terminal_max_cpu: str
+
+    @classmethod
+    def from_settings(cls, settings: "Settings") -> "RuntimeSettings":
+        """Derive a snapshot from a full Settings instance."""
+        return cls(
+            environment=settings.environment,
+            debug=settings.debug,
+            log_level=settings.log_level,
+            debug_logging=settings.debug and settings.log_level == "DEBUG",
+            is_production=settings.is_production,
+            is_testing=settings.is_testing,
+            db_pool_telemetry_enabled=settings.db_pool_telemetry_enabled,
+            cache_enabled=settings.cache_enabled,
+            cache_ttl=settings.cache_ttl,
+            rate_limit_requests=settings.rate_limit_requests,
+            rate_limit_period=settings.rate_limit_period,
+            rate_limit_redis_key_prefix=settings.rate_limit_redis_key_prefix,
+            db_pool_size=settings.db_pool_size,
+            db_max_overflow=settings.db_max_overflow,
+            redis_max_connections=settings.redis_max_connections,
+            terminal_timeout=settings.terminal_timeout,
+            terminal_max_sessions=settings.terminal_max_sessions,
+            terminal_max_memory=settings.terminal_max_memory,
+            terminal_max_cpu=settings.terminal_max_cpu,
+        )
+
+
 @lru_cache()
 def get_settings() -> Settings:
     """
@@ -361,6 +775,32 @@ def get_settings() -> Settings:
     return Settings()
 
 
+_runtime_settings: Optional[RuntimeSettings] = None
+
+
+def get_runtime_settings() -> RuntimeSettings:
+    """
+    Get the frozen runtime settings snapshot for hot paths.
+
+    The snapshot is derived from get_settings() on first use and replaced
+    as a whole when runtime tuning overrides change, so readers always see
+    a consistent set of values.
+
+    Returns:
+        RuntimeSettings: The current snapshot
+    """
+    global _runtime_settings
+    if _runtime_settings is None:
+        _runtime_settings = RuntimeSettings.from_settings(get_settings())
+    return _runtime_settings
+
+
+def set_runtime_settings(snapshot: RuntimeSettings) -> None:
+    """Atomically replace the runtime settings snapshot."""
+    global _runtime_settings
+    _runtime_settings = snapshot
+
+
 # Convenience function for accessing settings
 def get_config() -> Settings:
     """
@@ -377,6 +817,9 @@ def get_config() -> Settings:
 # Export commonly used settings
 __all__ = [
     "Settings",
+    "RuntimeSettings",
     "get_settings",
+    "get_runtime_settings",
+    "set_runtime_settings",
     "get_config"
 ]
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+Linux Daily Tips Backend - Startup State and Warmup
+
+This module tracks application startup for liveness and readiness probes
+and runs registered cache warmers once the database and Redis are up.
+Liveness only says the process is running; readiness says every startup
+phase finished and the worker may receive traffic.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .settings import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# STARTUP STATE
+# =============================================================================
+
+class StartupState:
+    """Liveness/readiness flags and per-phase startup timings."""
+
+    def __init__(self):
+        """Initialize state for a process that has not started up yet."""
+        self.alive = True
+        self.ready = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self._started_monotonic = 0.0
+
+    def begin(self) -> None:
+        """Mark the beginning of startup."""
+        self.ready = False
+        self.error = None
+        self.phases = {}
+        self.started_at = time.time()
+        self.finished_at = None
+        self._started_monotonic = time.perf_counter()
+
+    async def track(self, phase: str, awaitable: Awaitable[Any]) -> Any:
+        """Await a startup phase and record its duration and outcome."""
+        start = time.perf_counter()
+        self.phases[phase] = {"status": "running"}
+        try:
+            result = await awaitable
+        except Exception as e:
+            self.phases[phase] = {
+                "status": "failed",
+                "duration_ms": (time.perf_counter() - start) * 1000,
+                "error": str(e),
+            }
+            raise
+        self.phases[phase] = {
+            "status": "done",
+            "duration_ms": (time.perf_counter() - start) * 1000,
+        }
+        return result
+
+    def mark_ready(self) -> None:
+        """Mark startup as complete."""
+        self.ready = True
+        self.finished_at = time.time()
+
+    def mark_failed(self, error: Exception) -> None:
+        """Mark startup as failed; the worker stays alive but not ready."""
+        self.ready = False
+        self.error = str(error)
+        self.finished_at = time.time()
+
+    def mark_stopping(self) -> None:
+        """Stop receiving traffic while shutting down."""
+        self.ready = False
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        """Get total startup duration once finished."""
+        if self.finished_at is None or self.started_at is None:
+            return None
+        return (self.finished_at - self.started_at) * 1000
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get startup state for probes and diagnostics."""
+        return {
+            "alive": self.alive,
+            "ready": self.ready,
+            "error": self.error,
+            "duration_ms": self.duration_ms,
+            "phases": dict(self.phases),
+        }
+
+
+_startup_state = StartupState()
+
+
+def get_startup_state() -> StartupState:
+    """Get the process-wide startup state."""
+    return _startup_state
+
+
+def is_live() -> bool:
+    """Liveness: the process is up and its event loop is serving."""
+    return _startup_state.alive
+
+
+def is_ready() -> bool:
+    """Readiness: startup finished and the worker may receive traffic."""
+    return _startup_state.ready
+
+
+# =============================================================================
+# CACHE WARMERS
+# =============================================================================
+
+CacheWarmer = Callable[[], Awaitable[Any]]
+
+_cache_warmers: List[Tuple[str, CacheWarmer]] = []
+
+
+def register_cache_warmer(name: str, warmer: CacheWarmer) -> None:
+    """
+    Register a coroutine function that fills hot cache keys at startup.
+
+    Warmers run concurrently after the database and Redis are initialized.
+    They are best effort: a failing warmer is reported but does not keep
+    the worker from becoming ready.
+    """
+    _cache_warmers[:] = [entry for entry in _cache_warmers if entry[0] != name]
+    _cache_warmers.append((name, warmer))
+
+
+async def run_cache_warmers() -> Dict[str, str]:
+    """Run all registered cache warmers concurrently."""
+    if not get_settings().cache_prewarm_enabled or not _cache_warmers:
+        return {}
+
+    results = await asyncio.gather(
+        *(warmer() for _, warmer in _cache_warmers), return_exceptions=True
+    )
+
+    outcome = {}
+    for (name, _), result in zip(_cache_warmers, results):
+        if isinstance(result, Exception):
+            logger.error("Cache warmer '%s' failed: %s", name, result)
+            outcome[name] = f"failed: {result}"
+        else:
+            outcome[name] = "done"
+    return outcome
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "StartupState",
+    "get_startup_state",
+    "is_live",
+    "is_ready",
+    "register_cache_warmer",
+    "run_cache_warmers",
+]
@@ -0,0 +1,332 @@
+"""
+Linux Daily Tips Backend - Connection Pool Telemetry
+
+This module collects connection pool metrics for the SQLAlchemy engines:
+checkout wait time, connection hold time, overflow usage, pre-ping
+failures and invalidations. The numbers are meant for sizing
+db_pool_size/db_max_overflow against real traffic.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.util import queue as sqla_queue
+
+
+# =============================================================================
+# METRIC PRIMITIVES
+# =============================================================================
+
+# Latency bucket upper bounds in seconds (the last bucket is unbounded)
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+def percentile_from_counts(
+    buckets: Sequence[float],
+    counts: Sequence[int],
+    q: float,
+    max_value: float
+) -> float:
+    """Estimate a percentile (0-100) from bucket counts."""
+    total = sum(counts)
+    if not total:
+        return 0.0
+    rank = total * q / 100
+    seen = 0
+    for index, bucket_count in enumerate(counts):
+        seen += bucket_count
+        if seen >= rank:
+            if index < len(buckets):
+                return min(buckets[index], max_value)
+            return max_value
+    return max_value
+
+
+class Histogram:
+    """Fixed-bucket histogram with O(log buckets) observations."""
+
+    __slots__ = ("name", "buckets", "counts", "count", "total", "max")
+
+    def __init__(self, name: str, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """Initialize histogram with bucket upper bounds."""
+        self.name = name
+        self.buckets = tuple(buckets)
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all observations."""
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> float:
+        """Estimate a percentile (0-100) as the upper bound of its bucket."""
+        return percentile_from_counts(self.buckets, self.counts, q, self.max)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get histogram summary and bucket counts."""
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "avg": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "buckets": {
+                **{
+                    f"le_{bound}": count
+                    for bound, count in zip(self.buckets, self.counts)
+                },
+                "le_inf": self.counts[-1],
+            },
+        }
+
+
+class Gauge:
+    """Point-in-time value that also tracks its peak."""
+
+    __slots__ = ("name", "value", "peak")
+
+    def __init__(self, name: str):
+        """Initialize gauge at zero."""
+        self.name = name
+        self.value = 0
+        self.peak = 0
+
+    def set(self, value: int) -> None:
+        """Set the current value."""
+        self.value = value
+        if value > self.peak:
+            self.peak = value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get current and peak value."""
+        return {"value": self.value, "peak": self.peak}
+
+
+# =============================================================================
+# POOL TELEMETRY
+# =============================================================================
+
+class PoolTelemetry:
+    """Connection pool metrics for a single engine."""
+
+    def __init__(self, name: str):
+        """Initialize empty metrics for the named pool."""
+        self.name = name
+        self.checkout_wait = Histogram(f"{name}.checkout_wait_seconds")
+        self.hold_time = Histogram(f"{name}.hold_seconds")
+        self.checked_out = Gauge(f"{name}.checked_out")
+        self.overflow = Gauge(f"{name}.overflow")
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.checkout_timeouts = 0
+        self.connects = 0
+        self.pre_ping_failures = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+        self._engine = None
+
+    def attach(self, engine) -> None:
+        """Register pool event listeners on a sync engine."""
+        self._engine = engine
+        if isinstance(engine.pool, InstrumentedPoolMixin):
+            engine.pool.telemetry = self
+        has_overflow = hasattr(engine.pool, "overflow")
+        perf_counter = time.perf_counter
+
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            self.connects += 1
+
+        @event.listens_for(engine, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            connection_record.info["telemetry_checkout_at"] = perf_counter()
+            self.checkouts += 1
+            self.checked_out.set(self.checked_out.value + 1)
+            if has_overflow:
+                overflow = engine.pool.overflow()
+                self.overflow.set(max(overflow, 0))
+                if overflow > 0:
+                    self.overflow_checkouts += 1
+
+        @event.listens_for(engine, "checkin")
+        def on_checkin(dbapi_connection, connection_record):
+            checkout_at = connection_record.info.pop("telemetry_checkout_at", None)
+            if checkout_at is not None:
+                self.hold_time.observe(perf_counter() - checkout_at)
+                self.checked_out.set(max(self.checked_out.value - 1, 0))
+
+        @event.listens_for(engine, "invalidate")
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            self.invalidations += 1
+            # Pre-ping failures surface as disconnects raised during checkout
+            if isinstance(exception, exc.DisconnectionError):
+                self.pre_ping_failures += 1
+
+        @event.listens_for(engine, "soft_invalidate")
+        def on_soft_invalidate(dbapi_connection, connection_record, exception):
+            self.soft_invalidations += 1
+
+    def pool_status(self) -> Dict[str, Any]:
+        """Get live pool occupancy straight from the pool."""
+        if self._engine is None:
+            return {}
+        pool = self._engine.pool
+        status: Dict[str, Any] = {"class": type(pool).__name__}
+        for attribute in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, attribute, None)
+            if method is not None:
+                status[attribute] = method()
+        return status
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get all pool metrics."""
+        return {
+            "name": self.name,
+            "pool": self.pool_status(),
+            "checkout_wait_seconds": self.checkout_wait.snapshot(),
+            "hold_seconds": self.hold_time.snapshot(),
+            "checked_out": self.checked_out.snapshot(),
+            "overflow": self.overflow.snapshot(),
+            "checkouts": self.checkouts,
+            "overflow_checkouts": self.overflow_checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+            "connects": self.connects,
+            "pre_ping_failures": self.pre_ping_failures,
+            "invalidations": self.invalidations,
+            "soft_invalidations": self.soft_invalidations,
+        }
+
+    def reset(self) -> None:
+        """Reset counters and histograms (gauges keep their live value)."""
+        self.checkout_wait.reset()
+        self.hold_time.reset()
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.checkout_timeouts = 0
+        self.connects = 0
+        self.pre_ping_failures = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+
+
+# =============================================================================
+# INSTRUMENTED POOL CLASSES
+# =============================================================================
+
+class InstrumentedPoolMixin:
+    """Time and trace pool checkouts and allow resizing a live QueuePool."""
+
+    telemetry: Optional[PoolTelemetry] = None
+    # OpenTelemetry tracer and span attributes, set by TracingConfig
+    tracer: Optional[Any] = None
+    trace_attributes: Dict[str, Any] = {}
+
+    def _do_get(self):
+        telemetry = self.telemetry
+        tracer = self.tracer
+        if telemetry is None and tracer is None:
+            return super()._do_get()
+
+        if tracer is None:
+            return self._timed_get(telemetry)
+        # The span records the exception and error status on a timeout
+        with tracer.start_as_current_span(
+            "db.pool.checkout", attributes=self.trace_attributes
+        ) as span:
+            record = self._timed_get(telemetry)
+            span.set_attribute("db.pool.checked_out", self.checkedout())
+            return record
+
+    def _timed_get(self, telemetry: Optional[PoolTelemetry]):
+        """Check out a connection, reporting wait time to telemetry."""
+        if telemetry is None:
+            return super()._do_get()
+
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            telemetry.checkout_timeouts += 1
+            raise
+        finally:
+            telemetry.checkout_wait.observe(time.perf_counter() - start)
+
+    def resize(self, pool_size: int, max_overflow: int) -> None:
+        """
+        Change pool size and overflow limit in place.
+
+        _overflow counts connections beyond the pool size, so it is shifted
+        by the size change. Idle connections above the new size are closed;
+        checked-out ones are discarded on return because the queue is full.
+        For async pools call this through greenlet_spawn, since closing a
+        connection awaits the driver.
+        """
+        with self._overflow_lock:
+            delta = pool_size - self._pool.maxsize
+            self._pool.maxsize = pool_size
+            # AsyncAdaptedQueue builds its asyncio.Queue lazily from maxsize
+            async_queue = self._pool.__dict__.get("_queue")
+            if async_queue is not None:
+                async_queue._maxsize = pool_size
+            self._overflow -= delta
+            self._max_overflow = max_overflow
+
+        while self._pool.qsize() > pool_size:
+            try:
+                record = self._pool.get(False)
+            except sqla_queue.Empty:
+                break
+            try:
+                record.close()
+            finally:
+                self._dec_overflow()
+
+    def recreate(self):
+        # engine.dispose() replaces the pool; keep reporting to the same sink
+        new_pool = super().recreate()
+        new_pool.telemetry = self.telemetry
+        new_pool.tracer = self.tracer
+        new_pool.trace_attributes = self.trace_attributes
+        return new_pool
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    """QueuePool reporting checkout wait time to PoolTelemetry."""
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool reporting checkout wait time to PoolTelemetry."""
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "DEFAULT_LATENCY_BUCKETS",
+    "percentile_from_counts",
+    "Histogram",
+    "Gauge",
+    "PoolTelemetry",
+    "InstrumentedPoolMixin",
+    "InstrumentedQueuePool",
+    "InstrumentedAsyncAdaptedQueuePool",
+]
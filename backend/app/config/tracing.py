@@ -0,0 +1,428 @@
+"""
+Linux Daily Tips Backend - Tracing
+
+This module provides OpenTelemetry tracing for the database and Redis
+layers: spans for pool checkouts and statements on the engines built by
+DatabaseConfig, and for cache reads/writes and rate-limit checks made
+through RedisClient. Spans join the caller's trace, so a handler span
+(e.g. from opentelemetry-instrumentation-asgi) shows its cache and
+database work underneath it.
+
+Export is pluggable: "otlp", "console", "file" (JSON lines) and "memory"
+are built in and more can be added with register_exporter(). Tracing is
+off by default; when off, no listeners are registered and RedisClient is
+not wrapped, so the only cost left is the pool's existing branch on
+checkout. Requires opentelemetry-sdk (and
+opentelemetry-exporter-otlp-proto-http for OTLP), installed with the
+"tracing" extra.
+"""
+
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import event
+
+from .redis import RedisClient
+from .settings import Settings, get_settings
+from .telemetry import InstrumentedPoolMixin
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        ConsoleSpanExporter,
+        SimpleSpanProcessor,
+        SpanExporter,
+        SpanExportResult,
+    )
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # pragma: no cover - optional dependency
+    trace = None
+    SpanExporter = object
+
+
+# Longest db.statement attribute recorded
+MAX_STATEMENT_LENGTH = 2048
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# EXPORTERS
+# =============================================================================
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Append finished spans to a file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        """Initialize exporter for a file path."""
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Any]) -> "SpanExportResult":
+        """Write a batch of spans."""
+        lines = "".join(json.dumps(json.loads(span.to_json())) + "\n" for span in spans)
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with self._lock, open(self.path, "a") as f:
+                f.write(lines)
+        except OSError as e:
+            logger.error("Failed to write spans to %s: %s", self.path, e)
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        """Nothing to release; the file is opened per batch."""
+
+
+def _otlp_exporter(settings: Settings) -> "SpanExporter":
+    """OTLP over HTTP/protobuf to a collector."""
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    return OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+
+
+def _console_exporter(settings: Settings) -> "SpanExporter":
+    """Pretty-printed spans on stdout."""
+    return ConsoleSpanExporter()
+
+
+def _file_exporter(settings: Settings) -> "SpanExporter":
+    """JSON lines in tracing_file_path."""
+    return JsonLinesSpanExporter(settings.tracing_file_path)
+
+
+def _memory_exporter(settings: Settings) -> "SpanExporter":
+    """Spans kept in memory, for tests."""
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+    return InMemorySpanExporter()
+
+
+# Exporter name -> factory taking the settings
+EXPORTERS: Dict[str, Callable[[Settings], "SpanExporter"]] = {
+    "otlp": _otlp_exporter,
+    "console": _console_exporter,
+    "file": _file_exporter,
+    "memory": _memory_exporter,
+}
+
+# Exporters that batch in a background thread; the rest export inline so
+# spans are visible as soon as they end
+BATCHED_EXPORTERS = {"otlp"}
+
+
+def register_exporter(name: str, factory: Callable[[Settings], "SpanExporter"]) -> None:
+    """Make an exporter selectable through TRACING_EXPORTER."""
+    EXPORTERS[name] = factory
+
+
+# =============================================================================
+# TRACING CONFIGURATION
+# =============================================================================
+
+class TracingConfig:
+    """Tracer provider setup and instrumentation of the config layer."""
+
+    def __init__(self, settings: Optional[Settings] = None):
+        """Initialize tracing configuration."""
+        self.settings = settings or get_settings()
+        self.enabled = self.settings.tracing_enabled and trace is not None
+        self.exporters: Dict[str, "SpanExporter"] = {}
+        self._provider: Optional["TracerProvider"] = None
+        self._tracer: Optional[Any] = None
+
+        if self.settings.tracing_enabled and trace is None:
+            logger.warning(
+                "Tracing is enabled but opentelemetry-sdk is not installed "
+                "(install the tracing extra); disabled"
+            )
+
+    @property
+    def tracer(self) -> Optional[Any]:
+        """Get the tracer, or None when tracing is disabled."""
+        if self.enabled and self._tracer is None:
+            self._provider = self._create_provider()
+            # Global, so ASGI/HTTP instrumentation joins the same traces
+            trace.set_tracer_provider(self._provider)
+            self._tracer = self._provider.get_tracer(
+                "linux-daily-tips.config", self.settings.app_version
+            )
+        return self._tracer
+
+    def _create_provider(self) -> "TracerProvider":
+        """Create the provider with sampling and the configured exporters."""
+        settings = self.settings
+        provider = TracerProvider(
+            resource=Resource.create({
+                "service.name": settings.tracing_service_name,
+                "service.version": settings.app_version,
+                "deployment.environment": settings.environment,
+            }),
+            sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+        )
+        names = [name.strip().lower() for name in settings.tracing_exporter.split(",")]
+        for name in filter(None, names):
+            factory = EXPORTERS.get(name)
+            if factory is None:
+                logger.warning(
+                    "Unknown trace exporter '%s'; choose from %s", name, sorted(EXPORTERS)
+                )
+                continue
+            try:
+                exporter = self.exporters[name] = factory(settings)
+            except ImportError as e:
+                logger.warning(
+                    "Trace exporter '%s' is unavailable (%s); install the tracing extra",
+                    name, e,
+                )
+                continue
+            processor = BatchSpanProcessor if name in BATCHED_EXPORTERS else SimpleSpanProcessor
+            provider.add_span_processor(processor(exporter))
+        return provider
+
+    # =============================================================================
+    # DATABASE INSTRUMENTATION
+    # =============================================================================
+
+    def attach_engine(self, engine, name: str) -> None:
+        """Trace pool checkouts and statements on a (sync) engine."""
+        tracer = self.tracer
+        if tracer is None:
+            return
+        from .profiling import normalize_sql
+
+        url = engine.url
+        base_attributes = {
+            "db.system": engine.dialect.name,
+            "db.name": url.database or "",
+            "db.user": url.username or "",
+            "server.address": url.host or "",
+            "server.port": url.port or 5432,
+            "db.engine": name,
+        }
+        if isinstance(engine.pool, InstrumentedPoolMixin):
+            engine.pool.tracer = tracer
+            engine.pool.trace_attributes = base_attributes
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+            span = tracer.start_span(
+                f"db.{operation.lower() or 'statement'}",
+                kind=SpanKind.CLIENT,
+                attributes={
+                    **base_attributes,
+                    "db.operation": operation,
+                    # Literals are stripped so values never reach the exporter
+                    "db.statement": normalize_sql(statement)[:MAX_STATEMENT_LENGTH],
+                    "db.executemany": executemany,
+                },
+            )
+            conn.info.setdefault("tracing_spans", []).append(span)
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            span = conn.info["tracing_spans"].pop()
+            rowcount = getattr(cursor, "rowcount", -1)
+            if rowcount is not None and rowcount >= 0:
+                span.set_attribute("db.rows", rowcount)
+            span.end()
+
+        @event.listens_for(engine, "handle_error")
+        def handle_error(exception_context):
+            conn = exception_context.connection
+            spans = conn.info.get("tracing_spans") if conn is not None else None
+            if spans:
+                span = spans.pop()
+                error = exception_context.original_exception
+                span.record_exception(error)
+                span.set_status(Status(StatusCode.ERROR, type(error).__name__))
+                span.end()
+
+    # =============================================================================
+    # LIFECYCLE
+    # =============================================================================
+
+    def shutdown(self) -> None:
+        """Flush pending spans and stop the exporters."""
+        if self._provider is not None:
+            self._provider.shutdown()
+            self._provider = None
+            self._tracer = None
+
+
+# =============================================================================
+# REDIS INSTRUMENTATION
+# =============================================================================
+
+def key_namespace(key: str) -> str:
+    """Get the first segment of a colon-separated key ("tips:daily:x" -> "tips")."""
+    return key.split(":", 1)[0] if ":" in key else ""
+
+
+# Marks a miss, so a cached default cannot pass for a hit
+_MISS = object()
+
+
+class TracedRedisClient(RedisClient):
+    """
+    RedisClient with spans for cache reads/writes and rate-limit checks.
+
+    get_redis_client() builds this class instead of RedisClient when
+    tracing is enabled. RedisClient reports Redis errors by returning the
+    default, so spans record hit/miss but not the error itself.
+    """
+
+    def __init__(self, redis_instance, tracer):
+        """Initialize client wrapper with a tracer."""
+        super().__init__(redis_instance)
+        self.tracer = tracer
+
+    def _span(self, name: str, operation: str, key: str, **attributes):
+        """Start a client span for one Redis call."""
+        return self.tracer.start_as_current_span(
+            name,
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": "redis",
+                "db.operation": operation,
+                "cache.key_namespace": key_namespace(key),
+                **attributes,
+            },
+        )
+
+    async def _traced_get(self, name: str, read, key: str, default: Any) -> Any:
+        """Trace a read and record whether it hit."""
+        with self._span(name, "GET", key) as span:
+            value = await read(key, _MISS)
+            span.set_attribute("cache.hit", value is not _MISS)
+        return default if value is _MISS else value
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        """Get value from Redis with optional default."""
+        return await self._traced_get("cache.get", super().get, key, default)
+
+    async def get_json(self, key: str, default: Any = None) -> Any:
+        """Get JSON value from Redis."""
+        return await self._traced_get("cache.get", super().get_json, key, default)
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        nx: bool = False,
+        xx: bool = False
+    ) -> bool:
+        """Set value in Redis with optional TTL and conditions."""
+        with self._span("cache.set", "SET", key, **{"cache.ttl": ttl or 0}) as span:
+            stored = await super().set(key, value, ttl=ttl, nx=nx, xx=xx)
+            span.set_attribute("cache.stored", bool(stored))
+        return stored
+
+    async def set_json(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        nx: bool = False,
+        xx: bool = False
+    ) -> bool:
+        """Set JSON value in Redis."""
+        with self._span("cache.set", "SET", key, **{"cache.ttl": ttl or 0}) as span:
+            stored = await super().set_json(key, value, ttl=ttl, nx=nx, xx=xx)
+            span.set_attribute("cache.stored", bool(stored))
+        return stored
+
+    async def rate_limit_check(
+        self,
+        key: str,
+        limit: int,
+        window: int,
+        identifier: str = "default"
+    ) -> tuple[bool, int, int]:
+        """Check rate limit using sliding window."""
+        attributes = {"ratelimit.limit": limit, "ratelimit.window": window}
+        rate_key = f"{key}:{identifier}"
+        with self._span("ratelimit.check", "PIPELINE", rate_key, **attributes) as span:
+            allowed, remaining, reset = await super().rate_limit_check(
+                key, limit, window, identifier
+            )
+            span.set_attribute("ratelimit.allowed", allowed)
+            span.set_attribute("ratelimit.remaining", remaining)
+        return allowed, remaining, reset
+
+
+# =============================================================================
+# SPAN HELPER
+# =============================================================================
+
+@contextmanager
+def start_span(name: str, **attributes: Any) -> Iterator[Optional[Any]]:
+    """
+    Trace a block of application code, e.g. a service call.
+
+    Yields the span, or None when tracing is disabled.
+    """
+    tracer = get_tracing().tracer
+    if tracer is None:
+        yield None
+        return
+    with tracer.start_as_current_span(name, attributes=attributes) as span:
+        yield span
+
+
+# =============================================================================
+# GLOBAL TRACING INSTANCE
+# =============================================================================
+
+@lru_cache()
+def get_tracing() -> TracingConfig:
+    """Get cached tracing configuration instance."""
+    return TracingConfig()
+
+
+def get_tracer() -> Optional[Any]:
+    """Get the configured tracer, or None when tracing is disabled."""
+    return get_tracing().tracer
+
+
+def get_finished_spans() -> List[Any]:
+    """Get spans held by the "memory" exporter (for tests)."""
+    exporter = get_tracing().exporters.get("memory")
+    return list(exporter.get_finished_spans()) if exporter is not None else []
+
+
+def shutdown_tracing() -> None:
+    """Flush and stop tracing if it was started."""
+    if get_tracing.cache_info().currsize:
+        get_tracing().shutdown()
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "JsonLinesSpanExporter",
+    "EXPORTERS",
+    "register_exporter",
+    "TracingConfig",
+    "key_namespace",
+    "TracedRedisClient",
+    "start_span",
+    "get_tracing",
+    "get_tracer",
+    "get_finished_spans",
+    "shutdown_tracing",
+]
@@ -0,0 +1,5 @@
+"""
+Linux Daily Tips Backend - Services
+
+Application services built on top of the configuration layer.
+"""
@@ -0,0 +1,624 @@
+"""
+Linux Daily Tips Backend - HTTP Response Cache
+
+This module caches fully rendered responses for the public tip
+endpoints. A response is serialized once and stored identity, gzip and
+(when the brotli package is installed) brotli encoded, together with a
+strong ETag derived from tips.updated_at. Entries live in two levels: a
+small in-process LRU in front of a Redis hash shared by all workers.
+
+Conditional requests are answered from the cached validators, so a
+matching If-None-Match or If-Modified-Since gets a 304 without touching
+PostgreSQL or serializing anything. Entries past max-age are served while
+a single background rebuild runs, mirroring the stale-while-revalidate
+directive sent to the frontend and CDN. Each tag has a generation
+counter bumped on invalidation; a build that started before the bump is
+not stored.
+"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.config.settings import Settings, get_runtime_settings, get_settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Builders return the payload (bytes or JSON-serializable) and its updated_at,
+# optionally followed by a tuple of extra ETag parts (see make_etag)
+ResponseBuilder = Callable[[], Awaitable[Tuple[Any, ...]]]
+
+# Preferred first when the client accepts several
+ENCODINGS = ("br", "gzip", "identity")
+ETAG_SUFFIXES = {"identity": "", "gzip": "-gz", "br": "-br"}
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# VALIDATORS AND NEGOTIATION
+# =============================================================================
+
+def make_etag(key: str, updated_at: datetime, *parts: Any) -> str:
+    """
+    Build a strong ETag from a cache key and the data's updated_at.
+
+    Extra parts (such as a row count for list endpoints) are folded in
+    when updated_at alone cannot tell two versions apart.
+    """
+    seed = "|".join([key, updated_at.isoformat(), *(str(part) for part in parts)])
+    return hashlib.sha1(seed.encode()).hexdigest()[:24]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, and
+    treats the encoding-specific variants of an ETag as the same version.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        candidate = candidate.strip('"')
+        for suffix in ("-gz", "-br"):
+            if candidate.endswith(suffix):
+                candidate = candidate[:-len(suffix)]
+        if candidate == etag:
+            return True
+    return False
+
+
+def choose_encoding(accept_encoding: Optional[str], available: Iterable[str]) -> str:
+    """Pick the preferred available encoding the client accepts."""
+    available = set(available)
+    accepted: Dict[str, float] = {}
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+
+    for encoding in ENCODINGS[:-1]:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if encoding in available and quality > 0:
+            return encoding
+    return "identity"
+
+
+# =============================================================================
+# CACHED RESPONSE
+# =============================================================================
+
+@dataclass
+class CachedResponse:
+    """A rendered response with its validators and encoded bodies."""
+
+    etag: str
+    last_modified: datetime
+    media_type: str
+    fresh_until: float
+    stale_until: float
+    bodies: Dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def is_fresh(self) -> bool:
+        """Check whether the entry is within max-age."""
+        return time.time() < self.fresh_until
+
+    def not_modified(self, headers: Dict[str, str]) -> bool:
+        """Check a request's conditional headers against this entry."""
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None:
+            # If-Modified-Since is ignored when If-None-Match is present
+            return etag_matches(if_none_match, self.etag)
+        since = headers.get("if-modified-since")
+        if not since:
+            return False
+        try:
+            return self.last_modified.replace(microsecond=0) <= parsedate_to_datetime(since)
+        except (TypeError, ValueError):
+            return False
+
+    def render(
+        self,
+        headers: Dict[str, str],
+        max_age: int,
+        stale_while_revalidate: int
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Produce the status, headers and body for a request.
+
+        Args:
+            headers: Request headers with lower-case names
+
+        Returns:
+            (status, response headers, body); the body is empty for 304
+        """
+        encoding = choose_encoding(headers.get("accept-encoding"), self.bodies)
+        response_headers = {
+            "ETag": f'"{self.etag}{ETAG_SUFFIXES[encoding]}"',
+            "Last-Modified": format_datetime(self.last_modified, usegmt=True),
+            "Cache-Control": (
+                f"public, max-age={max_age}, "
+                f"stale-while-revalidate={stale_while_revalidate}"
+            ),
+            "Vary": "Accept-Encoding",
+        }
+        if self.not_modified(headers):
+            return 304, response_headers, b""
+
+        response_headers["Content-Type"] = self.media_type
+        if encoding != "identity":
+            response_headers["Content-Encoding"] = encoding
+        return 200, response_headers, self.bodies[encoding]
+
+    def to_mapping(self) -> Dict[str, str]:
+        """Get the entry as Redis hash fields."""
+        mapping = {
+            "etag": self.etag,
+            "last_modified": self.last_modified.isoformat(),
+            "media_type": self.media_type,
+            "fresh_until": repr(self.fresh_until),
+            "stale_until": repr(self.stale_until),
+        }
+        # The shared client decodes responses, so bodies are stored as base64
+        for encoding, body in self.bodies.items():
+            mapping[f"body:{encoding}"] = base64.b64encode(body).decode("ascii")
+        return mapping
+
+    @classmethod
+    def from_mapping(cls, mapping: Dict[str, str]) -> "CachedResponse":
+        """Rebuild an entry from Redis hash fields."""
+        return cls(
+            etag=mapping["etag"],
+            last_modified=datetime.fromisoformat(mapping["last_modified"]),
+            media_type=mapping["media_type"],
+            fresh_until=float(mapping["fresh_until"]),
+            stale_until=float(mapping["stale_until"]),
+            bodies={
+                name[5:]: base64.b64decode(value)
+                for name, value in mapping.items()
+                if name.startswith("body:")
+            },
+        )
+
+
+# =============================================================================
+# RESPONSE CACHE
+# =============================================================================
+
+class ResponseCache:
+    """Two-level cache of rendered responses with tag invalidation."""
+
+    def __init__(self, client, settings: Optional[Settings] = None):
+        """Initialize response cache over a RedisClient."""
+        self.client = client
+        self.settings = settings or get_settings()
+        self.key_prefix = self.settings.response_cache_key_prefix
+        self.max_age = self.settings.response_cache_max_age
+        self.stale_while_revalidate = self.settings.response_cache_stale_while_revalidate
+        self.local_ttl = self.settings.response_cache_local_ttl
+        self.local_max_entries = self.settings.cache_max_size
+        self.min_compress_bytes = self.settings.response_cache_min_compress_bytes
+        self.channel = f"{self.key_prefix}invalidate"
+
+        self._local: "OrderedDict[str, Tuple[float, CachedResponse]]" = OrderedDict()
+        self._rebuilds: Dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {
+            "local_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "not_modified": 0,
+            "stale_served": 0,
+            "builds": 0,
+            "stale_discarded": 0,
+        }
+
+    def _key(self, key: str) -> str:
+        """Get the Redis key of an entry."""
+        return f"{self.key_prefix}{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        """Get the Redis set holding the entries of a tag."""
+        return f"{self.key_prefix}tag:{tag}"
+
+    def _generation_key(self, tag: str) -> str:
+        """Get the counter bumped each time a tag is invalidated."""
+        return f"{self.key_prefix}gen:{tag}"
+
+    # =============================================================================
+    # LEVELS
+    # =============================================================================
+
+    def _get_local(self, key: str) -> Optional[CachedResponse]:
+        """Get an entry from the in-process LRU."""
+        item = self._local.get(key)
+        if item is None:
+            return None
+        expires_at, entry = item
+        if time.monotonic() >= expires_at:
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return entry
+
+    def _set_local(self, key: str, entry: CachedResponse) -> None:
+        """Put an entry in the in-process LRU, evicting the oldest."""
+        self._local[key] = (time.monotonic() + self.local_ttl, entry)
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_max_entries:
+            self._local.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """Get an entry from the local LRU, falling back to Redis."""
+        entry = self._get_local(key)
+        if entry is not None:
+            self._stats["local_hits"] += 1
+            return entry
+
+        try:
+            mapping = await self.client.redis.hgetall(self._key(key))
+        except Exception as e:
+            logger.error("Response cache read error for '%s': %s", key, e)
+            mapping = None
+        if not mapping:
+            self._stats["misses"] += 1
+            return None
+
+        entry = CachedResponse.from_mapping(mapping)
+        self._stats["redis_hits"] += 1
+        self._set_local(key, entry)
+        return entry
+
+    # =============================================================================
+    # STORING
+    # =============================================================================
+
+    def encode(
+        self,
+        payload: Any,
+        updated_at: datetime,
+        key: str,
+        media_type: str = "application/json",
+        etag_parts: Tuple[Any, ...] = ()
+    ) -> CachedResponse:
+        """Serialize and compress a payload once for every encoding."""
+        if isinstance(payload, bytes):
+            body = payload
+        else:
+            body = json.dumps(
+                payload, ensure_ascii=False, separators=(",", ":"), default=str
+            ).encode()
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+
+        bodies = {"identity": body}
+        if len(body) >= self.min_compress_bytes:
+            bodies["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                bodies["br"] = brotli.compress(body, quality=11)
+
+        now = time.time()
+        return CachedResponse(
+            etag=make_etag(key, updated_at, *etag_parts),
+            last_modified=updated_at,
+            media_type=media_type,
+            fresh_until=now + self.max_age,
+            stale_until=now + self.max_age + self.stale_while_revalidate,
+            bodies=bodies,
+        )
+
+    def _encode_built(
+        self,
+        key: str,
+        built: Tuple[Any, ...],
+        media_type: str = "application/json"
+    ) -> CachedResponse:
+        """Encode a builder's (payload, updated_at[, etag_parts]) result."""
+        payload, updated_at, *rest = built
+        etag_parts = tuple(rest[0]) if rest else ()
+        return self.encode(payload, updated_at, key, media_type, etag_parts)
+
+    async def _generations(self, tags: Iterable[str]) -> List[Optional[str]]:
+        """Get the current generation of each tag."""
+        tags = list(tags)
+        if not tags:
+            return []
+        return await self.client.redis.mget([self._generation_key(tag) for tag in tags])
+
+    async def store(
+        self,
+        key: str,
+        entry: CachedResponse,
+        tags: Iterable[str] = (),
+        generations: Optional[List[Optional[str]]] = None
+    ) -> bool:
+        """
+        Write an entry to both levels and index it under its tags.
+
+        Args:
+            generations: Tag generations read before the entry was built;
+                if a tag was invalidated since, the entry is not stored
+
+        Returns:
+            False if the entry was discarded as stale
+        """
+        from redis.exceptions import WatchError
+
+        tags = list(tags)
+        ttl = max(1, int(entry.stale_until - time.time()))
+        try:
+            async with self.client.redis.pipeline(transaction=True) as pipe:
+                if generations is not None and tags:
+                    generation_keys = [self._generation_key(tag) for tag in tags]
+                    await pipe.watch(*generation_keys)
+                    if await pipe.mget(generation_keys) != generations:
+                        return False
+                    pipe.multi()
+                pipe.delete(self._key(key))
+                pipe.hset(self._key(key), mapping=entry.to_mapping())
+                pipe.expire(self._key(key), ttl)
+                for tag in tags:
+                    pipe.sadd(self._tag_key(tag), key)
+                await pipe.execute()
+        except WatchError:
+            # Invalidated between the check and the write
+            return False
+        except Exception as e:
+            logger.error("Response cache write error for '%s': %s", key, e)
+        self._set_local(key, entry)
+        return True
+
+    async def build(
+        self,
+        key: str,
+        builder: ResponseBuilder,
+        tags: Iterable[str] = (),
+        media_type: str = "application/json"
+    ) -> CachedResponse:
+        """
+        Run a builder, then encode and store its result.
+
+        The result is returned either way, but is only cached if none of
+        its tags was invalidated while the builder ran.
+        """
+        tags = tuple(tags)
+        generations = await self._generations(tags)
+        entry = self._encode_built(key, await builder(), media_type)
+        if not await self.store(key, entry, tags, generations):
+            self._stats["stale_discarded"] += 1
+        self._stats["builds"] += 1
+        return entry
+
+    def _rebuild_in_background(
+        self,
+        key: str,
+        builder: ResponseBuilder,
+        tags: Iterable[str],
+        media_type: str
+    ) -> None:
+        """Start one background rebuild per key."""
+        task = self._rebuilds.get(key)
+        if task is not None and not task.done():
+            return
+
+        async def rebuild() -> None:
+            try:
+                await self.build(key, builder, tags, media_type)
+            except Exception as e:
+                logger.exception("Response cache rebuild of '%s' failed: %s", key, e)
+            finally:
+                self._rebuilds.pop(key, None)
+
+        self._rebuilds[key] = asyncio.create_task(rebuild())
+
+    # =============================================================================
+    # SERVING
+    # =============================================================================
+
+    async def serve(
+        self,
+        key: str,
+        headers: Dict[str, str],
+        builder: ResponseBuilder,
+        tags: Iterable[str] = (),
+        media_type: str = "application/json"
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Answer a request from the cache, building the response on a miss.
+
+        Args:
+            key: Cache key, normally the path and canonical query string
+            headers: Request headers with lower-case names
+            builder: Coroutine function returning (payload, updated_at) or
+                (payload, updated_at, etag_parts)
+            tags: Invalidation tags for the entry, such as "tips"
+
+        Returns:
+            (status, response headers, body)
+        """
+        tags = tuple(tags)
+        if not get_runtime_settings().cache_enabled:
+            entry = self._encode_built(key, await builder(), media_type)
+        else:
+            entry = await self.get(key)
+            if entry is None or time.time() >= entry.stale_until:
+                entry = await self.build(key, builder, tags, media_type)
+            elif not entry.is_fresh:
+                self._stats["stale_served"] += 1
+                self._rebuild_in_background(key, builder, tags, media_type)
+
+        status, response_headers, body = entry.render(
+            headers, self.max_age, self.stale_while_revalidate
+        )
+        if status == 304:
+            self._stats["not_modified"] += 1
+        return status, response_headers, body
+
+    async def respond(
+        self,
+        request,
+        key: str,
+        builder: ResponseBuilder,
+        tags: Iterable[str] = (),
+        media_type: str = "application/json"
+    ):
+        """Serve a FastAPI request from the cache as a Response."""
+        from fastapi import Response
+
+        headers = {name.lower(): value for name, value in request.headers.items()}
+        status, response_headers, body = await self.serve(
+            key, headers, builder, tags, media_type
+        )
+        return Response(content=body, status_code=status, headers=response_headers)
+
+    # =============================================================================
+    # INVALIDATION
+    # =============================================================================
+
+    def _drop_local(self, keys: Iterable[str]) -> None:
+        """Remove entries from the in-process LRU."""
+        for key in keys:
+            self._local.pop(key, None)
+
+    async def invalidate(self, *keys: str) -> None:
+        """Drop entries on every worker."""
+        self._drop_local(keys)
+        if not keys:
+            return
+        redis = self.client.redis
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.delete(*(self._key(key) for key in keys))
+            pipe.publish(self.channel, json.dumps(list(keys)))
+            await pipe.execute()
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        Drop every entry stored under a tag on every worker.
+
+        Returns:
+            The number of entries dropped
+        """
+        redis = self.client.redis
+        async with redis.pipeline(transaction=True) as pipe:
+            # Bumping the generation keeps builds already running from
+            # storing what they read before the change
+            pipe.incr(self._generation_key(tag))
+            pipe.smembers(self._tag_key(tag))
+            pipe.delete(self._tag_key(tag))
+            _, keys, _ = await pipe.execute()
+        await self.invalidate(*keys)
+        return len(keys)
+
+    async def on_tips_changed(self, dates: List[Any]) -> None:
+        """Drop cached tip responses after tips change."""
+        await self.invalidate_tag("tips")
+
+    async def run(self) -> None:
+        """Drop local entries invalidated by other workers."""
+        pubsub = self.client.redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        try:
+            while True:
+                message = await pubsub.get_message(timeout=self.local_ttl)
+                if message is not None:
+                    self._drop_local(json.loads(message["data"]))
+        finally:
+            await pubsub.unsubscribe(self.channel)
+            await pubsub.close()
+
+    async def _run(self) -> None:
+        """Keep listening, retrying after Redis errors."""
+        while True:
+            try:
+                await self.run()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("Response cache listener error: %s", e)
+                await asyncio.sleep(5)
+
+    def start(self) -> None:
+        """Start the invalidation listener on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the invalidation listener."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit counters and local cache occupancy."""
+        return {
+            **self._stats,
+            "local_entries": len(self._local),
+            "brotli": brotli is not None,
+        }
+
+
+# =============================================================================
+# GLOBAL RESPONSE CACHE
+# =============================================================================
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide response cache."""
+    global _response_cache
+    if _response_cache is None:
+        from app.config.redis import get_redis_client
+        from app.services.tips.events import register_tips_listener
+
+        _response_cache = ResponseCache(get_redis_client())
+        register_tips_listener("response_cache", _response_cache.on_tips_changed)
+    return _response_cache
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "CachedResponse",
+    "ResponseCache",
+    "make_etag",
+    "etag_matches",
+    "choose_encoding",
+    "get_response_cache",
+]
@@ -0,0 +1,88 @@
+"""
+Linux Daily Tips Backend - Terminal Services
+
+This package provides the terminal emulator's sandbox backends, the warm
+sandbox pool, the Redis session registry, the session manager, the
+WebSocket relay, session recording and the expired session reaper.
+"""
+
+from .sandbox import (
+    SandboxSpec,
+    Sandbox,
+    ExecResult,
+    SandboxBackend,
+    FakeSandboxBackend,
+    SubprocessSandboxBackend,
+    DockerSandboxBackend,
+    create_sandbox_backend
+)
+from .exceptions import (
+    TerminalError,
+    TerminalCapacityError,
+    SessionNotFoundError
+)
+from .pool import WarmPool
+from .registry import SessionRegistry, get_session_registry
+from .recording import (
+    RecordingStore,
+    DiskRecordingStore,
+    RedisRecordingStore,
+    SessionRecorder,
+    stream_recording,
+    replay_events
+)
+from .relay import (
+    PtyProcess,
+    TerminalRelay,
+    relay_session
+)
+from .reaper import SessionReaper, get_session_reaper
+from .manager import (
+    TerminalSession,
+    TerminalSessionManager,
+    get_terminal_manager
+)
+
+__all__ = [
+    # Sandboxes
+    "SandboxSpec",
+    "Sandbox",
+    "ExecResult",
+    "SandboxBackend",
+    "FakeSandboxBackend",
+    "SubprocessSandboxBackend",
+    "DockerSandboxBackend",
+    "create_sandbox_backend",
+
+    # Warm pool
+    "WarmPool",
+
+    # Session registry
+    "SessionRegistry",
+    "get_session_registry",
+
+    # Recording
+    "RecordingStore",
+    "DiskRecordingStore",
+    "RedisRecordingStore",
+    "SessionRecorder",
+    "stream_recording",
+    "replay_events",
+
+    # WebSocket relay
+    "PtyProcess",
+    "TerminalRelay",
+    "relay_session",
+
+    # Reaper
+    "SessionReaper",
+    "get_session_reaper",
+
+    # Sessions
+    "TerminalError",
+    "TerminalCapacityError",
+    "SessionNotFoundError",
+    "TerminalSession",
+    "TerminalSessionManager",
+    "get_terminal_manager",
+]
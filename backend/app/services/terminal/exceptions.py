@@ -0,0 +1,29 @@
+"""
+Linux Daily Tips Backend - Terminal Exceptions
+
+This module defines the errors raised by the terminal services.
+"""
+
+
+class TerminalError(Exception):
+    """Base error for terminal session operations."""
+
+
+class TerminalCapacityError(TerminalError):
+    """Raised when no more terminal sessions may be opened."""
+
+    def __init__(self, message: str, reason: str = "global"):
+        """Initialize error with the limit that was hit ("global" or "ip")."""
+        super().__init__(message)
+        self.reason = reason
+
+
+class SessionNotFoundError(TerminalError):
+    """Raised for unknown, ended or expired sessions."""
+
+
+__all__ = [
+    "TerminalError",
+    "TerminalCapacityError",
+    "SessionNotFoundError",
+]
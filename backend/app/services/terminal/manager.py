@@ -0,0 +1,344 @@
+"""
+Linux Daily Tips Backend - Terminal Session Manager
+
+This module owns the lifecycle of terminal sessions: admitting a new
+session against terminal_max_sessions, handing it a warm sandbox for the
+tip's terminal_setup, running commands, and returning the sandbox to the
+pool when the session ends or expires. With a SessionRegistry, admission
+and expiry are coordinated across workers through Redis; without one
+(tests, single-process development) limits are enforced per process.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import Settings, get_settings, get_runtime_settings
+
+from .exceptions import SessionNotFoundError, TerminalCapacityError
+from .pool import WarmPool
+from .recording import SessionRecorder, create_recording_store, save_recording_index
+from .registry import SessionRegistry
+from .sandbox import (
+    ExecResult,
+    Sandbox,
+    SandboxBackend,
+    SandboxSpec,
+    create_sandbox_backend
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# SESSION MODEL
+# =============================================================================
+
+@dataclass
+class TerminalSession:
+    """An active terminal session bound to one sandbox."""
+
+    id: str
+    tip_id: Optional[str]
+    sandbox: Sandbox
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    expires_at: float = 0.0
+    commands: int = 0
+    recorder: Optional[SessionRecorder] = None
+
+    @property
+    def expired(self) -> bool:
+        """Check whether the session has passed its expiry time."""
+        return time.time() >= self.expires_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get session fields as stored in terminal_sessions."""
+        return {
+            "id": self.id,
+            "tip_id": self.tip_id,
+            "container_id": self.sandbox.id,
+            "ip_address": self.ip_address,
+            "user_agent": self.user_agent,
+            "created_at": self.created_at,
+            "expires_at": self.expires_at,
+            "commands": self.commands,
+        }
+
+
+# =============================================================================
+# SESSION MANAGER
+# =============================================================================
+
+class TerminalSessionManager:
+    """Create, use and end terminal sessions backed by a warm pool."""
+
+    def __init__(
+        self,
+        backend: Optional[SandboxBackend] = None,
+        settings: Optional[Settings] = None,
+        registry: Optional[SessionRegistry] = None,
+        expiry_interval: float = 5.0
+    ):
+        """Initialize manager with a sandbox backend and optional registry."""
+        self.settings = settings or get_settings()
+        self.backend = backend or create_sandbox_backend(settings=self.settings)
+        self.registry = registry
+        self.pool = WarmPool(self.backend, self.settings)
+        self._sessions: Dict[str, TerminalSession] = {}
+        self._admission_lock = asyncio.Lock()
+        self._reserved = 0
+        self._recording_store = None
+        self.expiry_interval = expiry_interval
+        self._task: Optional[asyncio.Task] = None
+
+    # =============================================================================
+    # SESSION LIFECYCLE
+    # =============================================================================
+
+    def spec_for(self, terminal_setup: Optional[Dict[str, Any]]) -> SandboxSpec:
+        """Get the sandbox spec for a tip's terminal_setup."""
+        return SandboxSpec.from_terminal_setup(
+            terminal_setup, self.settings.terminal_default_image
+        )
+
+    async def create_session(
+        self,
+        tip_id: Optional[str] = None,
+        terminal_setup: Optional[Dict[str, Any]] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> TerminalSession:
+        """
+        Open a terminal session with a prepared sandbox.
+
+        Raises:
+            TerminalCapacityError: If the global or per-client session limit
+                is reached
+        """
+        runtime = get_runtime_settings()
+        session_id = str(uuid.uuid4())
+        now = time.time()
+        expires_at = now + runtime.terminal_timeout * 60
+
+        if self.registry is not None:
+            await self.registry.admit(
+                session_id,
+                expires_at,
+                tip_id=tip_id,
+                ip_address=ip_address,
+                user_agent=user_agent,
+            )
+        else:
+            await self._admit_locally(runtime.terminal_max_sessions)
+
+        try:
+            sandbox = await self.pool.acquire(self.spec_for(terminal_setup))
+        except Exception:
+            if self.registry is not None:
+                await self.registry.release(session_id, ip_address=ip_address)
+            raise
+        finally:
+            if self.registry is None:
+                self._reserved -= 1
+
+        if self.registry is not None:
+            await self.registry.set_container(session_id, sandbox.id)
+
+        session = TerminalSession(
+            id=session_id,
+            tip_id=tip_id,
+            sandbox=sandbox,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            created_at=now,
+            expires_at=expires_at,
+        )
+        self._sessions[session.id] = session
+        return session
+
+    async def _admit_locally(self, max_sessions: int) -> None:
+        """Enforce terminal_max_sessions within this process."""
+        async with self._admission_lock:
+            if len(self._sessions) + self._reserved >= max_sessions:
+                raise TerminalCapacityError(
+                    f"Maximum of {max_sessions} terminal sessions reached"
+                )
+            self._reserved += 1
+
+    def get_session(self, session_id: str) -> TerminalSession:
+        """
+        Get an active session.
+
+        Raises:
+            SessionNotFoundError: If the session does not exist or expired
+        """
+        session = self._sessions.get(session_id)
+        if session is None or session.expired:
+            raise SessionNotFoundError(f"Terminal session not found: {session_id}")
+        return session
+
+    def has_session(self, session_id: str) -> bool:
+        """Check whether this worker owns a session, expired or not."""
+        return session_id in self._sessions
+
+    async def execute(
+        self,
+        session_id: str,
+        command: str,
+        timeout: Optional[float] = None
+    ) -> ExecResult:
+        """Run a command in a session's sandbox."""
+        session = self.get_session(session_id)
+        session.commands += 1
+        return await self.backend.exec(session.sandbox, command, timeout)
+
+    def recorder_for(
+        self,
+        session: TerminalSession,
+        cols: int = 80,
+        rows: int = 24
+    ) -> Optional[SessionRecorder]:
+        """
+        Get the session's recorder when recording is enabled.
+
+        One recording spans the whole session; reattaching after a
+        reconnect continues it and records the new terminal size.
+        """
+        if not self.settings.terminal_recording_enabled:
+            return None
+        if session.recorder is None:
+            if self._recording_store is None:
+                self._recording_store = create_recording_store(self.settings)
+            session.recorder = SessionRecorder(
+                session.id, self._recording_store, cols, rows, self.settings
+            )
+        else:
+            session.recorder.record_resize(cols, rows)
+        return session.recorder
+
+    async def _finish_recording(self, session: TerminalSession) -> None:
+        """Flush the session's recording and store its index."""
+        try:
+            index = await session.recorder.finish()
+            await save_recording_index(session.id, index, self.registry)
+        except Exception as e:
+            logger.error("Saving recording for session %s failed: %s", session.id, e)
+
+    async def end_session(self, session_id: str, status: str = "terminated") -> bool:
+        """End a session and return its sandbox to the pool."""
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        self.pool.release(session.sandbox)
+        if session.recorder is not None:
+            await self._finish_recording(session)
+        if self.registry is not None:
+            await self.registry.release(session_id, status, session.ip_address)
+        return True
+
+    async def expire_sessions(self) -> List[str]:
+        """
+        End every local session past its expiry time.
+
+        With a registry, due sessions are claimed from its expiry set so
+        each one is marked expired exactly once across all workers.
+        """
+        ended = []
+        if self.registry is not None:
+            for data in await self.registry.expire_due():
+                session = self._sessions.pop(data["id"], None)
+                if session is not None:
+                    self.pool.release(session.sandbox)
+                    if session.recorder is not None:
+                        await self._finish_recording(session)
+                    ended.append(session.id)
+
+        expired = [
+            session_id for session_id, session in self._sessions.items()
+            if session.expired
+        ]
+        for session_id in expired:
+            await self.end_session(session_id, "expired")
+        return ended + expired
+
+    # =============================================================================
+    # STARTUP AND SHUTDOWN
+    # =============================================================================
+
+    async def run_expiry(self) -> None:
+        """Expire due sessions every interval until cancelled."""
+        while True:
+            try:
+                await self.expire_sessions()
+            except Exception as e:
+                logger.exception("Terminal session expiry failed: %s", e)
+            await asyncio.sleep(self.expiry_interval)
+
+    async def start(self) -> None:
+        """Warm the default image and start the background loops."""
+        self.pool.pin(self.spec_for(None))
+        await self.pool.maintain()
+        self.pool.start()
+        if self.registry is not None:
+            self.registry.start()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_expiry())
+
+    async def stop(self) -> None:
+        """End all sessions and destroy every sandbox."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for session_id in list(self._sessions):
+            await self.end_session(session_id)
+        await self.pool.stop()
+        if self.registry is not None:
+            await self.registry.stop()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get session counts and pool statistics."""
+        return {
+            "backend": self.backend.name,
+            "active_sessions": len(self._sessions),
+            "max_sessions": get_runtime_settings().terminal_max_sessions,
+            "pool": self.pool.get_stats(),
+        }
+
+
+# =============================================================================
+# GLOBAL SESSION MANAGER
+# =============================================================================
+
+_terminal_manager: Optional[TerminalSessionManager] = None
+
+
+def get_terminal_manager() -> TerminalSessionManager:
+    """Get the process-wide terminal session manager."""
+    global _terminal_manager
+    if _terminal_manager is None:
+        from .registry import get_session_registry
+
+        _terminal_manager = TerminalSessionManager(registry=get_session_registry())
+    return _terminal_manager
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "TerminalSession",
+    "TerminalSessionManager",
+    "get_terminal_manager",
+]
@@ -0,0 +1,287 @@
+"""
+Linux Daily Tips Backend - Warm Sandbox Pool
+
+This module keeps prepared sandboxes ready so a terminal session can be
+handed one without waiting for a container to start. Idle sandboxes are
+grouped by spec key (image plus terminal_setup); handout is a deque pop,
+returned sandboxes are reset in the background and the number kept warm
+per key follows recent demand.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set
+
+from app.config.settings import Settings, get_settings
+
+from .sandbox import Sandbox, SandboxBackend, SandboxSpec
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# DEMAND TRACKING
+# =============================================================================
+
+class DemandEstimator:
+    """Exponentially weighted acquisitions per second for one spec key."""
+
+    __slots__ = ("half_life", "rate", "_updated_at")
+
+    def __init__(self, half_life: float = 300.0):
+        """Initialize estimator with a decay half-life in seconds."""
+        self.half_life = half_life
+        self.rate = 0.0
+        self._updated_at = time.monotonic()
+
+    def _decay(self, now: float) -> None:
+        """Decay the rate for the time elapsed since the last update."""
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self.rate *= 0.5 ** (elapsed / self.half_life)
+            self._updated_at = now
+
+    def record(self) -> None:
+        """Record one acquisition."""
+        now = time.monotonic()
+        self._decay(now)
+        self.rate += math.log(2) / self.half_life
+
+    def current(self) -> float:
+        """Get the decayed acquisition rate."""
+        self._decay(time.monotonic())
+        return self.rate
+
+
+# =============================================================================
+# WARM POOL
+# =============================================================================
+
+class WarmPool:
+    """Per-spec pools of prepared sandboxes sized by demand."""
+
+    def __init__(
+        self,
+        backend: SandboxBackend,
+        settings: Optional[Settings] = None,
+        maintain_interval: float = 5.0
+    ):
+        """Initialize pool over a sandbox backend."""
+        self.backend = backend
+        self.settings = settings or get_settings()
+        self.min_size = self.settings.terminal_warm_pool_min
+        self.max_size = self.settings.terminal_warm_pool_max
+        self.lead_seconds = self.settings.terminal_warm_pool_lead_seconds
+        self.max_reuses = self.settings.terminal_sandbox_max_reuses
+        self.maintain_interval = maintain_interval
+
+        self._idle: Dict[str, Deque[Sandbox]] = {}
+        self._specs: Dict[str, SandboxSpec] = {}
+        self._demand: Dict[str, DemandEstimator] = {}
+        self._creating: Dict[str, int] = {}
+        self._pinned: Set[str] = set()
+        self._background: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"hits": 0, "misses": 0, "created": 0, "recycled": 0, "destroyed": 0}
+
+    # =============================================================================
+    # HANDOUT AND RETURN
+    # =============================================================================
+
+    async def acquire(self, spec: SandboxSpec) -> Sandbox:
+        """
+        Get a prepared sandbox for a spec.
+
+        A warm sandbox is returned immediately when one is idle; otherwise
+        one is created inline and the key starts being kept warm.
+        """
+        key = spec.key
+        self._specs.setdefault(key, spec)
+        self._demand.setdefault(key, DemandEstimator()).record()
+
+        idle = self._idle.get(key)
+        if idle:
+            sandbox = idle.popleft()
+            self._stats["hits"] += 1
+            self._spawn(self._fill(key))
+        else:
+            self._stats["misses"] += 1
+            sandbox = await self._create(spec)
+
+        sandbox.uses += 1
+        return sandbox
+
+    def release(self, sandbox: Sandbox) -> None:
+        """Return a sandbox; it is reset or destroyed in the background."""
+        self._spawn(self._recycle(sandbox))
+
+    async def _recycle(self, sandbox: Sandbox) -> None:
+        """Reset a used sandbox back into the pool, or destroy it."""
+        key = sandbox.spec.key
+        keep = (
+            sandbox.uses < self.max_reuses
+            and len(self._idle.get(key, ())) < self.target_size(key)
+        )
+        if keep:
+            try:
+                keep = await self.backend.reset(sandbox)
+            except Exception as e:
+                logger.error("Sandbox reset failed for %s: %s", sandbox.id, e)
+                keep = False
+
+        if keep:
+            self._idle.setdefault(key, deque()).append(sandbox)
+            self._stats["recycled"] += 1
+        else:
+            await self._destroy(sandbox)
+
+    # =============================================================================
+    # SIZING
+    # =============================================================================
+
+    def target_size(self, key: str) -> int:
+        """Get how many idle sandboxes to keep for a spec key."""
+        demand = self._demand.get(key)
+        expected = demand.current() * self.lead_seconds if demand else 0.0
+        if expected < 0.05 and key not in self._pinned:
+            # Key has gone cold; let its sandboxes drain
+            return 0
+        return max(self.min_size, min(self.max_size, math.ceil(expected)))
+
+    def pin(self, spec: SandboxSpec) -> None:
+        """Always keep at least min_size sandboxes warm for a spec."""
+        self._specs.setdefault(spec.key, spec)
+        self._pinned.add(spec.key)
+
+    async def _fill(self, key: str) -> None:
+        """Create sandboxes until the key reaches its target size."""
+        spec = self._specs[key]
+        idle = self._idle.setdefault(key, deque())
+        missing = self.target_size(key) - len(idle) - self._creating.get(key, 0)
+        if missing <= 0:
+            return
+
+        self._creating[key] = self._creating.get(key, 0) + missing
+        try:
+            results = await asyncio.gather(
+                *(self._create(spec) for _ in range(missing)),
+                return_exceptions=True,
+            )
+        finally:
+            self._creating[key] -= missing
+
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Warm sandbox creation failed: %s", result)
+            else:
+                idle.append(result)
+
+    async def _trim(self, key: str) -> None:
+        """Destroy idle sandboxes above the key's target size."""
+        idle = self._idle.get(key)
+        target = self.target_size(key)
+        surplus = []
+        while idle and len(idle) > target:
+            # Oldest first: they have the most reuses behind them
+            surplus.append(idle.popleft())
+        if surplus:
+            await asyncio.gather(*(self._destroy(sandbox) for sandbox in surplus))
+
+        if not idle and target == 0 and not self._creating.get(key):
+            self._idle.pop(key, None)
+            self._specs.pop(key, None)
+            self._demand.pop(key, None)
+
+    async def maintain(self) -> None:
+        """Bring every known key to its target size."""
+        for key in list(self._specs):
+            await self._fill(key)
+            await self._trim(key)
+
+    # =============================================================================
+    # SANDBOX LIFECYCLE
+    # =============================================================================
+
+    async def _create(self, spec: SandboxSpec) -> Sandbox:
+        """Create a sandbox through the backend."""
+        sandbox = await self.backend.create(spec)
+        self._stats["created"] += 1
+        return sandbox
+
+    async def _destroy(self, sandbox: Sandbox) -> None:
+        """Destroy a sandbox, reporting but not raising errors."""
+        try:
+            await self.backend.destroy(sandbox)
+            self._stats["destroyed"] += 1
+        except Exception as e:
+            logger.error("Sandbox destroy failed for %s: %s", sandbox.id, e)
+
+    def _spawn(self, coro) -> None:
+        """Run a coroutine in the background and keep a reference to it."""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    # =============================================================================
+    # BACKGROUND LOOP
+    # =============================================================================
+
+    async def run(self) -> None:
+        """Maintain pool sizes every interval until cancelled."""
+        while True:
+            try:
+                await self.maintain()
+            except Exception as e:
+                logger.exception("Warm pool maintenance failed: %s", e)
+            await asyncio.sleep(self.maintain_interval)
+
+    def start(self) -> None:
+        """Start pool maintenance on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop maintenance and destroy every idle sandbox."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+        idle = [sandbox for pool in self._idle.values() for sandbox in pool]
+        self._idle.clear()
+        await asyncio.gather(*(self._destroy(sandbox) for sandbox in idle))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool counters and per-key idle/target sizes."""
+        return {
+            **self._stats,
+            "keys": {
+                key: {
+                    "image": self._specs[key].image,
+                    "idle": len(self._idle.get(key, ())),
+                    "target": self.target_size(key),
+                    "creating": self._creating.get(key, 0),
+                }
+                for key in self._specs
+            },
+        }
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "DemandEstimator",
+    "WarmPool",
+]
@@ -0,0 +1,288 @@
+"""
+Linux Daily Tips Backend - Terminal Session Reaper
+
+This module replaces the unscheduled cleanup_expired_terminal_sessions()
+function with a background reaper. Each pass claims a batch of expired
+rows by marking them expired in one short transaction (FOR UPDATE SKIP
+LOCKED, so several workers can reap side by side without waiting on each
+other), then tears their sandboxes down concurrently with no transaction
+or row locks held. It catches what the Redis registry cannot: sessions
+whose worker died and rows left behind if Redis lost its data.
+
+A container is only destroyed when no live worker holds it: warm pool
+containers are recycled, so the container recorded on an expired row may
+already serve another visitor's session.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from app.config.settings import Settings, get_settings
+from app.config.telemetry import Histogram
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# STATEMENTS
+# =============================================================================
+
+# Ordered range scan on idx_terminal_sessions_active_expires_at; rows another
+# worker is already claiming are skipped instead of waited for
+CLAIM_EXPIRED_SQL = """
+UPDATE terminal_sessions
+SET status = 'expired', terminated_at = CURRENT_TIMESTAMP
+WHERE id IN (
+    SELECT id
+    FROM terminal_sessions
+    WHERE status = 'active' AND expires_at < CURRENT_TIMESTAMP
+    ORDER BY expires_at
+    LIMIT :batch_size
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING id::text AS id, container_id
+"""
+
+# Hands a claimed row back: its teardown failed, or the registry shows the
+# session was extended after the row was last written
+RESTORE_ACTIVE_SQL = """
+UPDATE terminal_sessions
+SET status = 'active',
+    terminated_at = NULL,
+    expires_at = COALESCE(CAST(:expires_at AS timestamptz), expires_at)
+WHERE id = CAST(:id AS uuid) AND status = 'expired'
+"""
+
+
+# =============================================================================
+# SESSION REAPER
+# =============================================================================
+
+class SessionReaper:
+    """Batched, concurrent teardown of expired terminal sessions."""
+
+    RATE_WINDOW_SECONDS = 60.0
+
+    def __init__(
+        self,
+        manager=None,
+        settings: Optional[Settings] = None
+    ):
+        """Initialize reaper over a terminal session manager."""
+        self.settings = settings or get_settings()
+        self.manager = manager
+        self.batch_size = self.settings.terminal_reaper_batch_size
+        self.interval = self.settings.terminal_reaper_interval
+        self._semaphore = asyncio.Semaphore(self.settings.terminal_reaper_concurrency)
+        self._task: Optional[asyncio.Task] = None
+
+        self.teardown_latency = Histogram("terminal_teardown_seconds")
+        self._reaped: Deque[Tuple[float, int]] = deque()
+        self._stats = {"passes": 0, "reaped": 0, "teardown_failures": 0, "skipped_owned": 0}
+
+    def _get_manager(self):
+        """Get the session manager, resolving the global one lazily."""
+        if self.manager is None:
+            from .manager import get_terminal_manager
+
+            self.manager = get_terminal_manager()
+        return self.manager
+
+    # =============================================================================
+    # TEARDOWN
+    # =============================================================================
+
+    async def _teardown(self, session_id: str, container_id: Optional[str]) -> bool:
+        """Tear down one session's sandbox under the concurrency limit."""
+        manager = self._get_manager()
+        async with self._semaphore:
+            start = time.perf_counter()
+            try:
+                if manager.has_session(session_id):
+                    # Owned by this worker: the sandbox goes back to the pool
+                    await manager.end_session(session_id, "expired")
+                else:
+                    if container_id:
+                        await self._destroy_unowned(container_id)
+                    if manager.registry is not None:
+                        await manager.registry.release(session_id, "expired")
+            except Exception as e:
+                self._stats["teardown_failures"] += 1
+                logger.error("Teardown of terminal session %s failed: %s", session_id, e)
+                return False
+            finally:
+                self.teardown_latency.observe(time.perf_counter() - start)
+        return True
+
+    async def _destroy_unowned(self, container_id: str) -> None:
+        """Destroy a container unless a live worker's pool still holds it."""
+        manager = self._get_manager()
+        if manager.registry is not None:
+            owner = await manager.registry.live_owner(container_id)
+            if owner is not None:
+                # The owner recycles or destroys it; it may already serve
+                # another session
+                logger.debug(
+                    "Container %s is held by worker %s, not destroying", container_id, owner
+                )
+                self._stats["skipped_owned"] += 1
+                return
+        await manager.backend.destroy_by_id(container_id)
+
+    async def _live_expiry(self, session_id: str) -> Optional[float]:
+        """Get the expiry of a session the registry still holds as live."""
+        registry = self._get_manager().registry
+        if registry is None:
+            return None
+        session = await registry.get(session_id)
+        return session["expires_at"] if session else None
+
+    # =============================================================================
+    # REAPING
+    # =============================================================================
+
+    async def reap_batch(self) -> int:
+        """
+        Claim and tear down one batch of expired sessions.
+
+        The claim marks the rows expired and commits before any teardown,
+        so no row locks or transaction are held while sandboxes are
+        destroyed. Sessions the registry shows as extended are handed back
+        with their new expiry; sessions whose teardown failed are handed
+        back as they were and retried on a later pass.
+
+        Returns:
+            The number of sessions reaped
+        """
+        from sqlalchemy import text
+
+        from app.config.database import transaction
+
+        async with transaction() as session:
+            result = await session.execute(
+                text(CLAIM_EXPIRED_SQL), {"batch_size": self.batch_size}
+            )
+            rows = result.all()
+        if not rows:
+            return 0
+
+        live = await asyncio.gather(*(self._live_expiry(row.id) for row in rows))
+        restore = [
+            {"id": row.id, "expires_at": datetime.fromtimestamp(expires_at, timezone.utc)}
+            for row, expires_at in zip(rows, live) if expires_at is not None
+        ]
+        due = [row for row, expires_at in zip(rows, live) if expires_at is None]
+
+        outcomes = await asyncio.gather(
+            *(self._teardown(row.id, row.container_id) for row in due)
+        )
+        restore += [
+            {"id": row.id, "expires_at": None}
+            for row, ok in zip(due, outcomes) if not ok
+        ]
+        if restore:
+            async with transaction() as session:
+                await session.execute(text(RESTORE_ACTIVE_SQL), restore)
+
+        reaped = sum(outcomes)
+        self._record(reaped)
+        return reaped
+
+    async def reap(self) -> int:
+        """Reap batches until the backlog is drained or teardowns fail."""
+        total = 0
+        while True:
+            reaped = await self.reap_batch()
+            total += reaped
+            if reaped < self.batch_size:
+                break
+        self._stats["passes"] += 1
+        return total
+
+    # =============================================================================
+    # METRICS
+    # =============================================================================
+
+    def _record(self, count: int) -> None:
+        """Record reaped sessions for the rate window."""
+        now = time.monotonic()
+        self._stats["reaped"] += count
+        self._reaped.append((now, count))
+        while self._reaped and now - self._reaped[0][0] > self.RATE_WINDOW_SECONDS:
+            self._reaped.popleft()
+
+    @property
+    def reaped_per_second(self) -> float:
+        """Get sessions reaped per second over the rate window."""
+        now = time.monotonic()
+        recent = sum(
+            count for at, count in self._reaped
+            if now - at <= self.RATE_WINDOW_SECONDS
+        )
+        return recent / self.RATE_WINDOW_SECONDS
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get reap counters, rate and teardown latency distribution."""
+        return {
+            **self._stats,
+            "reaped_per_second": round(self.reaped_per_second, 3),
+            "teardown_latency": self.teardown_latency.snapshot(),
+        }
+
+    # =============================================================================
+    # BACKGROUND LOOP
+    # =============================================================================
+
+    async def run(self) -> None:
+        """Reap every interval until cancelled."""
+        while True:
+            try:
+                await self.reap()
+            except Exception as e:
+                logger.exception("Terminal session reaper failed: %s", e)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the reaper on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the reaper."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# =============================================================================
+# GLOBAL SESSION REAPER
+# =============================================================================
+
+_session_reaper: Optional[SessionReaper] = None
+
+
+def get_session_reaper() -> SessionReaper:
+    """Get the process-wide terminal session reaper."""
+    global _session_reaper
+    if _session_reaper is None:
+        _session_reaper = SessionReaper()
+    return _session_reaper
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "SessionReaper",
+    "get_session_reaper",
+]
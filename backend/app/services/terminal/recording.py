@@ -0,0 +1,498 @@
+"""
+Linux Daily Tips Backend - Terminal Recording and Replay
+
+This module records terminal sessions for admin review in the asciicast
+v3 format: a JSON header line followed by one [interval, code, data]
+event per line, where interval is the time since the previous event.
+Events are grouped into append-only chunks stored on local disk or in a
+Redis stream; only a small chunk index is kept in
+terminal_sessions.session_data. Replay streams the recording chunk by
+chunk instead of loading it whole. Recordings are kept for
+terminal_recording_retention_days in either store.
+"""
+
+import asyncio
+import codecs
+import gzip
+import json
+import logging
+import os
+import shutil
+import time
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.config.settings import Settings, get_settings
+
+
+RECORDING_FORMAT = "asciicast-v3"
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CHUNK STORES
+# =============================================================================
+
+class RecordingStore(ABC):
+    """Append-only storage for recording chunks."""
+
+    name = "base"
+
+    @abstractmethod
+    async def write_chunk(self, session_id: str, seq: int, data: str) -> None:
+        """Store one chunk of newline-terminated event lines."""
+
+    @abstractmethod
+    async def read_chunk(self, session_id: str, seq: int) -> Optional[str]:
+        """Read one chunk, or None if it does not exist."""
+
+    @abstractmethod
+    async def list_chunks(self, session_id: str) -> List[int]:
+        """Get the stored chunk sequence numbers in order."""
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None:
+        """Delete a whole recording."""
+
+
+class DiskRecordingStore(RecordingStore):
+    """One gzip file per chunk under a per-session directory."""
+
+    name = "disk"
+
+    PRUNE_INTERVAL_SECONDS = 3600
+
+    def __init__(self, root: str, retention_seconds: int = 0):
+        """Initialize store rooted at a directory (0 retention keeps all)."""
+        self.root = root
+        self.retention_seconds = retention_seconds
+        self._next_prune = 0.0
+
+    def _path(self, session_id: str, seq: int) -> str:
+        """Get the file path of a chunk."""
+        return os.path.join(self.root, session_id, f"{seq:06d}.ndjson.gz")
+
+    async def write_chunk(self, session_id: str, seq: int, data: str) -> None:
+        """Compress and write a chunk file."""
+        def write() -> None:
+            path = self._path(session_id, seq)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so readers never see a partial chunk
+            with open(f"{path}.tmp", "wb") as f:
+                f.write(gzip.compress(data.encode(), compresslevel=6))
+            os.replace(f"{path}.tmp", path)
+
+        await asyncio.to_thread(write)
+        # New recordings are the natural point to drop expired ones
+        if seq == 0 and self.retention_seconds and time.monotonic() >= self._next_prune:
+            self._next_prune = time.monotonic() + self.PRUNE_INTERVAL_SECONDS
+            try:
+                await self.prune()
+            except OSError as e:
+                logger.error("Recording retention pruning failed: %s", e)
+
+    async def read_chunk(self, session_id: str, seq: int) -> Optional[str]:
+        """Read and decompress a chunk file."""
+        def read() -> Optional[str]:
+            try:
+                with open(self._path(session_id, seq), "rb") as f:
+                    return gzip.decompress(f.read()).decode()
+            except FileNotFoundError:
+                return None
+
+        return await asyncio.to_thread(read)
+
+    async def list_chunks(self, session_id: str) -> List[int]:
+        """List chunk files of a session."""
+        try:
+            names = await asyncio.to_thread(os.listdir, os.path.join(self.root, session_id))
+        except FileNotFoundError:
+            return []
+        return sorted(int(name.split(".")[0]) for name in names if name.endswith(".gz"))
+
+    async def delete(self, session_id: str) -> None:
+        """Remove the session's chunk directory."""
+        await asyncio.to_thread(
+            shutil.rmtree, os.path.join(self.root, session_id), True
+        )
+
+    async def prune(self) -> int:
+        """
+        Delete recordings not written to within the retention period.
+
+        Returns:
+            Number of recordings deleted
+        """
+        cutoff = time.time() - self.retention_seconds
+
+        def prune() -> int:
+            deleted = 0
+            try:
+                entries = list(os.scandir(self.root))
+            except FileNotFoundError:
+                return 0
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False) and entry.stat().st_mtime < cutoff:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                    deleted += 1
+            return deleted
+
+        deleted = await asyncio.to_thread(prune)
+        if deleted:
+            logger.info("Deleted %d recordings older than the retention period", deleted)
+        return deleted
+
+
+class RedisRecordingStore(RecordingStore):
+    """
+    One Redis stream entry per chunk, expiring after the retention period.
+
+    Chunk seq is stored as entry id "<seq + 1>-0", so a chunk is read by id
+    and a failed write leaves a gap instead of shifting later chunks.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, key_prefix: str, retention_seconds: int):
+        """Initialize store over a RedisClient."""
+        self.client = client
+        self.key_prefix = key_prefix
+        self.retention_seconds = retention_seconds
+
+    def _key(self, session_id: str) -> str:
+        """Get the stream key of a recording."""
+        return f"{self.key_prefix}recording:{session_id}"
+
+    @staticmethod
+    def _entry_id(seq: int) -> str:
+        """Get the stream entry id of a chunk (0-0 is not a valid id)."""
+        return f"{seq + 1}-0"
+
+    @staticmethod
+    def _seq(entry_id: str) -> int:
+        """Get the chunk seq of a stream entry id."""
+        return int(entry_id.split("-")[0]) - 1
+
+    async def write_chunk(self, session_id: str, seq: int, data: str) -> None:
+        """Append a chunk entry to the session's stream."""
+        redis = self.client.redis
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.xadd(
+                self._key(session_id), {"seq": seq, "data": data}, id=self._entry_id(seq)
+            )
+            pipe.expire(self._key(session_id), self.retention_seconds)
+            await pipe.execute()
+
+    async def read_chunk(self, session_id: str, seq: int) -> Optional[str]:
+        """Read a chunk entry by id."""
+        entry_id = self._entry_id(seq)
+        entries = await self.client.redis.xrange(
+            self._key(session_id), min=entry_id, max=entry_id
+        )
+        return entries[0][1]["data"] if entries else None
+
+    async def list_chunks(self, session_id: str) -> List[int]:
+        """List chunk numbers from the stream entry ids."""
+        return [seq async for seq, _ in self._entries(session_id)]
+
+    async def delete(self, session_id: str) -> None:
+        """Delete the session's stream."""
+        await self.client.redis.delete(self._key(session_id))
+
+    async def _entries(self, session_id: str, batch: int = 8) -> AsyncIterator[Tuple[int, str]]:
+        """Read (seq, data) entries in seq order a few at a time."""
+        start = "-"
+        while True:
+            entries = await self.client.redis.xrange(
+                self._key(session_id), min=start, count=batch
+            )
+            for entry_id, fields in entries:
+                yield self._seq(entry_id), fields["data"]
+            if len(entries) < batch:
+                return
+            start = f"({entries[-1][0]}"
+
+    async def iter_chunks(
+        self,
+        session_id: str,
+        sequence: Optional[List[int]] = None,
+        batch: int = 8
+    ) -> AsyncIterator[str]:
+        """Read chunks in seq order, only those in sequence when given."""
+        wanted = set(sequence) if sequence is not None else None
+        async for seq, data in self._entries(session_id, batch):
+            if wanted is None or seq in wanted:
+                yield data
+
+
+def create_recording_store(settings: Optional[Settings] = None) -> RecordingStore:
+    """Create the configured recording store."""
+    settings = settings or get_settings()
+    if settings.terminal_recording_store == "redis":
+        from app.config.redis import get_redis_client
+
+        return RedisRecordingStore(
+            get_redis_client(),
+            settings.terminal_registry_key_prefix,
+            settings.terminal_recording_retention_days * 86400,
+        )
+    return DiskRecordingStore(
+        settings.terminal_recording_dir,
+        settings.terminal_recording_retention_days * 86400,
+    )
+
+
+# =============================================================================
+# RECORDER
+# =============================================================================
+
+class SessionRecorder:
+    """Buffer session events into chunks and hand sealed chunks to a store."""
+
+    def __init__(
+        self,
+        session_id: str,
+        store: RecordingStore,
+        cols: int = 80,
+        rows: int = 24,
+        settings: Optional[Settings] = None
+    ):
+        """Initialize recorder and write the header into the first chunk."""
+        settings = settings or get_settings()
+        self.session_id = session_id
+        self.store = store
+        self.chunk_bytes = settings.terminal_recording_chunk_bytes
+        self.chunk_seconds = settings.terminal_recording_chunk_seconds
+        self.started_at = time.time()
+        self.cols = cols
+        self.rows = rows
+
+        self._last_event = time.monotonic()
+        self._elapsed = 0.0
+        self._lines: List[str] = []
+        self._size = 0
+        self._chunk_started = self._last_event
+        self._chunk_offset = 0.0
+        self._chunk_events = 0
+        self._chunks: List[Dict[str, Any]] = []
+        self._writes: List[asyncio.Task] = []
+        self._decoders = {
+            code: codecs.getincrementaldecoder("utf-8")(errors="replace")
+            for code in ("o", "i")
+        }
+        self.events = 0
+
+        self._append(json.dumps({
+            "version": 3,
+            "term": {"cols": cols, "rows": rows},
+            "timestamp": int(self.started_at),
+        }))
+
+    # =============================================================================
+    # EVENTS
+    # =============================================================================
+
+    def record_output(self, data: bytes) -> None:
+        """Record terminal output."""
+        self._event("o", self._decoders["o"].decode(data))
+
+    def record_input(self, data: bytes) -> None:
+        """Record keyboard input."""
+        self._event("i", self._decoders["i"].decode(data))
+
+    def record_resize(self, cols: int, rows: int) -> None:
+        """Record a terminal resize."""
+        self._event("r", f"{cols}x{rows}")
+
+    def _event(self, code: str, data: str) -> None:
+        """Append one event with the interval since the previous one."""
+        if not data:
+            return
+        now = time.monotonic()
+        interval = now - self._last_event
+        self._last_event = now
+        self._elapsed += interval
+        self._append(json.dumps([round(interval, 6), code, data], ensure_ascii=False))
+        self._chunk_events += 1
+        self.events += 1
+
+        if (
+            self._size >= self.chunk_bytes
+            or now - self._chunk_started >= self.chunk_seconds
+        ):
+            self._seal()
+
+    def _append(self, line: str) -> None:
+        """Add a line to the open chunk."""
+        self._lines.append(line)
+        self._size += len(line) + 1
+
+    # =============================================================================
+    # CHUNKS
+    # =============================================================================
+
+    def _seal(self) -> None:
+        """Close the open chunk and write it in the background."""
+        if not self._lines:
+            return
+        seq = len(self._chunks)
+        data = "\n".join(self._lines) + "\n"
+        self._chunks.append({
+            "seq": seq,
+            "offset": round(self._chunk_offset, 3),
+            "duration": round(self._elapsed - self._chunk_offset, 3),
+            "events": self._chunk_events,
+            "bytes": len(data),
+        })
+        previous = self._writes[-1] if self._writes else None
+        self._writes = [task for task in self._writes if not task.done()]
+        self._writes.append(asyncio.create_task(self._write(previous, seq, data)))
+        self._lines = []
+        self._size = 0
+        self._chunk_started = time.monotonic()
+        self._chunk_offset = self._elapsed
+        self._chunk_events = 0
+
+    async def _write(self, previous: Optional[asyncio.Task], seq: int, data: str) -> None:
+        """Write a chunk once the previous chunk's write has finished."""
+        # Chunks reach the store in seq order, whatever each write's latency
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        await self.store.write_chunk(self.session_id, seq, data)
+
+    async def finish(self) -> Dict[str, Any]:
+        """
+        Seal the last chunk, wait for all writes and build the index.
+
+        Returns:
+            The index to store under session_data["recording"]
+        """
+        self._seal()
+        results = await asyncio.gather(*self._writes, return_exceptions=True)
+        failed = [result for result in results if isinstance(result, Exception)]
+        if failed:
+            logger.error("Recording %s: %s chunk writes failed", self.session_id, len(failed))
+        return {
+            "format": RECORDING_FORMAT,
+            "store": self.store.name,
+            "started_at": self.started_at,
+            "cols": self.cols,
+            "rows": self.rows,
+            "duration": round(self._elapsed, 3),
+            "events": self.events,
+            "complete": not failed,
+            "chunks": self._chunks,
+        }
+
+
+# =============================================================================
+# REPLAY
+# =============================================================================
+
+async def stream_recording(
+    session_id: str,
+    index: Optional[Dict[str, Any]] = None,
+    store: Optional[RecordingStore] = None
+) -> AsyncIterator[str]:
+    """
+    Yield a recording as asciicast text, one chunk at a time.
+
+    Suitable as the body of a StreamingResponse. Without an index, the
+    chunks found in the store are used.
+    """
+    store = store or create_recording_store()
+    sequence = [chunk["seq"] for chunk in index["chunks"]] if index is not None else None
+    if isinstance(store, RedisRecordingStore):
+        async for chunk in store.iter_chunks(session_id, sequence):
+            yield chunk
+        return
+
+    if sequence is None:
+        sequence = await store.list_chunks(session_id)
+    for seq in sequence:
+        chunk = await store.read_chunk(session_id, seq)
+        if chunk is None:
+            # A chunk write failed; skip the gap rather than ending replay
+            continue
+        yield chunk
+
+
+async def replay_events(
+    session_id: str,
+    index: Optional[Dict[str, Any]] = None,
+    store: Optional[RecordingStore] = None,
+    speed: float = 1.0,
+    max_idle: float = 2.0
+) -> AsyncIterator[List[Any]]:
+    """
+    Yield [interval, code, data] events paced in real time.
+
+    Idle gaps are capped at max_idle seconds; speed scales playback.
+    """
+    header_seen = False
+    async for chunk in stream_recording(session_id, index, store):
+        for line in chunk.splitlines():
+            if not header_seen:
+                header_seen = True
+                continue
+            event = json.loads(line)
+            delay = min(event[0], max_idle) / speed
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield event
+
+
+# =============================================================================
+# SESSION INDEX
+# =============================================================================
+
+SET_RECORDING_INDEX_SQL = """
+UPDATE terminal_sessions
+SET session_data = jsonb_set(session_data, '{recording}', CAST(:index AS jsonb))
+WHERE id = CAST(:id AS uuid)
+"""
+
+
+async def save_recording_index(
+    session_id: str,
+    index: Dict[str, Any],
+    registry=None
+) -> None:
+    """
+    Store a recording index in terminal_sessions.session_data.
+
+    With a session registry the update rides the write-behind queue, so it
+    is applied after the row's own insert.
+    """
+    if registry is not None:
+        await registry.set_session_data(session_id, "recording", index)
+        return
+
+    from sqlalchemy import text
+
+    from app.config.database import transaction
+
+    async with transaction() as session:
+        await session.execute(
+            text(SET_RECORDING_INDEX_SQL),
+            {"id": session_id, "index": json.dumps(index)},
+        )
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "RECORDING_FORMAT",
+    "RecordingStore",
+    "DiskRecordingStore",
+    "RedisRecordingStore",
+    "create_recording_store",
+    "SessionRecorder",
+    "stream_recording",
+    "replay_events",
+    "save_recording_index",
+]
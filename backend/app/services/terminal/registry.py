@@ -0,0 +1,703 @@
+"""
+Linux Daily Tips Backend - Terminal Session Registry
+
+This module keeps live terminal sessions in Redis so admission checks and
+per-message session lookups never query PostgreSQL. Each session is a
+hash; a sorted set ordered by expires_at drives expiry, and a per-IP
+sorted set enforces the per-client limit. Admission runs as one Lua
+script, so concurrent workers cannot overshoot terminal_max_sessions.
+
+terminal_sessions is kept as the durable record through a write-behind
+queue: every change is appended to a Redis list and flushed to the table
+in batches by one worker at a time, so records reach the table in the
+order they were queued. Batches that fail because PostgreSQL is
+unavailable are retried indefinitely; records that keep failing for any
+other reason are moved to a dead-letter list so they cannot stall the
+queue.
+
+Each container handed to a session is recorded with the worker whose
+pool holds it, and workers refresh a heartbeat key, so a reaper on
+another worker can tell a container that is still in use (possibly
+recycled to a different session) from one left behind by a dead worker.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import Settings, get_settings, get_runtime_settings
+
+from .exceptions import TerminalCapacityError
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# LUA SCRIPTS
+# =============================================================================
+
+# KEYS: expiry zset, ip zset, session hash, write-behind list
+# ARGV: now, max sessions, max per ip, session id, expires_at, key ttl,
+#       write-behind record, hash field/value pairs...
+ADMIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+
+local active = redis.call('ZCOUNT', KEYS[1], '(' .. now, '+inf')
+if active >= tonumber(ARGV[2]) then
+    return -1
+end
+local max_per_ip = tonumber(ARGV[3])
+if max_per_ip > 0 and redis.call('ZCARD', KEYS[2]) >= max_per_ip then
+    return -2
+end
+
+redis.call('ZADD', KEYS[1], ARGV[5], ARGV[4])
+redis.call('ZADD', KEYS[2], ARGV[5], ARGV[4])
+redis.call('EXPIRE', KEYS[2], ARGV[6])
+redis.call('HSET', KEYS[3], unpack(ARGV, 8))
+redis.call('EXPIRE', KEYS[3], ARGV[6])
+redis.call('RPUSH', KEYS[4], ARGV[7])
+return active + 1
+"""
+
+# KEYS: expiry zset, ip zset, session hash, write-behind list
+# ARGV: session id, write-behind record
+RELEASE_SCRIPT = """
+if redis.call('ZREM', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('DEL', KEYS[3])
+redis.call('RPUSH', KEYS[4], ARGV[2])
+return 1
+"""
+
+# KEYS: expiry zset
+# ARGV: now, limit
+CLAIM_EXPIRED_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #ids > 0 then
+    redis.call('ZREM', KEYS[1], unpack(ids))
+end
+return ids
+"""
+
+# KEYS: expiry zset, ip zset, session hash, write-behind list
+# ARGV: session id, new expires_at, key ttl, write-behind record
+EXTEND_SCRIPT = """
+if not redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+redis.call('HSET', KEYS[3], 'expires_at', ARGV[2])
+redis.call('EXPIRE', KEYS[3], ARGV[3])
+redis.call('RPUSH', KEYS[4], ARGV[4])
+return 1
+"""
+
+# Release a lock only if this holder still owns it
+# KEYS: lock key
+# ARGV: token
+UNLOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Claim a batch of queued write-behind records
+# KEYS: write-behind list
+# ARGV: batch size
+DRAIN_SCRIPT = """
+local records = redis.call('LRANGE', KEYS[1], 0, ARGV[1] - 1)
+if #records > 0 then
+    redis.call('LTRIM', KEYS[1], #records, -1)
+end
+return records
+"""
+
+
+# =============================================================================
+# WRITE-BEHIND STATEMENTS
+# =============================================================================
+
+UPSERT_SESSIONS_SQL = """
+INSERT INTO terminal_sessions
+    (id, tip_id, container_id, status, ip_address, user_agent, created_at, expires_at)
+VALUES
+    (CAST(:id AS uuid), CAST(:tip_id AS uuid), :container_id, 'active',
+     CAST(:ip_address AS inet), :user_agent, :created_at, :expires_at)
+ON CONFLICT (id) DO UPDATE SET
+    container_id = EXCLUDED.container_id,
+    expires_at = EXCLUDED.expires_at
+"""
+
+SET_CONTAINER_SQL = """
+UPDATE terminal_sessions
+SET container_id = :container_id
+WHERE id = CAST(:id AS uuid)
+"""
+
+EXTEND_SESSIONS_SQL = """
+UPDATE terminal_sessions
+SET expires_at = :expires_at
+WHERE id = CAST(:id AS uuid) AND status = 'active'
+"""
+
+SET_SESSION_DATA_SQL = """
+UPDATE terminal_sessions
+SET session_data = session_data || jsonb_build_object(
+    CAST(:key AS text), CAST(:value AS jsonb)
+)
+WHERE id = CAST(:id AS uuid)
+"""
+
+END_SESSIONS_SQL = """
+UPDATE terminal_sessions
+SET status = CAST(:status AS terminal_status), terminated_at = :terminated_at
+WHERE id = CAST(:id AS uuid) AND status = 'active'
+"""
+
+
+def _is_transient(error: Exception) -> bool:
+    """Check whether a write failed because the database is unavailable."""
+    from sqlalchemy import exc
+
+    if isinstance(error, (ConnectionError, OSError, asyncio.TimeoutError, exc.TimeoutError)):
+        return True
+    if isinstance(error, exc.DBAPIError):
+        return error.connection_invalidated or isinstance(
+            error, (exc.OperationalError, exc.InterfaceError)
+        )
+    return False
+
+
+# =============================================================================
+# SESSION REGISTRY
+# =============================================================================
+
+class SessionRegistry:
+    """Redis-resident registry of live terminal sessions."""
+
+    # Hashes outlive their expiry a little so the expirer can still read
+    # them; anything left behind after a crash disappears on its own
+    KEY_GRACE_SECONDS = 300
+
+    # A worker whose heartbeat is this old is considered dead
+    WORKER_TTL_SECONDS = 60
+
+    # Longer than a batch write can take under statement_timeout
+    FLUSH_LOCK_SECONDS = 120
+
+    def __init__(self, client, settings: Optional[Settings] = None):
+        """Initialize registry over a RedisClient."""
+        self.client = client
+        self.settings = settings or get_settings()
+        prefix = self.settings.terminal_registry_key_prefix
+        self.prefix = prefix
+        self.expiry_key = f"{prefix}expiry"
+        self.write_behind_key = f"{prefix}write_behind"
+        self.dead_letter_key = f"{prefix}write_behind:dead"
+        self.flush_lock_key = f"{prefix}write_behind:lock"
+        self.batch_size = self.settings.terminal_write_behind_batch_size
+        self.flush_interval = self.settings.terminal_write_behind_interval
+        self.max_attempts = self.settings.terminal_write_behind_max_attempts
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        redis = client.redis
+        self._admit = redis.register_script(ADMIT_SCRIPT)
+        self._release = redis.register_script(RELEASE_SCRIPT)
+        self._claim_expired = redis.register_script(CLAIM_EXPIRED_SCRIPT)
+        self._extend = redis.register_script(EXTEND_SCRIPT)
+        self._drain = redis.register_script(DRAIN_SCRIPT)
+        self._unlock = redis.register_script(UNLOCK_SCRIPT)
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {
+            "flushed": 0, "flush_batches": 0, "flush_failures": 0, "dead_lettered": 0,
+        }
+
+    def session_key(self, session_id: str) -> str:
+        """Get the hash key for a session."""
+        return f"{self.prefix}session:{session_id}"
+
+    def ip_key(self, ip_address: Optional[str]) -> str:
+        """Get the per-IP sorted set key."""
+        return f"{self.prefix}ip:{ip_address or 'unknown'}"
+
+    def container_key(self, container_id: str) -> str:
+        """Get the key holding the worker that owns a container."""
+        return f"{self.prefix}container:{container_id}"
+
+    def worker_key(self, worker_id: str) -> str:
+        """Get a worker's heartbeat key."""
+        return f"{self.prefix}worker:{worker_id}"
+
+    # =============================================================================
+    # ADMISSION AND RELEASE
+    # =============================================================================
+
+    async def admit(
+        self,
+        session_id: str,
+        expires_at: float,
+        tip_id: Optional[str] = None,
+        container_id: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> int:
+        """
+        Atomically check the limits and register a session.
+
+        Returns:
+            The number of live sessions including the new one
+
+        Raises:
+            TerminalCapacityError: If the global or per-IP limit is reached
+        """
+        now = time.time()
+        fields = {
+            "id": session_id,
+            "tip_id": tip_id or "",
+            "container_id": container_id or "",
+            "ip_address": ip_address or "",
+            "user_agent": user_agent or "",
+            "created_at": now,
+            "expires_at": expires_at,
+        }
+        record = json.dumps({"op": "create", **fields})
+        key_ttl = int(expires_at - now) + self.KEY_GRACE_SECONDS
+        max_sessions = get_runtime_settings().terminal_max_sessions
+        max_per_ip = self.settings.terminal_max_sessions_per_ip
+
+        result = await self._admit(
+            keys=[
+                self.expiry_key,
+                self.ip_key(ip_address),
+                self.session_key(session_id),
+                self.write_behind_key,
+            ],
+            args=[
+                now, max_sessions, max_per_ip, session_id, expires_at, key_ttl,
+                record, *[item for pair in fields.items() for item in pair],
+            ],
+        )
+        if result == -1:
+            raise TerminalCapacityError(
+                f"Maximum of {max_sessions} terminal sessions reached", "global"
+            )
+        if result == -2:
+            raise TerminalCapacityError(
+                f"Maximum of {max_per_ip} terminal sessions per client reached", "ip"
+            )
+        return int(result)
+
+    async def release(
+        self,
+        session_id: str,
+        status: str = "terminated",
+        ip_address: Optional[str] = None
+    ) -> bool:
+        """
+        Remove a session and record how it ended.
+
+        Returns:
+            False if the session was already released or expired elsewhere
+        """
+        if ip_address is None:
+            ip_address = await self.client.redis.hget(
+                self.session_key(session_id), "ip_address"
+            )
+        record = json.dumps({
+            "op": "end", "id": session_id, "status": status, "at": time.time(),
+        })
+        result = await self._release(
+            keys=[
+                self.expiry_key,
+                self.ip_key(ip_address),
+                self.session_key(session_id),
+                self.write_behind_key,
+            ],
+            args=[session_id, record],
+        )
+        return bool(result)
+
+    async def set_container(self, session_id: str, container_id: str) -> None:
+        """Record the sandbox a session was given, and this worker as its owner."""
+        redis = self.client.redis
+        ttl = await redis.ttl(self.session_key(session_id))
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self.session_key(session_id), "container_id", container_id)
+            pipe.set(
+                self.container_key(container_id), self.worker_id,
+                ex=ttl if ttl > 0 else self.KEY_GRACE_SECONDS,
+            )
+            pipe.rpush(self.write_behind_key, json.dumps({
+                "op": "container", "id": session_id, "container_id": container_id,
+            }))
+            await pipe.execute()
+
+    async def set_session_data(self, session_id: str, key: str, value: Any) -> None:
+        """Queue a session_data key update for the session's row."""
+        await self.client.redis.rpush(self.write_behind_key, json.dumps({
+            "op": "data", "id": session_id, "key": key, "value": value,
+        }))
+
+    async def extend(self, session_id: str, expires_at: float) -> bool:
+        """Move a live session's expiry time."""
+        session = await self.get(session_id)
+        if session is None:
+            return False
+        record = json.dumps({"op": "extend", "id": session_id, "expires_at": expires_at})
+        result = await self._extend(
+            keys=[
+                self.expiry_key,
+                self.ip_key(session["ip_address"]),
+                self.session_key(session_id),
+                self.write_behind_key,
+            ],
+            args=[
+                session_id, expires_at,
+                int(expires_at - time.time()) + self.KEY_GRACE_SECONDS, record,
+            ],
+        )
+        if result and session.get("container_id"):
+            await self.client.redis.expire(
+                self.container_key(session["container_id"]),
+                int(expires_at - time.time()) + self.KEY_GRACE_SECONDS,
+            )
+        return bool(result)
+
+    # =============================================================================
+    # LOOKUP
+    # =============================================================================
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get a live session, or None if it is unknown or expired."""
+        data = await self.client.redis.hgetall(self.session_key(session_id))
+        if not data or float(data["expires_at"]) <= time.time():
+            return None
+        return self._decode(data)
+
+    async def count_active(self) -> int:
+        """Get the number of live sessions."""
+        return await self.client.redis.zcount(
+            self.expiry_key, f"({time.time()}", "+inf"
+        )
+
+    async def live_owner(self, container_id: str) -> Optional[str]:
+        """
+        Get the live worker holding a container, or None.
+
+        None means no worker that is still heartbeating recorded the
+        container, so nothing will use it again.
+        """
+        redis = self.client.redis
+        worker_id = await redis.get(self.container_key(container_id))
+        if worker_id and await redis.exists(self.worker_key(worker_id)):
+            return worker_id
+        return None
+
+    @staticmethod
+    def _decode(data: Dict[str, str]) -> Dict[str, Any]:
+        """Convert a session hash back to typed values."""
+        session = {key: (value or None) for key, value in data.items()}
+        session["created_at"] = float(data["created_at"])
+        session["expires_at"] = float(data["expires_at"])
+        return session
+
+    # =============================================================================
+    # EXPIRY
+    # =============================================================================
+
+    async def expire_due(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Claim sessions whose expires_at has passed and mark them expired.
+
+        The claim removes the ids from the expiry set in one script, so
+        each expired session is returned to exactly one caller.
+        """
+        session_ids = await self._claim_expired(
+            keys=[self.expiry_key], args=[time.time(), limit]
+        )
+        if not session_ids:
+            return []
+
+        redis = self.client.redis
+        async with redis.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.hgetall(self.session_key(session_id))
+            hashes = await pipe.execute()
+
+        now = time.time()
+        expired = []
+        async with redis.pipeline(transaction=True) as pipe:
+            for session_id, data in zip(session_ids, hashes):
+                if data:
+                    expired.append(self._decode(data))
+                    pipe.zrem(self.ip_key(data.get("ip_address")), session_id)
+                    pipe.delete(self.session_key(session_id))
+                pipe.rpush(self.write_behind_key, json.dumps({
+                    "op": "end", "id": session_id, "status": "expired", "at": now,
+                }))
+            await pipe.execute()
+        return expired
+
+    # =============================================================================
+    # WRITE-BEHIND
+    # =============================================================================
+
+    async def flush(self) -> int:
+        """
+        Write one batch of queued changes to terminal_sessions.
+
+        Only the worker holding the flush lock drains the queue, from the
+        drain until a failed batch is back in the queue; otherwise a later
+        batch (say, a session's end) could commit before an earlier one
+        (its create) and be lost. Returns 0 while another worker flushes.
+
+        Records are collapsed per session and applied by kind: creates,
+        then container, expiry and session_data updates, then endings.
+
+        A batch that fails because the database is unreachable is put back
+        at the head of the queue unchanged. Any other failure counts as an
+        attempt on each record; once a batch reaches max_attempts its
+        records are written one at a time and those that still fail go to
+        the dead-letter list.
+        """
+        redis = self.client.redis
+        token = uuid.uuid4().hex
+        if not await redis.set(self.flush_lock_key, token, ex=self.FLUSH_LOCK_SECONDS, nx=True):
+            return 0
+        try:
+            return await self._flush_batch()
+        finally:
+            await self._unlock(keys=[self.flush_lock_key], args=[token])
+
+    async def _flush_batch(self) -> int:
+        """Drain and write one batch; the caller holds the flush lock."""
+        records = await self._drain(
+            keys=[self.write_behind_key], args=[self.batch_size]
+        )
+        if not records:
+            return 0
+
+        decoded = [json.loads(record) for record in records]
+        try:
+            await self._write_batch(decoded)
+        except Exception as e:
+            self._stats["flush_failures"] += 1
+            if _is_transient(e):
+                await self.client.redis.lpush(self.write_behind_key, *reversed(records))
+                raise
+
+            attempts = max(record.get("attempts", 0) for record in decoded) + 1
+            if attempts < self.max_attempts:
+                for record in decoded:
+                    record["attempts"] = attempts
+                await self.client.redis.lpush(
+                    self.write_behind_key,
+                    *reversed([json.dumps(record) for record in decoded]),
+                )
+                raise
+            logger.error(
+                "Write-behind batch failed %d times, isolating failing records: %s",
+                attempts, e,
+            )
+            await self._write_individually(decoded)
+
+        self._stats["flushed"] += len(records)
+        self._stats["flush_batches"] += 1
+        return len(records)
+
+    async def _write_individually(self, records: List[Dict[str, Any]]) -> None:
+        """Write records one by one, dead-lettering the ones that fail."""
+        dead = []
+        for position, record in enumerate(records):
+            try:
+                await self._write_batch([record])
+            except Exception as e:
+                if _is_transient(e):
+                    # Lost the database midway: keep the rest for later
+                    remaining = records[position:]
+                    await self.client.redis.lpush(
+                        self.write_behind_key,
+                        *reversed([json.dumps(item) for item in remaining]),
+                    )
+                    break
+                dead.append(json.dumps({**record, "error": f"{type(e).__name__}: {e}"}))
+        if dead:
+            await self.client.redis.rpush(self.dead_letter_key, *dead)
+            self._stats["dead_lettered"] += len(dead)
+            logger.error(
+                "Moved %d terminal session records to %s", len(dead), self.dead_letter_key
+            )
+
+    async def _write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Apply a batch of write-behind records in one transaction."""
+        from sqlalchemy import text
+
+        from app.config.database import transaction
+
+        def timestamp(value: Any) -> datetime:
+            return datetime.fromtimestamp(float(value), tz=timezone.utc)
+
+        creates: Dict[str, Dict[str, Any]] = {}
+        containers: Dict[str, Dict[str, Any]] = {}
+        extends: Dict[str, Dict[str, Any]] = {}
+        data: Dict[tuple, Dict[str, Any]] = {}
+        ends: Dict[str, Dict[str, Any]] = {}
+        for record in records:
+            op = record["op"]
+            if op == "create":
+                creates[record["id"]] = {
+                    "id": record["id"],
+                    "tip_id": record["tip_id"] or None,
+                    "container_id": record["container_id"] or None,
+                    "ip_address": record["ip_address"] or None,
+                    "user_agent": record["user_agent"] or None,
+                    "created_at": timestamp(record["created_at"]),
+                    "expires_at": timestamp(record["expires_at"]),
+                }
+            elif op == "container":
+                if record["id"] in creates:
+                    creates[record["id"]]["container_id"] = record["container_id"]
+                else:
+                    containers[record["id"]] = {
+                        "id": record["id"], "container_id": record["container_id"],
+                    }
+            elif op == "extend":
+                expires_at = timestamp(record["expires_at"])
+                if record["id"] in creates:
+                    creates[record["id"]]["expires_at"] = expires_at
+                else:
+                    extends[record["id"]] = {"id": record["id"], "expires_at": expires_at}
+            elif op == "data":
+                data[(record["id"], record["key"])] = {
+                    "id": record["id"],
+                    "key": record["key"],
+                    "value": json.dumps(record["value"]),
+                }
+            elif op == "end":
+                ends[record["id"]] = {
+                    "id": record["id"],
+                    "status": record["status"],
+                    "terminated_at": timestamp(record["at"]),
+                }
+
+        async with transaction() as session:
+            if creates:
+                await session.execute(text(UPSERT_SESSIONS_SQL), list(creates.values()))
+            if containers:
+                await session.execute(
+                    text(SET_CONTAINER_SQL), list(containers.values())
+                )
+            if extends:
+                await session.execute(text(EXTEND_SESSIONS_SQL), list(extends.values()))
+            if data:
+                await session.execute(text(SET_SESSION_DATA_SQL), list(data.values()))
+            if ends:
+                await session.execute(text(END_SESSIONS_SQL), list(ends.values()))
+
+    async def pending(self) -> int:
+        """Get the number of queued write-behind records."""
+        return await self.client.redis.llen(self.write_behind_key)
+
+    async def dead_lettered(self) -> int:
+        """Get the number of records moved to the dead-letter list."""
+        return await self.client.redis.llen(self.dead_letter_key)
+
+    # =============================================================================
+    # BACKGROUND LOOP
+    # =============================================================================
+
+    async def heartbeat(self) -> None:
+        """Mark this worker alive."""
+        await self.client.redis.set(
+            self.worker_key(self.worker_id), time.time(), ex=self.WORKER_TTL_SECONDS
+        )
+
+    async def run(self) -> None:
+        """Heartbeat and flush the write-behind queue until cancelled."""
+        while True:
+            try:
+                # Keep draining while full batches are waiting
+                while True:
+                    await self.heartbeat()
+                    if await self.flush() < self.batch_size:
+                        break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("Terminal session write-behind failed: %s", e)
+            await asyncio.sleep(self.flush_interval)
+
+    def start(self) -> None:
+        """Start the write-behind flusher on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the flusher after writing out what is queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        try:
+            while await self.flush():
+                pass
+        except Exception as e:
+            logger.error("Final terminal session write-behind failed: %s", e)
+        try:
+            await self.client.redis.delete(self.worker_key(self.worker_id))
+        except Exception as e:
+            logger.warning("Could not clear terminal worker heartbeat: %s", e)
+
+    async def get_status(self) -> Dict[str, Any]:
+        """Get live session count and write-behind counters."""
+        return {
+            "active_sessions": await self.count_active(),
+            "pending_writes": await self.pending(),
+            "dead_letters": await self.dead_lettered(),
+            **self._stats,
+        }
+
+
+# =============================================================================
+# GLOBAL SESSION REGISTRY
+# =============================================================================
+
+_session_registry: Optional[SessionRegistry] = None
+
+
+def get_session_registry() -> SessionRegistry:
+    """Get the process-wide terminal session registry."""
+    global _session_registry
+    if _session_registry is None:
+        from app.config.redis import get_redis_client
+
+        _session_registry = SessionRegistry(get_redis_client())
+    return _session_registry
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "SessionRegistry",
+    "get_session_registry",
+]
@@ -0,0 +1,426 @@
+"""
+Linux Daily Tips Backend - Terminal WebSocket Relay
+
+This module relays bytes between a sandbox shell running under a local
+PTY and the browser's xterm.js WebSocket. PTY output is coalesced into
+frames by time and size instead of being sent one frame per read, the
+per-session buffer is bounded, and PTY reads are paused while a slow
+client drains it, so a command like `yes` cannot grow memory or flood
+the browser. Output throughput is capped in proportion to
+terminal_max_cpu.
+"""
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import pty
+import signal
+import struct
+import termios
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+from app.config.settings import Settings, get_settings, get_runtime_settings
+
+from .sandbox import PtyCommand
+
+
+logger = logging.getLogger(__name__)
+
+# Resize requests are clamped to this many columns and rows
+MAX_TERMINAL_SIZE = 1000
+
+
+def _parse_resize(control: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    """
+    Get (cols, rows) from a client resize message, clamped to
+    1..MAX_TERMINAL_SIZE, or None if either value is not an integer.
+    """
+    size = []
+    for key in ("cols", "rows"):
+        value = control.get(key)
+        # bool is an int subclass; strings and floats are not accepted
+        if not isinstance(value, int) or isinstance(value, bool):
+            return None
+        size.append(min(max(value, 1), MAX_TERMINAL_SIZE))
+    return size[0], size[1]
+
+
+# =============================================================================
+# PTY PROCESS
+# =============================================================================
+
+class PtyProcess:
+    """A child process attached to a pseudo-terminal, read without threads."""
+
+    READ_SIZE = 65536
+
+    def __init__(self, process: asyncio.subprocess.Process, master_fd: int):
+        """Initialize with a started process and the PTY master descriptor."""
+        self.process = process
+        self.master_fd = master_fd
+        self._loop = asyncio.get_running_loop()
+        self._on_output = None
+        self._reading = False
+        self.closed = False
+
+    @classmethod
+    async def spawn(
+        cls,
+        command: PtyCommand,
+        cols: int = 80,
+        rows: int = 24
+    ) -> "PtyProcess":
+        """Start a command under a new PTY."""
+        master_fd, slave_fd = pty.openpty()
+        try:
+            cls._set_size(slave_fd, cols, rows)
+            process = await asyncio.create_subprocess_exec(
+                *command.argv,
+                stdin=slave_fd,
+                stdout=slave_fd,
+                stderr=slave_fd,
+                cwd=command.cwd,
+                env=command.env,
+                start_new_session=True,
+            )
+        except Exception:
+            os.close(master_fd)
+            raise
+        finally:
+            os.close(slave_fd)
+
+        os.set_blocking(master_fd, False)
+        return cls(process, master_fd)
+
+    @staticmethod
+    def _set_size(fd: int, cols: int, rows: int) -> None:
+        """Set the terminal window size on a PTY descriptor."""
+        fcntl.ioctl(fd, termios.TIOCSWINSZ, struct.pack("HHHH", rows, cols, 0, 0))
+
+    def resize(self, cols: int, rows: int) -> None:
+        """Resize the terminal; the shell receives SIGWINCH."""
+        if not self.closed:
+            self._set_size(self.master_fd, cols, rows)
+
+    # =============================================================================
+    # READING
+    # =============================================================================
+
+    def start_reading(self, on_output) -> None:
+        """Deliver output chunks to on_output(bytes); b"" signals EOF."""
+        self._on_output = on_output
+        self.resume_reading()
+
+    def pause_reading(self) -> None:
+        """Stop reading; the PTY buffer fills and the child blocks on write."""
+        if self._reading:
+            self._loop.remove_reader(self.master_fd)
+            self._reading = False
+
+    def resume_reading(self) -> None:
+        """Resume reading output."""
+        if not self._reading and not self.closed and self._on_output is not None:
+            self._loop.add_reader(self.master_fd, self._read_ready)
+            self._reading = True
+
+    def _read_ready(self) -> None:
+        """Read whatever the PTY has available."""
+        try:
+            data = os.read(self.master_fd, self.READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError:
+            # EIO once the child side of the PTY has closed
+            data = b""
+        if not data:
+            self.pause_reading()
+        self._on_output(data)
+
+    # =============================================================================
+    # WRITING AND SHUTDOWN
+    # =============================================================================
+
+    async def write(self, data: bytes) -> None:
+        """Write input to the PTY, waiting while its buffer is full."""
+        view = memoryview(data)
+        while view and not self.closed:
+            try:
+                written = os.write(self.master_fd, view)
+                view = view[written:]
+            except BlockingIOError:
+                await asyncio.sleep(0.005)
+
+    async def close(self) -> None:
+        """Terminate the process group and release the PTY."""
+        if self.closed:
+            return
+        self.pause_reading()
+        self.closed = True
+        if self.process.returncode is None:
+            try:
+                os.killpg(self.process.pid, signal.SIGHUP)
+            except ProcessLookupError:
+                pass
+            try:
+                await asyncio.wait_for(self.process.wait(), 2)
+            except asyncio.TimeoutError:
+                os.killpg(self.process.pid, signal.SIGKILL)
+                await self.process.wait()
+        os.close(self.master_fd)
+
+
+# =============================================================================
+# RATE LIMITING
+# =============================================================================
+
+class ByteRateLimiter:
+    """Token bucket over bytes per second."""
+
+    __slots__ = ("rate", "burst", "_tokens", "_updated_at")
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """Initialize limiter; burst defaults to a quarter second of rate."""
+        self.rate = rate
+        self.burst = burst or rate / 4
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+
+    async def consume(self, amount: int) -> None:
+        """Wait until amount bytes may be sent."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        self._tokens -= amount
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+# =============================================================================
+# TERMINAL RELAY
+# =============================================================================
+
+class TerminalRelay:
+    """Coalescing, backpressured relay between a PTY and a WebSocket."""
+
+    def __init__(
+        self,
+        pty_process: PtyProcess,
+        websocket,
+        settings: Optional[Settings] = None,
+        flush_interval_ms: Optional[float] = None,
+        frame_bytes: Optional[int] = None,
+        buffer_bytes: Optional[int] = None,
+        max_bytes_per_second: Optional[float] = None,
+        compress: Optional[bool] = None,
+        recorder=None
+    ):
+        """
+        Initialize relay over a PTY and a FastAPI-compatible WebSocket.
+
+        Unset limits come from settings. max_bytes_per_second=0 disables
+        the output rate cap. An optional SessionRecorder receives output
+        frames, input and resizes.
+        """
+        settings = settings or get_settings()
+        self.pty = pty_process
+        self.websocket = websocket
+        self.flush_interval = (
+            flush_interval_ms if flush_interval_ms is not None
+            else settings.terminal_relay_flush_interval_ms
+        ) / 1000
+        self.frame_bytes = frame_bytes or settings.terminal_relay_frame_bytes
+        self.high_water = buffer_bytes or settings.terminal_relay_buffer_bytes
+        self.low_water = self.high_water // 2
+        if max_bytes_per_second is None:
+            max_bytes_per_second = settings.terminal_relay_bytes_per_cpu * float(
+                get_runtime_settings().terminal_max_cpu
+            )
+        self.limiter = (
+            ByteRateLimiter(max_bytes_per_second) if max_bytes_per_second else None
+        )
+        compress = settings.terminal_relay_compress if compress is None else compress
+        # Raw deflate with sync flushes, sharing one window across frames
+        # (the same framing permessage-deflate uses with context takeover)
+        self._compressor = zlib.compressobj(wbits=-15) if compress else None
+
+        self.recorder = recorder
+        self._buffer = bytearray()
+        self._data_ready = asyncio.Event()
+        self._eof = False
+        self.stats = {
+            "frames": 0,
+            "bytes_out": 0,
+            "wire_bytes_out": 0,
+            "bytes_in": 0,
+            "reads": 0,
+            "pauses": 0,
+        }
+
+    # =============================================================================
+    # PTY OUTPUT
+    # =============================================================================
+
+    def _on_output(self, data: bytes) -> None:
+        """Buffer PTY output and pause reads above the high-water mark."""
+        if not data:
+            self._eof = True
+        else:
+            self.stats["reads"] += 1
+            self._buffer += data
+            if len(self._buffer) >= self.high_water:
+                self.pty.pause_reading()
+                self.stats["pauses"] += 1
+        self._data_ready.set()
+
+    async def _pump_output(self) -> None:
+        """Send buffered output as coalesced frames until the PTY closes."""
+        loop = asyncio.get_running_loop()
+        while self._buffer or not self._eof:
+            if not self._buffer:
+                self._data_ready.clear()
+                await self._data_ready.wait()
+                continue
+
+            # Hold a partial frame for up to flush_interval so bursts of
+            # small reads leave as one frame
+            deadline = loop.time() + self.flush_interval
+            while len(self._buffer) < self.frame_bytes and not self._eof:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                self._data_ready.clear()
+                try:
+                    await asyncio.wait_for(self._data_ready.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            frame = bytes(self._buffer[:self.frame_bytes])
+            del self._buffer[:self.frame_bytes]
+            if self.limiter is not None:
+                await self.limiter.consume(len(frame))
+            await self._send(frame)
+            if len(self._buffer) <= self.low_water:
+                self.pty.resume_reading()
+
+    async def _send(self, frame: bytes) -> None:
+        """Send one output frame, compressing it when enabled."""
+        self.stats["frames"] += 1
+        self.stats["bytes_out"] += len(frame)
+        if self.recorder is not None:
+            self.recorder.record_output(frame)
+        if self._compressor is not None:
+            frame = (
+                self._compressor.compress(frame)
+                + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            )
+        self.stats["wire_bytes_out"] += len(frame)
+        await self.websocket.send_bytes(frame)
+
+    # =============================================================================
+    # CLIENT INPUT
+    # =============================================================================
+
+    async def _pump_input(self) -> None:
+        """Forward keystrokes and apply resize messages until disconnect."""
+        while True:
+            message = await self.websocket.receive()
+            if message.get("type") == "websocket.disconnect":
+                return
+            if message.get("bytes") is not None:
+                await self._write_input(message["bytes"])
+            elif message.get("text") is not None:
+                await self._handle_control(message["text"])
+
+    async def _handle_control(self, text: str) -> None:
+        """Handle a JSON control message, or treat text as input."""
+        try:
+            control = json.loads(text)
+        except ValueError:
+            control = None
+        if isinstance(control, dict) and control.get("type") == "resize":
+            size = _parse_resize(control)
+            if size is None:
+                logger.debug("Ignoring malformed resize message: %.200s", text)
+                return
+            cols, rows = size
+            self.pty.resize(cols, rows)
+            if self.recorder is not None:
+                self.recorder.record_resize(cols, rows)
+            return
+        await self._write_input(text.encode())
+
+    async def _write_input(self, data: bytes) -> None:
+        """Forward input to the PTY."""
+        self.stats["bytes_in"] += len(data)
+        if self.recorder is not None:
+            self.recorder.record_input(data)
+        await self.pty.write(data)
+
+    # =============================================================================
+    # RUNNING
+    # =============================================================================
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Relay until the shell exits or the client disconnects.
+
+        Returns:
+            Relay statistics for the session
+        """
+        self.pty.start_reading(self._on_output)
+        output = asyncio.create_task(self._pump_output())
+        tasks = [output]
+        if hasattr(self.websocket, "receive"):
+            tasks.append(asyncio.create_task(self._pump_input()))
+
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.pty.pause_reading()
+        return dict(self.stats)
+
+
+async def relay_session(
+    websocket,
+    session_id: str,
+    cols: int = 80,
+    rows: int = 24,
+    manager=None
+) -> Dict[str, Any]:
+    """
+    Attach a WebSocket to a terminal session's shell.
+
+    Intended to be awaited from a FastAPI WebSocket endpoint after
+    websocket.accept().
+    """
+    from .manager import get_terminal_manager
+
+    manager = manager or get_terminal_manager()
+    session = manager.get_session(session_id)
+    pty_process = await PtyProcess.spawn(
+        manager.backend.pty_command(session.sandbox), cols, rows
+    )
+    recorder = manager.recorder_for(session, cols, rows)
+    try:
+        return await TerminalRelay(pty_process, websocket, recorder=recorder).run()
+    finally:
+        await pty_process.close()
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "PtyProcess",
+    "ByteRateLimiter",
+    "TerminalRelay",
+    "relay_session",
+]
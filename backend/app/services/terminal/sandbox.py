@@ -0,0 +1,543 @@
+"""
+Linux Daily Tips Backend - Terminal Sandbox Backends
+
+This module defines the pluggable sandbox backends behind the terminal
+emulator. A sandbox is an isolated shell environment prepared from a
+tip's terminal_setup (directories and files). The Docker backend is used
+in deployments; the subprocess and fake backends need no Docker daemon
+and are meant for development and tests.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import resource
+import shutil
+import tempfile
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import Settings, get_settings
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# SANDBOX MODELS
+# =============================================================================
+
+@dataclass(frozen=True)
+class SandboxSpec:
+    """Image and filesystem setup a sandbox is prepared from."""
+
+    image: str
+    directories: tuple = ()
+    files: tuple = ()  # (path, content) pairs
+
+    @classmethod
+    def from_terminal_setup(
+        cls,
+        terminal_setup: Optional[Dict[str, Any]],
+        default_image: str
+    ) -> "SandboxSpec":
+        """Build a spec from a tips.terminal_setup JSONB value."""
+        setup = terminal_setup or {}
+        return cls(
+            image=setup.get("image", default_image),
+            directories=tuple(setup.get("directories", [])),
+            files=tuple(
+                (entry["path"], entry.get("content", ""))
+                for entry in setup.get("files", [])
+            ),
+        )
+
+    @property
+    def key(self) -> str:
+        """Stable key identifying interchangeable sandboxes."""
+        canonical = json.dumps(
+            [self.image, self.directories, self.files], separators=(",", ":")
+        )
+        return hashlib.sha1(canonical.encode()).hexdigest()[:16]
+
+
+@dataclass
+class Sandbox:
+    """A prepared sandbox owned by a backend."""
+
+    id: str
+    spec: SandboxSpec
+    handle: Any = None
+    created_at: float = field(default_factory=time.time)
+    uses: int = 0
+
+
+@dataclass
+class ExecResult:
+    """Outcome of running one command in a sandbox."""
+
+    exit_code: int
+    output: str
+    timed_out: bool = False
+    duration_ms: float = 0.0
+
+
+@dataclass
+class PtyCommand:
+    """Command line that attaches an interactive shell to a sandbox."""
+
+    argv: List[str]
+    cwd: Optional[str] = None
+    env: Optional[Dict[str, str]] = None
+
+
+# =============================================================================
+# BACKEND INTERFACE
+# =============================================================================
+
+class SandboxBackend(ABC):
+    """Create, prepare, reset and destroy sandboxes."""
+
+    name = "base"
+
+    def __init__(self, settings: Optional[Settings] = None):
+        """Initialize backend with settings."""
+        self.settings = settings or get_settings()
+
+    @abstractmethod
+    async def create(self, spec: SandboxSpec) -> Sandbox:
+        """Create a sandbox and apply the spec's setup."""
+
+    @abstractmethod
+    async def reset(self, sandbox: Sandbox) -> bool:
+        """Restore a used sandbox to its freshly prepared state."""
+
+    @abstractmethod
+    async def destroy(self, sandbox: Sandbox) -> None:
+        """Release all resources held by a sandbox."""
+
+    @abstractmethod
+    async def exec(
+        self,
+        sandbox: Sandbox,
+        command: str,
+        timeout: Optional[float] = None
+    ) -> ExecResult:
+        """Run a shell command inside a sandbox."""
+
+    @abstractmethod
+    def pty_command(self, sandbox: Sandbox) -> PtyCommand:
+        """Get the command to run under a local PTY for an interactive shell."""
+
+    @abstractmethod
+    async def destroy_by_id(self, sandbox_id: str) -> None:
+        """Destroy a sandbox known only by its id, e.g. one left by another worker."""
+
+    def new_sandbox_id(self) -> str:
+        """Get a unique sandbox identifier."""
+        return f"{self.settings.terminal_container_prefix}{uuid.uuid4().hex[:12]}"
+
+
+# =============================================================================
+# FAKE BACKEND
+# =============================================================================
+
+class FakeSandboxBackend(SandboxBackend):
+    """In-memory backend that echoes commands; for tests."""
+
+    name = "fake"
+
+    def __init__(self, settings: Optional[Settings] = None, create_delay: float = 0.0):
+        """Initialize fake backend with an optional simulated create cost."""
+        super().__init__(settings)
+        self.create_delay = create_delay
+        self.created = 0
+        self.destroyed = 0
+        self.resets = 0
+        self.commands: List[str] = []
+
+    async def create(self, spec: SandboxSpec) -> Sandbox:
+        """Create an in-memory sandbox."""
+        if self.create_delay:
+            await asyncio.sleep(self.create_delay)
+        self.created += 1
+        files = dict(spec.files)
+        return Sandbox(id=self.new_sandbox_id(), spec=spec, handle=files)
+
+    async def reset(self, sandbox: Sandbox) -> bool:
+        """Restore the spec's files."""
+        self.resets += 1
+        sandbox.handle = dict(sandbox.spec.files)
+        return True
+
+    async def destroy(self, sandbox: Sandbox) -> None:
+        """Forget the sandbox."""
+        self.destroyed += 1
+        sandbox.handle = None
+
+    async def exec(
+        self,
+        sandbox: Sandbox,
+        command: str,
+        timeout: Optional[float] = None
+    ) -> ExecResult:
+        """Record the command and echo it back."""
+        self.commands.append(command)
+        return ExecResult(exit_code=0, output=f"{command}\n")
+
+    def pty_command(self, sandbox: Sandbox) -> PtyCommand:
+        """Echo input back through the PTY."""
+        return PtyCommand(argv=["cat"])
+
+    async def destroy_by_id(self, sandbox_id: str) -> None:
+        """Count the teardown."""
+        self.destroyed += 1
+
+
+# =============================================================================
+# SUBPROCESS BACKEND
+# =============================================================================
+
+def parse_memory_limit(value: str) -> int:
+    """Convert a Docker-style memory limit ("512m", "1g") to bytes."""
+    units = {"k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+    value = value.strip().lower()
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+class SubprocessSandboxBackend(SandboxBackend):
+    """
+    Per-sandbox working directory with resource-limited shell processes.
+
+    Commands run as the server user with rlimits only; this is not an
+    isolation boundary and must not be exposed to untrusted users.
+    """
+
+    name = "subprocess"
+
+    def __init__(self, settings: Optional[Settings] = None, root: Optional[str] = None):
+        """Initialize backend rooted at a temporary directory."""
+        super().__init__(settings)
+        self.root = root or tempfile.mkdtemp(prefix="linuxtips-sandboxes-")
+
+    def _path(self, sandbox_dir: str, path: str) -> str:
+        """Map an absolute sandbox path into the sandbox directory."""
+        resolved = os.path.normpath(os.path.join(sandbox_dir, path.lstrip("/")))
+        # A plain prefix test would accept a sibling such as <sandbox_dir>X
+        if os.path.commonpath([resolved, sandbox_dir]) != os.path.normpath(sandbox_dir):
+            raise ValueError(f"Path escapes sandbox: {path}")
+        return resolved
+
+    def _apply_setup(self, sandbox_dir: str, spec: SandboxSpec) -> None:
+        """Materialize the spec's directories and files."""
+        os.makedirs(os.path.join(sandbox_dir, "home", "user"), exist_ok=True)
+        for directory in spec.directories:
+            os.makedirs(self._path(sandbox_dir, directory), exist_ok=True)
+        for path, content in spec.files:
+            target = self._path(sandbox_dir, path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "w", encoding="utf-8") as f:
+                f.write(content)
+
+    async def create(self, spec: SandboxSpec) -> Sandbox:
+        """Create and prepare a sandbox directory."""
+        sandbox_id = self.new_sandbox_id()
+        sandbox_dir = os.path.join(self.root, sandbox_id)
+        await asyncio.to_thread(self._apply_setup, sandbox_dir, spec)
+        return Sandbox(id=sandbox_id, spec=spec, handle=sandbox_dir)
+
+    async def reset(self, sandbox: Sandbox) -> bool:
+        """Recreate the sandbox directory from the spec."""
+        def rebuild() -> None:
+            shutil.rmtree(sandbox.handle, ignore_errors=True)
+            self._apply_setup(sandbox.handle, sandbox.spec)
+
+        try:
+            await asyncio.to_thread(rebuild)
+            return True
+        except OSError as e:
+            logger.error("Sandbox reset failed for %s: %s", sandbox.id, e)
+            return False
+
+    async def destroy(self, sandbox: Sandbox) -> None:
+        """Remove the sandbox directory."""
+        if sandbox.handle:
+            await asyncio.to_thread(shutil.rmtree, sandbox.handle, True)
+
+    async def destroy_by_id(self, sandbox_id: str) -> None:
+        """Remove the sandbox directory by id."""
+        sandbox_dir = os.path.join(self.root, os.path.basename(sandbox_id))
+        await asyncio.to_thread(shutil.rmtree, sandbox_dir, True)
+
+    def _limit_resources(self) -> None:
+        """Apply memory and CPU-time limits in the child process."""
+        memory = parse_memory_limit(self.settings.terminal_max_memory)
+        resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+        cpu_seconds = max(1, self.settings.terminal_command_timeout)
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+
+    async def exec(
+        self,
+        sandbox: Sandbox,
+        command: str,
+        timeout: Optional[float] = None
+    ) -> ExecResult:
+        """Run a command with the sandbox home as working directory."""
+        timeout = timeout or self.settings.terminal_command_timeout
+        home = os.path.join(sandbox.handle, "home", "user")
+        start = time.perf_counter()
+        process = await asyncio.create_subprocess_shell(
+            command,
+            cwd=home,
+            env={"HOME": home, "PATH": os.environ.get("PATH", "/usr/bin:/bin")},
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            preexec_fn=self._limit_resources,
+        )
+        try:
+            output, _ = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            output, _ = await process.communicate()
+            return ExecResult(
+                exit_code=-1,
+                output=output.decode(errors="replace"),
+                timed_out=True,
+                duration_ms=(time.perf_counter() - start) * 1000,
+            )
+        return ExecResult(
+            exit_code=process.returncode,
+            output=output.decode(errors="replace"),
+            duration_ms=(time.perf_counter() - start) * 1000,
+        )
+
+    def pty_command(self, sandbox: Sandbox) -> PtyCommand:
+        """Start a bash shell in the sandbox home."""
+        home = os.path.join(sandbox.handle, "home", "user")
+        return PtyCommand(
+            argv=["bash", "--noprofile", "--norc", "-i"],
+            cwd=home,
+            env={
+                "HOME": home,
+                "PATH": os.environ.get("PATH", "/usr/bin:/bin"),
+                "TERM": "xterm-256color",
+            },
+        )
+
+
+# =============================================================================
+# DOCKER BACKEND
+# =============================================================================
+
+# Kills every process except PID 1 (the container's "sleep infinity") and
+# this shell, then wipes the writable locations. Uses only /proc and shell
+# builtins, since sandbox images need not ship procps. Processes killed
+# after being orphaned stay as zombies of PID 1, which never reaps them, so
+# any process left after the passes (zombie or not) fails the reset and
+# the container is destroyed instead of recycled.
+DOCKER_RESET_SCRIPT = """
+set -eu
+survivors=0
+for pass in 1 2 3 4 5; do
+    survivors=0
+    for dir in /proc/[0-9]*; do
+        pid=${dir#/proc/}
+        if [ "$pid" = 1 ] || [ "$pid" = "$$" ]; then
+            continue
+        fi
+        # The process may exit between the glob and the read
+        read -r stat 2>/dev/null < "$dir/stat" || continue
+        survivors=$((survivors + 1))
+        rest=${stat##*) }
+        if [ "${rest%% *}" != Z ]; then
+            kill -9 "$pid" 2>/dev/null || true
+        fi
+    done
+    if [ "$survivors" = 0 ]; then
+        break
+    fi
+done
+if [ "$survivors" != 0 ]; then
+    echo "$survivors processes left after reset" >&2
+    exit 3
+fi
+rm -rf -- "$1"
+mkdir -p -- "$1"
+find /tmp /var/tmp /dev/shm -mindepth 1 -delete
+"""
+
+
+class DockerSandboxBackend(SandboxBackend):
+    """Sandboxes as long-running Docker containers driven by the docker CLI."""
+
+    name = "docker"
+    home = "/home/user"
+
+    async def _docker(
+        self,
+        *args: str,
+        stdin: Optional[bytes] = None,
+        timeout: Optional[float] = None
+    ) -> ExecResult:
+        """Run a docker CLI command against the configured daemon."""
+        start = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            "docker", *args,
+            stdin=asyncio.subprocess.PIPE if stdin is not None else None,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            env={**os.environ, "DOCKER_HOST": self.settings.docker_host},
+        )
+        try:
+            output, _ = await asyncio.wait_for(process.communicate(stdin), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            output, _ = await process.communicate()
+            return ExecResult(-1, output.decode(errors="replace"), timed_out=True)
+        return ExecResult(
+            exit_code=process.returncode,
+            output=output.decode(errors="replace"),
+            duration_ms=(time.perf_counter() - start) * 1000,
+        )
+
+    async def _apply_setup(self, sandbox: Sandbox) -> bool:
+        """Create the spec's directories and files inside the container."""
+        directories = [self.home, *sandbox.spec.directories]
+        result = await self._docker(
+            "exec", sandbox.handle, "mkdir", "-p", *directories
+        )
+        if result.exit_code != 0:
+            return False
+        for path, content in sandbox.spec.files:
+            result = await self._docker(
+                "exec", "-i", sandbox.handle, "sh", "-c",
+                'mkdir -p "$(dirname "$1")" && cat > "$1"', "sh", path,
+                stdin=content.encode(),
+            )
+            if result.exit_code != 0:
+                return False
+        return True
+
+    async def create(self, spec: SandboxSpec) -> Sandbox:
+        """Start a resource-limited, network-less container."""
+        settings = self.settings
+        sandbox_id = self.new_sandbox_id()
+        result = await self._docker(
+            "run", "-d",
+            "--name", sandbox_id,
+            "--memory", settings.terminal_max_memory,
+            "--cpus", settings.terminal_max_cpu,
+            "--network", "none",
+            "--pids-limit", "128",
+            "--workdir", self.home,
+            spec.image, "sleep", "infinity",
+        )
+        if result.exit_code != 0:
+            raise RuntimeError(f"Failed to start sandbox: {result.output.strip()}")
+
+        sandbox = Sandbox(id=sandbox_id, spec=spec, handle=sandbox_id)
+        if not await self._apply_setup(sandbox):
+            await self.destroy(sandbox)
+            raise RuntimeError(f"Failed to prepare sandbox {sandbox_id}")
+        return sandbox
+
+    async def reset(self, sandbox: Sandbox) -> bool:
+        """
+        Kill leftover processes, wipe the workspace and reapply setup.
+
+        Returns False, so the pool destroys the container, if any process
+        survives or any step fails.
+        """
+        result = await self._docker(
+            "exec", sandbox.handle, "sh", "-c", DOCKER_RESET_SCRIPT, "sh", self.home,
+        )
+        if result.exit_code != 0:
+            logger.warning(
+                "Sandbox %s failed to reset, destroying it: %s",
+                sandbox.id, result.output.strip(),
+            )
+            return False
+        return await self._apply_setup(sandbox)
+
+    async def destroy(self, sandbox: Sandbox) -> None:
+        """Force-remove the container."""
+        await self.destroy_by_id(sandbox.handle)
+
+    async def destroy_by_id(self, sandbox_id: str) -> None:
+        """Force-remove a container by name."""
+        result = await self._docker("rm", "-f", sandbox_id)
+        if result.exit_code != 0 and "No such container" not in result.output:
+            raise RuntimeError(f"Failed to remove {sandbox_id}: {result.output.strip()}")
+
+    async def exec(
+        self,
+        sandbox: Sandbox,
+        command: str,
+        timeout: Optional[float] = None
+    ) -> ExecResult:
+        """Run a command in the container's home directory."""
+        timeout = timeout or self.settings.terminal_command_timeout
+        # timeout(1) inside the container also stops the command itself
+        return await self._docker(
+            "exec", "-w", self.home, sandbox.handle,
+            "timeout", str(timeout), "sh", "-c", command,
+            timeout=timeout + 5,
+        )
+
+    def pty_command(self, sandbox: Sandbox) -> PtyCommand:
+        """Attach an interactive bash shell with docker exec -it."""
+        return PtyCommand(
+            argv=[
+                "docker", "exec", "-it", "-w", self.home,
+                "-e", "TERM=xterm-256color",
+                sandbox.handle, "bash", "-l",
+            ],
+            env={**os.environ, "DOCKER_HOST": self.settings.docker_host},
+        )
+
+
+# =============================================================================
+# BACKEND FACTORY
+# =============================================================================
+
+SANDBOX_BACKENDS = {
+    "docker": DockerSandboxBackend,
+    "subprocess": SubprocessSandboxBackend,
+    "fake": FakeSandboxBackend,
+}
+
+
+def create_sandbox_backend(
+    name: Optional[str] = None,
+    settings: Optional[Settings] = None
+) -> SandboxBackend:
+    """Create the configured sandbox backend."""
+    settings = settings or get_settings()
+    backend_class = SANDBOX_BACKENDS[name or settings.terminal_sandbox_backend]
+    return backend_class(settings)
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "SandboxSpec",
+    "Sandbox",
+    "ExecResult",
+    "PtyCommand",
+    "SandboxBackend",
+    "FakeSandboxBackend",
+    "SubprocessSandboxBackend",
+    "DockerSandboxBackend",
+    "SANDBOX_BACKENDS",
+    "parse_memory_limit",
+    "create_sandbox_backend",
+]
@@ -0,0 +1,53 @@
+"""
+Linux Daily Tips Backend - Tip Services
+
+This package provides draft week approval, tip change notifications,
+the precomputed publish calendar, category and difficulty facets and
+bulk import/export.
+"""
+
+from .events import register_tips_listener, notify_tips_changed
+from .approval import (
+    DAILY_TIP_CACHE_KEY,
+    ApprovalResult,
+    approve_weeks,
+    approve_week,
+    prewarm_daily_tips
+)
+from .calendar import PublishCalendar, get_publish_calendar, utc_today
+from .facets import FacetPage, TipFacets, get_tip_facets
+from .transfer import (
+    TransferProgress,
+    import_tips,
+    export_tips,
+    export_tips_to_file
+)
+
+__all__ = [
+    # Events
+    "register_tips_listener",
+    "notify_tips_changed",
+
+    # Approval
+    "DAILY_TIP_CACHE_KEY",
+    "ApprovalResult",
+    "approve_weeks",
+    "approve_week",
+    "prewarm_daily_tips",
+
+    # Calendar
+    "PublishCalendar",
+    "get_publish_calendar",
+    "utc_today",
+
+    # Facets
+    "FacetPage",
+    "TipFacets",
+    "get_tip_facets",
+
+    # Bulk transfer
+    "TransferProgress",
+    "import_tips",
+    "export_tips",
+    "export_tips_to_file",
+]
@@ -0,0 +1,204 @@
+"""
+Linux Daily Tips Backend - Draft Week Approval
+
+This module approves draft_weeks in one statement: a data-modifying CTE
+marks the weeks approved, copies their draft_tips into tips with
+publish_date = week_start_date + day_of_week - 1, and returns the new
+rows, so approving any number of weeks costs one round trip. After the
+transaction commits, the newly scheduled days are written to the daily
+tip cache and tip change listeners are notified.
+"""
+
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from .events import notify_tips_changed
+
+
+# =============================================================================
+# STATEMENTS
+# =============================================================================
+
+APPROVE_WEEKS_SQL = """
+WITH approved AS (
+    UPDATE draft_weeks
+    SET status = 'approved',
+        approved_by = CAST(:approved_by AS uuid),
+        approval_notes = :notes,
+        approved_at = CURRENT_TIMESTAMP
+    WHERE id = ANY(CAST(:week_ids AS uuid[])) AND status = 'draft'
+    RETURNING id, week_start_date
+),
+inserted AS (
+    INSERT INTO tips (title, content, difficulty, category, terminal_setup, publish_date)
+    SELECT dt.title, dt.content, dt.difficulty, dt.category, dt.terminal_setup,
+           a.week_start_date + dt.day_of_week - 1
+    FROM draft_tips dt
+    JOIN approved a ON a.id = dt.draft_week_id
+    ORDER BY a.week_start_date, dt.day_of_week
+    RETURNING id, title, content, difficulty, category, terminal_setup,
+              publish_date, is_active, view_count, created_at, updated_at
+),
+conflicts AS (
+    -- Snapshot taken before the insert: only pre-existing active tips
+    SELECT t.id, t.publish_date
+    FROM tips t
+    WHERE t.is_active
+      AND t.publish_date IN (SELECT publish_date FROM inserted)
+)
+SELECT 'week' AS kind, id::text AS id, week_start_date AS day, NULL::jsonb AS tip
+FROM approved
+UNION ALL
+SELECT 'tip', id::text, publish_date, to_jsonb(inserted) FROM inserted
+UNION ALL
+SELECT 'conflict', id::text, publish_date, NULL FROM conflicts
+"""
+
+DAILY_TIP_CACHE_KEY = "tips:daily:{day}"
+
+
+# =============================================================================
+# RESULTS
+# =============================================================================
+
+@dataclass
+class ApprovalResult:
+    """Outcome of approving one or more draft weeks."""
+
+    approved_weeks: List[str] = field(default_factory=list)
+    skipped_weeks: List[str] = field(default_factory=list)
+    tips: List[Dict[str, Any]] = field(default_factory=list)
+    conflicts: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def scheduled_dates(self) -> List[date]:
+        """Get the publish dates of the inserted tips."""
+        return sorted({date.fromisoformat(tip["publish_date"]) for tip in self.tips})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the result as a JSON-serializable dict."""
+        return {
+            "approved_weeks": self.approved_weeks,
+            "skipped_weeks": self.skipped_weeks,
+            "tips": self.tips,
+            "conflicts": self.conflicts,
+        }
+
+
+# =============================================================================
+# APPROVAL
+# =============================================================================
+
+async def approve_weeks(
+    week_ids: Sequence[str],
+    approved_by: Optional[str] = None,
+    notes: Optional[str] = None,
+    prewarm: bool = True
+) -> ApprovalResult:
+    """
+    Approve draft weeks and schedule their tips in a single statement.
+
+    Weeks that are not in 'draft' status (already approved, rejected or
+    unknown) are skipped rather than failing the batch. Tips that land on
+    a day that already has an active tip are inserted and reported as
+    conflicts for the caller to resolve.
+
+    Args:
+        week_ids: draft_weeks ids to approve
+        approved_by: admin_users id recorded on the weeks
+        notes: approval_notes recorded on the weeks
+        prewarm: Whether to cache the newly scheduled days
+
+    Returns:
+        ApprovalResult with approved/skipped weeks, new tips and conflicts
+    """
+    from sqlalchemy import Date, String, text
+    from sqlalchemy.dialects.postgresql import JSONB
+
+    from app.config.database import transaction
+
+    week_ids = list(dict.fromkeys(str(week_id) for week_id in week_ids))
+    result = ApprovalResult()
+    if not week_ids:
+        return result
+
+    async with transaction() as session:
+        statement = text(APPROVE_WEEKS_SQL).columns(
+            kind=String, id=String, day=Date, tip=JSONB
+        )
+        rows = (await session.execute(
+            statement,
+            {"week_ids": week_ids, "approved_by": approved_by, "notes": notes},
+        )).all()
+
+    for row in rows:
+        if row.kind == "week":
+            result.approved_weeks.append(row.id)
+        elif row.kind == "tip":
+            result.tips.append(row.tip)
+        else:
+            result.conflicts.append({"id": row.id, "publish_date": row.day.isoformat()})
+    approved = set(result.approved_weeks)
+    result.skipped_weeks = [week_id for week_id in week_ids if week_id not in approved]
+
+    if result.tips:
+        if prewarm:
+            await prewarm_daily_tips(result.tips)
+        await notify_tips_changed(result.scheduled_dates)
+    return result
+
+
+async def approve_week(
+    week_id: str,
+    approved_by: Optional[str] = None,
+    notes: Optional[str] = None
+) -> ApprovalResult:
+    """Approve a single draft week."""
+    return await approve_weeks([week_id], approved_by, notes)
+
+
+# =============================================================================
+# CACHE PRE-WARMING
+# =============================================================================
+
+async def prewarm_daily_tips(tips: List[Dict[str, Any]]) -> None:
+    """
+    Write newly scheduled tips to the daily tip cache in one round trip.
+
+    Each day's entry lives until the end of that day plus the normal
+    cache TTL, so future days stay cached until they are served.
+    """
+    from app.config.redis import get_redis_cache
+
+    cache = get_redis_cache()
+    today = datetime.now(timezone.utc).date()
+    by_day: Dict[str, Dict[str, Any]] = {}
+    for tip in tips:
+        if tip.get("is_active", True):
+            by_day.setdefault(tip["publish_date"], tip)
+
+    async with cache.client.redis.pipeline(transaction=False) as pipe:
+        for day, tip in by_day.items():
+            days_ahead = max(0, (date.fromisoformat(day) - today).days)
+            pipe.set(
+                DAILY_TIP_CACHE_KEY.format(day=day),
+                json.dumps(tip, ensure_ascii=False),
+                ex=(days_ahead + 1) * 86400 + cache.default_ttl,
+            )
+        await pipe.execute()
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "APPROVE_WEEKS_SQL",
+    "DAILY_TIP_CACHE_KEY",
+    "ApprovalResult",
+    "approve_weeks",
+    "approve_week",
+    "prewarm_daily_tips",
+]
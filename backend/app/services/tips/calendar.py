@@ -0,0 +1,387 @@
+"""
+Linux Daily Tips Backend - Publish Calendar
+
+This module precomputes which tip is served on each day of a rolling
+window (by default 30 days back to 14 days ahead) so resolving "today's
+tip" is a dictionary lookup. The calendar applies the same rule as the
+query it replaces: the active tip published that day, otherwise the most
+recent active tip before it.
+
+The calendar is built by one worker at a time, stored in Redis and
+announced over pub/sub; every worker keeps a copy in memory. It is rebuilt when tips
+change, rolls over at midnight UTC, and the next day's tip is written to
+the daily tip cache a few minutes before midnight.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import Settings, get_settings
+
+from .approval import DAILY_TIP_CACHE_KEY
+from .events import register_tips_listener
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# STATEMENTS
+# =============================================================================
+
+# Tips inside the window (latest per day) plus the most recent one before
+# it, which seeds the fallback for leading days without a tip. Both halves
+# read idx_tips_active_publish_date in index order.
+CALENDAR_TIPS_SQL = """
+(
+    SELECT DISTINCT ON (publish_date) publish_date, id::text AS id, to_jsonb(t) AS tip
+    FROM tips t
+    WHERE is_active AND publish_date BETWEEN :start AND :end
+    ORDER BY publish_date DESC, created_at DESC
+)
+UNION ALL
+(
+    SELECT publish_date, id::text, to_jsonb(t)
+    FROM tips t
+    WHERE is_active AND publish_date < :start
+    ORDER BY publish_date DESC, created_at DESC
+    LIMIT 1
+)
+"""
+
+
+def utc_today() -> date:
+    """Get the current date in UTC."""
+    return datetime.now(timezone.utc).date()
+
+
+# =============================================================================
+# PUBLISH CALENDAR
+# =============================================================================
+
+class PublishCalendar:
+    """Rolling date -> tip map held in memory and Redis."""
+
+    LOCK_TTL_SECONDS = 30
+
+    def __init__(self, client, settings: Optional[Settings] = None):
+        """Initialize calendar over a RedisClient."""
+        self.client = client
+        self.settings = settings or get_settings()
+        self.past_days = self.settings.calendar_past_days
+        self.future_days = self.settings.calendar_future_days
+        self.prewarm_lead = self.settings.calendar_prewarm_lead_seconds
+        self.resync_interval = self.settings.calendar_resync_interval
+        self.key = self.settings.calendar_redis_key
+        self.channel = f"{self.key}:changes"
+
+        self.version = 0
+        self.window_start: Optional[date] = None
+        self.window_end: Optional[date] = None
+        self._days: Dict[date, str] = {}
+        self._tips: Dict[str, Dict[str, Any]] = {}
+        self._rebuild_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"hits": 0, "misses": 0, "rebuilds": 0, "loads": 0}
+
+    # =============================================================================
+    # LOOKUP
+    # =============================================================================
+
+    def get_tip_id(self, day: Optional[date] = None) -> Optional[str]:
+        """Get the tip id served on a day, if the day is in the window."""
+        return self._days.get(day or utc_today())
+
+    def get_tip(self, day: Optional[date] = None) -> Optional[Dict[str, Any]]:
+        """Get the tip served on a day from memory, without any I/O."""
+        tip_id = self.get_tip_id(day)
+        return self._tips.get(tip_id) if tip_id else None
+
+    def covers(self, day: date) -> bool:
+        """Check whether a day is inside the built window."""
+        return self.window_start is not None and self.window_start <= day <= self.window_end
+
+    async def get_daily_tip(self, day: Optional[date] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the tip served on a day.
+
+        Served from memory; the Redis copy is loaded if this worker has
+        none, and the calendar is rebuilt only if the day is outside every
+        available window. Days outside the rolling window return None.
+        """
+        day = day or utc_today()
+        if self.covers(day):
+            self._stats["hits"] += 1
+            return self.get_tip(day)
+
+        self._stats["misses"] += 1
+        await self.load()
+        if not self.covers(day) and self.past_days >= (utc_today() - day).days >= -self.future_days:
+            await self.rebuild()
+        return self.get_tip(day)
+
+    # =============================================================================
+    # BUILDING
+    # =============================================================================
+
+    async def _query(self, start: date, end: date) -> Dict[str, Any]:
+        """Read the window's tips and resolve every day."""
+        from sqlalchemy import Date, String, text
+        from sqlalchemy.dialects.postgresql import JSONB
+
+        from app.config.database import get_session_context
+
+        statement = text(CALENDAR_TIPS_SQL).columns(
+            publish_date=Date, id=String, tip=JSONB
+        )
+        async with get_session_context(readonly=True) as session:
+            rows = (await session.execute(statement, {"start": start, "end": end})).all()
+
+        by_date = {row.publish_date: row for row in rows}
+        seed = next((row for row in rows if row.publish_date < start), None)
+        days: Dict[str, str] = {}
+        tips: Dict[str, Dict[str, Any]] = {}
+        current = seed
+        day = start
+        while day <= end:
+            current = by_date.get(day, current)
+            if current is not None:
+                days[day.isoformat()] = current.id
+                tips[current.id] = current.tip
+            day += timedelta(days=1)
+
+        return {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "built_at": time.time(),
+            "days": days,
+            "tips": tips,
+        }
+
+    def _apply(self, payload: Dict[str, Any], version: int) -> None:
+        """Swap in a calendar payload."""
+        self._days = {
+            date.fromisoformat(day): tip_id for day, tip_id in payload["days"].items()
+        }
+        self._tips = payload["tips"]
+        self.window_start = date.fromisoformat(payload["start"])
+        self.window_end = date.fromisoformat(payload["end"])
+        self.version = version
+
+    async def rebuild(self, today: Optional[date] = None) -> bool:
+        """
+        Rebuild the calendar from PostgreSQL and publish it.
+
+        A short Redis lock keeps workers from rebuilding at the same time.
+        A worker that loses the race marks the calendar dirty and loads the
+        winner's result; the winner rebuilds again if the calendar was
+        marked dirty while it held the lock, since its query may have run
+        before the loser's change.
+
+        Returns:
+            True if this worker rebuilt the calendar
+        """
+        today = today or utc_today()
+        redis = self.client.redis
+        lock_key = f"{self.key}:lock"
+        dirty_key = f"{self.key}:dirty"
+        token = uuid.uuid4().hex
+        async with self._rebuild_lock:
+            while True:
+                acquired = await redis.set(lock_key, token, ex=self.LOCK_TTL_SECONDS, nx=True)
+                if not acquired:
+                    await redis.set(dirty_key, "1", ex=self.LOCK_TTL_SECONDS)
+                    # The holder may have finished between the two commands
+                    acquired = await redis.set(
+                        lock_key, token, ex=self.LOCK_TTL_SECONDS, nx=True
+                    )
+                if not acquired:
+                    await asyncio.sleep(0.5)
+                    await self.load()
+                    return False
+
+                try:
+                    # Changes flagged from here on are either seen by the
+                    # query below or flag the calendar again
+                    await redis.delete(dirty_key)
+                    payload = await self._query(
+                        today - timedelta(days=self.past_days),
+                        today + timedelta(days=self.future_days),
+                    )
+                    async with redis.pipeline(transaction=True) as pipe:
+                        pipe.set(self.key, json.dumps(payload, ensure_ascii=False))
+                        pipe.incr(f"{self.key}:version")
+                        _, version = await pipe.execute()
+                    self._apply(payload, int(version))
+                    await redis.publish(self.channel, version)
+                    self._stats["rebuilds"] += 1
+                finally:
+                    if await redis.get(lock_key) == token:
+                        await redis.delete(lock_key)
+
+                if not await redis.exists(dirty_key):
+                    return True
+
+    async def load(self) -> bool:
+        """Load the calendar stored in Redis if it differs from ours."""
+        redis = self.client.redis
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.get(self.key)
+            pipe.get(f"{self.key}:version")
+            stored, version = await pipe.execute()
+        if stored is None or int(version or 0) == self.version:
+            return False
+        self._apply(json.loads(stored), int(version))
+        self._stats["loads"] += 1
+        return True
+
+    async def ensure(self) -> None:
+        """Make sure a calendar covering today is available."""
+        await self.load()
+        if not self.covers(utc_today()):
+            await self.rebuild()
+
+    # =============================================================================
+    # EVENTS AND ROLLOVER
+    # =============================================================================
+
+    async def on_tips_changed(self, dates: List[date]) -> None:
+        """Rebuild when a changed date can affect the window."""
+        # Dates before the window still matter as the fallback seed
+        if self.window_end is None or any(day <= self.window_end for day in dates):
+            await self.rebuild()
+
+    async def _cache_days(self, today: date, days: List[date]) -> None:
+        """Write the tips of days to the daily tip cache until each day ends."""
+        from app.config.redis import get_redis_cache
+
+        cache = get_redis_cache()
+        for day in days:
+            tip = self.get_tip(day)
+            if tip is not None:
+                await cache.set(
+                    DAILY_TIP_CACHE_KEY.format(day=day.isoformat()),
+                    tip,
+                    ttl=((day - today).days + 1) * 86400 + cache.default_ttl,
+                )
+
+    async def prewarm_next_day(self, today: Optional[date] = None) -> None:
+        """Write tomorrow's tip to the daily tip cache ahead of midnight."""
+        today = today or utc_today()
+        await self._cache_days(today, [today + timedelta(days=1)])
+
+    async def warm(self) -> None:
+        """Startup cache warmer: load the calendar and cache today's and tomorrow's tips."""
+        await self.ensure()
+        today = utc_today()
+        await self._cache_days(today, [today, today + timedelta(days=1)])
+
+    def _seconds_until_midnight(self) -> float:
+        """Get the seconds left until the next UTC midnight."""
+        now = datetime.now(timezone.utc)
+        midnight = datetime.combine(
+            now.date() + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc
+        )
+        return (midnight - now).total_seconds()
+
+    async def run(self) -> None:
+        """Follow changes, pre-warm before midnight and roll over after it."""
+        pubsub = self.client.redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        prewarmed_for: Optional[date] = None
+        try:
+            while True:
+                today = utc_today()
+                if not self.covers(today) or self.window_end - today < timedelta(days=self.future_days):
+                    # Midnight passed (or nothing built yet): shift the window
+                    await self.rebuild(today)
+
+                until_midnight = self._seconds_until_midnight()
+                if until_midnight <= self.prewarm_lead and prewarmed_for != today:
+                    await self.prewarm_next_day(today)
+                    prewarmed_for = today
+
+                # Wake for the next pre-warm or rollover, or a change message
+                if prewarmed_for != today:
+                    wait = until_midnight - self.prewarm_lead
+                else:
+                    wait = until_midnight + 1
+                message = await pubsub.get_message(
+                    timeout=max(0.1, min(wait, self.resync_interval))
+                )
+                if message is not None or wait > self.resync_interval:
+                    await self.load()
+        finally:
+            await pubsub.unsubscribe(self.channel)
+            await pubsub.aclose()
+
+    async def _run(self) -> None:
+        """Keep the loop running, retrying after errors."""
+        while True:
+            try:
+                await self.run()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("Publish calendar loop error: %s", e)
+                await asyncio.sleep(5)
+
+    def start(self) -> None:
+        """Start the calendar loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the calendar loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get the window, version and lookup counters."""
+        return {
+            "version": self.version,
+            "start": self.window_start.isoformat() if self.window_start else None,
+            "end": self.window_end.isoformat() if self.window_end else None,
+            "days": len(self._days),
+            **self._stats,
+        }
+
+
+# =============================================================================
+# GLOBAL PUBLISH CALENDAR
+# =============================================================================
+
+_publish_calendar: Optional[PublishCalendar] = None
+
+
+def get_publish_calendar() -> PublishCalendar:
+    """Get the process-wide publish calendar."""
+    global _publish_calendar
+    if _publish_calendar is None:
+        from app.config.redis import get_redis_client
+
+        _publish_calendar = PublishCalendar(get_redis_client())
+        register_tips_listener("publish_calendar", _publish_calendar.on_tips_changed)
+    return _publish_calendar
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "CALENDAR_TIPS_SQL",
+    "PublishCalendar",
+    "get_publish_calendar",
+    "utc_today",
+]
@@ -0,0 +1,50 @@
+"""
+Linux Daily Tips Backend - Tip Change Events
+
+This module lets services that derive data from the tips table (caches,
+the publish calendar) react when tips are scheduled or edited. Listeners
+are coroutine functions called with the publish dates that changed.
+"""
+
+import asyncio
+import logging
+from datetime import date
+from typing import Awaitable, Callable, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+TipsListener = Callable[[List[date]], Awaitable[None]]
+
+_listeners: List[Tuple[str, TipsListener]] = []
+
+
+def register_tips_listener(name: str, listener: TipsListener) -> None:
+    """Register a coroutine function called after tips change."""
+    _listeners[:] = [entry for entry in _listeners if entry[0] != name]
+    _listeners.append((name, listener))
+
+
+async def notify_tips_changed(dates: Iterable[date]) -> None:
+    """
+    Tell every listener which publish dates changed.
+
+    Call after the change is committed. Listeners run concurrently and are
+    best effort: a failing listener is reported but does not fail the
+    change that triggered it.
+    """
+    changed = sorted(set(dates))
+    if not changed or not _listeners:
+        return
+
+    results = await asyncio.gather(
+        *(listener(changed) for _, listener in _listeners), return_exceptions=True
+    )
+    for (name, _), result in zip(_listeners, results):
+        if isinstance(result, Exception):
+            logger.error("Tips listener '%s' failed: %s", name, result)
+
+
+__all__ = [
+    "register_tips_listener",
+    "notify_tips_changed",
+]
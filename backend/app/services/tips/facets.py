@@ -0,0 +1,363 @@
+"""
+Linux Daily Tips Backend - Tip Facets
+
+This module answers category and difficulty filters without aggregating
+over the tips table. Every active tip is a member of one Redis sorted set
+per category and one per difficulty, scored by publish date, and a hash
+holds the per-facet counts. A combined filter (several categories AND a
+difficulty) is a ZINTERSTORE of those sets, newest first; the requested
+page of ids is then hydrated from PostgreSQL in one batched query.
+
+The sets are built once from PostgreSQL and then kept up to date
+incrementally: when tips change, only the tips on the changed publish
+dates are re-read and moved between sets.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.config.settings import Settings, get_settings
+
+from .events import register_tips_listener
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# STATEMENTS
+# =============================================================================
+
+FACET_TIPS_SQL = """
+SELECT id::text AS id, publish_date, difficulty::text AS difficulty, category
+FROM tips
+WHERE is_active
+"""
+
+FACET_TIPS_ON_DATES_SQL = """
+SELECT id::text AS id, publish_date, difficulty::text AS difficulty, category
+FROM tips
+WHERE is_active AND publish_date = ANY(:dates)
+"""
+
+HYDRATE_TIPS_SQL = """
+SELECT id::text AS id, to_jsonb(t) AS tip
+FROM tips t
+WHERE id = ANY(CAST(:ids AS uuid[])) AND is_active
+"""
+
+
+# =============================================================================
+# RESULTS
+# =============================================================================
+
+@dataclass
+class FacetPage:
+    """One page of tips matching a facet filter."""
+
+    total: int = 0
+    limit: int = 20
+    offset: int = 0
+    tips: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the page as a JSON-serializable dict."""
+        return {
+            "total": self.total,
+            "limit": self.limit,
+            "offset": self.offset,
+            "tips": self.tips,
+        }
+
+
+# =============================================================================
+# TIP FACETS
+# =============================================================================
+
+class TipFacets:
+    """Category and difficulty tip-id sets held in Redis."""
+
+    LOCK_TTL_SECONDS = 30
+
+    def __init__(self, client, settings: Optional[Settings] = None):
+        """Initialize facets over a RedisClient."""
+        self.client = client
+        self.settings = settings or get_settings()
+        self.key = self.settings.facets_redis_key
+        self._stats = {"queries": 0, "rebuilds": 0, "updates": 0, "updated_tips": 0}
+
+    # =============================================================================
+    # KEYS
+    # =============================================================================
+
+    def _facet_key(self, facet: str, value: str) -> str:
+        """Get the sorted set key of one facet value."""
+        return f"{self.key}:{facet}:{value}"
+
+    def _filter_keys(
+        self,
+        categories: Sequence[str] = (),
+        difficulty: Optional[str] = None
+    ) -> List[str]:
+        """Get the set keys a filter intersects; no filter means all tips."""
+        keys = [self._facet_key("category", category) for category in dict.fromkeys(categories)]
+        if difficulty:
+            keys.append(self._facet_key("difficulty", difficulty))
+        return keys or [f"{self.key}:all"]
+
+    @staticmethod
+    def _facets_of(difficulty: str, categories: Iterable[str]) -> List[Tuple[str, str]]:
+        """Get the (facet, value) pairs a tip belongs to."""
+        return [("difficulty", difficulty)] + [
+            ("category", category) for category in dict.fromkeys(categories)
+        ]
+
+    def _add(self, pipe, tip_id: str, publish_date: date, difficulty: str, categories: List[str]) -> None:
+        """Queue adding a tip to its sets and counts."""
+        score = publish_date.toordinal()
+        pipe.zadd(f"{self.key}:all", {tip_id: score})
+        for facet, value in self._facets_of(difficulty, categories):
+            pipe.zadd(self._facet_key(facet, value), {tip_id: score})
+            pipe.hincrby(f"{self.key}:counts", f"{facet}:{value}", 1)
+        pipe.hset(
+            f"{self.key}:members",
+            tip_id,
+            json.dumps({"d": difficulty, "c": categories}, ensure_ascii=False),
+        )
+
+    def _remove(self, pipe, tip_id: str, member: Dict[str, Any]) -> None:
+        """Queue removing a tip from the sets recorded for it."""
+        pipe.zrem(f"{self.key}:all", tip_id)
+        for facet, value in self._facets_of(member["d"], member["c"]):
+            pipe.zrem(self._facet_key(facet, value), tip_id)
+            pipe.hincrby(f"{self.key}:counts", f"{facet}:{value}", -1)
+        pipe.hdel(f"{self.key}:members", tip_id)
+
+    @asynccontextmanager
+    async def _locked(self) -> AsyncIterator[None]:
+        """Hold the facets lock so rebuilds and updates do not interleave."""
+        redis = self.client.redis
+        lock_key = f"{self.key}:lock"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.LOCK_TTL_SECONDS
+        while not await redis.set(lock_key, token, ex=self.LOCK_TTL_SECONDS, nx=True):
+            if time.monotonic() > deadline:
+                raise TimeoutError("Timed out waiting for the tip facets lock")
+            await asyncio.sleep(0.1)
+        try:
+            yield
+        finally:
+            if await redis.get(lock_key) == token:
+                await redis.delete(lock_key)
+
+    # =============================================================================
+    # BUILDING
+    # =============================================================================
+
+    async def _read_tips(self, dates: Optional[List[date]] = None) -> List[Any]:
+        """Read facet columns of active tips, optionally on some dates only."""
+        from sqlalchemy import text
+
+        from app.config.database import get_session_context
+
+        if dates is None:
+            statement, params = text(FACET_TIPS_SQL), {}
+        else:
+            statement, params = text(FACET_TIPS_ON_DATES_SQL), {"dates": dates}
+        async with get_session_context() as session:
+            return (await session.execute(statement, params)).all()
+
+    async def rebuild(self) -> int:
+        """
+        Rebuild every set from PostgreSQL.
+
+        The old sets are replaced inside one MULTI, so readers see either
+        the old facets or the new ones.
+
+        Returns:
+            Number of tips indexed
+        """
+        redis = self.client.redis
+        async with self._locked():
+            rows = await self._read_tips()
+            old_facets = await redis.hkeys(f"{self.key}:counts")
+            async with redis.pipeline(transaction=True) as pipe:
+                stale = [f"{self.key}:{name}" for name in old_facets]
+                pipe.delete(f"{self.key}:all", f"{self.key}:counts", f"{self.key}:members", *stale)
+                for row in rows:
+                    self._add(pipe, row.id, row.publish_date, row.difficulty, list(row.category or []))
+                pipe.incr(f"{self.key}:version")
+                await pipe.execute()
+        self._stats["rebuilds"] += 1
+        logger.info("Tip facets rebuilt from %d tips", len(rows))
+        return len(rows)
+
+    async def ensure(self) -> None:
+        """Build the facets if Redis has none."""
+        if not await self.client.redis.exists(f"{self.key}:version"):
+            await self.rebuild()
+
+    async def on_tips_changed(self, dates: List[date]) -> None:
+        """
+        Move the tips on changed publish dates between sets.
+
+        Tips previously indexed on those dates and tips now active on them
+        are removed using their recorded facets and re-added from the
+        current rows, so edits, deactivations and date moves all land.
+        """
+        redis = self.client.redis
+        if not await redis.exists(f"{self.key}:version"):
+            # Nothing built yet; the first query builds from scratch
+            return
+
+        async with self._locked():
+            rows = await self._read_tips(dates)
+            async with redis.pipeline(transaction=False) as pipe:
+                for day in dates:
+                    pipe.zrangebyscore(f"{self.key}:all", day.toordinal(), day.toordinal())
+                previous = await pipe.execute()
+            tip_ids = list(dict.fromkeys(
+                [tip_id for ids in previous for tip_id in ids] + [row.id for row in rows]
+            ))
+            members = await redis.hmget(f"{self.key}:members", tip_ids) if tip_ids else []
+
+            async with redis.pipeline(transaction=True) as pipe:
+                for tip_id, member in zip(tip_ids, members):
+                    if member is not None:
+                        self._remove(pipe, tip_id, json.loads(member))
+                for row in rows:
+                    self._add(pipe, row.id, row.publish_date, row.difficulty, list(row.category or []))
+                pipe.incr(f"{self.key}:version")
+                await pipe.execute()
+        self._stats["updates"] += 1
+        self._stats["updated_tips"] += len(tip_ids)
+
+    # =============================================================================
+    # QUERIES
+    # =============================================================================
+
+    async def counts(
+        self,
+        categories: Sequence[str] = (),
+        difficulty: Optional[str] = None
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Get tip counts per category and difficulty.
+
+        Without a filter the maintained counts are returned as they are;
+        with one, each facet value is counted within the filter with
+        ZINTERCARD.
+        """
+        await self.ensure()
+        redis = self.client.redis
+        stored = await redis.hgetall(f"{self.key}:counts")
+        facets = [name for name, count in stored.items() if int(count) > 0]
+        if categories or difficulty:
+            keys = self._filter_keys(categories, difficulty)
+            async with redis.pipeline(transaction=False) as pipe:
+                for name in facets:
+                    pipe.zintercard(len(keys) + 1, keys + [f"{self.key}:{name}"])
+                values = await pipe.execute()
+        else:
+            values = [int(stored[name]) for name in facets]
+
+        result: Dict[str, Dict[str, int]] = {"category": {}, "difficulty": {}}
+        for name, count in zip(facets, values):
+            facet, value = name.split(":", 1)
+            if count:
+                result[facet][value] = int(count)
+        return result
+
+    async def query(
+        self,
+        categories: Sequence[str] = (),
+        difficulty: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> FacetPage:
+        """
+        Get a page of active tips in every given category and difficulty.
+
+        Tips are ordered newest publish date first (ties by id). The ids
+        come from one set intersection; the tips from one query.
+        """
+        await self.ensure()
+        redis = self.client.redis
+        keys = self._filter_keys(categories, difficulty)
+        stop = offset + limit - 1
+
+        if len(keys) == 1:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.zcard(keys[0])
+                pipe.zrevrange(keys[0], offset, stop)
+                total, tip_ids = await pipe.execute()
+        else:
+            result_key = f"{self.key}:result:{uuid.uuid4().hex}"
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.zinterstore(result_key, keys, aggregate="MAX")
+                pipe.zrevrange(result_key, offset, stop)
+                pipe.delete(result_key)
+                total, tip_ids, _ = await pipe.execute()
+        self._stats["queries"] += 1
+
+        return FacetPage(
+            total=int(total),
+            limit=limit,
+            offset=offset,
+            tips=await self.hydrate(tip_ids),
+        )
+
+    async def hydrate(self, tip_ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetch tips by id in one query, keeping the given order."""
+        if not tip_ids:
+            return []
+        from sqlalchemy import String, text
+        from sqlalchemy.dialects.postgresql import JSONB
+
+        from app.config.database import get_session_context
+
+        statement = text(HYDRATE_TIPS_SQL).columns(id=String, tip=JSONB)
+        async with get_session_context(readonly=True) as session:
+            rows = (await session.execute(statement, {"ids": tip_ids})).all()
+        by_id = {row.id: row.tip for row in rows}
+        return [by_id[tip_id] for tip_id in tip_ids if tip_id in by_id]
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get query and maintenance counters."""
+        return dict(self._stats)
+
+
+# =============================================================================
+# GLOBAL TIP FACETS
+# =============================================================================
+
+_tip_facets: Optional[TipFacets] = None
+
+
+def get_tip_facets() -> TipFacets:
+    """Get the process-wide tip facets."""
+    global _tip_facets
+    if _tip_facets is None:
+        from app.config.redis import get_redis_client
+
+        _tip_facets = TipFacets(get_redis_client())
+        register_tips_listener("tip_facets", _tip_facets.on_tips_changed)
+    return _tip_facets
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "FacetPage",
+    "TipFacets",
+    "get_tip_facets",
+]
@@ -0,0 +1,575 @@
+"""
+Linux Daily Tips Backend - Bulk Tip Import and Export
+
+This module moves tips in and out of PostgreSQL with COPY instead of
+row-at-a-time INSERTs. Imports stream NDJSON or CSV into a temporary
+staging table (copy_records_to_table / copy_to_table) and upsert it into
+tips with one INSERT ... ON CONFLICT; exports stream COPY ... TO STDOUT.
+Everything is driven by async generators, so memory stays constant
+whatever the file size, and progress is reported as rows go by.
+
+Usage (from backend/):
+    python -m app.services.tips.transfer import tips.ndjson.gz
+    python -m app.services.tips.transfer export tips.csv --format csv
+"""
+
+import argparse
+import asyncio
+import csv
+import gzip
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union
+)
+
+from .events import notify_tips_changed
+
+
+# =============================================================================
+# STATEMENTS
+# =============================================================================
+
+TRANSFER_FORMATS = ("ndjson", "csv")
+
+# Refresh planner statistics after imports touching at least this many rows
+ANALYZE_AFTER_ROWS = 10000
+
+# Columns accepted on import, in staging table order
+IMPORT_COLUMNS = (
+    "id",
+    "title",
+    "content",
+    "difficulty",
+    "category",
+    "terminal_setup",
+    "publish_date",
+    "is_active",
+)
+
+# Pooled connections carry the request-sized statement_timeout and
+# idle_in_transaction_session_timeout; bulk transfers lift both for their
+# own transaction only, so the connection goes back to the pool unchanged
+BULK_TIMEOUTS_SQL = """
+SET LOCAL statement_timeout = 0;
+SET LOCAL idle_in_transaction_session_timeout = 0
+"""
+
+EXPORT_COLUMNS = IMPORT_COLUMNS + ("view_count", "created_at", "updated_at")
+
+# Columns a CSV import must have in its header row
+REQUIRED_COLUMNS = ("title", "content")
+
+# JSON columns stay text until the upsert casts them, so malformed rows
+# fail with a clear cast error instead of inside the COPY protocol. The
+# export-only columns are staged so exported CSV files load as they are,
+# and ignored by the upsert.
+CREATE_STAGING_SQL = """
+CREATE TEMP TABLE tips_import (
+    seq bigserial,
+    id uuid,
+    title text,
+    content text,
+    difficulty text,
+    category text,
+    terminal_setup text,
+    publish_date date,
+    is_active boolean,
+    view_count text,
+    created_at text,
+    updated_at text
+) ON COMMIT DROP
+"""
+
+# The last staged row wins when an id appears more than once; rows without
+# an id are always inserted. Unchanged rows are not rewritten. The changed
+# dates include the day an updated tip moved away from: previous reads the
+# tips as they were before the statement.
+UPSERT_STAGED_SQL = """
+WITH staged AS (
+    SELECT * FROM (
+        SELECT DISTINCT ON (id) * FROM tips_import
+        WHERE id IS NOT NULL
+        ORDER BY id, seq DESC
+    ) latest
+    UNION ALL
+    SELECT * FROM tips_import WHERE id IS NULL
+),
+previous AS (
+    SELECT tips.id, tips.publish_date
+    FROM tips JOIN staged ON staged.id = tips.id
+),
+upserted AS (
+    INSERT INTO tips (id, title, content, difficulty, category, terminal_setup,
+                      publish_date, is_active)
+    SELECT COALESCE(id, uuid_generate_v4()),
+           title,
+           content,
+           COALESCE(difficulty, 'beginner')::difficulty_level,
+           COALESCE(category, '[]')::jsonb,
+           COALESCE(terminal_setup, '{}')::jsonb,
+           COALESCE(publish_date, CURRENT_DATE),
+           COALESCE(is_active, true)
+    FROM staged
+    ON CONFLICT (id) DO UPDATE SET
+        title = EXCLUDED.title,
+        content = EXCLUDED.content,
+        difficulty = EXCLUDED.difficulty,
+        category = EXCLUDED.category,
+        terminal_setup = EXCLUDED.terminal_setup,
+        publish_date = EXCLUDED.publish_date,
+        is_active = EXCLUDED.is_active
+    WHERE (tips.title, tips.content, tips.difficulty, tips.category,
+           tips.terminal_setup, tips.publish_date, tips.is_active)
+          IS DISTINCT FROM
+          (EXCLUDED.title, EXCLUDED.content, EXCLUDED.difficulty, EXCLUDED.category,
+           EXCLUDED.terminal_setup, EXCLUDED.publish_date, EXCLUDED.is_active)
+    RETURNING id, (xmax = 0) AS inserted, publish_date
+),
+changed_dates AS (
+    SELECT publish_date FROM upserted
+    UNION
+    SELECT previous.publish_date FROM previous JOIN upserted USING (id)
+)
+SELECT (SELECT count(*) FROM upserted WHERE inserted) AS inserted,
+       (SELECT count(*) FROM upserted WHERE NOT inserted) AS updated,
+       (SELECT array_agg(publish_date) FROM changed_dates) AS dates
+"""
+
+EXPORT_SQL = f"""
+SELECT {', '.join(EXPORT_COLUMNS)}
+FROM tips {{where}}
+ORDER BY publish_date, id
+"""
+
+# CSV with quote and delimiter characters that never occur in JSON text
+# makes COPY emit each document verbatim, one per line
+EXPORT_NDJSON_SQL = f"SELECT row_to_json(t) FROM ({EXPORT_SQL}) t"
+NDJSON_COPY_OPTIONS = {"format": "csv", "quote": "\x01", "delimiter": "\x02"}
+
+
+# =============================================================================
+# PROGRESS
+# =============================================================================
+
+@dataclass
+class TransferProgress:
+    """Running totals of an import or export."""
+
+    direction: str
+    rows: int = 0
+    bytes: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    inserted: int = 0
+    updated: int = 0
+    finished: bool = False
+
+    @property
+    def elapsed(self) -> float:
+        """Get seconds since the transfer started."""
+        return time.monotonic() - self.started_at
+
+    @property
+    def rows_per_second(self) -> float:
+        """Get the average row rate."""
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the totals as a JSON-serializable dict."""
+        return {
+            "direction": self.direction,
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "elapsed": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "finished": self.finished,
+        }
+
+
+ProgressCallback = Callable[[TransferProgress], None]
+
+
+class _Reporter:
+    """Call a progress callback every N rows."""
+
+    def __init__(self, progress: TransferProgress, callback: Optional[ProgressCallback], every: int):
+        """Initialize reporter."""
+        self.progress = progress
+        self.callback = callback
+        self.every = every
+        self._next = every
+
+    def advance(self, rows: int, size: int) -> None:
+        """Count rows and bytes, reporting when a step is crossed."""
+        self.progress.rows += rows
+        self.progress.bytes += size
+        if self.callback is not None and self.progress.rows >= self._next:
+            self._next = self.progress.rows + self.every
+            self.callback(self.progress)
+
+    def finish(self) -> None:
+        """Report the final totals."""
+        self.progress.finished = True
+        if self.callback is not None:
+            self.callback(self.progress)
+
+
+# =============================================================================
+# STREAMING HELPERS
+# =============================================================================
+
+Source = Union[str, AsyncIterable[bytes]]
+
+
+async def read_file_chunks(path: str, chunk_size: int = 1 << 20) -> AsyncIterator[bytes]:
+    """Read a file (gzip if it ends in .gz) in chunks off the event loop."""
+    opener = gzip.open if path.endswith(".gz") else open
+    f = await asyncio.to_thread(opener, path, "rb")
+    try:
+        while True:
+            chunk = await asyncio.to_thread(f.read, chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        await asyncio.to_thread(f.close)
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines without buffering the whole stream."""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        lines = pending.split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+def _json_text(value: Any) -> Optional[str]:
+    """Render a JSON column value as text for the staging table."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def tip_record(document: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Convert one NDJSON document into a staging table record."""
+    tip_id = document.get("id")
+    publish_date = document.get("publish_date")
+    return (
+        uuid.UUID(tip_id) if tip_id else None,
+        document["title"],
+        document["content"],
+        document.get("difficulty"),
+        _json_text(document.get("category")),
+        _json_text(document.get("terminal_setup")),
+        date.fromisoformat(publish_date[:10]) if publish_date else None,
+        document.get("is_active"),
+    )
+
+
+async def ndjson_records(
+    chunks: AsyncIterable[bytes],
+    reporter: _Reporter
+) -> AsyncIterator[Tuple[Any, ...]]:
+    """Parse NDJSON into staging records, counting progress."""
+    async for line in iter_lines(chunks):
+        size = len(line) + 1
+        line = line.strip()
+        if not line:
+            reporter.advance(0, size)
+            continue
+        reporter.advance(1, size)
+        yield tip_record(json.loads(line))
+
+
+async def _counted(chunks: AsyncIterable[bytes], reporter: _Reporter) -> AsyncIterator[bytes]:
+    """Pass CSV chunks through, counting lines and bytes."""
+    # Quoted fields can span lines, so this is an estimate until COPY ends
+    async for chunk in chunks:
+        reporter.advance(chunk.count(b"\n"), len(chunk))
+        yield chunk
+
+
+async def split_csv_header(
+    chunks: AsyncIterable[bytes]
+) -> Tuple[List[str], AsyncIterator[bytes]]:
+    """
+    Read the header row of a CSV stream.
+
+    Returns:
+        (column names, the remaining bytes of the stream)
+
+    Raises:
+        ValueError: if a column is unknown or repeated, or title or
+            content is missing
+    """
+    iterator = chunks.__aiter__()
+    pending = b""
+    while b"\n" not in pending:
+        try:
+            pending += await iterator.__anext__()
+        except StopAsyncIteration:
+            break
+    line, _, rest = pending.partition(b"\n")
+    header = next(csv.reader([line.decode("utf-8-sig").rstrip("\r")]), [])
+    columns = [name.strip() for name in header]
+
+    unknown = [name for name in columns if name not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown CSV columns: {unknown}")
+    if len(set(columns)) != len(columns):
+        raise ValueError(f"Repeated CSV columns: {columns}")
+    missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+    if missing:
+        raise ValueError(f"Missing CSV columns: {missing}")
+
+    async def body() -> AsyncIterator[bytes]:
+        if rest:
+            yield rest
+        async for chunk in iterator:
+            yield chunk
+
+    return columns, body()
+
+
+def _copied_rows(status: str) -> int:
+    """Get the row count from a "COPY n" command status."""
+    return int(status.split()[-1])
+
+
+# =============================================================================
+# IMPORT
+# =============================================================================
+
+async def import_tips(
+    source: Source,
+    format: str = "ndjson",
+    progress: Optional[ProgressCallback] = None,
+    progress_every: int = 100000,
+    notify: bool = True
+) -> TransferProgress:
+    """
+    Import tips from NDJSON or CSV through a staging table.
+
+    NDJSON documents use the tips column names. CSV columns are matched
+    by the names in the header row, in any order; the columns export_tips
+    writes are all accepted, view_count and the timestamps being ignored.
+    Only title and content are required. Rows with an existing id update
+    that tip, other rows are inserted. The import is one transaction, run
+    without the pool's statement and idle-in-transaction timeouts.
+
+    Args:
+        source: File path, or an async iterable of raw bytes
+        format: "ndjson" or "csv" (CSV needs a header row)
+        progress: Called every progress_every rows and once at the end
+        notify: Whether to notify tip change listeners afterwards
+
+    Returns:
+        Final TransferProgress with inserted and updated counts
+    """
+    if format not in TRANSFER_FORMATS:
+        raise ValueError(f"Format must be one of: {list(TRANSFER_FORMATS)}")
+
+    from app.config.database import get_database
+
+    chunks = read_file_chunks(source) if isinstance(source, str) else source
+    if format == "csv":
+        columns, chunks = await split_csv_header(chunks)
+    state = TransferProgress("import")
+    reporter = _Reporter(state, progress, progress_every)
+
+    async with get_database().driver_connection() as conn:
+        async with conn.transaction():
+            await conn.execute(BULK_TIMEOUTS_SQL)
+            await conn.execute(CREATE_STAGING_SQL)
+            if format == "ndjson":
+                await conn.copy_records_to_table(
+                    "tips_import",
+                    records=ndjson_records(chunks, reporter),
+                    columns=IMPORT_COLUMNS,
+                )
+            else:
+                status = await conn.copy_to_table(
+                    "tips_import",
+                    source=_counted(chunks, reporter),
+                    columns=columns,
+                    format="csv",
+                )
+                state.rows = _copied_rows(status)
+            row = await conn.fetchrow(UPSERT_STAGED_SQL)
+
+        # After the commit: refresh planner statistics after a bulk change
+        if row["inserted"] + row["updated"] >= ANALYZE_AFTER_ROWS:
+            async with conn.transaction():
+                await conn.execute(BULK_TIMEOUTS_SQL)
+                await conn.execute("ANALYZE tips")
+
+    state.inserted = row["inserted"]
+    state.updated = row["updated"]
+    reporter.finish()
+
+    if notify and row["dates"]:
+        await notify_tips_changed(row["dates"])
+    return state
+
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+
+async def export_tips(
+    format: str = "ndjson",
+    active_only: bool = False,
+    progress: Optional[ProgressCallback] = None,
+    progress_every: int = 100000,
+    queue_chunks: int = 16
+) -> AsyncIterator[bytes]:
+    """
+    Stream tips out as NDJSON or CSV chunks.
+
+    COPY writes into a bounded queue, so a slow consumer pauses the COPY
+    instead of buffering the table. Suitable as the body of a
+    StreamingResponse. Runs on a read replica when one is available, in a
+    read-only transaction without the pool's statement timeouts.
+    """
+    if format not in TRANSFER_FORMATS:
+        raise ValueError(f"Format must be one of: {list(TRANSFER_FORMATS)}")
+
+    from app.config.database import get_database
+
+    where = "WHERE is_active" if active_only else ""
+    if format == "ndjson":
+        query = EXPORT_NDJSON_SQL.format(where=where)
+        options = NDJSON_COPY_OPTIONS
+    else:
+        query = EXPORT_SQL.format(where=where)
+        options = {"format": "csv", "header": True}
+
+    state = TransferProgress("export")
+    reporter = _Reporter(state, progress, progress_every)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_chunks)
+    done = object()
+
+    async with get_database().driver_connection(readonly=True) as conn:
+        async with conn.transaction(readonly=True):
+            await conn.execute(BULK_TIMEOUTS_SQL)
+
+            async def copy() -> str:
+                try:
+                    return await conn.copy_from_query(query, output=queue.put, **options)
+                finally:
+                    await queue.put(done)
+
+            task = asyncio.create_task(copy())
+            try:
+                while True:
+                    chunk = await queue.get()
+                    if chunk is done:
+                        break
+                    reporter.advance(chunk.count(b"\n"), len(chunk))
+                    yield chunk
+                # Line counts overstate CSV rows with multi-line fields
+                state.rows = _copied_rows(await task)
+            finally:
+                if not task.done():
+                    task.cancel()
+                    try:
+                        await task
+                    except asyncio.CancelledError:
+                        pass
+
+    reporter.finish()
+
+
+async def export_tips_to_file(
+    path: str,
+    format: str = "ndjson",
+    active_only: bool = False,
+    progress: Optional[ProgressCallback] = None
+) -> None:
+    """Export tips to a file (gzip if it ends in .gz)."""
+    opener = gzip.open if path.endswith(".gz") else open
+    f = await asyncio.to_thread(opener, path, "wb")
+    try:
+        async for chunk in export_tips(format, active_only, progress):
+            await asyncio.to_thread(f.write, chunk)
+    finally:
+        await asyncio.to_thread(f.close)
+
+
+# =============================================================================
+# COMMAND LINE
+# =============================================================================
+
+def _print_progress(progress: TransferProgress) -> None:
+    """Print a one-line progress report."""
+    print(
+        f"{progress.direction}: {progress.rows:,} rows, "
+        f"{progress.bytes / 1e6:.1f} MB, {progress.rows_per_second:,.0f} rows/s"
+        + (" (done)" if progress.finished else "")
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run an import or export from the command line."""
+    parser = argparse.ArgumentParser(description="Bulk tip import/export via COPY")
+    parser.add_argument("direction", choices=["import", "export"])
+    parser.add_argument("path", help="NDJSON or CSV file, optionally .gz")
+    parser.add_argument("--format", choices=TRANSFER_FORMATS)
+    parser.add_argument("--active-only", action="store_true", help="export only active tips")
+    args = parser.parse_args(argv)
+
+    format = args.format or ("csv" if ".csv" in args.path else "ndjson")
+
+    async def run() -> None:
+        from app.config.database import cleanup_database
+
+        try:
+            if args.direction == "import":
+                result = await import_tips(args.path, format, _print_progress)
+                print(json.dumps(result.to_dict()))
+            else:
+                await export_tips_to_file(
+                    args.path, format, args.active_only, _print_progress
+                )
+        finally:
+            await cleanup_database()
+
+    asyncio.run(run())
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    "TRANSFER_FORMATS",
+    "TransferProgress",
+    "read_file_chunks",
+    "import_tips",
+    "export_tips",
+    "export_tips_to_file",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Linux Daily Tips Backend - Bulk Import Benchmark
+
+Imports synthetic tips through the COPY-based importer and compares it
+with row-at-a-time INSERTs (the way the sample data is seeded), then
+exports the table back out. The INSERT baseline runs on a sample and is
+extrapolated. Synthetic tips are tagged "bench" and deleted afterwards.
+Requires the PostgreSQL service from docker-compose and a configured .env.
+
+Usage (from backend/):
+    python -m benchmarks.bench_copy --rows 1000000
+    python -m benchmarks.bench_copy --rows 100000 --insert-sample 5000 --keep
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Any, AsyncIterator, Dict
+
+from benchmarks.datagen import tip_document
+
+
+BENCH_CATEGORY = "bench"
+
+INSERT_SQL = """
+INSERT INTO tips (title, content, difficulty, category, terminal_setup, publish_date)
+VALUES ($1, $2, $3::difficulty_level, $4::jsonb, $5::jsonb, $6)
+"""
+
+DELETE_BENCH_SQL = "DELETE FROM tips WHERE category ? $1"
+
+
+def synthetic_tip(index: int, rng: random.Random) -> Dict[str, Any]:
+    """Build one synthetic tip document tagged for cleanup."""
+    tip = tip_document(index, rng)
+    tip["category"].append(BENCH_CATEGORY)
+    tip["publish_date"] = (date(2000, 1, 1) + timedelta(days=index % 9000)).isoformat()
+    return tip
+
+
+async def synthetic_ndjson(rows: int, seed: int, batch: int = 1000) -> AsyncIterator[bytes]:
+    """Stream synthetic tips as NDJSON chunks."""
+    rng = random.Random(seed)
+    for start in range(0, rows, batch):
+        lines = [
+            json.dumps(synthetic_tip(index, rng))
+            for index in range(start, min(rows, start + batch))
+        ]
+        yield ("\n".join(lines) + "\n").encode()
+        # Let the COPY writer run between batches
+        await asyncio.sleep(0)
+
+
+async def bench_inserts(sample: int, seed: int) -> float:
+    """Time row-at-a-time INSERTs of a sample; returns rows/s."""
+    from app.config.database import get_database
+
+    rng = random.Random(seed)
+    tips = [synthetic_tip(index, rng) for index in range(sample)]
+    async with get_database().driver_connection() as conn:
+        start = time.perf_counter()
+        for tip in tips:
+            await conn.execute(
+                INSERT_SQL,
+                tip["title"],
+                tip["content"],
+                tip["difficulty"],
+                json.dumps(tip["category"]),
+                json.dumps(tip["terminal_setup"]),
+                date.fromisoformat(tip["publish_date"]),
+            )
+        elapsed = time.perf_counter() - start
+    return sample / elapsed
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run the import, baseline and export measurements."""
+    from app.config.database import cleanup_database, get_database
+    from app.services.tips.transfer import export_tips, import_tips
+
+    results: Dict[str, Any] = {"rows": args.rows}
+    try:
+        tracemalloc.start()
+        start = time.perf_counter()
+        imported = await import_tips(
+            synthetic_ndjson(args.rows, args.seed), notify=False
+        )
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results["copy_import"] = {
+            **imported.to_dict(),
+            "seconds": round(elapsed, 2),
+            "peak_python_mb": round(peak / 1e6, 1),
+        }
+
+        if args.insert_sample:
+            insert_rate = await bench_inserts(args.insert_sample, args.seed + 1)
+            results["insert_baseline"] = {
+                "sample_rows": args.insert_sample,
+                "rows_per_second": round(insert_rate, 1),
+                "extrapolated_seconds": round(args.rows / insert_rate, 1),
+            }
+            results["speedup"] = round(imported.rows_per_second / insert_rate, 1)
+
+        for format in ("ndjson", "csv"):
+            start = time.perf_counter()
+            size = 0
+            async for chunk in export_tips(format):
+                size += len(chunk)
+            results[f"{format}_export"] = {
+                "seconds": round(time.perf_counter() - start, 2),
+                "mb": round(size / 1e6, 1),
+            }
+    finally:
+        if not args.keep:
+            async with get_database().driver_connection() as conn:
+                await conn.execute(DELETE_BENCH_SQL, BENCH_CATEGORY)
+        await cleanup_database()
+    return results
+
+
+def main() -> None:
+    """Run the benchmark and print a JSON summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument(
+        "--insert-sample", type=int, default=10000,
+        help="rows for the INSERT baseline (0 = skip)"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic tips")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
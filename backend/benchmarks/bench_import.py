@@ -0,0 +1,112 @@
+"""
+Linux Daily Tips Backend - Import and Settings Benchmark
+
+Measures, in fresh interpreters, how long it takes to import app.config,
+to construct Settings cold, and to reach the database and Redis modules
+through the lazy exports. It also compares hot-path attribute reads on
+Settings against the frozen RuntimeSettings snapshot. Requires a
+configured .env (no running services).
+
+Usage (from backend/):
+    python -m benchmarks.bench_import --runs 10
+    python -m benchmarks.bench_import --importtime   # top self-time imports
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+
+CHILD_CODE = """
+import json, time, timeit
+t0 = time.perf_counter()
+import app.config as config
+t1 = time.perf_counter()
+settings = config.get_settings()
+t2 = time.perf_counter()
+runtime = config.get_runtime_settings()
+t3 = time.perf_counter()
+config.DatabaseConfig
+t4 = time.perf_counter()
+config.RedisClient
+t5 = time.perf_counter()
+
+reads = 100000
+settings_read = timeit.timeit(
+    lambda: settings.debug and settings.log_level == "DEBUG", number=reads
+)
+runtime_read = timeit.timeit(lambda: runtime.debug_logging, number=reads)
+
+print(json.dumps({
+    "import_app_config_ms": (t1 - t0) * 1000,
+    "settings_construct_ms": (t2 - t1) * 1000,
+    "runtime_snapshot_ms": (t3 - t2) * 1000,
+    "lazy_database_import_ms": (t4 - t3) * 1000,
+    "lazy_redis_import_ms": (t5 - t4) * 1000,
+    "settings_debug_check_ns": settings_read / reads * 1e9,
+    "runtime_debug_check_ns": runtime_read / reads * 1e9,
+}))
+"""
+
+
+def run_once() -> Dict[str, float]:
+    """Measure one fresh interpreter."""
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def top_imports(limit: int = 25) -> List[str]:
+    """Get the imports with the highest self time under -X importtime."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.config"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    rows.sort(reverse=True)
+    return [
+        f"{self_us:>8} us self {cumulative_us:>8} us cumulative {name}"
+        for self_us, cumulative_us, name in rows[:limit]
+    ]
+
+
+def main() -> None:
+    """Run the benchmark and print a JSON summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--importtime", action="store_true")
+    args = parser.parse_args()
+
+    if args.importtime:
+        print("\n".join(top_imports()))
+        return
+
+    runs = [run_once() for _ in range(args.runs)]
+    print(json.dumps(
+        {
+            "runs": args.runs,
+            "median": {
+                name: statistics.median(run[name] for run in runs)
+                for name in runs[0]
+            },
+        },
+        indent=2,
+    ))
+
+
+if __name__ == "__main__":
+    main()
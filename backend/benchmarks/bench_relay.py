@@ -0,0 +1,135 @@
+"""
+Linux Daily Tips Backend - Terminal Relay Benchmark
+
+Measures frames/sec and bytes/sec through the terminal relay for a
+command running under a local PTY, against a naive relay that sends one
+WebSocket frame per PTY read. The WebSocket is replaced by an in-process
+sink that can simulate a slow client. Needs no database, Redis or Docker.
+
+Usage (from backend/):
+    python -m benchmarks.bench_relay --seconds 5
+    python -m benchmarks.bench_relay --command "find /" --client-delay-ms 2
+    python -m benchmarks.bench_relay --compress --rate-limit 524288
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict
+
+from app.services.terminal.relay import PtyProcess, TerminalRelay
+from app.services.terminal.sandbox import PtyCommand
+
+
+class SinkWebSocket:
+    """Counts frames; optionally sleeps per frame like a slow client."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.frames = 0
+        self.bytes = 0
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.frames += 1
+        self.bytes += len(data)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+
+class NaiveRelay:
+    """Baseline: one frame per PTY read, unbounded queue."""
+
+    def __init__(self, pty_process: PtyProcess, websocket: SinkWebSocket):
+        self.pty = pty_process
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.peak_queued = 0
+        self._queued = 0
+
+    def _on_output(self, data: bytes) -> None:
+        self._queued += len(data)
+        self.peak_queued = max(self.peak_queued, self._queued)
+        self.queue.put_nowait(data)
+
+    async def run(self) -> None:
+        self.pty.start_reading(self._on_output)
+        while True:
+            data = await self.queue.get()
+            if not data:
+                return
+            self._queued -= len(data)
+            await self.websocket.send_bytes(data)
+
+
+async def measure(args: argparse.Namespace, naive: bool) -> Dict[str, Any]:
+    """Run the command for the configured time through one relay."""
+    pty_process = await PtyProcess.spawn(PtyCommand(argv=["sh", "-c", args.command]))
+    sink = SinkWebSocket(args.client_delay_ms / 1000)
+    if naive:
+        relay = NaiveRelay(pty_process, sink)
+    else:
+        relay = TerminalRelay(
+            pty_process,
+            sink,
+            flush_interval_ms=args.flush_ms,
+            frame_bytes=args.frame_bytes,
+            max_bytes_per_second=args.rate_limit,
+            compress=args.compress,
+        )
+
+    start = time.perf_counter()
+    task = asyncio.create_task(relay.run())
+    done, _ = await asyncio.wait({task}, timeout=args.seconds)
+    elapsed = time.perf_counter() - start
+    await pty_process.close()
+    if not done:
+        task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    if naive:
+        details = {"peak_buffered_bytes": relay.peak_queued}
+    else:
+        details = dict(relay.stats)
+    payload_bytes = details.get("bytes_out", sink.bytes)
+    return {
+        "frames": sink.frames,
+        "frames_per_sec": round(sink.frames / elapsed, 1),
+        "bytes_per_sec": round(payload_bytes / elapsed),
+        "wire_bytes_per_sec": round(sink.bytes / elapsed),
+        "avg_frame_bytes": round(payload_bytes / sink.frames) if sink.frames else 0,
+        **details,
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Measure the naive baseline and the coalescing relay."""
+    return {
+        "command": args.command,
+        "seconds": args.seconds,
+        "client_delay_ms": args.client_delay_ms,
+        "naive": await measure(args, naive=True),
+        "relay": await measure(args, naive=False),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print a JSON summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--command", default="yes")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--client-delay-ms", type=float, default=0.0)
+    parser.add_argument("--flush-ms", type=float, default=8.0)
+    parser.add_argument("--frame-bytes", type=int, default=16384)
+    parser.add_argument(
+        "--rate-limit", type=float, default=0,
+        help="relay output cap in bytes/sec (0 = uncapped)"
+    )
+    parser.add_argument("--compress", action="store_true")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
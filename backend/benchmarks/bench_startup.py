@@ -0,0 +1,100 @@
+"""
+Linux Daily Tips Backend - Startup Benchmark
+
+Measures per-worker cold start: each run spawns a fresh interpreter (as a
+new uvicorn worker would), imports app.config, runs init_all() and records
+the per-phase timings from the startup state. Requires the PostgreSQL and
+Redis services from docker-compose and a configured .env.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup --runs 10
+    python -m benchmarks.bench_startup --runs 10 --db-mode create
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+
+CHILD_CODE = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+import app.config as config
+imported = time.perf_counter()
+
+async def main():
+    await config.init_all(db_mode=sys.argv[1] or None)
+    ready = time.perf_counter()
+    state = config.get_startup_state().snapshot()
+    await config.cleanup_all()
+    return ready, state
+
+ready, state = asyncio.run(main())
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "init_ms": (ready - imported) * 1000,
+    "total_ms": (ready - start) * 1000,
+    "phases": {name: phase.get("duration_ms") for name, phase in state["phases"].items()},
+}))
+"""
+
+
+def run_once(db_mode: str) -> Dict[str, Any]:
+    """Start one fresh interpreter and return its startup timings."""
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE, db_mode],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # init_all prints progress; the timings are the last line
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """Get median/p95/min/max of a list of milliseconds."""
+    ordered = sorted(values)
+    p95_index = max(0, round(len(ordered) * 0.95) - 1)
+    return {
+        "median": statistics.median(ordered),
+        "p95": ordered[p95_index],
+        "min": ordered[0],
+        "max": ordered[-1],
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print a JSON summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--db-mode", choices=["", "create", "verify"], default="",
+        help="override DB_STARTUP_MODE for the measured workers"
+    )
+    args = parser.parse_args()
+
+    runs = [run_once(args.db_mode) for _ in range(args.runs)]
+
+    metrics: Dict[str, List[float]] = {}
+    for run in runs:
+        for name in ("import_ms", "init_ms", "total_ms"):
+            metrics.setdefault(name, []).append(run[name])
+        for phase, duration in run["phases"].items():
+            if duration is not None:
+                metrics.setdefault(f"phase.{phase}_ms", []).append(duration)
+
+    print(json.dumps(
+        {
+            "runs": args.runs,
+            "db_mode": args.db_mode or "settings",
+            "results": {name: summarize(values) for name, values in metrics.items()},
+        },
+        indent=2,
+    ))
+
+
+if __name__ == "__main__":
+    main()
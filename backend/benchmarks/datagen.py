@@ -0,0 +1,507 @@
+"""
+Linux Daily Tips Backend - Synthetic Data Generator
+
+Fills every table in init-db/01-init-schema.sql with realistic synthetic
+data for benchmarking: tips with markdown content, category arrays and
+terminal_setup documents shaped like the sample data, draft weeks with
+their seven draft tips, terminal sessions, and analytics events skewed
+towards recent days and recent tips. Rows are streamed with COPY, so the
+large scales fit in constant memory apart from the id lists used for
+foreign keys. Output is deterministic for a given --seed.
+
+Requires the PostgreSQL service from docker-compose and a configured
+.env. Refuses to run against a production environment.
+
+Usage (from backend/):
+    python -m benchmarks.datagen --scale small --truncate
+    python -m benchmarks.datagen --scale large --events 10000000
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import random
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+from ipaddress import IPv4Address
+from typing import Any, AsyncIterator, Dict, Iterator, List, Sequence, Tuple
+
+
+# =============================================================================
+# SCALES
+# =============================================================================
+
+@dataclass
+class Scale:
+    """Row counts per table."""
+
+    admins: int
+    tips: int
+    weeks: int
+    sessions: int
+    events: int
+
+
+SCALES = {
+    "small": Scale(admins=5, tips=10000, weeks=200, sessions=5000, events=10000),
+    "medium": Scale(admins=20, tips=100000, weeks=2000, sessions=50000, events=1000000),
+    "large": Scale(admins=50, tips=100000, weeks=5000, sessions=500000, events=10000000),
+}
+
+# Tables in foreign key order; truncated in reverse
+TABLES = (
+    "admin_users",
+    "tips",
+    "draft_weeks",
+    "draft_tips",
+    "terminal_sessions",
+    "analytics_events",
+)
+
+
+# =============================================================================
+# VOCABULARY
+# =============================================================================
+
+COMMANDS = {
+    "file-system": ["ls", "find", "du", "df", "stat", "ln", "mkdir", "rsync"],
+    "navigation": ["cd", "pushd", "popd", "tree", "realpath"],
+    "text-processing": ["grep", "sed", "awk", "cut", "sort", "uniq", "tr", "jq"],
+    "process-management": ["ps", "top", "kill", "nice", "pgrep", "nohup", "jobs"],
+    "system-admin": ["systemctl", "journalctl", "crontab", "useradd", "sudo"],
+    "networking": ["ss", "curl", "dig", "ip", "ping", "traceroute", "nc"],
+    "permissions": ["chmod", "chown", "umask", "setfacl", "getfacl"],
+    "monitoring": ["vmstat", "iostat", "free", "uptime", "watch", "dmesg"],
+    "archiving": ["tar", "gzip", "zstd", "zip", "xz"],
+    "scripting": ["bash", "xargs", "test", "read", "trap", "printf"],
+}
+CATEGORIES = list(COMMANDS)
+EXTRA_CATEGORIES = [
+    "basic-commands", "security", "data-manipulation", "productivity", "shell",
+]
+SEARCH_TERMS = CATEGORIES + [command for group in COMMANDS.values() for command in group]
+TITLE_PREFIXES = [
+    "Getting started with", "Mastering", "Hidden options of", "Practical uses of",
+]
+SETUP_FILES = ["data.csv", "notes.txt", "app.log", "script.sh", "config.ini"]
+DIFFICULTIES = ("beginner", "intermediate", "advanced")
+DIFFICULTY_WEIGHTS = (0.5, 0.35, 0.15)
+FLAGS = ["-a", "-l", "-h", "-r", "-n", "-v", "-i", "-f", "-x", "-z", "--color=auto"]
+PATHS = ["/etc", "/var/log", "/tmp", "/home/user", "/home/user/projects", "/srv/data"]
+PHRASES = [
+    "is one of the most useful tools for everyday work",
+    "saves a lot of time once you know its options",
+    "combines well with pipes and redirection",
+    "is often overlooked but worth learning",
+    "helps when debugging a misbehaving system",
+]
+USER_AGENTS = [
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 Chrome/126.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_5) AppleWebKit/605.1.15 Safari/605.1.15",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:127.0) Gecko/20100101 Firefox/127.0",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_5 like Mac OS X) Mobile/15E148",
+]
+EVENT_TYPES = (
+    "tip_view", "terminal_start", "terminal_command", "search", "tip_share", "copy_command",
+)
+EVENT_WEIGHTS = (0.6, 0.08, 0.12, 0.1, 0.03, 0.07)
+
+
+# =============================================================================
+# DOCUMENT FACTORIES
+# =============================================================================
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    """Draw a version 4 UUID from a seeded generator."""
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _midnight(day: date) -> datetime:
+    """Get the start of a day in UTC."""
+    return datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
+
+
+def _command_line(rng: random.Random, command: str) -> str:
+    """Build a plausible command line."""
+    flags = " ".join(rng.sample(FLAGS, rng.randint(0, 2)))
+    return " ".join(part for part in (command, flags, rng.choice(PATHS)) if part)
+
+
+def _random_command_line(rng: random.Random) -> str:
+    """Build a command line for a random command."""
+    return _command_line(rng, rng.choice(COMMANDS[rng.choice(CATEGORIES)]))
+
+
+def tip_categories(rng: random.Random) -> List[str]:
+    """Pick 1-3 categories, most specific first."""
+    categories = [rng.choice(CATEGORIES)]
+    for _ in range(rng.randint(0, 2)):
+        extra = rng.choice(CATEGORIES + EXTRA_CATEGORIES)
+        if extra not in categories:
+            categories.append(extra)
+    return categories
+
+
+def terminal_setup(rng: random.Random, commands: Sequence[str]) -> Dict[str, Any]:
+    """Build a terminal_setup document like the sample data's."""
+    base = rng.choice(PATHS[3:])
+    files = [
+        {
+            "path": f"{base}/{name}",
+            "content": "\n".join(
+                f"{rng.choice(['alpha', 'beta', 'gamma', 'delta'])},{rng.randint(1, 999)}"
+                for _ in range(rng.randint(1, 6))
+            ),
+        }
+        for name in rng.sample(SETUP_FILES, rng.randint(1, 3))
+    ]
+    return {
+        "directories": [base],
+        "files": files,
+        "commands": list(commands),
+    }
+
+
+def tip_document(index: int, rng: random.Random) -> Dict[str, Any]:
+    """Build one tip's title, content, difficulty, categories and setup."""
+    categories = tip_categories(rng)
+    command = rng.choice(COMMANDS[categories[0]])
+    examples = [_command_line(rng, command) for _ in range(rng.randint(2, 6))]
+    sections = [
+        f"The `{command}` command {rng.choice(PHRASES)}.",
+        "## Basic Usage\n```bash\n" + "\n".join(examples) + "\n```",
+    ]
+    for _ in range(rng.randint(0, 4)):
+        other = rng.choice(COMMANDS[rng.choice(CATEGORIES)])
+        sections.append(
+            f"## Combining with {other}\n"
+            f"Pipe `{command}` into `{other}` when the output {rng.choice(PHRASES)}.\n"
+            f"```bash\n{examples[0]} | {_command_line(rng, other)}\n```"
+        )
+    return {
+        "title": f"{command.capitalize()}: {rng.choice(TITLE_PREFIXES)} {command} #{index}",
+        "content": "\n\n".join(sections),
+        "difficulty": rng.choices(DIFFICULTIES, DIFFICULTY_WEIGHTS)[0],
+        "category": categories,
+        "terminal_setup": terminal_setup(rng, examples[:3]),
+    }
+
+
+# =============================================================================
+# ROW STREAMS
+# =============================================================================
+
+Row = Tuple[Any, ...]
+
+
+def _skewed_index(rng: random.Random, size: int, bias: float = 3.0) -> int:
+    """Pick an index from 0..size-1 favouring the low end."""
+    return min(size - 1, int(size * rng.random() ** bias))
+
+
+def _ip(rng: random.Random) -> str:
+    """Pick a client IP from a pool that repeats like real traffic."""
+    return str(IPv4Address(0x0A000000 + _skewed_index(rng, 50000, 2.0)))
+
+
+class DataGenerator:
+    """Deterministic row streams for every table."""
+
+    def __init__(self, scale: Scale, seed: int = 42, today: date = None):
+        """Initialize generator; ids are derived from the seed."""
+        self.scale = scale
+        self.seed = seed
+        self.today = today or datetime.now(timezone.utc).date()
+        self.now = _midnight(self.today)
+        id_rng = random.Random(seed)
+        self.admin_ids = [_uuid(id_rng) for _ in range(scale.admins)]
+        # Newest tip first, so skewed picks favour recent tips
+        self.tip_ids = [_uuid(id_rng) for _ in range(scale.tips)]
+        self.week_ids = [_uuid(id_rng) for _ in range(scale.weeks)]
+
+    def _rng(self, table: str) -> random.Random:
+        """Get an independent generator per table."""
+        return random.Random(f"{self.seed}:{table}")
+
+    def admin_users(self) -> Iterator[Row]:
+        """Yield admin_users rows."""
+        rng = self._rng("admin_users")
+        for index, admin_id in enumerate(self.admin_ids):
+            yield (
+                admin_id,
+                f"admin{index}",
+                f"admin{index}@example.com",
+                "$2b$12$" + "".join(rng.choices("abcdefghijklmnopqrstuvwxyz0123456789", k=53)),
+                rng.random() > 0.1,
+                index == 0,
+                self.now - timedelta(hours=rng.randint(1, 2000)),
+            )
+
+    def tips(self) -> Iterator[Row]:
+        """Yield tips rows, one per day going back from two weeks ahead."""
+        rng = self._rng("tips")
+        start = self.today + timedelta(days=14)
+        for index, tip_id in enumerate(self.tip_ids):
+            document = tip_document(index, rng)
+            publish_date = start - timedelta(days=index)
+            created_at = _midnight(publish_date - timedelta(days=rng.randint(1, 14)))
+            yield (
+                tip_id,
+                document["title"],
+                document["content"],
+                document["difficulty"],
+                json.dumps(document["category"]),
+                json.dumps(document["terminal_setup"]),
+                publish_date,
+                rng.random() > 0.03,
+                int(rng.paretovariate(1.2) * 20) if publish_date <= self.today else 0,
+                created_at,
+                created_at + timedelta(hours=rng.randint(0, 48)),
+            )
+
+    def _week_start(self, index: int) -> date:
+        """Get the Monday of a draft week, newest first."""
+        monday = self.today - timedelta(days=self.today.weekday())
+        return monday + timedelta(weeks=2 - index)
+
+    def draft_weeks(self) -> Iterator[Row]:
+        """Yield draft_weeks rows; recent weeks are still drafts."""
+        rng = self._rng("draft_weeks")
+        for index, week_id in enumerate(self.week_ids):
+            week_start = self._week_start(index)
+            created_at = _midnight(week_start - timedelta(days=7))
+            if index < 3:
+                status = "draft"
+            else:
+                status = "rejected" if rng.random() < 0.05 else "approved"
+            approved = status != "draft"
+            yield (
+                week_id,
+                week_start,
+                status,
+                "llm",
+                rng.choice(self.admin_ids) if approved and self.admin_ids else None,
+                rng.choice(["Looks good", "Minor edits", None]) if approved else None,
+                created_at,
+                created_at + timedelta(days=rng.randint(1, 5)) if approved else None,
+            )
+
+    def draft_tips(self) -> Iterator[Row]:
+        """Yield seven draft_tips rows per draft week."""
+        rng = self._rng("draft_tips")
+        for index, week_id in enumerate(self.week_ids):
+            created_at = _midnight(self._week_start(index) - timedelta(days=7))
+            for day in range(1, 8):
+                document = tip_document(index * 7 + day, rng)
+                yield (
+                    _uuid(rng),
+                    week_id,
+                    day,
+                    document["title"],
+                    document["content"],
+                    document["difficulty"],
+                    json.dumps(document["category"]),
+                    json.dumps(document["terminal_setup"]),
+                    round(rng.uniform(0.55, 0.99), 2),
+                    created_at,
+                )
+
+    def terminal_sessions(self) -> Iterator[Row]:
+        """Yield terminal_sessions rows; the newest few are still active."""
+        rng = self._rng("terminal_sessions")
+        for index in range(self.scale.sessions):
+            spacing = 90 * 86400 / max(1, self.scale.sessions)
+            created_at = self.now - timedelta(seconds=index * spacing)
+            active = index < min(50, self.scale.sessions // 100)
+            if active:
+                status = "active"
+            else:
+                status = rng.choices(("expired", "terminated"), (0.7, 0.3))[0]
+            commands = [
+                _random_command_line(rng)
+                for _ in range(rng.randint(0, 8))
+            ]
+            yield (
+                _uuid(rng),
+                self.tip_ids[_skewed_index(rng, len(self.tip_ids))] if self.tip_ids else None,
+                f"sandbox_{rng.getrandbits(32):08x}",
+                status,
+                _ip(rng),
+                rng.choice(USER_AGENTS),
+                json.dumps({
+                    "commands_executed": commands,
+                    "last_command": commands[-1] if commands else None,
+                }),
+                created_at,
+                created_at + timedelta(minutes=30),
+                None if active else created_at + timedelta(minutes=rng.randint(1, 30)),
+            )
+
+    def analytics_events(self) -> Iterator[Row]:
+        """Yield analytics_events rows over 90 days, denser towards today."""
+        rng = self._rng("analytics_events")
+        for _ in range(self.scale.events):
+            event_type = rng.choices(EVENT_TYPES, EVENT_WEIGHTS)[0]
+            created_at = self.now - timedelta(seconds=90 * 86400 * rng.random() ** 2)
+            tip_id = (
+                self.tip_ids[_skewed_index(rng, len(self.tip_ids))]
+                if self.tip_ids and event_type != "search" else None
+            )
+            data: Dict[str, Any] = {"user_agent": rng.choice(USER_AGENTS)}
+            if event_type == "tip_view":
+                data["duration"] = int(rng.expovariate(1 / 90))
+                data["referrer"] = rng.choice(["direct", "search", "social", "newsletter"])
+            elif event_type == "search":
+                data["query"] = rng.choice(SEARCH_TERMS)
+                data["results"] = rng.randint(0, 40)
+            elif event_type in ("terminal_command", "copy_command"):
+                data["command"] = _random_command_line(rng)
+            yield (
+                _uuid(rng),
+                event_type,
+                tip_id,
+                _uuid(rng),
+                _ip(rng),
+                data["user_agent"],
+                json.dumps(data),
+                created_at,
+            )
+
+
+COLUMNS = {
+    "admin_users": (
+        "id", "username", "email", "password_hash", "is_active", "is_superuser", "last_login",
+    ),
+    "tips": (
+        "id", "title", "content", "difficulty", "category", "terminal_setup",
+        "publish_date", "is_active", "view_count", "created_at", "updated_at",
+    ),
+    "draft_weeks": (
+        "id", "week_start_date", "status", "generated_by", "approved_by",
+        "approval_notes", "created_at", "approved_at",
+    ),
+    "draft_tips": (
+        "id", "draft_week_id", "day_of_week", "title", "content", "difficulty",
+        "category", "terminal_setup", "llm_confidence_score", "created_at",
+    ),
+    "terminal_sessions": (
+        "id", "tip_id", "container_id", "status", "ip_address", "user_agent",
+        "session_data", "created_at", "expires_at", "terminated_at",
+    ),
+    "analytics_events": (
+        "id", "event_type", "tip_id", "session_id", "ip_address", "user_agent",
+        "event_data", "created_at",
+    ),
+}
+
+
+# =============================================================================
+# LOADING
+# =============================================================================
+
+async def csv_chunks(
+    rows: Iterator[Row],
+    counter: List[int],
+    batch: int = 5000
+) -> AsyncIterator[bytes]:
+    """Render rows as CSV chunks of batch rows each."""
+    # Text COPY lets PostgreSQL parse enum, jsonb and inet values itself;
+    # None becomes an unquoted empty field, which CSV COPY reads as NULL
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(row)
+        counter[0] += 1
+        if counter[0] % batch == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            await asyncio.sleep(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def load(
+    generator: DataGenerator,
+    truncate: bool = False,
+    tables: Sequence[str] = TABLES
+) -> Dict[str, Any]:
+    """Generate and load the selected tables; returns per-table timings."""
+    from app.config.database import get_database
+
+    results: Dict[str, Any] = {}
+    async with get_database().driver_connection() as conn:
+        # Loads run for minutes; lift the pool's statement_timeout for this
+        # session and restore it before the connection goes back to the pool
+        await conn.execute("SET statement_timeout = 0")
+        try:
+            if truncate:
+                await conn.execute(f"TRUNCATE {', '.join(reversed(TABLES))} CASCADE")
+
+            for table in tables:
+                counter = [0]
+                start = time.perf_counter()
+                await conn.copy_to_table(
+                    table,
+                    source=csv_chunks(getattr(generator, table)(), counter),
+                    columns=COLUMNS[table],
+                    format="csv",
+                )
+                elapsed = time.perf_counter() - start
+                results[table] = {
+                    "rows": counter[0],
+                    "seconds": round(elapsed, 2),
+                    "rows_per_second": round(counter[0] / elapsed, 1) if elapsed else 0.0,
+                }
+                print(f"{table}: {counter[0]:,} rows in {elapsed:.1f}s")
+
+            await conn.execute(f"ANALYZE {', '.join(tables)}")
+        finally:
+            await conn.execute("RESET statement_timeout")
+    return results
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Load the requested scale."""
+    from app.config.database import cleanup_database
+    from app.config.settings import get_settings
+
+    if get_settings().is_production:
+        raise SystemExit("Refusing to generate synthetic data in production")
+
+    scale = SCALES[args.scale]
+    for name in asdict(scale):
+        value = getattr(args, name)
+        if value is not None:
+            setattr(scale, name, value)
+
+    generator = DataGenerator(scale, seed=args.seed)
+    try:
+        tables = await load(generator, args.truncate, args.tables or TABLES)
+    finally:
+        await cleanup_database()
+    return {"scale": asdict(scale), "seed": args.seed, "tables": tables}
+
+
+def main() -> None:
+    """Generate data and print a JSON summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    for name in asdict(SCALES["small"]):
+        parser.add_argument(f"--{name}", type=int, help=f"override the scale's {name} count")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--tables", nargs="+", choices=TABLES, help="load only these tables")
+    parser.add_argument(
+        "--truncate", action="store_true", help="empty all tables first (CASCADE)"
+    )
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
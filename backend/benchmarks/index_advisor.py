@@ -0,0 +1,515 @@
+"""
+Linux Daily Tips Backend - Index Advisor
+
+Checks the indexes against the queries the config layer actually runs.
+"analyze" ranks statements from pg_stat_statements, EXPLAINs the hot
+queries (daily tip, archive, search, categories, stats, publish calendar,
+session reaper, admin login), flags sequential scans and explicit sorts,
+and lists redundant indexes found in the catalog: duplicates and leading
+prefixes of other indexes, standalone low-cardinality columns, and
+indexes never scanned. Proposed indexes that are not present yet are
+printed as CONCURRENTLY DDL.
+
+"apply" upgrades the schema to an Alembic revision (by default head),
+whose index migrations build CONCURRENTLY under a lock timeout. "report"
+measures plans and latencies of the hot queries, optionally applies the
+migrations, measures again and writes the comparison to
+benchmarks/results/.
+
+Load the synthetic dataset with benchmarks.datagen first. Requires the
+PostgreSQL service from docker-compose (which preloads
+pg_stat_statements) and a configured .env.
+
+Usage (from backend/):
+    python -m benchmarks.index_advisor analyze
+    python -m benchmarks.index_advisor apply --revision 0002
+    python -m benchmarks.index_advisor report --apply --runs 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from benchmarks.workload import (
+    CATEGORY_SQL,
+    DAILY_TIP_SQL,
+    HISTORY_SQL,
+    SEARCH_SQL,
+    STATS_SQL,
+)
+
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RESULTS_DIR = os.path.join(BENCHMARK_DIR, "results")
+SCHEMAS = ["linux_tips", "public"]
+
+# Sequential scans over fewer rows than this are not worth an index
+SEQ_SCAN_MIN_ROWS = 10000
+
+
+# =============================================================================
+# HOT QUERIES
+# =============================================================================
+
+ADMIN_LOGIN_SQL = """
+SELECT id::text AS id, password_hash, is_active
+FROM admin_users
+WHERE username = :username
+"""
+
+
+def _hot_queries() -> Dict[str, Tuple[str, Callable[[], Dict[str, Any]]]]:
+    """Hot queries by name, with a factory for representative parameters."""
+    from app.services.terminal.reaper import CLAIM_EXPIRED_SQL
+    from app.services.tips.calendar import CALENDAR_TIPS_SQL
+
+    today = datetime.now(timezone.utc).date
+
+    return {
+        "daily_tip": (DAILY_TIP_SQL, lambda: {"today": today()}),
+        "history_first_page": (
+            HISTORY_SQL, lambda: {"today": today(), "limit": 20, "offset": 0}
+        ),
+        "history_deep_page": (
+            HISTORY_SQL, lambda: {"today": today(), "limit": 20, "offset": 980}
+        ),
+        "calendar": (
+            CALENDAR_TIPS_SQL,
+            lambda: {"start": today() - timedelta(days=30), "end": today() + timedelta(days=14)},
+        ),
+        "search": (SEARCH_SQL, lambda: {"query": "grep"}),
+        "category": (CATEGORY_SQL, lambda: {"category": json.dumps(["networking"])}),
+        "stats": (STATS_SQL, lambda: {}),
+        "reaper_claim": (CLAIM_EXPIRED_SQL, lambda: {"batch_size": 100}),
+        "admin_login": (ADMIN_LOGIN_SQL, lambda: {"username": "admin"}),
+    }
+
+
+# =============================================================================
+# PROPOSALS
+# =============================================================================
+
+@dataclass
+class IndexProposal:
+    """An index matched to the hot queries it serves."""
+
+    name: str
+    table: str
+    columns: str
+    include: str = ""
+    where: str = ""
+    serves: Sequence[str] = ()
+    reason: str = ""
+
+    def create_sql(self) -> str:
+        """Render the CONCURRENTLY DDL."""
+        sql = f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {self.name} ON {self.table} ({self.columns})"
+        if self.include:
+            sql += f" INCLUDE ({self.include})"
+        if self.where:
+            sql += f" WHERE {self.where}"
+        return sql
+
+
+PROPOSED_INDEXES = [
+    IndexProposal(
+        name="idx_tips_active_publish_date",
+        table="tips",
+        columns="publish_date DESC, created_at DESC",
+        where="is_active",
+        serves=("daily_tip", "history_first_page", "history_deep_page", "calendar", "stats"),
+        reason=(
+            "every public read filters is_active and orders by publish_date; the "
+            "partial index skips inactive rows and the sort. The reads still fetch "
+            "heap rows (archive pages select id, category and view_count), so no "
+            "columns are INCLUDEd: covering them would need view_count in the "
+            "index, and view counter updates would stop being HOT"
+        ),
+    ),
+    IndexProposal(
+        name="idx_terminal_sessions_active_expires_at",
+        table="terminal_sessions",
+        columns="expires_at",
+        where="status = 'active'",
+        serves=("reaper_claim", "stats"),
+        reason=(
+            "the reaper and the active-session count only read active sessions, "
+            "a small fraction of a table that keeps every expired session"
+        ),
+    ),
+]
+
+
+# =============================================================================
+# CATALOG ANALYSIS
+# =============================================================================
+
+INDEXES_SQL = """
+SELECT
+    ic.relname AS index,
+    c.relname AS table,
+    ARRAY(
+        SELECT a.attname::text
+        FROM unnest(i.indkey) WITH ORDINALITY AS k(attnum, ord)
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+        ORDER BY k.ord
+    ) AS columns,
+    i.indnkeyatts AS key_columns,
+    i.indisunique AS is_unique,
+    i.indisvalid AS is_valid,
+    i.indexprs IS NOT NULL AS has_expressions,
+    pg_get_expr(i.indpred, i.indrelid) AS predicate,
+    am.amname AS method,
+    con.conname AS constraint_name,
+    COALESCE(s.idx_scan, 0) AS scans,
+    pg_relation_size(i.indexrelid) AS bytes
+FROM pg_index i
+JOIN pg_class c ON c.oid = i.indrelid
+JOIN pg_class ic ON ic.oid = i.indexrelid
+JOIN pg_am am ON am.oid = ic.relam
+JOIN pg_namespace n ON n.oid = c.relnamespace
+LEFT JOIN pg_constraint con ON con.conindid = i.indexrelid
+LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = i.indexrelid
+WHERE n.nspname = ANY(:schemas)
+ORDER BY c.relname, ic.relname
+"""
+
+COLUMN_STATS_SQL = """
+SELECT tablename AS table, attname AS column, n_distinct
+FROM pg_stats
+WHERE schemaname = ANY(:schemas)
+"""
+
+TOP_STATEMENTS_SQL = """
+SELECT
+    query,
+    calls,
+    round(total_exec_time::numeric, 3) AS total_ms,
+    round(mean_exec_time::numeric, 3) AS mean_ms,
+    rows,
+    shared_blks_hit,
+    shared_blks_read
+FROM pg_stat_statements
+WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+ORDER BY total_exec_time DESC
+LIMIT :limit
+"""
+
+
+def find_redundant_indexes(
+    indexes: List[Dict[str, Any]],
+    n_distinct: Dict[Tuple[str, str], float]
+) -> List[Dict[str, str]]:
+    """
+    Find indexes that can be dropped.
+
+    Only plain indexes are candidates: indexes backing a constraint, and
+    expression indexes, are never proposed. Unused indexes are reported
+    separately because idx_scan depends on when statistics were reset.
+    """
+    findings = []
+    plain = [
+        index for index in indexes
+        if index["constraint_name"] is None and not index["is_unique"]
+        and not index["has_expressions"]
+    ]
+    for index in plain:
+        keys = index["columns"][:index["key_columns"]]
+        for other in indexes:
+            if other is index or other["table"] != index["table"]:
+                continue
+            if other["method"] != index["method"] or other["has_expressions"]:
+                continue
+            if other["predicate"] != index["predicate"]:
+                continue
+            other_keys = other["columns"][:other["key_columns"]]
+            if other_keys[:len(keys)] != keys:
+                continue
+            # Of two identical plain indexes keep the one sorting first
+            if other_keys == keys and other in plain and other["index"] > index["index"]:
+                continue
+            relation = "duplicates" if other_keys == keys else "is a leading prefix of"
+            findings.append({
+                "index": index["index"],
+                "table": index["table"],
+                "reason": f"{relation} {other['index']}",
+            })
+            break
+        else:
+            if len(keys) == 1 and index["predicate"] is None and index["method"] == "btree":
+                distinct = n_distinct.get((index["table"], keys[0]))
+                if distinct is not None and 0 < distinct <= 2:
+                    findings.append({
+                        "index": index["index"],
+                        "table": index["table"],
+                        "reason": (
+                            f"{keys[0]} has {int(distinct)} distinct values; "
+                            "use it as a partial index predicate instead"
+                        ),
+                    })
+    return findings
+
+
+# =============================================================================
+# PLANS AND LATENCY
+# =============================================================================
+
+def _walk(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield a plan node and all of its descendants."""
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def summarize_plan(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) output to what matters here."""
+    root = plan["Plan"]
+    nodes = list(_walk(root))
+    warnings = []
+    for node in nodes:
+        rows = node.get("Actual Rows", 0) * node.get("Actual Loops", 1)
+        removed = node.get("Rows Removed by Filter", 0)
+        if node["Node Type"] == "Seq Scan" and rows + removed >= SEQ_SCAN_MIN_ROWS:
+            warnings.append(f"seq scan on {node.get('Relation Name')} ({rows + removed} rows)")
+        if node["Node Type"] == "Sort":
+            warnings.append(f"sort on {', '.join(node.get('Sort Key', []))}")
+        if removed and removed > 10 * max(rows, 1):
+            warnings.append(f"{removed} rows removed by filter on {node.get('Relation Name')}")
+    return {
+        "nodes": [node["Node Type"] for node in nodes],
+        "indexes": sorted({node["Index Name"] for node in nodes if "Index Name" in node}),
+        "execution_ms": plan.get("Execution Time"),
+        "planning_ms": plan.get("Planning Time"),
+        "shared_hit": root.get("Shared Hit Blocks", 0),
+        "shared_read": root.get("Shared Read Blocks", 0),
+        "warnings": warnings,
+    }
+
+
+async def explain(conn, sql: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """EXPLAIN ANALYZE a query inside a transaction that is rolled back."""
+    from sqlalchemy import text
+
+    async with conn.begin() as transaction:
+        result = await conn.execute(
+            text("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql), params
+        )
+        plan = result.scalar()
+        await transaction.rollback()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+
+async def measure(conn, sql: str, params: Dict[str, Any], runs: int) -> Dict[str, float]:
+    """Time repeated executions after one warm-up run."""
+    from sqlalchemy import text
+
+    statement = text(sql)
+    timings = []
+    for run in range(runs + 1):
+        async with conn.begin() as transaction:
+            start = time.perf_counter()
+            await conn.execute(statement, params)
+            elapsed = time.perf_counter() - start
+            await transaction.rollback()
+        if run:
+            timings.append(elapsed * 1000)
+    timings.sort()
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[max(0, int(len(timings) * 0.95) - 1)], 3),
+        "min_ms": round(timings[0], 3),
+    }
+
+
+async def profile_queries(runs: int) -> Dict[str, Dict[str, Any]]:
+    """Plan and time every hot query."""
+    from app.config.database import get_database
+
+    results = {}
+    async with get_database().async_engine.connect() as conn:
+        for name, (sql, params_factory) in _hot_queries().items():
+            params = params_factory()
+            try:
+                plan = summarize_plan(await explain(conn, sql, params))
+                latency = await measure(conn, sql, params, runs) if runs else {}
+            except Exception as e:
+                results[name] = {"error": f"{type(e).__name__}: {e}"}
+                continue
+            results[name] = {**plan, **latency}
+    return results
+
+
+# =============================================================================
+# ANALYSIS
+# =============================================================================
+
+async def analyze(limit: int = 15) -> Dict[str, Any]:
+    """Collect statement stats, hot query plans and index findings."""
+    from sqlalchemy import text
+
+    from app.config.database import get_database
+
+    async with get_database().async_engine.connect() as conn:
+        indexes = [
+            dict(row._mapping)
+            for row in await conn.execute(text(INDEXES_SQL), {"schemas": SCHEMAS})
+        ]
+        n_distinct = {}
+        for row in await conn.execute(text(COLUMN_STATS_SQL), {"schemas": SCHEMAS}):
+            # Negative values are a fraction of the row count
+            if row.n_distinct is not None and row.n_distinct > 0:
+                n_distinct[(row.table, row.column)] = row.n_distinct
+
+        try:
+            async with conn.begin_nested():
+                statements = [
+                    dict(row._mapping)
+                    for row in await conn.execute(text(TOP_STATEMENTS_SQL), {"limit": limit})
+                ]
+        except Exception as e:
+            statements = [{"error": f"pg_stat_statements unavailable: {e}"}]
+        await conn.rollback()
+
+    existing = {index["index"] for index in indexes}
+    return {
+        "top_statements": statements,
+        "hot_queries": await profile_queries(runs=0),
+        "proposed": [
+            {
+                "index": proposal.name,
+                "serves": list(proposal.serves),
+                "reason": proposal.reason,
+                "sql": proposal.create_sql(),
+            }
+            for proposal in PROPOSED_INDEXES if proposal.name not in existing
+        ],
+        "redundant": find_redundant_indexes(indexes, n_distinct),
+        "invalid": [index["index"] for index in indexes if not index["is_valid"]],
+        "unused": [
+            {"index": index["index"], "bytes": index["bytes"]}
+            for index in indexes
+            if index["scans"] == 0 and index["constraint_name"] is None
+            and not index["is_unique"]
+        ],
+    }
+
+
+# =============================================================================
+# MIGRATIONS
+# =============================================================================
+
+async def apply_migrations(revision: str) -> Dict[str, Any]:
+    """Upgrade the schema and report the revisions before and after."""
+    from app.config.migrations import get_migration_engine, get_schema_status, upgrade_schema
+
+    engine = get_migration_engine()
+    try:
+        before = await get_schema_status(engine)
+    finally:
+        await engine.dispose()
+    start = time.perf_counter()
+    after = await upgrade_schema(revision)
+    return {
+        "from": list(before.current),
+        "to": list(after.current),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+# =============================================================================
+# REPORT
+# =============================================================================
+
+def compare(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    """Pair before/after measurements per hot query."""
+    comparison = {}
+    for name, old in before.items():
+        new = after.get(name, {})
+        entry = {
+            "indexes_before": old.get("indexes"),
+            "indexes_after": new.get("indexes"),
+            "median_ms_before": old.get("median_ms"),
+            "median_ms_after": new.get("median_ms"),
+            "warnings_before": old.get("warnings"),
+            "warnings_after": new.get("warnings"),
+        }
+        if old.get("median_ms") and new.get("median_ms"):
+            entry["speedup"] = round(old["median_ms"] / new["median_ms"], 2)
+        comparison[name] = entry
+    return comparison
+
+
+async def report(args: argparse.Namespace) -> Dict[str, Any]:
+    """Measure, optionally apply the migration, and measure again."""
+    before = await profile_queries(args.runs)
+    result: Dict[str, Any] = {"before": before}
+    if args.apply:
+        result["applied"] = await apply_migrations(args.revision)
+        result["after"] = await profile_queries(args.runs)
+        result["comparison"] = compare(before, result["after"])
+
+    os.makedirs(args.results_dir, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = os.path.join(args.results_dir, f"index-advisor-{stamp}.json")
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2, default=str)
+    result["written_to"] = path
+    return result
+
+
+# =============================================================================
+# COMMAND LINE
+# =============================================================================
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run a subcommand and clean up."""
+    from app.config.database import cleanup_database
+
+    try:
+        if args.command == "analyze":
+            return await analyze(args.limit)
+        if args.command == "apply":
+            return {"applied": await apply_migrations(args.revision)}
+        return await report(args)
+    finally:
+        await cleanup_database()
+
+
+def main() -> None:
+    """Analyze, apply or report."""
+    from app.config.settings import get_settings
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    analyze_parser = commands.add_parser("analyze", help="propose index changes")
+    analyze_parser.add_argument("--limit", type=int, default=15, help="top statements to list")
+
+    for name, help_text in (
+        ("apply", "apply migrations"),
+        ("report", "compare plans and latency before/after"),
+    ):
+        sub = commands.add_parser(name, help=help_text)
+        sub.add_argument("--revision", default="head", help="Alembic revision to upgrade to")
+    report_parser = commands.choices["report"]
+    report_parser.add_argument("--apply", action="store_true", help="apply migrations between runs")
+    report_parser.add_argument("--runs", type=int, default=30, help="timed runs per query")
+    report_parser.add_argument("--results-dir", default=DEFAULT_RESULTS_DIR)
+    args = parser.parse_args()
+
+    if args.command != "analyze" and get_settings().is_production:
+        parser.error("apply and report change indexes; run them through a reviewed migration")
+
+    print(json.dumps(asyncio.run(run(args)), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,573 @@
+"""
+Linux Daily Tips Backend - Hot Path Benchmark Suite
+
+Micro-benchmarks for the config, database and Redis layers: RedisClient
+operations, rate_limit_check alone and under contention, RedisCache and
+response cache hits, session acquire/release, transaction() overhead,
+cold get_settings() and init_all() startup. Each case runs several
+timed rounds; the median time per operation is compared against the
+committed baseline (benchmarks/baseline.json) and the run fails when a
+case is slower by more than the threshold.
+
+Cases needing PostgreSQL or Redis are skipped when the service is not
+reachable. Record the baseline on the reference machine with
+--update-baseline and commit it. The contention case runs 64 concurrent
+checks and needs REDIS_MAX_CONNECTIONS of at least 64; with a smaller
+pool it errors instead of timing rate_limit_check's fail-open path.
+
+Usage (from backend/):
+    python -m benchmarks.suite                          # run, compare, gate
+    python -m benchmarks.suite --filter redis --threshold 0.25
+    python -m benchmarks.suite --update-baseline
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+DEFAULT_RESULTS_DIR = os.path.join(BENCHMARK_DIR, "results")
+KEY_PREFIX = "bench:suite:"
+
+
+# =============================================================================
+# CASES
+# =============================================================================
+
+# A setup coroutine returns the operation to time; an operation may return
+# the seconds it measured itself, overriding the wall-clock time
+Operation = Callable[[], Any]
+Setup = Callable[["SuiteContext"], Awaitable[Operation]]
+
+
+@dataclass
+class Case:
+    """One benchmark case."""
+
+    name: str
+    setup: Setup
+    requires: Tuple[str, ...] = ()
+    number: int = 1000
+    rounds: int = 7
+    ops_per_call: int = 1
+
+
+CASES: List[Case] = []
+
+
+def case(
+    name: str,
+    requires: Tuple[str, ...] = (),
+    number: int = 1000,
+    rounds: int = 7,
+    ops_per_call: int = 1
+) -> Callable[[Setup], Setup]:
+    """Register a benchmark case."""
+    def register(setup: Setup) -> Setup:
+        CASES.append(Case(name, setup, requires, number, rounds, ops_per_call))
+        return setup
+    return register
+
+
+class SuiteContext:
+    """Services shared by the cases, initialized on first use."""
+
+    def __init__(self):
+        """Initialize empty context."""
+        self.available: Dict[str, Optional[str]] = {}
+
+    async def require(self, service: str) -> Optional[str]:
+        """Make a service available; returns why it is not, or None."""
+        if service not in self.available:
+            try:
+                if service == "redis":
+                    from app.config.redis import init_redis
+
+                    await init_redis()
+                elif service == "db":
+                    from app.config.database import init_database
+
+                    await init_database("verify")
+                self.available[service] = None
+            except Exception as e:
+                self.available[service] = f"{service} unavailable: {e}"
+        return self.available[service]
+
+    async def close(self) -> None:
+        """Close the services that were opened."""
+        if self.available.get("redis", "") is None:
+            from app.config.redis import cleanup_redis, get_redis_client
+
+            redis = get_redis_client().redis
+            keys = [key async for key in redis.scan_iter(match=f"{KEY_PREFIX}*")]
+            if keys:
+                await redis.delete(*keys)
+            await cleanup_redis()
+        if self.available.get("db", "") is None:
+            from app.config.database import cleanup_database
+
+            await cleanup_database()
+
+
+# =============================================================================
+# SETTINGS
+# =============================================================================
+
+@case("settings.get_settings_cold", number=50)
+async def settings_cold(ctx: SuiteContext) -> Operation:
+    """Construct Settings from the environment and .env."""
+    from app.config.settings import get_settings
+
+    def op() -> None:
+        get_settings.cache_clear()
+        get_settings()
+    return op
+
+
+@case("startup.init_all", requires=("db", "redis"), number=1, rounds=5)
+async def startup_init_all(ctx: SuiteContext) -> Operation:
+    """Run init_all() in a fresh interpreter, timed inside the child."""
+    code = (
+        "import asyncio, time\n"
+        "import app.config as config\n"
+        "async def main():\n"
+        "    start = time.perf_counter()\n"
+        "    await config.init_all(db_mode='verify')\n"
+        "    print(time.perf_counter() - start)\n"
+        "    await config.cleanup_all()\n"
+        "asyncio.run(main())\n"
+    )
+    cwd = os.path.dirname(BENCHMARK_DIR)
+
+    async def op() -> float:
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", code, cwd=cwd,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await process.communicate()
+        if process.returncode:
+            raise RuntimeError(f"init_all child exited with {process.returncode}")
+        lines = [line for line in stdout.decode().splitlines() if line.strip()]
+        # The timing is the last line before cleanup output
+        return next(float(line) for line in reversed(lines) if _is_float(line))
+    return op
+
+
+def _is_float(text: str) -> bool:
+    """Check whether a line is a bare number."""
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+# =============================================================================
+# REDIS
+# =============================================================================
+
+@case("redis.get", requires=("redis",))
+async def redis_get(ctx: SuiteContext) -> Operation:
+    """RedisClient.get on an existing key."""
+    from app.config.redis import get_redis_client
+
+    client = get_redis_client()
+    await client.set(f"{KEY_PREFIX}get", "value")
+    return lambda: client.get(f"{KEY_PREFIX}get")
+
+
+@case("redis.set", requires=("redis",))
+async def redis_set(ctx: SuiteContext) -> Operation:
+    """RedisClient.set with a TTL."""
+    from app.config.redis import get_redis_client
+
+    client = get_redis_client()
+    return lambda: client.set(f"{KEY_PREFIX}set", "value", ttl=60)
+
+
+@case("redis.get_json", requires=("redis",))
+async def redis_get_json(ctx: SuiteContext) -> Operation:
+    """RedisClient.get_json of a tip-sized document."""
+    from app.config.redis import get_redis_client
+
+    client = get_redis_client()
+    await client.set_json(f"{KEY_PREFIX}json", _tip_payload(), ttl=300)
+    return lambda: client.get_json(f"{KEY_PREFIX}json")
+
+
+@case("redis.set_json", requires=("redis",))
+async def redis_set_json(ctx: SuiteContext) -> Operation:
+    """RedisClient.set_json of a tip-sized document."""
+    from app.config.redis import get_redis_client
+
+    client = get_redis_client()
+    payload = _tip_payload()
+    return lambda: client.set_json(f"{KEY_PREFIX}json", payload, ttl=300)
+
+
+@case("redis.pipeline_10", requires=("redis",), number=500, ops_per_call=10)
+async def redis_pipeline(ctx: SuiteContext) -> Operation:
+    """Ten SETs in one non-transactional pipeline."""
+    from app.config.redis import get_redis_client
+
+    redis = get_redis_client().redis
+
+    async def op() -> None:
+        async with redis.pipeline(transaction=False) as pipe:
+            for index in range(10):
+                pipe.set(f"{KEY_PREFIX}pipe:{index}", index, ex=60)
+            await pipe.execute()
+    return op
+
+
+@case("redis.rate_limit_check", requires=("redis",))
+async def rate_limit_single(ctx: SuiteContext) -> Operation:
+    """rate_limit_check for one client at a time."""
+    from app.config.redis import get_redis_client
+
+    client = get_redis_client()
+    return lambda: client.rate_limit_check(f"{KEY_PREFIX}rl", 1000000, 60, "single")
+
+
+@case("redis.rate_limit_contention_64", requires=("redis",), number=100, ops_per_call=64)
+async def rate_limit_contention(ctx: SuiteContext) -> Operation:
+    """64 concurrent rate_limit_check calls on the same client key."""
+    from app.config.redis import get_redis_client
+
+    client = get_redis_client()
+    limit = 1000000
+
+    async def op() -> None:
+        results = await asyncio.gather(*(
+            client.rate_limit_check(f"{KEY_PREFIX}rl", limit, 60, "contended")
+            for _ in range(64)
+        ))
+        # rate_limit_check fails open on Redis errors; timing that path
+        # (e.g. a pool smaller than 64) would record a meaningless baseline
+        if any(remaining == limit for _, remaining, _ in results):
+            raise RuntimeError(
+                "rate_limit_check failed open; REDIS_MAX_CONNECTIONS must be at least 64"
+            )
+    return op
+
+
+@case("cache.redis_cache_hit", requires=("redis",))
+async def redis_cache_hit(ctx: SuiteContext) -> Operation:
+    """RedisCache.get on a cached tip."""
+    from app.config.redis import RedisCache, get_redis_client
+
+    cache = RedisCache(get_redis_client(), default_ttl=300)
+    await cache.set(f"{KEY_PREFIX}cache", _tip_payload())
+    return lambda: cache.get(f"{KEY_PREFIX}cache")
+
+
+@case("cache.response_not_modified", requires=("redis",))
+async def response_cache_304(ctx: SuiteContext) -> Operation:
+    """ResponseCache answering If-None-Match from the local level."""
+    from app.config.redis import get_redis_client
+    from app.services.response_cache import ResponseCache
+
+    cache = ResponseCache(get_redis_client())
+    cache.key_prefix = f"{KEY_PREFIX}http:"
+    updated_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    async def builder() -> Tuple[Any, datetime]:
+        return _tip_payload(), updated_at
+
+    _, headers, _ = await cache.serve("tips/today", {}, builder)
+    request = {"if-none-match": headers["ETag"], "accept-encoding": "gzip"}
+    return lambda: cache.serve("tips/today", request, builder)
+
+
+# =============================================================================
+# DATABASE
+# =============================================================================
+
+@case("db.session_acquire_release", requires=("db",), number=500)
+async def session_acquire(ctx: SuiteContext) -> Operation:
+    """get_async_session() with a pool checkout and release."""
+    from app.config.database import get_async_session
+
+    async def op() -> None:
+        async for session in get_async_session():
+            await session.connection()
+    return op
+
+
+@case("db.select_1", requires=("db",), number=500)
+async def select_one(ctx: SuiteContext) -> Operation:
+    """A bare SELECT 1 on a session, for transaction() to compare with."""
+    from sqlalchemy import text
+
+    from app.config.database import get_session_context
+
+    statement = text("SELECT 1")
+
+    async def op() -> None:
+        async with get_session_context() as session:
+            await session.execute(statement)
+    return op
+
+
+@case("db.transaction_select_1", requires=("db",), number=500)
+async def transaction_select_one(ctx: SuiteContext) -> Operation:
+    """SELECT 1 inside transaction(), including the COMMIT."""
+    from sqlalchemy import text
+
+    from app.config.database import transaction
+
+    statement = text("SELECT 1")
+
+    async def op() -> None:
+        async with transaction() as session:
+            await session.execute(statement)
+    return op
+
+
+def _tip_payload() -> Dict[str, Any]:
+    """Get a tip-sized JSON document."""
+    return {
+        "id": "00000000-0000-4000-8000-000000000000",
+        "title": "Basic File Navigation with ls command",
+        "content": "The `ls` command lists directory contents.\n" * 40,
+        "difficulty": "beginner",
+        "category": ["file-system", "navigation", "basic-commands"],
+        "terminal_setup": {"directories": ["/home/user"], "commands": ["ls", "ls -la"]},
+        "publish_date": "2024-01-01",
+        "is_active": True,
+        "view_count": 42,
+    }
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+async def _call(op: Operation) -> Optional[float]:
+    """Call an operation, awaiting it if needed."""
+    result = op()
+    if asyncio.iscoroutine(result) or isinstance(result, asyncio.Future):
+        result = await result
+    return result if isinstance(result, float) else None
+
+
+async def run_case(ctx: SuiteContext, bench: Case, scale: float) -> Dict[str, Any]:
+    """Time one case; returns its statistics or a skip reason."""
+    for service in bench.requires:
+        reason = await ctx.require(service)
+        if reason:
+            return {"skipped": reason}
+
+    op = await bench.setup(ctx)
+    number = max(1, int(bench.number * scale))
+
+    # Warm up connections, caches and code paths
+    for _ in range(max(1, number // 10)):
+        await _call(op)
+
+    per_op: List[float] = []
+    for _ in range(bench.rounds):
+        measured = 0.0
+        start = time.perf_counter()
+        for _ in range(number):
+            seconds = await _call(op)
+            if seconds is not None:
+                measured += seconds
+        elapsed = measured or (time.perf_counter() - start)
+        per_op.append(elapsed / (number * bench.ops_per_call))
+
+    median = statistics.median(per_op)
+    return {
+        "median_us": round(median * 1e6, 3),
+        "mean_us": round(statistics.fmean(per_op) * 1e6, 3),
+        "min_us": round(min(per_op) * 1e6, 3),
+        "stdev_us": round(statistics.stdev(per_op) * 1e6, 3) if len(per_op) > 1 else 0.0,
+        "ops_per_second": round(1 / median, 1) if median else 0.0,
+        "rounds": bench.rounds,
+        "number": number,
+    }
+
+
+def _metadata() -> Dict[str, Any]:
+    """Describe the machine and revision the results come from."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=BENCHMARK_DIR, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+async def run_suite(pattern: str, scale: float) -> Dict[str, Any]:
+    """Run every case matching a glob pattern."""
+    ctx = SuiteContext()
+    results: Dict[str, Any] = {}
+    try:
+        for bench in CASES:
+            if not fnmatch.fnmatch(bench.name, pattern):
+                continue
+            try:
+                results[bench.name] = await run_case(ctx, bench, scale)
+            except Exception as e:
+                results[bench.name] = {"error": f"{type(e).__name__}: {e}"}
+            summary = results[bench.name]
+            print(
+                f"{bench.name:40s} "
+                + (f"{summary['median_us']:12.2f} us" if "median_us" in summary
+                   else summary.get("skipped") or summary.get("error")),
+                file=sys.stderr,
+            )
+    finally:
+        await ctx.close()
+    return {"meta": _metadata(), "results": results}
+
+
+# =============================================================================
+# BASELINE COMPARISON
+# =============================================================================
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Compare median times against a baseline.
+
+    A case regresses when its median is more than threshold (a fraction)
+    slower than the baseline's. A case that raised fails the run like a
+    regression; skipped cases and cases missing from the baseline are
+    reported but never fail it.
+
+    Returns:
+        (rows for the report, whether any case regressed or errored)
+    """
+    rows = []
+    failed = False
+    thresholds = baseline.get("thresholds", {})
+    base_results = baseline.get("results", {})
+    for name, result in current["results"].items():
+        base = base_results.get(name, {})
+        if "error" in result:
+            rows.append({"name": name, "status": "ERROR", "error": result["error"]})
+            failed = True
+            continue
+        if "median_us" not in result or "median_us" not in base:
+            status = "new" if "median_us" in result else "skipped"
+            rows.append({"name": name, "status": status})
+            continue
+        limit = thresholds.get(name, threshold)
+        change = result["median_us"] / base["median_us"] - 1
+        if change > limit:
+            status = "REGRESSED"
+            failed = True
+        elif change < -limit:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({
+            "name": name,
+            "baseline_us": base["median_us"],
+            "current_us": result["median_us"],
+            "change": round(change, 4),
+            "threshold": limit,
+            "status": status,
+        })
+    return rows, failed
+
+
+def print_report(rows: List[Dict[str, Any]]) -> None:
+    """Print the comparison as a table."""
+    print(f"{'case':40s} {'baseline':>12s} {'current':>12s} {'change':>9s}  status")
+    for row in rows:
+        if "change" not in row:
+            detail = f" ({row['error']})" if "error" in row else ""
+            print(f"{row['name']:40s} {'-':>12s} {'-':>12s} {'-':>9s}  {row['status']}{detail}")
+            continue
+        print(
+            f"{row['name']:40s} {row['baseline_us']:10.2f}us {row['current_us']:10.2f}us "
+            f"{row['change']:+8.1%}  {row['status']}"
+        )
+
+
+def main() -> None:
+    """Run the suite, store the results and gate on the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filter", default="*", help="glob over case names")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--threshold", type=float, default=0.15,
+        help="allowed median slowdown as a fraction (0.15 = 15%%)"
+    )
+    parser.add_argument("--output", help="results file (default: results/<timestamp>.json)")
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="multiply iterations per round"
+    )
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--no-gate", action="store_true", help="report regressions and errors without failing"
+    )
+    args = parser.parse_args()
+
+    current = asyncio.run(run_suite(args.filter, args.scale))
+
+    output = args.output or os.path.join(
+        DEFAULT_RESULTS_DIR,
+        datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ") + ".json",
+    )
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(current, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.update_baseline:
+        # Keep per-case thresholds and cases that were not run this time
+        baseline = {"thresholds": {}, "results": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline["meta"] = current["meta"]
+        baseline.setdefault("results", {}).update({
+            name: result for name, result in current["results"].items()
+            if "median_us" in result
+        })
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Baseline updated: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    rows, failed = compare(current, baseline, args.threshold)
+    print_report(rows)
+    if failed and not args.no_gate:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
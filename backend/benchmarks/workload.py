@@ -0,0 +1,343 @@
+"""
+Linux Daily Tips Backend - Mixed Workload Replay
+
+Replays a scripted mix of the operations behind the public site against
+the config layer (database sessions, Redis cache and rate limiter): the
+daily tip, history paging, full-text search, category filters, stats and
+rate-limit checks. A script is a deterministic NDJSON list of operations
+with their parameters and arrival offsets, so the same workload can be
+replayed before and after a change. Reports throughput, per-operation
+latency percentiles and errors.
+
+Load data with benchmarks.datagen first. Requires the PostgreSQL and
+Redis services from docker-compose and a configured .env.
+
+Usage (from backend/):
+    python -m benchmarks.workload generate --ops 50000 --rate 500 > workload.ndjson
+    python -m benchmarks.workload run --script workload.ndjson --concurrency 32
+    python -m benchmarks.workload run --ops 20000 --concurrency 16   # generated on the fly
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from benchmarks.datagen import CATEGORIES, SEARCH_TERMS
+
+
+# =============================================================================
+# OPERATIONS
+# =============================================================================
+
+DAILY_TIP_SQL = """
+SELECT to_jsonb(t) AS tip
+FROM tips t
+WHERE is_active AND publish_date <= :today
+ORDER BY publish_date DESC, created_at DESC
+LIMIT 1
+"""
+
+HISTORY_SQL = """
+SELECT id::text AS id, title, difficulty, category, publish_date, view_count
+FROM tips
+WHERE is_active AND publish_date <= :today
+ORDER BY publish_date DESC
+LIMIT :limit OFFSET :offset
+"""
+
+# Matches the expression of idx_tips_search
+SEARCH_SQL = """
+SELECT id::text AS id, title, publish_date,
+       ts_rank(to_tsvector('english', title || ' ' || content), query) AS rank
+FROM tips, plainto_tsquery('english', :query) query
+WHERE is_active AND to_tsvector('english', title || ' ' || content) @@ query
+ORDER BY rank DESC
+LIMIT 20
+"""
+
+CATEGORY_SQL = """
+SELECT id::text AS id, title, publish_date
+FROM tips
+WHERE is_active AND category @> CAST(:category AS jsonb)
+ORDER BY publish_date DESC
+LIMIT 20
+"""
+
+STATS_SQL = """
+SELECT
+    (SELECT count(*) FROM tips WHERE is_active) AS tips,
+    (SELECT count(*) FROM analytics_events
+     WHERE created_at > CURRENT_TIMESTAMP - INTERVAL '7 days') AS events_7d,
+    (SELECT count(*) FROM terminal_sessions WHERE status = 'active') AS active_terminals
+"""
+
+# Relative weights of the default mix
+DEFAULT_MIX = {
+    "daily_tip": 40,
+    "history": 20,
+    "search": 12,
+    "category": 5,
+    "stats": 5,
+    "rate_limit": 18,
+}
+
+
+async def _query(sql: str, params: Dict[str, Any], one: bool = False) -> Any:
+    """Run a read query through the replica-aware session context."""
+    from sqlalchemy import text
+
+    from app.config.database import get_session_context
+
+    async with get_session_context(readonly=True) as session:
+        result = await session.execute(text(sql), params)
+        return result.first() if one else result.all()
+
+
+async def op_daily_tip(params: Dict[str, Any]) -> None:
+    """Resolve today's tip cache-aside, as the homepage does."""
+    from app.config.redis import get_redis_cache
+    from app.services.tips.approval import DAILY_TIP_CACHE_KEY
+
+    today = datetime.now(timezone.utc).date()
+    cache = get_redis_cache()
+    key = DAILY_TIP_CACHE_KEY.format(day=today.isoformat())
+    if params.get("cached", True) and await cache.get(key) is not None:
+        return
+    row = await _query(DAILY_TIP_SQL, {"today": today}, one=True)
+    if row is not None and params.get("cached", True):
+        await cache.set(key, row.tip)
+
+
+async def op_history(params: Dict[str, Any]) -> None:
+    """Fetch one page of the tip archive."""
+    await _query(HISTORY_SQL, {
+        "today": datetime.now(timezone.utc).date(),
+        "limit": params["limit"],
+        "offset": params["page"] * params["limit"],
+    })
+
+
+async def op_search(params: Dict[str, Any]) -> None:
+    """Run a full-text search."""
+    await _query(SEARCH_SQL, {"query": params["query"]})
+
+
+async def op_category(params: Dict[str, Any]) -> None:
+    """List tips in a category."""
+    await _query(CATEGORY_SQL, {"category": json.dumps([params["category"]])})
+
+
+async def op_stats(params: Dict[str, Any]) -> None:
+    """Compute the public stats counters."""
+    await _query(STATS_SQL, {}, one=True)
+
+
+async def op_rate_limit(params: Dict[str, Any]) -> None:
+    """Check the API rate limit for a client IP."""
+    from app.config.redis import get_redis_client
+    from app.config.settings import get_runtime_settings
+
+    runtime = get_runtime_settings()
+    await get_redis_client().rate_limit_check(
+        "workload", runtime.rate_limit_requests, runtime.rate_limit_period, params["ip"]
+    )
+
+
+OPERATIONS: Dict[str, Callable[[Dict[str, Any]], Awaitable[None]]] = {
+    "daily_tip": op_daily_tip,
+    "history": op_history,
+    "search": op_search,
+    "category": op_category,
+    "stats": op_stats,
+    "rate_limit": op_rate_limit,
+}
+
+
+# =============================================================================
+# SCRIPTS
+# =============================================================================
+
+def _params(op: str, rng: random.Random, cached: bool) -> Dict[str, Any]:
+    """Draw parameters for one operation."""
+    if op == "daily_tip":
+        return {"cached": cached}
+    if op == "history":
+        # Most visitors stay on the first pages
+        return {"page": min(49, int(rng.expovariate(0.7))), "limit": 20}
+    if op == "search":
+        return {"query": " ".join(rng.sample(SEARCH_TERMS, rng.choice((1, 1, 2))))}
+    if op == "category":
+        return {"category": rng.choice(CATEGORIES)}
+    if op == "rate_limit":
+        return {"ip": f"10.0.{rng.randint(0, 255)}.{rng.randint(1, 254)}"}
+    return {}
+
+
+def generate_script(
+    ops: int,
+    seed: int = 42,
+    rate: float = 0.0,
+    mix: Optional[Dict[str, int]] = None,
+    cached: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Build a deterministic workload script.
+
+    With a rate, arrival offsets follow a Poisson process at that many
+    operations per second; without one, operations run back to back.
+    """
+    rng = random.Random(seed)
+    mix = mix or DEFAULT_MIX
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    script = []
+    at = 0.0
+    for _ in range(ops):
+        op = rng.choices(names, weights)[0]
+        if rate > 0:
+            at += rng.expovariate(rate)
+        script.append({"op": op, "at": round(at, 6), "params": _params(op, rng, cached)})
+    return script
+
+
+def read_script(path: str) -> List[Dict[str, Any]]:
+    """Read an NDJSON workload script."""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# =============================================================================
+# REPLAY
+# =============================================================================
+
+def _summarize(latencies: Iterable[float]) -> Dict[str, float]:
+    """Get count and latency percentiles in milliseconds."""
+    values = sorted(latencies)
+    if not values:
+        return {"count": 0}
+    if len(values) > 1:
+        cuts = statistics.quantiles(values, n=100, method="inclusive")
+    else:
+        cuts = values * 99
+    return {
+        "count": len(values),
+        "mean_ms": round(statistics.fmean(values) * 1000, 3),
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3),
+    }
+
+
+async def replay(
+    script: List[Dict[str, Any]],
+    concurrency: int = 16,
+    paced: bool = True
+) -> Dict[str, Any]:
+    """
+    Replay a script with a fixed number of concurrent clients.
+
+    When paced, operations wait for their arrival offset, so latency
+    includes any queueing behind slow operations (open loop).
+    """
+    latencies: Dict[str, List[float]] = {name: [] for name in OPERATIONS}
+    errors: Dict[str, int] = {}
+    position = iter(script)
+    start = time.perf_counter()
+
+    async def client() -> None:
+        for entry in position:
+            due = start + entry["at"]
+            if paced and entry["at"]:
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            began = due if paced and entry["at"] else time.perf_counter()
+            try:
+                await OPERATIONS[entry["op"]](entry["params"])
+            except Exception as e:
+                key = f"{entry['op']}: {type(e).__name__}"
+                errors[key] = errors.get(key, 0) + 1
+                continue
+            latencies[entry["op"]].append(time.perf_counter() - began)
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    completed = sum(len(values) for values in latencies.values())
+    return {
+        "operations": len(script),
+        "completed": completed,
+        "seconds": round(elapsed, 3),
+        "throughput": round(completed / elapsed, 1) if elapsed else 0.0,
+        "overall": _summarize(value for values in latencies.values() for value in values),
+        "by_operation": {
+            name: _summarize(values) for name, values in latencies.items() if values
+        },
+        "errors": errors,
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Initialize services, replay the workload and clean up."""
+    from app.config.database import cleanup_database
+    from app.config.redis import cleanup_redis
+
+    if args.script:
+        script = read_script(args.script)
+    else:
+        script = generate_script(args.ops, args.seed, args.rate, cached=not args.no_cache)
+
+    try:
+        if args.warmup:
+            await replay(generate_script(args.warmup, args.seed + 1), args.concurrency, False)
+        results = await replay(script, args.concurrency, paced=not args.unpaced)
+    finally:
+        await cleanup_database()
+        await cleanup_redis()
+    results["concurrency"] = args.concurrency
+    return results
+
+
+def main() -> None:
+    """Generate a script or replay a workload."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="write a workload script to stdout")
+    replay_parser = commands.add_parser("run", help="replay a workload")
+    for sub in (generate, replay_parser):
+        sub.add_argument("--ops", type=int, default=10000)
+        sub.add_argument("--seed", type=int, default=42)
+        sub.add_argument(
+            "--rate", type=float, default=0.0,
+            help="arrival rate in ops/sec (0 = back to back)"
+        )
+        sub.add_argument(
+            "--no-cache", action="store_true", help="resolve the daily tip from the database"
+        )
+    replay_parser.add_argument("--script", help="NDJSON script from 'generate'")
+    replay_parser.add_argument("--concurrency", type=int, default=16)
+    replay_parser.add_argument("--warmup", type=int, default=500, help="unmeasured ops first")
+    replay_parser.add_argument(
+        "--unpaced", action="store_true", help="ignore arrival offsets (closed loop)"
+    )
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        script = generate_script(args.ops, args.seed, args.rate, cached=not args.no_cache)
+        for entry in script:
+            sys.stdout.write(json.dumps(entry) + "\n")
+        return
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pg_trgm";  -- For full-text search performance
 CREATE EXTENSION IF NOT EXISTS "btree_gin"; -- For JSONB indexing
+CREATE EXTENSION IF NOT EXISTS "pg_stat_statements"; -- Query statistics (index advisor)
 
 -- Create database schema
 CREATE SCHEMA IF NOT EXISTS linux_tips;
@@ -98,8 +99,10 @@ CREATE TABLE analytics_events (
 -- Create indexes for performance optimization
 -- Tips table indexes
 CREATE INDEX idx_tips_publish_date ON tips(publish_date DESC);
+-- Daily tip, archive pages and the publish calendar: active tips by date
+CREATE INDEX idx_tips_active_publish_date ON tips(publish_date DESC, created_at DESC)
+    WHERE is_active;
 CREATE INDEX idx_tips_difficulty ON tips(difficulty);
-CREATE INDEX idx_tips_is_active ON tips(is_active);
 CREATE INDEX idx_tips_category_gin ON tips USING gin(category);
 CREATE INDEX idx_tips_search ON tips USING gin(to_tsvector('english', title || ' ' || content));
 
@@ -108,20 +111,18 @@ CREATE INDEX idx_draft_weeks_status ON draft_weeks(status);
 CREATE INDEX idx_draft_weeks_week_start ON draft_weeks(week_start_date);
 CREATE UNIQUE INDEX idx_draft_weeks_unique_week ON draft_weeks(week_start_date) WHERE status != 'rejected';
 
--- Draft tips indexes
-CREATE INDEX idx_draft_tips_week_id ON draft_tips(draft_week_id);
+-- Draft tips indexes (lookups by week use idx_draft_tips_unique_day)
 CREATE INDEX idx_draft_tips_day ON draft_tips(day_of_week);
 CREATE UNIQUE INDEX idx_draft_tips_unique_day ON draft_tips(draft_week_id, day_of_week);
 
--- Admin users indexes
-CREATE INDEX idx_admin_users_username ON admin_users(username);
-CREATE INDEX idx_admin_users_email ON admin_users(email);
+-- Admin users indexes (username and email are indexed by their UNIQUE constraints)
 CREATE INDEX idx_admin_users_is_active ON admin_users(is_active);
 
 -- Terminal sessions indexes
 CREATE INDEX idx_terminal_sessions_tip_id ON terminal_sessions(tip_id);
-CREATE INDEX idx_terminal_sessions_status ON terminal_sessions(status);
-CREATE INDEX idx_terminal_sessions_expires_at ON terminal_sessions(expires_at);
+-- Expiry sweeps and active-session counts only look at active sessions
+CREATE INDEX idx_terminal_sessions_active_expires_at ON terminal_sessions(expires_at)
+    WHERE status = 'active';
 
 -- Analytics events indexes
 CREATE INDEX idx_analytics_events_type ON analytics_events(event_type);
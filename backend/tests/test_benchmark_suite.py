@@ -0,0 +1,28 @@
+"""
+Linux Daily Tips Backend - Benchmark Suite Gate Tests
+"""
+
+from benchmarks.suite import compare
+
+
+def test_compare_fails_on_errors_and_regressions_only():
+    baseline = {
+        "thresholds": {"settings.get_settings_cold": 0.25},
+        "results": {
+            "settings.get_settings_cold": {"median_us": 100.0},
+            "redis.get": {"median_us": 10.0},
+        },
+    }
+    current = {"results": {
+        "settings.get_settings_cold": {"median_us": 120.0},
+        "redis.get": {"skipped": "redis unavailable: connection refused"},
+        "db.select_1": {"median_us": 50.0},
+    }}
+    rows, failed = compare(current, baseline, threshold=0.15)
+    assert [row["status"] for row in rows] == ["ok", "skipped", "new"]
+    assert not failed
+
+    current["results"]["startup.init_all"] = {"error": "RuntimeError: child exited with 1"}
+    rows, failed = compare(current, baseline, threshold=0.15)
+    assert rows[-1]["status"] == "ERROR"
+    assert failed
@@ -0,0 +1,125 @@
+"""
+Linux Daily Tips Backend - Migration Helper Tests
+"""
+
+import importlib.util
+import os
+from contextlib import contextmanager
+from typing import Any, List, Optional
+
+import pytest
+
+
+class LockNotAvailable(Exception):
+    """Driver error carrying SQLSTATE 55P03."""
+
+    sqlstate = "55P03"
+
+
+class FakeBind:
+    """Synchronous connection inside an autocommit block with a fake pg_index."""
+
+    def __init__(self, validity: List[Optional[bool]], lock_timeouts: int = 0):
+        self.executed: List[str] = []
+        self._validity = list(validity)
+        self._lock_timeouts = lock_timeouts
+
+    def get_execution_options(self):
+        return {"isolation_level": "AUTOCOMMIT"}
+
+    def scalar(self, statement, params: Optional[Any] = None):
+        self.executed.append(str(statement))
+        return self._validity.pop(0)
+
+    def execute(self, statement, params: Optional[Any] = None):
+        from sqlalchemy import exc
+
+        sql = str(statement)
+        self.executed.append(sql)
+        if sql.startswith("CREATE") and self._lock_timeouts:
+            self._lock_timeouts -= 1
+            raise exc.OperationalError(sql, params, LockNotAvailable("lock timeout"))
+
+
+@pytest.fixture
+def migration_bind(monkeypatch):
+    """Install a FakeBind as alembic's op bind."""
+    from alembic import op
+
+    from app.config import migrations
+
+    def install(bind: FakeBind) -> FakeBind:
+        class Context:
+            @contextmanager
+            def autocommit_block(self):
+                yield
+
+        monkeypatch.setattr(op, "get_bind", lambda: bind, raising=False)
+        monkeypatch.setattr(op, "get_context", lambda: Context(), raising=False)
+        monkeypatch.setattr(migrations.time, "sleep", lambda seconds: None)
+        return bind
+
+    return install
+
+
+def test_create_index_drops_invalid_index_before_each_attempt(migration_bind):
+    from app.config.migrations import create_index_concurrently
+
+    # Invalid before the first attempt, invalid again after a timed-out
+    # attempt, then valid once the build returns
+    bind = migration_bind(FakeBind([False, False, True], lock_timeouts=1))
+
+    create_index_concurrently("ix_events_time", "analytics_events", ["occurred_at"])
+
+    statements = [sql.split(" ")[0] for sql in bind.executed if not sql.startswith(("SET", "RESET"))]
+    assert statements == ["SELECT", "DROP", "CREATE", "SELECT", "DROP", "CREATE", "SELECT"]
+
+
+def test_create_index_raises_when_index_invalid_after_build(migration_bind):
+    from app.config.migrations import create_index_concurrently
+
+    migration_bind(FakeBind([None, False]))
+
+    with pytest.raises(RuntimeError, match="invalid"):
+        create_index_concurrently("ix_events_time", "analytics_events", ["occurred_at"])
+
+
+def test_autocommit_lock_timeout_is_reset_after_each_attempt(migration_bind):
+    from app.config.migrations import execute_with_lock_timeout
+
+    bind = migration_bind(FakeBind([], lock_timeouts=1))
+
+    execute_with_lock_timeout("CREATE INDEX CONCURRENTLY ix ON t (c)", lock_timeout="2s")
+
+    create = "CREATE INDEX CONCURRENTLY ix ON t (c)"
+    assert bind.executed == [
+        "SET lock_timeout = '2s'", create, "RESET lock_timeout",
+        "SET lock_timeout = '2s'", create, "RESET lock_timeout",
+    ]
+
+
+def _baseline_revision():
+    path = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "alembic", "versions", "0001_baseline.py",
+    )
+    spec = importlib.util.spec_from_file_location("baseline_revision", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_baseline_script_drops_psql_meta_commands():
+    baseline = _baseline_revision()
+    with open(baseline.INIT_SCHEMA) as f:
+        script = baseline._strip_psql_meta_commands(f.read())
+
+    assert "\\echo" not in script
+    assert "CREATE TABLE" in script
+
+
+def test_baseline_downgrade_explains_why_it_refuses():
+    from alembic.util import CommandError
+
+    with pytest.raises(CommandError, match="baseline"):
+        _baseline_revision().downgrade()
@@ -0,0 +1,82 @@
+"""
+Linux Daily Tips Backend - Request Profiling Tests
+"""
+
+import os
+
+import pytest
+
+from app.config.profiling import ProfilingMiddleware, RequestProfiler
+from app.config.settings import get_settings
+
+
+@pytest.fixture
+def profiler(tmp_path) -> RequestProfiler:
+    settings = get_settings().copy(update={
+        "profiling_enabled": True,
+        "profiling_sample_rate": 1.0,
+        "profiling_slow_request_ms": 0.0,
+        "profiling_capture_dir": str(tmp_path),
+        "profiling_max_captures": 2,
+    })
+    return RequestProfiler(settings)
+
+
+async def _receive():
+    return {"type": "http.request", "body": b""}
+
+
+def _scope(path: str = "/api/tips/today"):
+    return {"type": "http", "method": "GET", "path": path}
+
+
+async def test_successful_request_gets_server_timing(profiler):
+    sent = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def send(message):
+        sent.append(message)
+
+    await ProfilingMiddleware(app, profiler)(_scope(), _receive, send)
+
+    headers = dict(sent[0]["headers"])
+    assert headers[b"server-timing"].startswith(b"db;dur=")
+    assert profiler.get_report()["requests"]["count"] == 1
+
+
+async def test_failed_request_is_recorded_and_captured(profiler):
+    async def app(scope, receive, send):
+        raise RuntimeError("handler failed")
+
+    async def send(message):
+        pass
+
+    with pytest.raises(RuntimeError):
+        await ProfilingMiddleware(app, profiler)(_scope(), _receive, send)
+
+    report = profiler.get_report()
+    assert report["requests"]["count"] == 1
+    assert report["slow_requests"] == 1
+    (capture,) = report["captures"]
+    assert os.path.exists(capture["file"])
+    # The capture slot is free again for the next request
+    assert profiler._capturing is False
+
+
+async def test_pruning_keeps_files_it_did_not_write(profiler, tmp_path):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+
+    async def send(message):
+        pass
+
+    (tmp_path / "README.txt").write_text("notes")
+    for path in ("/a", "/b", "/c"):
+        await ProfilingMiddleware(app, profiler)(_scope(path), _receive, send)
+
+    names = sorted(os.listdir(tmp_path))
+    assert "README.txt" in names
+    assert len(names) == profiler.max_captures + 1
@@ -0,0 +1,109 @@
+"""
+Linux Daily Tips Backend - Publish Calendar Tests
+"""
+
+import asyncio
+import json
+import time
+from datetime import date, timedelta
+
+from app.services.tips import calendar as calendar_module
+from app.services.tips.calendar import PublishCalendar
+
+
+async def _fake_query(start: date, end: date):
+    """One tip per day of the requested window."""
+    days = {}
+    day = start
+    while day <= end:
+        days[day.isoformat()] = f"tip-{day.isoformat()}"
+        day += timedelta(days=1)
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "built_at": time.time(),
+        "days": days,
+        "tips": {tip_id: {"id": tip_id} for tip_id in days.values()},
+    }
+
+
+async def _wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+async def test_loop_starts_and_rolls_over_at_midnight(redis_client, monkeypatch):
+    today = {"value": date(2026, 3, 10)}
+    monkeypatch.setattr(calendar_module, "utc_today", lambda: today["value"])
+
+    calendar = PublishCalendar(redis_client)
+    calendar.resync_interval = 0.05
+    monkeypatch.setattr(calendar, "_query", _fake_query)
+    # Keep the pre-warm (which writes through the global cache) out of reach
+    monkeypatch.setattr(calendar, "_seconds_until_midnight", lambda: 3600.0)
+
+    calendar.start()
+    try:
+        await _wait_for(lambda: calendar.covers(date(2026, 3, 10)))
+        assert calendar.window_start == date(2026, 3, 10) - timedelta(days=calendar.past_days)
+        assert calendar.get_tip_id(date(2026, 3, 10)) == "tip-2026-03-10"
+        first_version = calendar.version
+
+        today["value"] = date(2026, 3, 11)
+        await _wait_for(lambda: calendar.version > first_version)
+        assert calendar.window_start == date(2026, 3, 11) - timedelta(days=calendar.past_days)
+        assert calendar.window_end == date(2026, 3, 11) + timedelta(days=calendar.future_days)
+        assert calendar.get_status()["start"] == calendar.window_start.isoformat()
+    finally:
+        await calendar.stop()
+
+
+async def test_rebuild_reruns_when_another_worker_lost_the_lock(redis_client):
+    holder = PublishCalendar(redis_client)
+    loser = PublishCalendar(redis_client)
+    started = asyncio.Event()
+    release = asyncio.Event()
+    queries = []
+
+    async def slow_query(start: date, end: date):
+        queries.append(start)
+        if len(queries) == 1:
+            # The loser's change lands after this query read the tips
+            started.set()
+            await release.wait()
+        return await _fake_query(start, end)
+
+    holder._query = slow_query
+    loser._query = _fake_query
+
+    rebuilding = asyncio.create_task(holder.rebuild(date(2026, 3, 10)))
+    await started.wait()
+    losing = asyncio.create_task(loser.rebuild(date(2026, 3, 10)))
+    await asyncio.sleep(0.05)
+    release.set()
+
+    assert await rebuilding is True
+    assert await losing is False
+    # The holder saw the dirty flag and rebuilt once more
+    assert len(queries) == 2
+    assert holder.version == loser.version == 2
+    assert not await redis_client.redis.exists(f"{holder.key}:lock", f"{holder.key}:dirty")
+
+
+async def test_warm_caches_today_and_tomorrow(redis_client, monkeypatch):
+    from app.config import redis as redis_module
+
+    monkeypatch.setattr(calendar_module, "utc_today", lambda: date(2026, 3, 10))
+    monkeypatch.setattr(redis_module, "get_redis_client", lambda: redis_client)
+    calendar = PublishCalendar(redis_client)
+    monkeypatch.setattr(calendar, "_query", _fake_query)
+
+    await calendar.warm()
+
+    for day in ("2026-03-10", "2026-03-11"):
+        cached = await redis_client.redis.get(f"tips:daily:{day}")
+        assert json.loads(cached) == {"id": f"tip-{day}"}
+    assert await redis_client.redis.ttl("tips:daily:2026-03-11") > 86400
+    assert not await redis_client.redis.exists("tips:daily:2026-03-12")
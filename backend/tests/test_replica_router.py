@@ -0,0 +1,31 @@
+"""
+Linux Daily Tips Backend - Read Replica Routing Tests
+"""
+
+from app.config.database import ReplicaRouter
+
+
+def _router(lags) -> ReplicaRouter:
+    router = ReplicaRouter([object()] * len(lags), max_lag_seconds=10.0, check_interval=5.0)
+    measured = iter(lags)
+
+    async def measure_lag(engine) -> float:
+        return next(measured)
+
+    router._measure_lag = measure_lag
+    return router
+
+
+async def test_choose_uses_background_measurements_only():
+    router = _router([2.0, 30.0])
+
+    # Nothing measured yet: reads go to the primary
+    assert router.choose() is None
+
+    await router.refresh_lag()
+    assert router.choose() == 0
+    assert router.choose() == 0
+
+    # Measurements the refresh task stopped updating are not trusted
+    router._checked_at -= router.check_interval * router.STALE_AFTER_INTERVALS + 1
+    assert router.choose() is None
@@ -0,0 +1,128 @@
+"""
+Linux Daily Tips Backend - HTTP Response Cache Tests
+"""
+
+import asyncio
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from app.services.response_cache import ResponseCache, choose_encoding
+
+UPDATED_AT = datetime(2026, 3, 10, 12, 0, 0, 500000, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def cache(redis_client) -> ResponseCache:
+    cache = ResponseCache(redis_client)
+    cache.min_compress_bytes = 0
+    return cache
+
+
+def _builder(payload, *etag_parts):
+    calls = []
+
+    async def builder():
+        calls.append(payload)
+        if etag_parts:
+            return payload, UPDATED_AT, etag_parts
+        return payload, UPDATED_AT
+    builder.calls = calls
+    return builder
+
+
+async def test_conditional_requests_get_304_without_building(cache):
+    builder = _builder({"title": "Using ls"})
+    status, headers, body = await cache.serve("tips/today", {}, builder, tags=["tips"])
+    assert status == 200 and json.loads(body) == {"title": "Using ls"}
+
+    etag = headers["ETag"]
+    for conditional in (
+        {"if-none-match": etag},
+        {"if-none-match": f'W/{etag}, "other"'},
+        {"if-modified-since": format_datetime(UPDATED_AT, usegmt=True)},
+    ):
+        status, _, body = await cache.serve("tips/today", conditional, builder)
+        assert (status, body) == (304, b"")
+
+    # If-None-Match wins over a matching If-Modified-Since
+    status, _, _ = await cache.serve("tips/today", {
+        "if-none-match": '"other"',
+        "if-modified-since": format_datetime(UPDATED_AT + timedelta(days=1), usegmt=True),
+    }, builder)
+    assert status == 200
+    assert len(builder.calls) == 1
+    assert cache.get_stats()["not_modified"] == 3
+
+
+@pytest.mark.parametrize("accept, available, expected", [
+    ("gzip, deflate, br", ("identity", "gzip", "br"), "br"),
+    ("gzip, br;q=0", ("identity", "gzip", "br"), "gzip"),
+    ("*", ("identity", "gzip"), "gzip"),
+    ("gzip;q=0, identity", ("identity", "gzip"), "identity"),
+    (None, ("identity", "gzip", "br"), "identity"),
+])
+def test_choose_encoding(accept, available, expected):
+    assert choose_encoding(accept, available) == expected
+
+
+async def test_encoded_variants_share_one_version(cache):
+    builder = _builder({"title": "Using ls"})
+    _, identity, plain = await cache.serve("tips/today", {}, builder)
+    status, headers, body = await cache.serve(
+        "tips/today", {"accept-encoding": "gzip"}, builder
+    )
+
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(body) == plain
+    assert headers["ETag"] == identity["ETag"][:-1] + '-gz"'
+    # The gzip ETag revalidates the identity representation too
+    status, _, _ = await cache.serve("tips/today", {"if-none-match": headers["ETag"]}, builder)
+    assert status == 304
+
+
+async def test_builder_etag_parts_change_the_etag(cache):
+    _, first, _ = await cache.serve("tips", {}, _builder([1, 2], 2), tags=["tips"])
+    await cache.invalidate_tag("tips")
+    _, second, _ = await cache.serve("tips", {}, _builder([1, 2, 3], 3), tags=["tips"])
+
+    assert first["ETag"] != second["ETag"]
+
+
+async def test_build_started_before_invalidation_is_not_stored(cache, redis_client):
+    other_worker = ResponseCache(redis_client)
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_builder():
+        started.set()
+        await release.wait()
+        return {"title": "before the change"}, UPDATED_AT
+
+    building = asyncio.create_task(cache.build("tips/today", slow_builder, ["tips"]))
+    await started.wait()
+    assert await other_worker.invalidate_tag("tips") == 0
+    release.set()
+
+    entry = await building
+    # The caller still gets its response, but nothing is cached
+    assert json.loads(entry.bodies["identity"]) == {"title": "before the change"}
+    assert await cache.get("tips/today") is None
+    assert cache.get_stats()["stale_discarded"] == 1
+
+    await cache.build("tips/today", _builder({"title": "after"}), ["tips"])
+    assert await other_worker.get("tips/today") is not None
+
+
+async def test_invalidate_tag_drops_entries_everywhere(cache):
+    await cache.serve("tips/today", {}, _builder({"day": 1}), tags=["tips"])
+    await cache.serve("stats", {}, _builder({"total": 1}), tags=["stats"])
+
+    assert await cache.invalidate_tag("tips") == 1
+
+    assert await cache.get("tips/today") is None
+    assert await cache.get("stats") is not None
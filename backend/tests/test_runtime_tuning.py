@@ -0,0 +1,74 @@
+"""
+Linux Daily Tips Backend - Runtime Tuning Tests
+"""
+
+import asyncio
+import dataclasses
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import pool_sizing
+from app.config.pool_sizing import RedisPoolTarget
+from app.config.runtime_tuning import RuntimeTuning, apply_pool_sizes
+from app.config.settings import get_runtime_settings, get_settings, set_runtime_settings
+
+
+@pytest.fixture
+def tuning(redis_client):
+    """RuntimeTuning over fakeredis, restoring the runtime snapshot afterwards."""
+    snapshot = get_runtime_settings()
+    yield RuntimeTuning(redis_client)
+    set_runtime_settings(snapshot)
+
+
+async def test_audit_records_the_value_in_effect(tuning):
+    default = tuning.settings.cache_ttl
+
+    first = await tuning.set_overrides({"cache_ttl": default + 60}, actor="ops")
+    second = await tuning.set_overrides({"cache_ttl": default + 120}, actor="ops")
+
+    assert first["changes"]["cache_ttl"] == {"old": default, "new": default + 60}
+    assert second["changes"]["cache_ttl"] == {"old": default + 60, "new": default + 120}
+    assert [entry["version"] for entry in await tuning.get_audit_log()] == [2, 1]
+    assert get_runtime_settings().cache_ttl == default + 120
+
+
+async def test_concurrent_changes_are_serialized(tuning, redis_client):
+    other = RuntimeTuning(redis_client)
+
+    await asyncio.gather(
+        tuning.set_overrides({"cache_ttl": 600}, actor="a"),
+        other.set_overrides({"rate_limit_requests": 50}, actor="b"),
+    )
+
+    await tuning.load()
+    status = tuning.get_status()
+    assert status["version"] == 2
+    assert status["overrides"] == {"cache_ttl": 600, "rate_limit_requests": 50}
+    assert sorted(entry["version"] for entry in await tuning.get_audit_log()) == [1, 2]
+
+
+async def test_invalid_change_writes_nothing(tuning, redis_client):
+    with pytest.raises(ValueError, match="not tunable"):
+        await tuning.set_overrides({"secret_key": "x"}, actor="ops")
+
+    assert await redis_client.redis.exists(tuning.version_key, tuning.audit_key) == 0
+
+
+async def test_pool_override_stays_within_budget_and_controller_bounds(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "pool_autoscale_enabled", True)
+    monkeypatch.setattr(settings, "redis_connection_budget", 20)
+    monkeypatch.setattr(settings, "workers", 4)
+    pool = SimpleNamespace(max_connections=4, _available_connections=[], _in_use_connections=set())
+    target = RedisPoolTarget(pool, min_size=2, max_size=5)
+    monkeypatch.setattr(
+        pool_sizing, "get_pool_controller", lambda: SimpleNamespace(targets=[target])
+    )
+
+    old = get_runtime_settings()
+    await apply_pool_sizes(old, dataclasses.replace(old, redis_max_connections=50))
+
+    # 20 connections across 4 workers
+    assert pool.max_connections == 5
@@ -0,0 +1,32 @@
+"""
+Linux Daily Tips Backend - Sandbox Backend Tests
+"""
+
+import os
+
+import pytest
+
+from app.services.terminal.sandbox import SubprocessSandboxBackend
+
+
+@pytest.mark.parametrize("path", [
+    "../lt_abcX/home/user/evil",
+    "/../lt_abc2/evil",
+    "home/../../outside",
+])
+def test_subprocess_paths_cannot_escape_into_siblings(tmp_path, path):
+    backend = SubprocessSandboxBackend(root=str(tmp_path))
+    sandbox_dir = os.path.join(str(tmp_path), "lt_abc")
+
+    with pytest.raises(ValueError, match="escapes"):
+        backend._path(sandbox_dir, path)
+
+
+def test_subprocess_paths_inside_the_sandbox_resolve(tmp_path):
+    backend = SubprocessSandboxBackend(root=str(tmp_path))
+    sandbox_dir = os.path.join(str(tmp_path), "lt_abc")
+
+    assert backend._path(sandbox_dir, "/home/user/notes.txt") == os.path.join(
+        sandbox_dir, "home", "user", "notes.txt"
+    )
+    assert backend._path(sandbox_dir, "/") == sandbox_dir
@@ -0,0 +1,66 @@
+"""
+Linux Daily Tips Backend - Terminal Session Reaper Tests
+"""
+
+import time
+from types import SimpleNamespace
+
+from app.services.terminal.reaper import (
+    CLAIM_EXPIRED_SQL,
+    RESTORE_ACTIVE_SQL,
+    SessionReaper,
+)
+from app.services.terminal.registry import SessionRegistry
+from app.services.terminal.sandbox import FakeSandboxBackend
+
+
+class FakeManager:
+    """Session manager of a worker that owns none of the claimed sessions."""
+
+    def __init__(self, registry: SessionRegistry):
+        self.registry = registry
+        self.backend = FakeSandboxBackend()
+        self.destroyed = []
+
+        async def destroy_by_id(sandbox_id: str) -> None:
+            self.destroyed.append(sandbox_id)
+
+        self.backend.destroy_by_id = destroy_by_id
+
+    def has_session(self, session_id: str) -> bool:
+        return False
+
+
+async def test_reaper_spares_containers_held_by_live_workers(redis_client, fake_session):
+    registry = SessionRegistry(redis_client)
+    other = SessionRegistry(redis_client)
+    dead = SessionRegistry(redis_client)
+    now = time.time()
+
+    # Recycled to a new session on a live worker
+    await other.heartbeat()
+    await other.admit("33333333-3333-3333-3333-333333333333", now + 600)
+    await other.set_container("33333333-3333-3333-3333-333333333333", "recycled")
+    # Left behind by a worker that stopped heartbeating
+    await dead.admit("44444444-4444-4444-4444-444444444444", now + 600)
+    await dead.set_container("44444444-4444-4444-4444-444444444444", "orphaned")
+    await dead.release("44444444-4444-4444-4444-444444444444")
+    # Extended in Redis after its row was last written
+    await other.admit("55555555-5555-5555-5555-555555555555", now + 900)
+
+    fake_session.respond(CLAIM_EXPIRED_SQL, [
+        SimpleNamespace(id="11111111-1111-1111-1111-111111111111", container_id="recycled"),
+        SimpleNamespace(id="22222222-2222-2222-2222-222222222222", container_id="orphaned"),
+        SimpleNamespace(id="55555555-5555-5555-5555-555555555555", container_id="extended"),
+    ])
+    manager = FakeManager(registry)
+    reaper = SessionReaper(manager)
+
+    assert await reaper.reap_batch() == 2
+    assert manager.destroyed == ["orphaned"]
+    assert reaper.get_metrics()["skipped_owned"] == 1
+
+    sql, params = fake_session.executed[-1]
+    assert sql == RESTORE_ACTIVE_SQL
+    assert [restored["id"] for restored in params] == ["55555555-5555-5555-5555-555555555555"]
+    assert abs(params[0]["expires_at"].timestamp() - (now + 900)) < 0.001
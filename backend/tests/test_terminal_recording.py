@@ -0,0 +1,62 @@
+"""
+Linux Daily Tips Backend - Terminal Recording Tests
+"""
+
+import asyncio
+import os
+import time
+
+from app.services.terminal.recording import (
+    DiskRecordingStore,
+    RedisRecordingStore,
+    SessionRecorder,
+    stream_recording,
+)
+
+SESSION_ID = "11111111-1111-1111-1111-111111111111"
+
+
+class SlowFirstWriteStore(RedisRecordingStore):
+    """Redis store whose first chunk write is slower than the next ones."""
+
+    async def write_chunk(self, session_id: str, seq: int, data: str) -> None:
+        if seq == 0:
+            await asyncio.sleep(0.05)
+        if seq == 1:
+            raise ConnectionError("write lost")
+        await super().write_chunk(session_id, seq, data)
+
+
+async def test_redis_chunks_are_addressed_by_seq(redis_client):
+    store = SlowFirstWriteStore(redis_client, "test:", 60)
+    recorder = SessionRecorder(SESSION_ID, store)
+    recorder.chunk_bytes = 1
+    for text in (b"one", b"two", b"three"):
+        recorder.record_output(text)
+
+    index = await recorder.finish()
+
+    assert [chunk["seq"] for chunk in index["chunks"]] == [0, 1, 2]
+    assert index["complete"] is False
+    # Chunk 1 was lost; chunk 2 keeps its seq instead of taking its place
+    assert await store.list_chunks(SESSION_ID) == [0, 2]
+    assert await store.read_chunk(SESSION_ID, 1) is None
+    assert '"three"' in await store.read_chunk(SESSION_ID, 2)
+
+    replayed = [chunk async for chunk in stream_recording(SESSION_ID, index, store)]
+    assert len(replayed) == 2 and '"three"' in replayed[1]
+    partial = {"chunks": [{"seq": 2}]}
+    assert [chunk async for chunk in stream_recording(SESSION_ID, partial, store)] == replayed[1:]
+
+
+async def test_disk_store_prunes_recordings_past_retention(tmp_path):
+    store = DiskRecordingStore(str(tmp_path), retention_seconds=3600)
+    (tmp_path / "old").mkdir()
+    (tmp_path / "old" / "000000.ndjson.gz").write_bytes(b"")
+    stale = time.time() - 7200
+    os.utime(tmp_path / "old", (stale, stale))
+
+    await store.write_chunk("new", 0, "header\n")
+
+    assert sorted(os.listdir(tmp_path)) == ["new"]
+    assert await store.read_chunk("new", 0) == "header\n"
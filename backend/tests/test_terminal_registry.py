@@ -0,0 +1,120 @@
+"""
+Linux Daily Tips Backend - Terminal Session Registry Tests
+"""
+
+import asyncio
+import json
+import time
+
+from sqlalchemy import exc
+
+from app.services.terminal.registry import (
+    END_SESSIONS_SQL,
+    EXTEND_SESSIONS_SQL,
+    SET_SESSION_DATA_SQL,
+    UPSERT_SESSIONS_SQL,
+    SessionRegistry,
+)
+
+
+async def _queue_mixed_batch(registry: SessionRegistry) -> None:
+    """Leave create, extend, data and end records for two sessions queued."""
+    now = time.time()
+    await registry.admit("11111111-1111-1111-1111-111111111111", now + 600, ip_address="10.0.0.1")
+    await registry.flush()
+
+    await registry.admit("22222222-2222-2222-2222-222222222222", now + 600, ip_address="10.0.0.2")
+    await registry.extend("11111111-1111-1111-1111-111111111111", now + 1200)
+    await registry.set_session_data("11111111-1111-1111-1111-111111111111", "commands", 3)
+    await registry.release("22222222-2222-2222-2222-222222222222", ip_address="10.0.0.2")
+
+
+async def test_flush_applies_create_extend_data_end(redis_client, fake_session):
+    registry = SessionRegistry(redis_client)
+    await _queue_mixed_batch(registry)
+    fake_session.executed.clear()
+
+    assert await registry.flush() == 4
+    assert [sql for sql, _ in fake_session.executed] == [
+        UPSERT_SESSIONS_SQL, EXTEND_SESSIONS_SQL, SET_SESSION_DATA_SQL, END_SESSIONS_SQL,
+    ]
+    extend_params = fake_session.executed[1][1]
+    assert extend_params[0]["id"] == "11111111-1111-1111-1111-111111111111"
+    assert await registry.pending() == 0
+
+
+async def test_deterministic_failure_moves_record_to_dead_letter(redis_client, fake_session):
+    registry = SessionRegistry(redis_client)
+    await _queue_mixed_batch(registry)
+    fake_session.fail(EXTEND_SESSIONS_SQL, lambda: ValueError("bad expires_at"))
+
+    for _ in range(registry.max_attempts - 1):
+        try:
+            await registry.flush()
+        except ValueError:
+            pass
+        assert await registry.pending() == 4
+
+    assert await registry.flush() == 4
+    assert await registry.pending() == 0
+    dead = [json.loads(record) for record in await redis_client.lrange(registry.dead_letter_key)]
+    assert [record["op"] for record in dead] == ["extend"]
+    assert "bad expires_at" in dead[0]["error"]
+    # The other records of the batch still reached the table
+    written = [sql for sql, _ in fake_session.executed]
+    assert END_SESSIONS_SQL in written and SET_SESSION_DATA_SQL in written
+
+
+async def test_database_outage_requeues_without_counting_attempts(redis_client, fake_session):
+    registry = SessionRegistry(redis_client)
+    await _queue_mixed_batch(registry)
+    fake_session.fail(
+        UPSERT_SESSIONS_SQL,
+        lambda: exc.OperationalError("INSERT", {}, ConnectionRefusedError("down")),
+    )
+
+    for _ in range(registry.max_attempts + 1):
+        try:
+            await registry.flush()
+        except exc.OperationalError:
+            pass
+
+    records = [json.loads(record) for record in await redis_client.lrange(registry.write_behind_key)]
+    assert len(records) == 4
+    assert all("attempts" not in record for record in records)
+    assert await registry.dead_lettered() == 0
+
+
+async def test_end_cannot_commit_before_create_held_by_another_flusher(redis_client, fake_session):
+    first = SessionRegistry(redis_client)
+    second = SessionRegistry(redis_client)
+    first.batch_size = 1
+    session_id = "33333333-3333-3333-3333-333333333333"
+    await first.admit(session_id, time.time() + 600, ip_address="10.0.0.3")
+    await first.release(session_id, ip_address="10.0.0.3")
+
+    # The first worker drains the create, then loses the database mid-write
+    writing = asyncio.Event()
+    resume = asyncio.Event()
+
+    async def stalled_write(records):
+        writing.set()
+        await resume.wait()
+        raise exc.OperationalError("INSERT", {}, ConnectionRefusedError("down"))
+
+    first._write_batch = stalled_write
+    flushing = asyncio.create_task(first.flush())
+    await writing.wait()
+
+    # Meanwhile the second worker must not drain and commit the end
+    assert await second.flush() == 0
+    assert fake_session.executed == []
+
+    resume.set()
+    try:
+        await flushing
+    except exc.OperationalError:
+        pass
+
+    assert await second.flush() == 2
+    assert [sql for sql, _ in fake_session.executed] == [UPSERT_SESSIONS_SQL, END_SESSIONS_SQL]
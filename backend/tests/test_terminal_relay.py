@@ -0,0 +1,36 @@
+"""
+Linux Daily Tips Backend - Terminal Relay Tests
+"""
+
+from app.services.terminal.relay import MAX_TERMINAL_SIZE, TerminalRelay
+
+
+class FakePty:
+    def __init__(self):
+        self.sizes = []
+        self.written = []
+
+    def resize(self, cols: int, rows: int) -> None:
+        self.sizes.append((cols, rows))
+
+    async def write(self, data: bytes) -> None:
+        self.written.append(data)
+
+
+async def test_resize_messages_are_validated_and_clamped():
+    pty = FakePty()
+    relay = TerminalRelay(pty, websocket=None, max_bytes_per_second=0)
+
+    await relay._handle_control('{"type": "resize", "cols": 120, "rows": 40}')
+    await relay._handle_control('{"type": "resize", "cols": 0, "rows": 99999999}')
+    for malformed in (
+        '{"type": "resize"}',
+        '{"type": "resize", "cols": "wide", "rows": 40}',
+        '{"type": "resize", "cols": 80.5, "rows": 24}',
+        '{"type": "resize", "cols": true, "rows": 24}',
+        '{"type": "resize", "cols": null, "rows": 24}',
+    ):
+        await relay._handle_control(malformed)
+
+    assert pty.sizes == [(120, 40), (1, MAX_TERMINAL_SIZE)]
+    assert pty.written == []
@@ -0,0 +1,79 @@
+"""
+Linux Daily Tips Backend - Draft Week Approval Tests
+"""
+
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.tips import events
+from app.services.tips.approval import approve_weeks
+
+WEEK_A = "00000000-0000-4000-8000-00000000000a"
+WEEK_B = "00000000-0000-4000-8000-00000000000b"
+WEEK_C = "00000000-0000-4000-8000-00000000000c"
+
+
+def _row(kind: str, row_id: str, day: date, tip=None) -> SimpleNamespace:
+    return SimpleNamespace(kind=kind, id=row_id, day=day, tip=tip)
+
+
+def _tip(tip_id: str, week_start: date, day_of_week: int) -> dict:
+    """The tip row the statement returns for a draft tip of a week."""
+    publish_date = week_start + timedelta(days=day_of_week - 1)
+    return {"id": tip_id, "publish_date": publish_date.isoformat(), "is_active": True}
+
+
+@pytest.fixture
+def changed(monkeypatch):
+    """Collect the dates passed to tip change listeners."""
+    calls = []
+
+    async def listener(dates):
+        calls.append(dates)
+
+    monkeypatch.setattr(events, "_listeners", [("test", listener)])
+    return calls
+
+
+async def test_approve_weeks_schedules_skips_and_reports_conflicts(fake_session, changed):
+    monday = date(2026, 3, 9)
+    fake_session.respond("WITH approved", [
+        _row("week", WEEK_A, monday),
+        _row("tip", "t1", monday, _tip("t1", monday, 1)),
+        _row("tip", "t7", monday + timedelta(days=6), _tip("t7", monday, 7)),
+        _row("conflict", "old", monday),
+    ])
+
+    result = await approve_weeks([WEEK_A, WEEK_B, WEEK_A], approved_by=None, prewarm=False)
+
+    # One statement, duplicate ids collapsed
+    ((sql, params),) = fake_session.executed
+    assert params["week_ids"] == [WEEK_A, WEEK_B]
+    assert "a.week_start_date + dt.day_of_week - 1" in sql
+    assert "status = 'draft'" in sql
+
+    assert result.approved_weeks == [WEEK_A]
+    # B was not in draft status (or unknown) and is skipped, not an error
+    assert result.skipped_weeks == [WEEK_B]
+    # Day 1 is the week's Monday, day 7 its Sunday
+    assert result.scheduled_dates == [date(2026, 3, 9), date(2026, 3, 15)]
+    assert result.conflicts == [{"id": "old", "publish_date": "2026-03-09"}]
+    assert changed == [[date(2026, 3, 9), date(2026, 3, 15)]]
+
+
+async def test_approve_weeks_without_new_tips_notifies_nobody(fake_session, changed):
+    result = await approve_weeks([WEEK_C], prewarm=False)
+
+    assert len(fake_session.executed) == 1
+    assert result.to_dict() == {
+        "approved_weeks": [],
+        "skipped_weeks": [WEEK_C],
+        "tips": [],
+        "conflicts": [],
+    }
+    assert changed == []
+
+    assert (await approve_weeks([])).to_dict()["skipped_weeks"] == []
+    assert len(fake_session.executed) == 1
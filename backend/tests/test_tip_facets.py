@@ -0,0 +1,83 @@
+"""
+Linux Daily Tips Backend - Tip Facets Tests
+"""
+
+from datetime import date
+from types import SimpleNamespace
+from typing import List, Optional
+
+import pytest
+
+from app.services.tips.facets import TipFacets
+
+
+def _tip(tip_id: str, day: date, difficulty: str, *categories: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=tip_id, publish_date=day, difficulty=difficulty, category=list(categories)
+    )
+
+
+@pytest.fixture
+def facets(redis_client, monkeypatch) -> TipFacets:
+    """TipFacets over fakeredis reading tips from a mutable in-memory table."""
+    facets = TipFacets(redis_client)
+    facets.tips = {
+        "a": _tip("a", date(2026, 3, 1), "beginner", "files", "shell"),
+        "b": _tip("b", date(2026, 3, 2), "advanced", "files"),
+        "c": _tip("c", date(2026, 3, 3), "beginner", "network"),
+    }
+
+    async def read_tips(dates: Optional[List[date]] = None):
+        return [
+            tip for tip in facets.tips.values()
+            if dates is None or tip.publish_date in dates
+        ]
+
+    async def hydrate(tip_ids: List[str]):
+        return [{"id": tip_id} for tip_id in tip_ids if tip_id in facets.tips]
+
+    monkeypatch.setattr(facets, "_read_tips", read_tips)
+    monkeypatch.setattr(facets, "hydrate", hydrate)
+    return facets
+
+
+async def test_query_intersects_filters_newest_first(facets):
+    page = await facets.query()
+    assert page.total == 3
+    assert [tip["id"] for tip in page.tips] == ["c", "b", "a"]
+
+    page = await facets.query(categories=["files"], limit=1, offset=1)
+    assert (page.total, [tip["id"] for tip in page.tips]) == (2, ["a"])
+
+    page = await facets.query(categories=["files", "shell"], difficulty="beginner")
+    assert (page.total, [tip["id"] for tip in page.tips]) == (1, ["a"])
+
+    page = await facets.query(categories=["files"], difficulty="intermediate")
+    assert (page.total, page.tips) == (0, [])
+    # The intersection result is not left behind
+    assert await facets.client.redis.keys(f"{facets.key}:result:*") == []
+
+
+async def test_on_tips_changed_moves_edited_and_removed_tips(facets):
+    await facets.ensure()
+    assert (await facets.counts())["category"] == {"files": 2, "shell": 1, "network": 1}
+
+    # "a" moves to another day and category; "b" is deactivated
+    facets.tips["a"] = _tip("a", date(2026, 3, 4), "advanced", "network")
+    del facets.tips["b"]
+    await facets.on_tips_changed([date(2026, 3, 1), date(2026, 3, 2), date(2026, 3, 4)])
+
+    counts = await facets.counts()
+    assert counts["category"] == {"network": 2}
+    assert counts["difficulty"] == {"advanced": 1, "beginner": 1}
+    page = await facets.query(categories=["network"])
+    assert [tip["id"] for tip in page.tips] == ["a", "c"]
+    assert (await facets.query(categories=["files"])).total == 0
+    assert facets.get_status()["updated_tips"] == 2
+
+
+async def test_on_tips_changed_waits_for_first_build(facets):
+    await facets.on_tips_changed([date(2026, 3, 1)])
+
+    assert not await facets.client.redis.exists(f"{facets.key}:version")
+    assert facets.get_status()["updates"] == 0
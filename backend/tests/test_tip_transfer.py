@@ -0,0 +1,141 @@
+"""
+Linux Daily Tips Backend - Bulk Tip Import and Export Tests
+"""
+
+import json
+from contextlib import asynccontextmanager
+from datetime import date
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List
+
+import pytest
+
+from app.services.tips import transfer
+from app.services.tips.transfer import (
+    EXPORT_COLUMNS,
+    UPSERT_STAGED_SQL,
+    export_tips,
+    import_tips,
+)
+
+
+EXPORTED_CSV = (
+    ",".join(EXPORT_COLUMNS) + "\n"
+    + "00000000-0000-4000-8000-000000000001,Using ls,\"List files\nwith ls\",beginner,"
+    + "\"[\"\"files\"\"]\",{},2024-01-02,t,42,2024-01-01 00:00:00+00,2024-01-01 00:00:00+00\n"
+).encode()
+
+
+class FakeCopyConnection:
+    """asyncpg connection double recording COPY calls."""
+
+    def __init__(self, upserted: Dict[str, Any]):
+        self.upserted = upserted
+        self.executed: List[str] = []
+        self.copied: Dict[str, Any] = {}
+
+    @asynccontextmanager
+    async def transaction(self, readonly: bool = False):
+        yield
+
+    async def execute(self, sql: str, *args) -> str:
+        self.executed.append(sql)
+        return "OK"
+
+    async def fetchrow(self, sql: str) -> Dict[str, Any]:
+        self.executed.append(sql)
+        return self.upserted
+
+    async def copy_records_to_table(self, table, records, columns) -> str:
+        rows = [record async for record in records]
+        self.copied = {"table": table, "columns": list(columns), "records": rows}
+        return f"COPY {len(rows)}"
+
+    async def copy_to_table(self, table, source, columns, format) -> str:
+        data = b"".join([chunk async for chunk in source])
+        self.copied = {"table": table, "columns": list(columns), "data": data}
+        return "COPY 1"
+
+    async def copy_from_query(self, query, output, **options) -> str:
+        for start in range(0, len(EXPORTED_CSV), 64):
+            await output(EXPORTED_CSV[start:start + 64])
+        return "COPY 1"
+
+
+@pytest.fixture
+def copy_connection(monkeypatch):
+    """Route driver_connection() to a FakeCopyConnection and record notifications."""
+    from app.config import database
+
+    conn = FakeCopyConnection({
+        "inserted": 0, "updated": 1, "dates": [date(2024, 1, 2), date(2024, 1, 1)],
+    })
+    conn.notified = []
+
+    @asynccontextmanager
+    async def driver_connection(readonly: bool = False):
+        yield conn
+
+    async def notify(dates):
+        conn.notified.append(sorted(dates))
+
+    monkeypatch.setattr(
+        database, "get_database", lambda: SimpleNamespace(driver_connection=driver_connection)
+    )
+    monkeypatch.setattr(transfer, "notify_tips_changed", notify)
+    return conn
+
+
+async def _stream(data: bytes) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), 16):
+        yield data[start:start + 16]
+
+
+async def test_exported_csv_imports_by_header(copy_connection):
+    exported = b"".join([chunk async for chunk in export_tips(format="csv")])
+    assert exported == EXPORTED_CSV
+
+    result = await import_tips(_stream(exported), format="csv")
+
+    assert copy_connection.copied["columns"] == list(EXPORT_COLUMNS)
+    # The header row is consumed, not loaded as data
+    assert copy_connection.copied["data"] == EXPORTED_CSV.split(b"\n", 1)[1]
+    assert result.updated == 1
+
+
+async def test_csv_columns_match_by_name_in_any_order(copy_connection):
+    await import_tips(_stream(b"content,title\nList files,Using ls\n"), format="csv")
+
+    assert copy_connection.copied["columns"] == ["content", "title"]
+    assert copy_connection.copied["data"] == b"List files,Using ls\n"
+
+
+@pytest.mark.parametrize("header, error", [
+    (b"title,content,colour\n", "Unknown"),
+    (b"title,title,content\n", "Repeated"),
+    (b"title,difficulty\n", "Missing"),
+])
+async def test_csv_header_is_validated(copy_connection, header, error):
+    with pytest.raises(ValueError, match=error):
+        await import_tips(_stream(header + b"x,y,z\n"), format="csv")
+    assert copy_connection.executed == []
+
+
+async def test_ndjson_import_notifies_old_and_new_dates(copy_connection):
+    document = {
+        "id": "00000000-0000-4000-8000-000000000001",
+        "title": "Using ls",
+        "content": "List files",
+        "category": ["files"],
+        "publish_date": "2024-01-02",
+    }
+    await import_tips(_stream(json.dumps(document).encode() + b"\n\n"))
+
+    records = copy_connection.copied["records"]
+    assert len(records) == 1
+    assert records[0][4] == '["files"]'
+    assert records[0][6] == date(2024, 1, 2)
+    assert copy_connection.executed[-1] == UPSERT_STAGED_SQL
+    # The tip moved from 2024-01-01: both days are reported as changed
+    assert copy_connection.notified == [[date(2024, 1, 1), date(2024, 1, 2)]]
+
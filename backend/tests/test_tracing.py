@@ -0,0 +1,101 @@
+"""
+Linux Daily Tips Backend - Tracing Tests
+"""
+
+import functools
+import io
+import logging
+
+import pytest
+
+pytest.importorskip("opentelemetry.sdk")
+
+from sqlalchemy import create_engine, text
+
+from app.config import tracing
+from app.config.settings import get_settings
+from app.config.tracing import TracedRedisClient, TracingConfig
+
+
+def _config(exporter: str = "memory") -> TracingConfig:
+    settings = get_settings().copy(
+        update={"tracing_enabled": True, "tracing_exporter": exporter}
+    )
+    return TracingConfig(settings)
+
+
+@pytest.fixture
+def config():
+    config = _config()
+    yield config
+    config.shutdown()
+
+
+def _spans(config: TracingConfig):
+    return config.exporters["memory"].get_finished_spans()
+
+
+def test_statements_are_traced_without_literals(config):
+    engine = create_engine("sqlite://")
+    config.attach_engine(engine, "primary")
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 'secret' AS value"))
+
+    (span,) = _spans(config)
+    assert span.name == "db.select"
+    assert span.attributes["db.engine"] == "primary"
+    assert "secret" not in span.attributes["db.statement"]
+
+
+async def test_redis_reads_record_hits_and_misses(config, redis_client):
+    client = TracedRedisClient(redis_client.redis, config.tracer)
+    await client.set("tips:daily:1", "value", ttl=60)
+
+    assert await client.get("tips:daily:1") == "value"
+    assert await client.get("tips:daily:2", "default") == "default"
+
+    stored, hit, miss = _spans(config)
+    assert stored.attributes["cache.stored"] is True
+    assert (hit.attributes["cache.hit"], miss.attributes["cache.hit"]) == (True, False)
+    assert hit.attributes["cache.key_namespace"] == "tips"
+
+
+def test_console_exporter_prints_spans(monkeypatch):
+    out = io.StringIO()
+    monkeypatch.setattr(
+        tracing, "ConsoleSpanExporter", functools.partial(tracing.ConsoleSpanExporter, out=out)
+    )
+    config = _config("console")
+    with config.tracer.start_as_current_span("tips.approve"):
+        pass
+    config.shutdown()
+
+    assert '"name": "tips.approve"' in out.getvalue()
+
+
+def test_exporter_missing_its_package_is_skipped(monkeypatch, caplog):
+    def otlp(settings):
+        raise ImportError("No module named 'opentelemetry.exporter'")
+
+    monkeypatch.setitem(tracing.EXPORTERS, "otlp", otlp)
+    config = _config("otlp,memory")
+
+    with caplog.at_level(logging.WARNING, logger="app.config.tracing"):
+        with config.tracer.start_as_current_span("tips.approve"):
+            pass
+
+    assert "Trace exporter 'otlp' is unavailable" in caplog.text
+    assert [span.name for span in _spans(config)] == ["tips.approve"]
+    config.shutdown()
+
+
+def test_tracing_is_disabled_with_a_warning_without_the_sdk(monkeypatch, caplog):
+    monkeypatch.setattr(tracing, "trace", None)
+
+    with caplog.at_level(logging.WARNING, logger="app.config.tracing"):
+        config = _config()
+
+    assert config.enabled is False
+    assert config.tracer is None
+    assert "opentelemetry-sdk is not installed" in caplog.text